@@ -0,0 +1,226 @@
+"""Parse and validate BPMN documents from asyncio code without blocking the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, Union
+
+from pybpmn_parser.parse import Parser, ParseResult
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from pybpmn_parser.validator import ValidationResult, XMLBuffer
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 4
+"""The default number of documents an `AsyncParser` processes at the same time."""
+
+
+async def _read_file(path: Union[str, Path]) -> bytes:
+    """Read a file in the loop's default executor, so the event loop never waits on the disk."""
+    return await asyncio.get_running_loop().run_in_executor(None, Path(path).read_bytes)
+
+
+async def _run_cancellable(executor: Optional[Executor], func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a function in an executor, telling it to stop when the awaiting task is cancelled.
+
+    The function receives a `threading.Event` as the `cancel_event` keyword argument. When the task is
+    cancelled, the event is set and the task waits for the function to return before re-raising, so the
+    work it is still doing never outlives the caller's concurrency limit.
+    """
+    cancel_event = threading.Event()
+    future = asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, cancel_event=cancel_event))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        await asyncio.wait([future])
+        raise
+
+
+class AsyncParser:
+    """
+    An asyncio front end for a `Parser`.
+
+    Files are read in the event loop's default executor. Parsing and validation run in a dedicated executor,
+    so a large model never blocks the event loop, and a semaphore limits how many documents are processed at
+    the same time.
+
+    Cancelling a task that awaits a parse stops the work before the next element is built.
+
+    Example:
+        ```python
+        async with AsyncParser(max_concurrency=8) as parser:
+            results = await asyncio.gather(*(parser.parse_file(path) for path in paths))
+        ```
+    """
+
+    def __init__(
+        self,
+        parser: Optional[Parser] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Create an asynchronous parser.
+
+        Args:
+            parser: The parser that does the work. A default `Parser` is created if omitted.
+            max_concurrency: The number of documents processed at the same time.
+            executor: The executor for the CPU-bound work. A thread pool with `max_concurrency` threads is
+                created, and shut down by `close`, if omitted.
+        """
+        self.parser = parser or Parser()
+        """The parser that does the work."""
+
+        self.max_concurrency = max_concurrency
+        """The number of documents processed at the same time."""
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix="pybpmn-parser")
+
+    async def parse_file(self, xml_file: Union[str, Path]) -> ParseResult:
+        """
+        Parse a BPMN XML file into internal representation.
+
+        Args:
+            xml_file: The path to a BPMN XML file
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        async with self._semaphore:
+            xml_bytes = await _read_file(xml_file)
+            return await _run_cancellable(self._executor, self.parser.parse_bytes, xml_bytes)
+
+    async def parse_bytes(self, xml_bytes: XMLBuffer) -> ParseResult:
+        """
+        Parse raw BPMN XML data into internal representation.
+
+        Args:
+            xml_bytes: The BPMN XML document
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        async with self._semaphore:
+            return await _run_cancellable(self._executor, self.parser.parse_bytes, xml_bytes)
+
+    async def parse_string(self, xml_str: str) -> ParseResult:
+        """
+        Parse a BPMN XML string into internal representation.
+
+        Args:
+            xml_str: A BPMN XML string
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        async with self._semaphore:
+            return await _run_cancellable(self._executor, self.parser.parse_string, xml_str)
+
+    async def validate(self, xml: Union[str, XMLBuffer]) -> ValidationResult:
+        """
+        Validate a BPMN XML document with the validation level and schema backend of the parser.
+
+        Args:
+            xml: The BPMN XML document, as a string or raw data
+
+        Returns:
+            ValidationResult containing validation status and any errors
+        """
+        async with self._semaphore:
+            return await _run_cancellable(self._executor, self.parser.validate, xml)
+
+    def close(self) -> None:
+        """Shut down the executor if this parser created it."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncParser:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+_DEFAULT_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_DEFAULT_PARSER: Optional[Parser] = None
+_DEFAULTS_LOCK = threading.Lock()
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    """Return the executor shared by the module-level coroutines, creating it on first use."""
+    global _DEFAULT_EXECUTOR  # noqa: PLW0603
+    with _DEFAULTS_LOCK:
+        if _DEFAULT_EXECUTOR is None:
+            _DEFAULT_EXECUTOR = ThreadPoolExecutor(DEFAULT_MAX_CONCURRENCY, thread_name_prefix="pybpmn-parser")
+        return _DEFAULT_EXECUTOR
+
+
+def _default_parser() -> Parser:
+    """Return the parser shared by the module-level coroutines, creating it on first use."""
+    global _DEFAULT_PARSER  # noqa: PLW0603
+    with _DEFAULTS_LOCK:
+        if _DEFAULT_PARSER is None:
+            _DEFAULT_PARSER = Parser()
+        return _DEFAULT_PARSER
+
+
+async def aparse_file(xml_file: Union[str, Path], parser: Optional[Parser] = None) -> ParseResult:
+    """
+    Parse a BPMN XML file without blocking the event loop.
+
+    Args:
+        xml_file: The path to a BPMN XML file
+        parser: The parser to use. A shared default `Parser` is used if omitted.
+
+    Returns:
+        The parsed BPMN definitions and the elements indexed by ID
+    """
+    xml_bytes = await _read_file(xml_file)
+    return await aparse_bytes(xml_bytes, parser)
+
+
+async def aparse_bytes(xml_bytes: XMLBuffer, parser: Optional[Parser] = None) -> ParseResult:
+    """
+    Parse raw BPMN XML data without blocking the event loop.
+
+    Args:
+        xml_bytes: The BPMN XML document
+        parser: The parser to use. A shared default `Parser` is used if omitted.
+
+    Returns:
+        The parsed BPMN definitions and the elements indexed by ID
+    """
+    parser = parser or _default_parser()
+    return await _run_cancellable(_default_executor(), parser.parse_bytes, xml_bytes)
+
+
+async def avalidate(xml: Union[str, XMLBuffer], parser: Optional[Parser] = None) -> ValidationResult:
+    """
+    Validate a BPMN XML document without blocking the event loop.
+
+    Args:
+        xml: The BPMN XML document, as a string or raw data
+        parser: The parser whose validation level and schema backend are used. A shared default `Parser` is used
+            if omitted.
+
+    Returns:
+        ValidationResult containing validation status and any errors
+    """
+    parser = parser or _default_parser()
+    return await _run_cancellable(_default_executor(), parser.validate, xml)
@@ -0,0 +1,609 @@
+"""
+A compact binary format for parsed models, read in place through memory-mapped, read-only element views.
+
+A file holds a header, a table of sections, and the sections, each starting on an 8-byte boundary:
+
+- `strings` and `string_offsets`: every distinct string once, as UTF-8, and where each one starts and ends.
+- `classes` and `fields`: the schema, taken from the element registry. For each element class, its qualified
+  name and the names of its properties, in descriptor order.
+- `records`: one fixed-size record per element, by element number: its class, where its values start, its
+  parent, the range of its child elements, and the names of its extra attributes. Elements are numbered
+  breadth first from the root, so the children of an element are consecutive and come after it.
+- `values`: fixed-size value slots, first the properties and then the extra attributes of each element.
+  Elements are stored as element numbers and lists as ranges of slots.
+- `extras`: the names of the extra attributes of the elements.
+- `references`: the references between the elements, as in `ParseResult.references`.
+- `ids`: the element number of each ID, sorted by ID, for binary search.
+
+The integer arrays are read with `memoryview.cast`, so opening a file reads only its header and schema. The
+rest is read, from the page cache shared by every process that maps the file, as the elements are used.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from enum import Enum
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Optional, Union
+
+from pybpmn_parser.core import QName
+from pybpmn_parser.element_registry import ElementDescriptor, element_qname, registry
+from pybpmn_parser.factory import add_references
+from pybpmn_parser.hashing import is_element
+from pybpmn_parser.parse import ParseContext, ParseResult, Reference
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+MAGIC = b"PBPMNBIN"
+FORMAT_VERSION = 1
+
+SECTIONS = ("strings", "string_offsets", "classes", "fields", "records", "values", "extras", "references", "ids")
+"""The sections of a file, in the order of the section table."""
+
+NO_INDEX = 0xFFFFFFFF
+"""The element or string number of a missing element or string, such as the parent of the root."""
+
+_U32 = "I"
+_HEADER = struct.Struct("<8sHH")
+_SECTION = struct.Struct("<QQ")
+_RECORD_SIZE = 7
+"""The number of integers in a record: class, values start, parent, children start and count, extras start and
+count."""
+
+_SLOT = struct.Struct("<B3xQ")
+_SLOT_INT = struct.Struct("<B3xq")
+_SLOT_FLOAT = struct.Struct("<B3xd")
+_SLOT_PAIR = struct.Struct("<B3xII")
+_SLOT_SIZE = _SLOT.size
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _ELEMENT, _LIST, _JSON = range(9)
+_INT_RANGE = range(-(2**63), 2**63)
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _Writer:
+    """Numbers the elements of a model breadth first and lays out their records and values."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.schemas: dict[type, tuple[int, ElementDescriptor, tuple[str, ...]]] = {}
+        self.classes = array(_U32)
+        self.fields = array(_U32)
+        self.records = array(_U32)
+        self.values = bytearray()
+        self.extras = array(_U32)
+        self.elements: list[Any] = []
+        self.parents: list[int] = []
+        self.context = ParseContext()
+
+    def intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return NO_INDEX
+        if (index := self.strings.get(text)) is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def schema(self, element_type: type) -> tuple[int, ElementDescriptor, tuple[str, ...]]:
+        """Return the class number, descriptor and property names of an element class, adding it to the schema."""
+        if (schema := self.schemas.get(element_type)) is None:
+            descriptor = registry.by_qname[element_qname(element_type)]
+            self.classes.extend((self.intern(str(descriptor.q_name)), len(self.fields), len(descriptor.properties)))
+            self.fields.extend(self.intern(prop.property_name) for prop in descriptor.properties.values())
+            names = tuple(prop.property_name for prop in descriptor.properties.values())
+            schema = self.schemas[element_type] = (len(self.schemas), descriptor, names)
+        return schema
+
+    def write_elements(self, root: Any) -> None:
+        self.elements.append(root)
+        self.parents.append(NO_INDEX)
+        index = 0
+        while index < len(self.elements):
+            self.record(index)
+            index += 1
+
+    def record(self, index: int) -> None:
+        element = self.elements[index]
+        class_index, descriptor, names = self.schema(type(element))
+        extra = getattr(element, "__extra_kwargs__", {})
+        start = self.reserve(len(names) + len(extra))
+        children_start = len(self.elements)
+        for slot, name in enumerate(names, start):
+            if (value := getattr(element, name)) is not None:
+                self.put(slot, value, index)
+        for slot, value in enumerate(extra.values(), start + len(names)):
+            self.put(slot, value, index)
+        self.records.extend(
+            (
+                class_index,
+                start,
+                self.parents[index],
+                children_start,
+                len(self.elements) - children_start,
+                len(self.extras),
+                len(extra),
+            )
+        )
+        self.extras.extend(self.intern(name) for name in extra)
+        add_references(element, descriptor.properties.values(), self.context)
+        self.context.add_element(element)
+
+    def reserve(self, count: int) -> int:
+        """Add `count` empty value slots, returning the number of the first one."""
+        start = len(self.values) // _SLOT_SIZE
+        self.values.extend(bytes(count * _SLOT_SIZE))
+        return start
+
+    def put(self, slot: int, value: Any, parent: int) -> None:
+        """Encode a value into a slot; elements are queued as children of `parent`."""
+        offset = slot * _SLOT_SIZE
+        if isinstance(value, Enum):
+            value = value.value
+        if value is None:
+            return
+        if isinstance(value, bool):
+            _SLOT.pack_into(self.values, offset, _TRUE if value else _FALSE, 0)
+        elif isinstance(value, int) and value in _INT_RANGE:
+            _SLOT_INT.pack_into(self.values, offset, _INT, value)
+        elif isinstance(value, float):
+            _SLOT_FLOAT.pack_into(self.values, offset, _FLOAT, value)
+        elif isinstance(value, str):
+            _SLOT_PAIR.pack_into(self.values, offset, _STR, self.intern(value), 0)
+        elif is_element(value):
+            _SLOT_PAIR.pack_into(self.values, offset, _ELEMENT, len(self.elements), 0)
+            self.elements.append(value)
+            self.parents.append(parent)
+        elif isinstance(value, (list, tuple)):
+            self.put_list(offset, value, parent)
+        else:
+            _SLOT_PAIR.pack_into(self.values, offset, _JSON, self.intern(json.dumps(value)), 0)
+
+    def put_list(self, offset: int, items: Union[list, tuple], parent: int) -> None:
+        start = self.reserve(len(items))
+        _SLOT_PAIR.pack_into(self.values, offset, _LIST, start, len(items))
+        for slot, item in enumerate(items, start):
+            self.put(slot, item, parent)
+
+    def sections(self) -> list[bytes]:
+        """Return the sections, in the order of `SECTIONS`."""
+        references = array(_U32)
+        for reference in self.context.references:
+            references.extend(
+                (
+                    self.intern(reference.element_id),
+                    self.intern(reference.property),
+                    self.intern(reference.reference_id),
+                )
+            )
+        encoded = [text.encode("utf-8") for text in self.strings]
+        offsets = array(_U32, [0])
+        for text in encoded:
+            offsets.append(offsets[-1] + len(text))
+        positions = {id(element): index for index, element in enumerate(self.elements)}
+        ids = sorted(
+            (element_id.encode("utf-8"), self.strings[element_id], positions[id(element)])
+            for element_id, element in self.context.elements_by_id.items()
+            if isinstance(element_id, str) and element_id in self.strings
+        )
+        return [
+            b"".join(encoded),
+            _little_endian(offsets),
+            _little_endian(self.classes),
+            _little_endian(self.fields),
+            _little_endian(self.records),
+            bytes(self.values),
+            _little_endian(self.extras),
+            _little_endian(references),
+            _little_endian(array(_U32, [number for _, string, index in ids for number in (string, index)])),
+        ]
+
+
+def write_binary(model: Union[ParseResult, Any], fp: BinaryIO) -> int:
+    """
+    Write a model to a file in the binary format, see the module documentation.
+
+    Enum members are stored as their values and read back as such, as the parser reads them. Values that are
+    neither elements, lists nor scalars, such as the raw dicts of unknown extension elements, are stored as JSON.
+    The references and IDs are those of the elements written.
+
+    Args:
+        model: The result of parsing a document, or the root element of a model.
+        fp: The binary file to write to.
+
+    Returns:
+        The number of elements written.
+
+    Raises:
+        TypeError: If a value can't be stored as JSON.
+    """
+    writer = _Writer()
+    writer.write_elements(model.definition if isinstance(model, ParseResult) else model)
+    sections = writer.sections()
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for section in sections:
+        offset += _pad(offset)
+        table.append(_SECTION.pack(offset, len(section)))
+        offset += len(section)
+
+    fp.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+    fp.write(b"".join(table))
+    position = _HEADER.size + _SECTION.size * len(sections)
+    for section in sections:
+        fp.write(bytes(_pad(position)))
+        fp.write(section)
+        position += _pad(position) + len(section)
+    return len(writer.elements)
+
+
+class _Class:
+    """An element class of the schema of a file."""
+
+    __slots__ = ("names", "positions", "q_name")
+
+    def __init__(self, q_name: QName, names: tuple[str, ...]) -> None:
+        self.q_name = q_name
+        self.names = names
+        self.positions = {name: position for position, name in enumerate(names)}
+
+
+class BinaryModel:
+    """
+    A model in the binary format, read in place.
+
+    Elements are read through `BinaryElementView`s, which decode a value each time it is read; nothing is
+    decoded ahead. `to_result` builds the whole model instead. Once the model is closed, reading it or its views
+    raises `ValueError`.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        """
+        Read the header and the schema of a model.
+
+        Args:
+            buffer: The contents of a file written by `write_binary`, as `bytes` or any object supporting the
+                buffer protocol, such as `mmap.mmap`.
+
+        Raises:
+            ValueError: If the buffer does not hold a model in a version of the format this module reads.
+        """
+        self._mmap: Optional[mmap.mmap] = None
+        self._closed = False
+        self._view = memoryview(buffer)
+        if len(self._view) < _HEADER.size:
+            raise ValueError("Not a binary model: the file is too short.")
+        magic, version, count = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("Not a binary model: wrong magic number.")
+        if version != FORMAT_VERSION or count != len(SECTIONS):
+            raise ValueError(f"Unsupported binary model version {version}, expected {FORMAT_VERSION}.")
+        sections = {}
+        for number, name in enumerate(SECTIONS):
+            offset, size = _SECTION.unpack_from(self._view, _HEADER.size + number * _SECTION.size)
+            sections[name] = self._view[offset : offset + size]
+
+        self._strings = sections["strings"]
+        self._values = sections["values"]
+        self._string_offsets = self._integers(sections["string_offsets"])
+        self._records = self._integers(sections["records"])
+        self._extras = self._integers(sections["extras"])
+        self._references = self._integers(sections["references"])
+        self._ids = self._integers(sections["ids"])
+        self._decoded: dict[int, str] = {}
+        classes = self._integers(sections["classes"])
+        fields = self._integers(sections["fields"])
+        self._classes: list[_Class] = []
+        for number in range(0, len(classes), 3):
+            name, start, count = classes[number : number + 3]
+            names = tuple(self.string(fields[field]) for field in range(start, start + count))
+            self._classes.append(_Class(QName.from_str(self.string(name)), names))
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> BinaryModel:
+        """
+        Map a file into memory and read its model.
+
+        The file is mapped read-only, so every process that opens it shares the same pages of the page cache.
+
+        Args:
+            path: The path of a file written by `write_binary`.
+
+        Returns:
+            The model. Close it, or use it as a context manager, to unmap the file.
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            model = cls(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+        model._mmap = buffer
+        return model
+
+    @staticmethod
+    def _integers(view: memoryview) -> Union[memoryview, array]:
+        if sys.byteorder == "little":
+            return view.cast(_U32)
+        values = array(_U32, bytes(view))
+        values.byteswap()
+        return values
+
+    @property
+    def closed(self) -> bool:
+        """Whether the model is closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Release the buffer, unmapping the file if the model was opened with `open`. Closing twice does nothing."""
+        if self._closed:
+            return
+        self._closed = True
+        self._decoded.clear()
+        for name, value in list(vars(self).items()):
+            if isinstance(value, memoryview):
+                value.release()
+                setattr(self, name, None)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("model is closed")
+
+    def __enter__(self) -> BinaryModel:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        self._check_open()
+        return len(self._records) // _RECORD_SIZE
+
+    @property
+    def root(self) -> BinaryElementView:
+        """The root element, usually the definitions."""
+        return BinaryElementView(self, 0)
+
+    def element(self, index: int) -> BinaryElementView:
+        """Return the view of an element by element number."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"No element number {index}.")
+        return BinaryElementView(self, index)
+
+    @property
+    def elements_by_id(self) -> Mapping[str, BinaryElementView]:
+        """The views of the elements by ID, looked up by binary search."""
+        return _IdIndex(self)
+
+    @property
+    def references(self) -> list[Reference]:
+        """The references between the elements, decoded on each access."""
+        self._check_open()
+        references = self._references
+        return [
+            Reference(
+                self.string(references[number]),
+                self.string(references[number + 1]),
+                self.string(references[number + 2]),
+            )
+            for number in range(0, len(references), 3)
+        ]
+
+    def string(self, index: int) -> Optional[str]:
+        """Return a string of the string table, decoding it on first use."""
+        self._check_open()
+        if index == NO_INDEX:
+            return None
+        if (text := self._decoded.get(index)) is None:
+            text = self._decoded[index] = str(self.string_bytes(index), "utf-8")
+        return text
+
+    def string_bytes(self, index: int) -> bytes:
+        """Return the UTF-8 bytes of a string of the string table."""
+        self._check_open()
+        return bytes(self._strings[self._string_offsets[index] : self._string_offsets[index + 1]])
+
+    def record(self, index: int) -> tuple[int, ...]:
+        """Return the record of an element: see `_RECORD_SIZE`."""
+        self._check_open()
+        start = index * _RECORD_SIZE
+        return tuple(self._records[start : start + _RECORD_SIZE])
+
+    def schema(self, index: int) -> _Class:
+        """Return the class of an element, from the schema of the file."""
+        self._check_open()
+        return self._classes[self._records[index * _RECORD_SIZE]]
+
+    def slot(self, index: int, name: str) -> Optional[int]:
+        """Return the value slot of a property or extra attribute of an element, or None if it has none."""
+        class_number, start, _, _, _, extras_start, extras_count = self.record(index)
+        schema = self._classes[class_number]
+        if (position := schema.positions.get(name)) is not None:
+            return start + position
+        for extra in range(extras_count):
+            if self.string(self._extras[extras_start + extra]) == name:
+                return start + len(schema.names) + extra
+        return None
+
+    def items(self, index: int) -> Iterator[tuple[str, int]]:
+        """Yield the name and value slot of each property, then each extra attribute, of an element."""
+        class_number, start, _, _, _, extras_start, extras_count = self.record(index)
+        names = self._classes[class_number].names
+        yield from zip(names, range(start, start + len(names)), strict=True)
+        for extra in range(extras_count):
+            yield self.string(self._extras[extras_start + extra]), start + len(names) + extra
+
+    def decode(self, slot: int, element: Callable[[int], Any], sequence: Callable[[Iterator[Any]], Any]) -> Any:
+        """
+        Decode a value slot.
+
+        Args:
+            slot: The number of the slot.
+            element: Returns the value of an element by element number.
+            sequence: Builds the value of a list from its items.
+
+        Returns:
+            The value.
+        """
+        self._check_open()
+        offset = slot * _SLOT_SIZE
+        tag = self._values[offset]
+        if tag <= _TRUE:
+            return None if tag == _NONE else tag == _TRUE
+        if tag == _INT:
+            return _SLOT_INT.unpack_from(self._values, offset)[1]
+        if tag == _FLOAT:
+            return _SLOT_FLOAT.unpack_from(self._values, offset)[1]
+        _, first, second = _SLOT_PAIR.unpack_from(self._values, offset)
+        if tag == _STR:
+            return self.string(first)
+        if tag == _ELEMENT:
+            return element(first)
+        if tag == _LIST:
+            return sequence(self.decode(item, element, sequence) for item in range(first, first + second))
+        return json.loads(self.string(first))
+
+    def subtree(self, index: int) -> list[int]:
+        """Return the element numbers of an element and of the elements below it."""
+        indexes = [index]
+        position = 0
+        while position < len(indexes):
+            _, _, _, children_start, children_count, _, _ = self.record(indexes[position])
+            indexes.extend(range(children_start, children_start + children_count))
+            position += 1
+        return indexes
+
+    def build(self, indexes: list[int], context: ParseContext) -> dict[int, Any]:
+        """Build the elements with the given element numbers, which must include all the elements below them."""
+        built: dict[int, Any] = {}
+        for index in sorted(indexes, reverse=True):
+            descriptor = registry.by_qname[self.schema(index).q_name]
+            kwargs = {name: self.decode(slot, built.__getitem__, list) for name, slot in self.items(index)}
+            element = built[index] = descriptor.type.from_kwargs(**kwargs)
+            add_references(element, descriptor.properties.values(), context)
+            context.add_element(element)
+        return built
+
+    def to_result(self) -> ParseResult:
+        """Build the whole model, with its `elements_by_id` and references, as the parser would."""
+        context = ParseContext()
+        built = self.build(list(range(len(self))), context)
+        return ParseResult(built[0], context)
+
+
+class _IdIndex(Mapping):
+    """The element views of a binary model by ID, found by binary search in its sorted `ids` section."""
+
+    def __init__(self, model: BinaryModel) -> None:
+        self._model = model
+
+    def __getitem__(self, key: str) -> BinaryElementView:
+        model = self._model
+        model._check_open()
+        ids = model._ids
+        target = key.encode("utf-8") if isinstance(key, str) else None
+        low, high = 0, len(ids) // 2
+        while target is not None and low < high:
+            middle = (low + high) // 2
+            found = model.string_bytes(ids[2 * middle])
+            if found == target:
+                return BinaryElementView(model, ids[2 * middle + 1])
+            if found < target:
+                low = middle + 1
+            else:
+                high = middle
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._model._check_open()
+        ids = self._model._ids
+        return (self._model.string(ids[number]) for number in range(0, len(ids), 2))
+
+    def __len__(self) -> int:
+        self._model._check_open()
+        return len(self._model._ids) // 2
+
+
+class BinaryElementView:
+    """
+    A read-only view of an element of a `BinaryModel`.
+
+    The properties and extra attributes of the element are read as attributes of the view, like those of the
+    element itself, and decoded on each access. Child elements are views too, and lists are tuples.
+    """
+
+    __slots__ = ("_model", "index")
+
+    def __init__(self, model: BinaryModel, index: int) -> None:
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "index", index)
+
+    def __getattr__(self, name: str) -> Any:
+        model = self._model
+        if (slot := model.slot(self.index, name)) is None:
+            raise AttributeError(f"{self.qname.local} has no attribute {name!r}")
+        return model.decode(slot, self._view, tuple)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BinaryElementView) and other._model is self._model and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self._model), self.index))
+
+    def __repr__(self) -> str:
+        element_id = getattr(self, "id", None)
+        return f"BinaryElementView({self.qname.local}, index={self.index}, id={element_id!r})"
+
+    def _view(self, index: int) -> BinaryElementView:
+        return BinaryElementView(self._model, index)
+
+    @property
+    def qname(self) -> QName:
+        """The qualified name of the element's class."""
+        return self._model.schema(self.index).q_name
+
+    @property
+    def element_type(self) -> type:
+        """The element's class, from the element registry."""
+        return registry.by_qname[self.qname].type
+
+    @property
+    def parent(self) -> Optional[BinaryElementView]:
+        """The element the element is a property of, or None for the root."""
+        parent = self._model.record(self.index)[2]
+        return None if parent == NO_INDEX else self._view(parent)
+
+    @property
+    def children(self) -> tuple[BinaryElementView, ...]:
+        """The elements held by the element's properties and extra attributes, in property order."""
+        _, _, _, children_start, children_count, _, _ = self._model.record(self.index)
+        return tuple(self._view(index) for index in range(children_start, children_start + children_count))
+
+    def to_element(self) -> Any:
+        """Build the element, and the elements below it, as model objects."""
+        return self._model.build(self._model.subtree(self.index), ParseContext())[self.index]
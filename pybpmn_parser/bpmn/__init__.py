@@ -1,7 +1,19 @@
-"""Data parsing for BPMN 2.0 XML bpmn."""
+"""
+Data parsing for BPMN 2.0 XML bpmn.
 
+The element classes are imported on demand: importing this package declares them in the element registry, which
+imports the module of a class when its qualified name is first looked up. The classes are also available as
+attributes of this package, e.g. `pybpmn_parser.bpmn.Process`, imported on first access. `load_classes` imports
+them all at once.
+"""
+
+import importlib
 from typing import Any
 
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.element_registry import registry
+
 IMPORT_ORDER = [
     "pybpmn_parser.bpmn.dc.point.Point",
     "pybpmn_parser.bpmn.dc.font.Font",
@@ -160,19 +172,264 @@ IMPORT_ORDER = [
 ]
 
 
+ELEMENT_CLASSES: dict[QName, str] = {
+    QName("Point", NAMESPACES["dc"]): "pybpmn_parser.bpmn.dc.point.Point",
+    QName("Font", NAMESPACES["dc"]): "pybpmn_parser.bpmn.dc.font.Font",
+    QName("Bounds", NAMESPACES["dc"]): "pybpmn_parser.bpmn.dc.bounds.Bounds",
+    QName("documentation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.foundation.documentation.Documentation",
+    QName("extension", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.foundation.extension.Extension",
+    QName(
+        "extensionElements", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.foundation.extension_elements.ExtensionElements",
+    QName("baseElement", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.foundation.base_element.BaseElement",
+    QName("rootElement", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.foundation.base_element.RootElement",
+    QName("ioBinding", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.io_binding.IoBinding",
+    QName("import", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.infrastructure.import_mod.Import",
+    QName("diagramElement", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.diagram_element.DiagramElement",
+    QName("node", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.node.Node",
+    QName("waypoint", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.edge.Waypoint",
+    QName("edge", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.edge.Edge",
+    QName("diagram", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.diagram.Diagram",
+    QName("operation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.service.operation.Operation",
+    QName("auditing", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.auditing.Auditing",
+    QName("monitoring", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.monitoring.Monitoring",
+    QName("lane", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.lane.Lane",
+    QName("laneSet", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.lane.LaneSet",
+    QName("rendering", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.rendering.Rendering",
+    QName("relationship", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.foundation.relationship.Relationship",
+    QName("dataState", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_state.DataState",
+    QName("inputSet", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.input_set.InputSet",
+    QName("outputSet", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.output_set.OutputSet",
+    QName(
+        "conversationLink", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.conversation.conversation_link.ConversationLink",
+    QName(
+        "conversationAssociation", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.conversation.conversation_association.ConversationAssociation",
+    QName("correlationKey", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.correlation_key.CorrelationKey",
+    QName("expression", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.expression.Expression",
+    QName("formalExpression", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.expression.FormalExpression",
+    QName("resourceParameter", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.resource_parameter.ResourceParameter",
+    QName("messageFlow", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.collaboration.message_flow.MessageFlow",
+    QName(
+        "messageFlowAssociation", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.collaboration.message_flow_association.MessageFlowAssociation",
+    QName(
+        "participantAssociation", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.collaboration.participant_association.ParticipantAssociation",
+    QName(
+        "participantMultiplicity", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.collaboration.participant_multiplicity.ParticipantMultiplicity",
+    QName("artifact", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.artifact.Artifact",
+    QName("categoryValue", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.category.CategoryValue",
+    QName("category", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.category.Category",
+    QName("dataInput", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_input.DataInput",
+    QName("flowElement", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.flow_element.FlowElement",
+    QName("dataObject", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_object.DataObject",
+    QName("dataOutput", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_output.DataOutput",
+    QName(
+        "eventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.event_definition.EventDefinition",
+    QName(
+        "cancelEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.cancel_event_definition.CancelEventDefinition",
+    QName(
+        "compensateEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.compensate_event_definition.CompensateEventDefinition",
+    QName(
+        "conditionalEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.conditional_event_definition.ConditionalEventDefinition",
+    QName(
+        "errorEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.error_event_definition.ErrorEventDefinition",
+    QName(
+        "escalationEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.escalation_event_definition.EscalationEventDefinition",
+    QName(
+        "linkEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.link_event_definition.LinkEventDefinition",
+    QName(
+        "messageEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.message_event_definition.MessageEventDefinition",
+    QName(
+        "signalEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.signal_event_definition.SignalEventDefinition",
+    QName(
+        "terminateEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.terminate_event_definition.TerminateEventDefinition",
+    QName(
+        "timerEventDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event_definition.timer_event_definition.TimerEventDefinition",
+    QName("property", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.property.Property",
+    QName("dataStore", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_store.DataStore",
+    QName("dataStoreReference", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_store_reference.DataStoreReference",
+    QName(
+        "dataObjectReference", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.data.data_object_reference.DataObjectReference",
+    QName("assignment", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.assignment.Assignment",
+    QName("dataAssociation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.data_association.DataAssociation",
+    QName("flowNode", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.flow_node.FlowNode",
+    QName("event", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.Event",
+    QName("escalation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.escalation.Escalation",
+    QName("signal", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.signal.Signal",
+    QName("throwEvent", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.throw_event.ThrowEvent",
+    QName("catchEvent", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.catch_event.CatchEvent",
+    QName(
+        "intermediateThrowEvent", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event.intermediate_throw_event.IntermediateThrowEvent",
+    QName("endEvent", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.end_event.EndEvent",
+    QName(
+        "intermediateCatchEvent", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event.intermediate_catch_event.IntermediateCatchEvent",
+    QName("startEvent", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.start_event.StartEvent",
+    QName("boundaryEvent", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.event.boundary_event.BoundaryEvent",
+    QName(
+        "implicitThrowEvent", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.event.implicit_throw_event.ImplicitThrowEvent",
+    QName(
+        "complexBehaviorDefinition", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.complex_behavior_definition.ComplexBehaviorDefinition",
+    QName(
+        "loopCharacteristics", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.loop_characteristics.LoopCharacteristics",
+    QName(
+        "multiInstanceLoopCharacteristics", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.loop_characteristics.MultiInstanceLoopCharacteristics",
+    QName(
+        "standardLoopCharacteristics", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.loop_characteristics.StandardLoopCharacteristics",
+    QName("shape", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.shape.Shape",
+    QName("plane", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.plane.Plane",
+    QName("label", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.label.Label",
+    QName("interface", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.service.interface.Interface",
+    QName("endPoint", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.service.end_point.EndPoint",
+    QName("participant", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.collaboration.participant.Participant",
+    QName("error", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.error.Error",
+    QName("message", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.message.Message",
+    QName("itemDefinition", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.item_definition.ItemDefinition",
+    QName(
+        "conversationNode", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.conversation.conversation_node.ConversationNode",
+    QName(
+        "resourceParameterBinding", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.common.resource_parameter_binding.ResourceParameterBinding",
+    QName(
+        "resourceAssignmentExpression", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.resource_assignment_expression.ResourceAssignmentExpression",
+    QName("resource", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.resource.Resource",
+    QName("textAnnotation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.text_annotation.TextAnnotation",
+    QName("group", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.group.Group",
+    QName("association", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.association.Association",
+    QName("BPMNLabel", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmnlabel.BPMNLabel",
+    QName("BPMNShape", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmnshape.BPMNShape",
+    QName("labeledEdge", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.labeled_edge.LabeledEdge",
+    QName("BPMNEdge", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmnedge.BPMNEdge",
+    QName("BPMNPlane", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmnplane.BPMNPlane",
+    QName("style", NAMESPACES["di"]): "pybpmn_parser.bpmn.di.style.Style",
+    QName("BPMNLabelStyle", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmnlabel_style.BPMNLabelStyle",
+    QName("sequenceFlow", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.sequence_flow.SequenceFlow",
+    QName(
+        "callConversation", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.conversation.call_conversation.CallConversation",
+    QName("conversation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.conversation.conversation.Conversation",
+    QName("subConversation", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.conversation.sub_conversation.SubConversation",
+    QName(
+        "correlationPropertyRetrievalExpression", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.common.correlation_property_retrieval_expression.CorrelationPropertyRetrievalExpression",
+    QName(
+        "correlationPropertyBinding", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.common.correlation_property_binding.CorrelationPropertyBinding",
+    QName("resourceRole", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.resource_role.ResourceRole",
+    QName("collaboration", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.collaboration.collaboration.Collaboration",
+    QName("BPMNDiagram", NAMESPACES["bpmndi"]): "pybpmn_parser.bpmn.bpmndi.bpmndiagram.BPMNDiagram",
+    QName("gateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.Gateway",
+    QName("ioSpecification", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.data.io_specification.IoSpecification",
+    QName(
+        "correlationProperty", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.common.correlation_property.CorrelationProperty",
+    QName(
+        "correlationSubscription", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.common.correlation_subscription.CorrelationSubscription",
+    QName("performer", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.performer.Performer",
+    QName("humanPerformer", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.performer.HumanPerformer",
+    QName("potentialOwner", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.performer.PotentialOwner",
+    QName(
+        "globalConversation", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.conversation.global_conversation.GlobalConversation",
+    QName("complexGateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.complex_gateway.ComplexGateway",
+    QName("eventBasedGateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.event_based_gateway.EventBasedGateway",
+    QName("exclusiveGateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.exclusive_gateway.ExclusiveGateway",
+    QName("inclusiveGateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.inclusive_gateway.InclusiveGateway",
+    QName("parallelGateway", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.gateway.parallel_gateway.ParallelGateway",
+    QName("callableElement", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.common.callable_element.CallableElement",
+    QName("activity", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.activity.Activity",
+    QName("task", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.task.Task",
+    QName("userTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.user_task.UserTask",
+    QName("manualTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.manual_task.ManualTask",
+    QName("serviceTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.service_task.ServiceTask",
+    QName("sendTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.send_task.SendTask",
+    QName("receiveTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.receive_task.ReceiveTask",
+    QName("scriptTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.script_task.ScriptTask",
+    QName("businessRuleTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.business_rule_task.BusinessRuleTask",
+    QName("callActivity", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.call_activity.CallActivity",
+    QName(
+        "transactionlessSubProcess", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.sub_process.TransactionlessSubProcess",
+    QName("transaction", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.sub_process.Transaction",
+    QName("subProcess", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.sub_process.SubProcess",
+    QName("adHocSubProcess", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.sub_process.AdHocSubProcess",
+    QName("globalTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.global_task.GlobalTask",
+    QName("process", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.process.process.Process",
+    QName("globalManualTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.global_manual_task.GlobalManualTask",
+    QName("globalUserTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.global_user_task.GlobalUserTask",
+    QName("globalScriptTask", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.activities.global_script_task.GlobalScriptTask",
+    QName(
+        "globalBusinessRuleTask", NAMESPACES["bpmn"]
+    ): "pybpmn_parser.bpmn.activities.global_business_rule_task.GlobalBusinessRuleTask",
+    QName("definitions", NAMESPACES["bpmn"]): "pybpmn_parser.bpmn.infrastructure.definitions.Definitions",
+}
+"""The class registered under each qualified name once the whole model is loaded, by import path."""
+
+CLASS_PATHS = {module_path.rsplit(".", 1)[1]: module_path for module_path in IMPORT_ORDER}
+"""The import path of each class, by class name."""
+
+
+def import_class(module_path: str) -> Any:
+    """Import a class by its import path, e.g. `pybpmn_parser.bpmn.process.process.Process`."""
+    module_name, class_name = module_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 def load_classes() -> None:
     """Load all classes in the module."""
-    import importlib
-
     for module_path in IMPORT_ORDER:
-        module_name, class_name = module_path.rsplit(".", 1)
-        mod = importlib.import_module(module_name)
-        globals().update({class_name: getattr(mod, class_name)})
+        globals()[module_path.rsplit(".", 1)[1]] = import_class(module_path)
+
+
+class _ModelNamespace(dict):
+    """A namespace of the element classes that imports a class when its name is first looked up."""
+
+    def __missing__(self, name: str) -> Any:
+        if name not in CLASS_PATHS:
+            raise KeyError(name)
+        value = self[name] = import_class(CLASS_PATHS[name])
+        return value
 
 
 def get_loaded_namespace() -> dict[str, Any]:
-    """Get a list of all loaded classes in the module."""
-    return globals()
+    """
+    Get a namespace of all classes in the module, to resolve the type hints of the element classes.
+
+    Classes that are not loaded yet are imported when the namespace is first asked for them.
+    """
+    return _ModelNamespace(globals())
+
+
+def __getattr__(name: str) -> Any:
+    if name not in CLASS_PATHS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = import_class(CLASS_PATHS[name])
+    return value
 
 
-load_classes()
+registry.declare(__name__, ELEMENT_CLASSES)
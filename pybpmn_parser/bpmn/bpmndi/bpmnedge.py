@@ -38,6 +38,7 @@ class BPMNEdge(LabeledEdge):
         metadata={
             "name": "bpmnElement",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """A reference to a connecting BPMN element that this edge depicts."""
@@ -47,6 +48,7 @@ class BPMNEdge(LabeledEdge):
         metadata={
             "name": "sourceElement",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """An optional reference to the edge's source element if different from the source inferred from bpmn_element."""
@@ -56,6 +58,7 @@ class BPMNEdge(LabeledEdge):
         metadata={
             "name": "targetElement",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """
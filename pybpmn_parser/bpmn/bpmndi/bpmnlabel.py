@@ -25,6 +25,7 @@ class BPMNLabel(Label):
         metadata={
             "name": "labelStyle",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """An optional reference to a diagram's label style that gives the appearance options for the label."""
@@ -29,6 +29,7 @@ class BPMNPlane(Plane):
         metadata={
             "name": "bpmnElement",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """
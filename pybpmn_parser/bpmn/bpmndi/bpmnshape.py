@@ -38,6 +38,7 @@ class BPMNShape(LabeledShape):
         metadata={
             "name": "bpmnElement",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """A reference to a BPMN node element that this shape depicts."""
@@ -108,6 +109,7 @@ class BPMNShape(LabeledShape):
         metadata={
             "name": "choreographyActivityShape",
             "type": "Attribute",
+            "is_reference": True,
         },
     )
     """
@@ -0,0 +1,396 @@
+"""A content-addressed cache of parse results, in memory and on disk."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import hmac
+import os
+import pickle  # noqa: S403
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import pybpmn_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pybpmn_parser.parse import ParseResult
+    from pybpmn_parser.plugins.moddle_types import ModdlePackage
+
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+"""The default size of the in-memory tier."""
+
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+"""The default size of the on-disk tier."""
+
+CACHE_FILE_SUFFIX = ".pickle"
+
+MAC_SIZE = 32
+"""The size of the HMAC-SHA256 at the start of the files of `write_verified`."""
+
+CACHE_DIR_ENV = "PYBPMN_PARSER_CACHE_DIR"
+"""The environment variable that overrides `user_cache_directory`. Set it to an empty string to disable caching."""
+
+
+def user_cache_directory() -> Optional[Path]:
+    """
+    Return the directory of the files the library caches between runs, such as compiled schemas.
+
+    Returns:
+        `$PYBPMN_PARSER_CACHE_DIR`, or `pybpmn_parser` in the user's cache directory.
+        None if `$PYBPMN_PARSER_CACHE_DIR` is empty.
+    """
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if directory is None:
+        return Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "pybpmn_parser"
+    return Path(directory) if directory else None
+
+
+def write_atomic(path: Path, payload: bytes) -> None:
+    """
+    Write a file through a temporary file in the same directory, so readers never see a partial file.
+
+    Args:
+        path: The file to write.
+        payload: Its contents.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_verified(path: Path, payload: bytes, key: str) -> None:
+    """
+    Write a file for `read_verified`: the payload preceded by its HMAC-SHA256 under `key`.
+
+    The file is written atomically, readable and writable by the current user only, in a directory that is created
+    with the same permissions if needed.
+
+    Args:
+        path: The file to write.
+        payload: Its contents, typically a pickle.
+        key: A digest of everything the payload depends on, such as the library version and its source files.
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    write_atomic(path, hmac.digest(key.encode(), payload, "sha256") + payload)
+
+
+def read_verified(path: Path, key: str) -> Optional[bytes]:
+    """
+    Read a file written by `write_verified` before its payload is unpickled.
+
+    The file is rejected unless it belongs to the current user, cannot be written by anyone else, and its payload
+    matches its HMAC under `key`, so a file left by another version of the library, damaged, or planted by
+    another user is never unpickled.
+
+    Args:
+        path: The file to read.
+        key: The key the file was written with.
+
+    Returns:
+        The payload, or None if the file is missing or rejected.
+    """
+    try:
+        with path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            if hasattr(os, "getuid") and (stat.st_uid != os.getuid() or stat.st_mode & 0o022):
+                return None
+            data = f.read()
+    except OSError:
+        return None
+    mac, payload = data[:MAC_SIZE], data[MAC_SIZE:]
+    return payload if hmac.compare_digest(mac, hmac.digest(key.encode(), payload, "sha256")) else None
+
+
+def fingerprint(packages: Iterable[ModdlePackage], options: Iterable[Any]) -> str:
+    """
+    Return a fingerprint of everything besides the document that affects a parse result.
+
+    Args:
+        packages: The loaded moddle packages.
+        options: The parser options, each with a stable `repr`.
+
+    Returns:
+        A hexadecimal digest covering the library version, the packages and the options.
+    """
+    digest = hashlib.sha256(pybpmn_parser.__version__.encode())
+    for package in packages:
+        digest.update(package.model_dump_json(exclude={"enums": True, "types": {"__all__": {"package"}}}).encode())
+    for option in options:
+        digest.update(repr(option).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a `ParseCache`."""
+
+    memory_hits: int = 0
+    """Lookups answered by the in-memory tier."""
+
+    disk_hits: int = 0
+    """Lookups answered by the on-disk tier."""
+
+    misses: int = 0
+    """Lookups answered by neither tier."""
+
+    memory_evictions: int = 0
+    """Entries dropped from the in-memory tier to stay within its budget."""
+
+    disk_evictions: int = 0
+    """Entries deleted from the on-disk tier to stay within its budget."""
+
+    rejected: int = 0
+    """Results that could not be stored because they cannot be pickled."""
+
+    @property
+    def hits(self) -> int:
+        """Lookups answered by either tier."""
+        return self.memory_hits + self.disk_hits
+
+
+class ParseCache:
+    """
+    A cache of parse results keyed by the hash of the document and the parser's fingerprint.
+
+    Results are stored pickled, so every hit returns an independent copy that the caller may modify,
+    and the size of an entry is known exactly. The in-memory tier is an LRU bounded by `max_memory_bytes`.
+    The optional on-disk tier keeps one file per entry in `directory`, evicting the least recently used
+    files once their total size exceeds `max_disk_bytes`; it can be shared by several processes. Each process
+    counts the files it knows of, and once they exceed `max_disk_bytes` it rescans the directory and evicts by
+    modification time, including files written by the others. The directory may thus exceed its budget by what
+    the other processes wrote since the last rescan.
+
+    Files of the on-disk tier are written with `write_verified` and only unpickled once `read_verified` has
+    accepted them, so a damaged file, or one planted by another user, is a miss. Entries are still unpickled, so
+    only point the on-disk tier at a directory you trust.
+
+    Example:
+        ```python
+        parser = Parser(cache=ParseCache(directory=Path("~/.cache/bpmn").expanduser()))
+        parser.parse_file(path)  # parsed
+        parser.parse_file(path)  # unpickled from memory
+        ```
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        directory: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Create a cache.
+
+        Args:
+            max_memory_bytes: The total size of the pickled results kept in memory.
+            directory: The directory of the on-disk tier, created if needed. No on-disk tier if omitted.
+            max_disk_bytes: The total size of the files kept in `directory`.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        """The total size of the pickled results kept in memory."""
+
+        self.directory = None if directory is None else Path(directory)
+        """The directory of the on-disk tier, if any."""
+
+        self.max_disk_bytes = max_disk_bytes
+        """The total size of the files kept in `directory`."""
+
+        self.stats = CacheStats()
+        """The hit, miss and eviction counters."""
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if self.directory is not None:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self._index_disk(self._scan_directory())
+
+    @staticmethod
+    def key(data: Union[bytes, bytearray, memoryview], parser_fingerprint: str) -> str:
+        """
+        Return the cache key of a document.
+
+        Args:
+            data: The document, as passed to the parser.
+            parser_fingerprint: The fingerprint of the parser, from `fingerprint`.
+
+        Returns:
+            A hexadecimal digest of the document and the fingerprint.
+        """
+        digest = hashlib.sha256(parser_fingerprint.encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ParseResult]:
+        """
+        Look up a result, promoting an entry found on disk into memory.
+
+        Args:
+            key: The cache key, from `key`.
+
+        Returns:
+            A copy of the cached result, or None on a miss.
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+        from_disk = payload is None
+        if from_disk:
+            payload = self._read_disk(key)
+        result = None
+        if payload is not None:
+            try:
+                result = pickle.loads(payload)  # noqa: S301
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+                # A damaged file, or one that refers to classes that no longer exist or have changed
+                self._discard(key)
+        with self._lock:
+            if result is None:
+                self.stats.misses += 1
+            elif from_disk:
+                self.stats.disk_hits += 1
+                self._store_memory(key, payload)
+            else:
+                self.stats.memory_hits += 1
+        return result
+
+    def put(self, key: str, result: ParseResult) -> None:
+        """
+        Store a result in both tiers.
+
+        Args:
+            key: The cache key, from `key`.
+            result: The result to store. Lazy results are fully built first.
+        """
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            with self._lock:
+                self.stats.rejected += 1
+            return
+        with self._lock:
+            self._store_memory(key, payload)
+        self._write_disk(key, payload)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers. The counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            keys = list(self._disk)
+            self._disk.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def __reduce__(self) -> tuple:
+        """Pickle the cache's settings only: the copy, e.g. in a worker process, starts with an empty memory tier."""
+        return type(self), (self.max_memory_bytes, self.directory, self.max_disk_bytes)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory.keys() | self._disk.keys())
+
+    def _discard(self, key: str) -> None:
+        """Remove an entry from both tiers, leaving its file if it can't be deleted, e.g. as another user's."""
+        with self._lock:
+            if (payload := self._memory.pop(key, None)) is not None:
+                self._memory_bytes -= len(payload)
+            if (size := self._disk.pop(key, None)) is not None:
+                self._disk_bytes -= size
+        if self.directory is not None:
+            with contextlib.suppress(OSError):
+                self._path(key).unlink(missing_ok=True)
+
+    def _store_memory(self, key: str, payload: bytes) -> None:
+        """Add an entry to the in-memory tier and evict the least recently used ones. Call with the lock held."""
+        if len(payload) > self.max_memory_bytes:
+            return
+        if (previous := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = payload
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats.memory_evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def _scan_directory(self) -> list[tuple[str, int]]:
+        """Return the key and size of each file in the directory, least recently used first."""
+        entries = []
+        for path in self.directory.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, path.stem, stat.st_size))
+        return [(key, size) for _, key, size in sorted(entries)]
+
+    def _index_disk(self, entries: list[tuple[str, int]]) -> None:
+        """Replace the index of the on-disk tier with the result of `_scan_directory`. Call with the lock held."""
+        self._disk = OrderedDict(entries)
+        self._disk_bytes = sum(size for _, size in entries)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """
+        Read an entry from the on-disk tier, which other processes may have written, and mark it as used.
+
+        A missing file is dropped from the index, and a file `read_verified` rejects is discarded.
+        """
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        if (payload := read_verified(path, key)) is None:
+            self._discard(key)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        size = MAC_SIZE + len(payload)
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+        return payload
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        """Write an entry to the on-disk tier atomically and evict the least recently used files."""
+        size = MAC_SIZE + len(payload)
+        if self.directory is None or size > self.max_disk_bytes:
+            return
+        write_verified(self._path(key), payload, key)
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Rescan the directory, which other processes may share, and delete the least recently used files."""
+        entries = self._scan_directory()
+        evicted = []
+        with self._lock:
+            self._index_disk(entries)
+            while self._disk_bytes > self.max_disk_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self.stats.disk_evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-import contextlib
+import itertools
+import math
+import operator
 from dataclasses import dataclass, fields, is_dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, Optional
+from json.encoder import encode_basestring_ascii
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from typing import TextIO
 
 
 def get_fields_by_metadata(data_class: Any, key: str, val: Any) -> dict[str, Any]:
@@ -52,6 +58,73 @@ class QName:
         return cls(qname, default_uri)
 
 
+class NamespaceContext(dict):
+    """
+    An immutable, interned namespace map.
+
+    Equal maps are the same object, so `context_id` identifies a namespace context across elements and documents
+    and can be used as a cache key. Adding declarations never modifies a context: `with_declarations` returns the
+    context itself when nothing changes, and another interned context otherwise.
+    """
+
+    __slots__ = ("context_id",)
+
+    MAX_INTERNED: ClassVar[int] = 1024
+    """The number of contexts kept before the intern table is cleared."""
+
+    _interned: ClassVar[dict[frozenset, NamespaceContext]] = {}
+    _ids: ClassVar[Iterator[int]] = itertools.count()
+
+    context_id: int
+    """A unique number identifying this context."""
+
+    @classmethod
+    def of(cls, nsmap: Optional[dict[str, str]]) -> NamespaceContext:
+        """
+        Return the interned context equal to a namespace map.
+
+        Args:
+            nsmap: A mapping of prefixes to namespace URIs, or a context.
+
+        Returns:
+            The interned context.
+        """
+        if isinstance(nsmap, NamespaceContext):
+            return nsmap
+        nsmap = nsmap or {}
+        key = frozenset(nsmap.items())
+        if (context := cls._interned.get(key)) is None:
+            if len(cls._interned) >= cls.MAX_INTERNED:
+                cls._interned.clear()
+            context = cls(nsmap)
+            context.context_id = next(cls._ids)
+            cls._interned[key] = context
+        return context
+
+    def with_declarations(self, declarations: dict[str, str]) -> NamespaceContext:
+        """
+        Return the context in scope for an element that makes the given declarations.
+
+        Args:
+            declarations: The prefixes the element declares, mapped to their namespace URIs.
+
+        Returns:
+            This context if the declarations change nothing, otherwise the interned context including them.
+        """
+        if all(self.get(prefix) == uri for prefix, uri in declarations.items()):
+            return self
+        return NamespaceContext.of({**self, **declarations})
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("NamespaceContext is immutable; use with_declarations instead.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple:
+        return NamespaceContext.of, (dict(self),)
+
+
 def default_empty_predicate(x: Any) -> bool:
     """Default predicate for determining if a value is considered empty."""
     if x is None:
@@ -69,69 +142,222 @@ def _enum_to_primitive(e: Enum, enum_as: str) -> Any:
     return e.value if enum_as == "value" else e.name
 
 
-def _convert(
-    value: Any,
-    *,
-    skip_empty: bool = False,
-    empty_predicate: Callable[[Any], bool] | None = None,
-    enum_as: str = "value",
-) -> Any:
-    empty_predicate = empty_predicate or default_empty_predicate
-
-    # Enums
-    if isinstance(value, Enum):
-        return _enum_to_primitive(value, enum_as=enum_as)
+_LEAF, _ENUM, _DATACLASS, _MAPPING, _SEQUENCE, _OBJECT = range(6)
 
-    # Dataclasses
-    if is_dataclass(value):
-        return convert_dataclass(value, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+"""The types whose values are converted to themselves, and that every JSON library serializes."""
 
-    # Dicts
-    if isinstance(value, dict):
-        return convert_dict(value, empty_predicate=empty_predicate, enum_as=enum_as, skip_empty=skip_empty)
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, type(None))
+"""The types whose values are converted to themselves, without looking for attributes."""
 
-    # Iterables (sequence-like) — normalize to list for JSON-friendliness
-    if isinstance(value, (list, tuple, set)):
-        return _convert_sequence(value, empty_predicate=empty_predicate, enum_as=enum_as, skip_empty=skip_empty)
+_PENDING = object()
+"""Marks a container whose conversion has been started but not finished."""
 
-    # Objects with __dict__ (non-dataclass)
-    if hasattr(value, "__dict__") and not isinstance(value, (str, bytes, bytearray)):
-        with contextlib.suppress(TypeError):
-            return _convert(vars(value), skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
 
-    # Primitives
-    return value
-
-
-def _convert_sequence(
-    value: list | tuple | set, *, empty_predicate: Callable[[Any], bool] | None, enum_as: str, skip_empty: bool
-) -> list[Any]:
+@dataclass(frozen=True, slots=True)
+class _ClassConverter:
+    """How `_convert` converts the instances of a class, worked out once per class."""
+
+    kind: int
+    """How the instances are traversed: one of `_LEAF`, `_ENUM`, `_DATACLASS`, `_MAPPING`, `_SEQUENCE`, `_OBJECT`."""
+
+    field_names: tuple[str, ...] = ()
+    """The names of the fields of a dataclass, in declaration order."""
+
+    read_fields: Optional[Callable[[Any], tuple[Any, ...]]] = None
+    """Return the values of the fields of an instance of a dataclass, in declaration order."""
+
+
+_CONVERTERS: dict[type, _ClassConverter] = {}
+
+
+def _no_fields(value: Any) -> tuple[Any, ...]:
+    return ()
+
+
+def _class_converter(cls: type) -> _ClassConverter:
+    """Return how the instances of a class are converted, compiling it on first use."""
+    if (converter := _CONVERTERS.get(cls)) is not None:
+        return converter
+    if issubclass(cls, Enum):
+        converter = _ClassConverter(_ENUM)
+    elif is_dataclass(cls):
+        names = tuple(f.name for f in fields(cls))
+        if len(names) > 1:
+            read_fields = operator.attrgetter(*names)
+        elif names:
+            read_one = operator.attrgetter(names[0])
+
+            def read_fields(value: Any) -> tuple[Any, ...]:
+                return (read_one(value),)
+        else:
+            read_fields = _no_fields
+        converter = _ClassConverter(_DATACLASS, names, read_fields)
+    elif issubclass(cls, dict):
+        converter = _ClassConverter(_MAPPING)
+    elif issubclass(cls, (list, tuple, set)):
+        converter = _ClassConverter(_SEQUENCE)
+    elif issubclass(cls, _LEAF_TYPES):
+        converter = _ClassConverter(_LEAF)
+    else:
+        converter = _ClassConverter(_OBJECT)
+    _CONVERTERS[cls] = converter
+    return converter
+
+
+def _json_leaf(value: Any) -> Any:
+    """Return a value that JSON libraries serialize natively, such as orjson without a `default` hook."""
+    if type(value) in _SCALAR_TYPES or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+class _Walk:
     """
-    Converts a collection (list, tuple, or set) to a processed list with optional filtering and transformations.
+    The traversal shared by `_Converter` and `_JsonWriter`: how each object is expanded into its items.
 
-    This function processes sequences by applying a conversion function to each element. It can also exclude
-    elements that are considered "empty" based on a predicate function. The conversion ensures compatibility
-    with JSON, producing a list regardless of the input type.
+    The traversals keep their own stack instead of recursing, so the depth of a value is not limited by the
+    recursion limit, and the way each class is traversed is looked up in `_CONVERTERS` rather than worked out
+    again for every object.
+    """
 
-    Parameters:
-        value: The input collection to be processed. Non-sequence types are not supported.
-        empty_predicate: A callable that determines if an element is "empty."
-            If None, the predicate is not used, and no filtering occurs.
-        enum_as: A string that determines how enumerations are treated during conversion. The exact behavior
-            depends on the implementation of the `_convert` function.
-        skip_empty: A flag indicating whether "empty" elements, as defined by the empty_predicate,
-            should be removed from the resulting list.
+    def __init__(self, enum_as: str, json_compatible: bool) -> None:
+        self.enum_as = enum_as
+        self.json_compatible = json_compatible
+        self.active: set[int] = set()
+        """The id() of the containers being traversed, to detect cycles."""
+
+    def expand(self, item: Any) -> tuple[Any, Optional[Iterator[tuple[Any, Any]]], bool]:
+        """
+        Expand an object.
+
+        Returns:
+            The converted value and None for a leaf, or None and the keys and values of a container (keys are None
+            in a list), and whether the container converts to a list.
+        """
+        converter = _CONVERTERS.get(type(item)) or _class_converter(type(item))
+        kind = converter.kind
+        if kind == _ENUM:
+            return self.leaf(_enum_to_primitive(item, enum_as=self.enum_as)), None, False
+        if kind == _LEAF:
+            return self.leaf(item), None, False
+        if id(item) in self.active:
+            # A cycle: refer to the object by ID instead of converting it again.
+            return (getattr(item, "id", None) if kind in {_DATACLASS, _OBJECT} else None), None, False
+
+        if kind == _DATACLASS:
+            items: Iterator[tuple[Any, Any]] = zip(converter.field_names, converter.read_fields(item), strict=False)
+            if extra := getattr(item, "__extra_kwargs__", None):
+                items = iter({**dict(items), **extra}.items())
+        elif kind == _MAPPING:
+            items = iter(item.items())
+        elif kind == _SEQUENCE:
+            return None, zip(itertools.repeat(None), item, strict=False), True
+        else:
+            try:
+                items = iter(vars(item).items())
+            except TypeError:
+                return self.leaf(item), None, False
+        return None, items, False
+
+    def convert_key(self, key: Any) -> Any:
+        if isinstance(key, Enum):
+            key = _enum_to_primitive(key, enum_as=self.enum_as)
+        return str(key) if self.json_compatible and not isinstance(key, str) else key
+
+    def leaf(self, value: Any) -> Any:
+        return _json_leaf(value) if self.json_compatible else value
+
+
+class _Converter(_Walk):
+    """Convert values to plain Python structures, see `dataclass_to_dict`."""
+
+    def __init__(
+        self, skip_empty: bool, empty_predicate: Callable[[Any], bool], enum_as: str, json_compatible: bool
+    ) -> None:
+        super().__init__(enum_as, json_compatible)
+        self.skip_empty = skip_empty
+        self.empty_predicate = empty_predicate
+        self.default_empty = empty_predicate is default_empty_predicate
+
+        # The containers being converted, innermost last: the converted container, the items left to convert,
+        # the id() of the source object and the key of the container in its parent.
+        self.stack: list[tuple[Any, Iterator[tuple[Any, Any]], int, Any]] = []
+
+    def convert(self, value: Any) -> Any:
+        """Convert a value."""
+        result = self.start(value, None)
+        if result is not _PENDING:
+            return result
+        stack, active, fill, add = self.stack, self.active, self.fill, self.add
+        while True:
+            output, items, item_id, key = stack[-1]
+            if fill(output, items):
+                stack.pop()
+                active.discard(item_id)
+                if not stack:
+                    return output
+                add(stack[-1][0], key, output)
+
+    def fill(self, output: Any, items: Iterator[tuple[Any, Any]]) -> bool:
+        """Convert the items of a container until one of them is a container, return True when they are done."""
+        skip_empty = self.skip_empty
+        default_empty = self.default_empty
+        for key, child in items:
+            if type(child) in _SCALAR_TYPES:
+                if skip_empty and (
+                    child is None or (type(child) is str and not child)
+                    if default_empty
+                    else self.empty_predicate(child)
+                ):
+                    continue
+                if type(output) is list:
+                    output.append(child)
+                else:
+                    output[key if type(key) is str else self.convert_key(key)] = child
+            else:
+                converted = self.start(child, key)
+                if converted is _PENDING:
+                    return False
+                self.add(output, key, converted)
+        return True
 
-    Returns:
-        A new list formed by processing the input collection and optionally filtering out empty elements.
-    """
-    seq = [_convert(v, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as) for v in value]
+    def start(self, item: Any, key: Any) -> Any:
+        """Convert a leaf, or push the frame of a container and return `_PENDING`."""
+        leaf, items, is_list = self.expand(item)
+        if items is None:
+            return leaf
+        self.active.add(id(item))
+        self.stack.append(([] if is_list else {}, items, id(item), key))
+        return _PENDING
+
+    def add(self, output: Any, key: Any, converted: Any) -> None:
+        """Add a converted item to its converted container, unless it is empty and empty items are skipped."""
+        if self.skip_empty and self.is_empty(converted):
+            return
+        if type(output) is list:
+            output.append(converted)
+        else:
+            output[key if type(key) is str else self.convert_key(key)] = converted
+
+    def is_empty(self, converted: Any) -> bool:
+        if self.default_empty and type(converted) in {dict, list, str}:
+            return not converted
+        return self.empty_predicate(converted)
 
-    # Optionally drop empty items inside sequences
-    if skip_empty:
-        seq = [s for s in seq if not empty_predicate(s)]
 
-    return seq
+def _convert(
+    value: Any,
+    *,
+    skip_empty: bool = False,
+    empty_predicate: Callable[[Any], bool] | None = None,
+    enum_as: str = "value",
+    json_compatible: bool = False,
+) -> Any:
+    converter = _Converter(skip_empty, empty_predicate or default_empty_predicate, enum_as, json_compatible)
+    return converter.convert(value)
 
 
 def convert_dict(
@@ -143,14 +369,14 @@ def convert_dict(
     Summary:
     - Keys that are Enum instances are processed based on the provided `enum_as` behavior.
     - Remaining keys are left unaltered.
-    - Values are always recursively converted using internal conversion logic.
+    - Values are always recursively converted, with the same options.
     - Entries can be skipped if `skip_empty` is set to True and the predicate function indicates
       that the value is considered empty.
 
     Args:
         value: The dictionary to be converted.
         empty_predicate: A predicate function that determines whether a value is considered empty.
-            If None, no predicate is applied.
+            If None, the default predicate is used.
         enum_as: Specifies the behavior for converting Enum instances. Accepted values depend on
             internal Enum conversion logic.
         skip_empty: A flag indicating whether to skip entries where the predicate function identifies
@@ -160,14 +386,7 @@ def convert_dict(
         A newly converted dictionary with potentially altered keys and values and with entries optionally
         removed based on the given predicate.
     """
-    out: Dict[Any, Any] = {}
-    for k, v in value.items():
-        ck = _enum_to_primitive(k, enum_as=enum_as) if isinstance(k, Enum) else k
-        cv = _convert(v)
-        if skip_empty and empty_predicate(cv):
-            continue
-        out[ck] = cv
-    return out
+    return _convert(value, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
 
 
 def convert_dataclass(
@@ -193,20 +412,7 @@ def convert_dataclass(
     Returns:
         A dictionary representation of the dataclass instance, possibly excluding empty fields.
     """
-    out: Dict[str, Any] = {}
-
-    for f in fields(value):
-        v = getattr(value, f.name)
-        cv = _convert(v, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
-        if skip_empty and empty_predicate(cv):
-            continue
-        out[f.name] = cv
-    for key, val in getattr(value, "__extra_kwargs__", {}).items():
-        cv = _convert(val, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
-        if skip_empty and empty_predicate(cv):
-            continue
-        out[key] = cv
-    return out
+    return _convert(value, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
 
 
 def dataclass_to_dict(
@@ -215,6 +421,7 @@ def dataclass_to_dict(
     skip_empty: bool = False,
     empty_predicate: Callable[[Any], bool] | None = None,
     enum_as: str = "value",  # "value" | "name"
+    json_compatible: bool = False,
 ) -> Any:
     """
     Recursively convert a dataclass instance to a plain Python structure (dicts/lists/etc.).
@@ -233,17 +440,23 @@ def dataclass_to_dict(
             - Any object with len(x) == 0 as empty (lists, tuples, sets, dicts, etc.)
             Note: False and 0 are NOT considered empty by default.
         enum_as: How to represent Enum members: "value" (default) or "name".
+        json_compatible: If True, only produce dicts with string keys, lists, strings, numbers, booleans and
+            None, which `json.dumps` and `orjson.dumps` serialize without a `default` hook. Other values are
+            converted with `str()`, bytes are decoded as UTF-8.
 
     Returns:
         A structure of plain dicts/lists/tuples with primitive values (and optionally Enums mapped to name/value).
 
     Notes:
-        - Cyclic references are not handled; they will cause recursion errors.
+        - An object that contains itself is converted once; the inner occurrences are replaced with its `id`,
+          or with None if it has none.
         - Non-dataclass arbitrary objects are converted via `vars(obj)` when possible.
     """
     empty_predicate = empty_predicate or default_empty_predicate
 
-    result = _convert(obj, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as)
+    result = _convert(
+        obj, skip_empty=skip_empty, empty_predicate=empty_predicate, enum_as=enum_as, json_compatible=json_compatible
+    )
 
     # If the root itself is empty and skip_empty=True, return an empty dict instead of dropping everything
     if skip_empty and empty_predicate(result):
@@ -252,6 +465,169 @@ def dataclass_to_dict(
     return result
 
 
+def _json_scalar(value: Any) -> str:
+    """Encode a JSON scalar as `json.dumps` does."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        return repr(float(value))
+    return repr(int(value))
+
+
+@dataclass(slots=True)
+class _JsonFrame:
+    """A container being written by `_JsonWriter`."""
+
+    items: Iterator[tuple[Any, Any]]
+    is_list: bool
+    key: Any
+    item_id: int
+    depth: int
+    written: bool = False
+    """Whether the opening bracket is written; it is held back until the first item, in case it has none."""
+    has_items: bool = False
+
+
+class _JsonWriter(_Walk):
+    """Write the JSON of the plain structure of a value piece by piece, see `write_json`."""
+
+    def __init__(
+        self, fp: TextIO, skip_empty: bool, enum_as: str, indent: Union[int, str, None], sort_keys: bool
+    ) -> None:
+        super().__init__(enum_as, json_compatible=True)
+        self.fp = fp
+        self.skip_empty = skip_empty
+        self.sort_keys = sort_keys
+        self.indent = " " * indent if isinstance(indent, int) else indent
+        self.item_separator = ", " if indent is None else ","
+        self.chunks: list[str] = []
+        self.stack: list[_JsonFrame] = []
+
+    def write(self, value: Any) -> None:
+        """Write a value."""
+        leaf = self.start(value, None)
+        if leaf is not _PENDING:
+            self.chunks.append(_json_scalar(leaf))
+        stack = self.stack
+        while stack:
+            frame = stack[-1]
+            if self.fill(frame):
+                stack.pop()
+                self.active.discard(frame.item_id)
+                self.close(frame)
+            if len(self.chunks) > 1024:
+                self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        self.fp.write("".join(self.chunks))
+        self.chunks.clear()
+
+    def fill(self, frame: _JsonFrame) -> bool:
+        """Write the items of a container until one of them is a container, return True when they are done."""
+        for key, child in frame.items:
+            if type(child) in _SCALAR_TYPES:
+                leaf = child
+            else:
+                leaf = self.start(child, key)
+                if leaf is _PENDING:
+                    return False
+            if not self.skip_empty or not (leaf is None or (isinstance(leaf, str) and not leaf)):
+                self.begin_item(frame, key)
+                self.chunks.append(_json_scalar(leaf))
+        return True
+
+    def start(self, item: Any, key: Any) -> Any:
+        """Return the JSON-compatible value of a leaf, or push the frame of a container and return `_PENDING`."""
+        leaf, items, is_list = self.expand(item)
+        if items is None:
+            return leaf
+        if not is_list:
+            items = ((key if type(key) is str else self.convert_key(key), value) for key, value in items)
+            if self.sort_keys:
+                items = iter(sorted(items, key=operator.itemgetter(0)))
+        self.active.add(id(item))
+        self.stack.append(_JsonFrame(items, is_list, key, id(item), len(self.stack) + 1))
+        return _PENDING
+
+    def begin_item(self, frame: _JsonFrame, key: Any) -> None:
+        """Write what comes before an item of a container: its opening if needed, a separator and the key."""
+        if not frame.written:
+            self.open(frame)
+        chunks = self.chunks
+        if frame.has_items:
+            chunks.append(self.item_separator)
+        frame.has_items = True
+        if self.indent is not None:
+            chunks.append("\n" + self.indent * frame.depth)
+        if not frame.is_list:
+            chunks.append(encode_basestring_ascii(key) + ": ")
+
+    def open(self, frame: _JsonFrame) -> None:
+        """Write the opening brackets of a container, and of the containers around it that are still held back."""
+        for index in range(frame.depth - 1, -1, -1):
+            if self.stack[index].written:
+                break
+        else:
+            index = -1
+        for outer in self.stack[index + 1 : frame.depth]:
+            if outer.depth > 1:
+                self.begin_item(self.stack[outer.depth - 2], outer.key)
+            self.chunks.append("[" if outer.is_list else "{")
+            outer.written = True
+
+    def close(self, frame: _JsonFrame) -> None:
+        """Write the end of a container, or nothing if it is empty and empty values are skipped."""
+        if frame.written:
+            if self.indent is not None:
+                self.chunks.append("\n" + self.indent * (frame.depth - 1))
+            self.chunks.append("]" if frame.is_list else "}")
+            return
+        if self.stack:
+            if self.skip_empty:
+                return
+            self.begin_item(self.stack[-1], frame.key)
+        self.chunks.append("[]" if frame.is_list else "{}")
+
+
+def write_json(
+    obj: Any,
+    fp: TextIO,
+    *,
+    skip_empty: bool = False,
+    enum_as: str = "value",
+    indent: Union[int, str, None] = None,
+    sort_keys: bool = False,
+) -> None:
+    """
+    Write the JSON of a dataclass instance to a file, without building its plain structure in memory.
+
+    The output is the same as `json.dump(dataclass_to_dict(obj, json_compatible=True, ...), fp, ...)`, but
+    it is written while the object is traversed, so the memory used does not grow with the size of the object
+    and a reader can consume the start of the output while the rest is produced.
+
+    Args:
+        obj: The object to write, see `dataclass_to_dict`.
+        fp: The text file to write to.
+        skip_empty: If True, omit None, empty strings and empty containers, as the default `empty_predicate`
+            of `dataclass_to_dict` does.
+        enum_as: How to represent Enum members: "value" (default) or "name".
+        indent: The indentation of nested containers, as for `json.dump`; None writes a single line.
+        sort_keys: If True, write the keys of each object in sorted order.
+    """
+    _JsonWriter(fp, skip_empty, enum_as, indent, sort_keys).write(obj)
+
+
 def index_ids(obj: Any) -> dict[str, Any]:
     """
     Indexes all 'id' fields within a dataclass object or its nested attributes.
@@ -0,0 +1,151 @@
+"""Compare two versions of a model, skipping the subtrees whose content hashes are equal."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Optional, Union
+
+from pybpmn_parser.hashing import ModelHasher, is_element, item_keys, normalize_whitespace
+from pybpmn_parser.parse import ParseResult
+
+
+class ChangeKind(str, Enum):
+    """The kind of a change between two versions of a model."""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass(frozen=True)
+class Change:
+    """A difference between two versions of a model."""
+
+    kind: ChangeKind
+    """Whether an element was added or removed, or a property changed."""
+
+    path: str
+    """
+    Where the change is, from the root element: the property names and, for the items of a list, the ID of the
+    item or its position among the items without an ID, e.g. `processes[Process_1].flow_elements[Task_1].name`.
+    """
+
+    element_id: Optional[str]
+    """
+    The ID of the added or removed element, or of the element whose property changed; for an element without an
+    ID, that of the closest element above it with one.
+    """
+
+    property: Optional[str] = None
+    """The name of the changed property, None for an added or removed element."""
+
+    old: Any = None
+    """The removed element, or the previous value of the property."""
+
+    new: Any = None
+    """The added element, or the new value of the property."""
+
+
+def _normalized(value: Any) -> Any:
+    """Normalize the whitespace of a plain value, as the hashes do."""
+    if isinstance(value, str):
+        return normalize_whitespace(value)
+    if isinstance(value, list):
+        return [_normalized(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalized(item) for key, item in value.items()}
+    return value
+
+
+class _Differ:
+    """Collect the changes between two models."""
+
+    def __init__(self, hasher: ModelHasher) -> None:
+        self.hasher = hasher
+        self.changes: list[Change] = []
+
+    def element(self, old: Any, new: Any, path: str, owner_id: Optional[str] = None) -> None:
+        """Compare two versions of an element, unless their hashes are equal."""
+        if self.hasher.digest(old) == self.hasher.digest(new):
+            return
+        if type(old) is not type(new):
+            self.changes.append(Change(ChangeKind.REMOVED, path, getattr(old, "id", None) or owner_id, old=old))
+            self.changes.append(Change(ChangeKind.ADDED, path, getattr(new, "id", None) or owner_id, new=new))
+            return
+
+        old_properties = dict(self.hasher.properties(old))
+        new_properties = dict(self.hasher.properties(new))
+        element_id = getattr(new, "id", None) or owner_id
+        for name in [*old_properties, *(name for name in new_properties if name not in old_properties)]:
+            self.value(
+                old_properties.get(name),
+                new_properties.get(name),
+                f"{path}.{name}" if path else name,
+                name,
+                element_id,
+            )
+
+    def value(self, old: Any, new: Any, path: str, name: str, element_id: Optional[str]) -> None:
+        """Compare two versions of the value of a property."""
+        if is_element(old) and is_element(new):
+            self.element(old, new, path, element_id)
+        elif _contains_elements(old) or _contains_elements(new):
+            self.items(old if isinstance(old, list) else [], new if isinstance(new, list) else [], path, element_id)
+        elif _normalized(old) != _normalized(new):
+            self.changes.append(Change(ChangeKind.CHANGED, path, element_id, name, old, new))
+
+    def items(self, old: list[Any], new: list[Any], path: str, owner_id: Optional[str]) -> None:
+        """Compare two versions of a list of elements, matching the items by ID."""
+        old_items = item_keys(old)
+        new_items = item_keys(new)
+        for key, item in old_items.items():
+            if key not in new_items:
+                self.changes.append(
+                    Change(ChangeKind.REMOVED, f"{path}[{key}]", getattr(item, "id", None) or owner_id, old=item)
+                )
+        for key, item in new_items.items():
+            if key not in old_items:
+                self.changes.append(
+                    Change(ChangeKind.ADDED, f"{path}[{key}]", getattr(item, "id", None) or owner_id, new=item)
+                )
+            elif is_element(item) and is_element(old_items[key]):
+                self.element(old_items[key], item, f"{path}[{key}]", owner_id)
+            elif _normalized(old_items[key]) != _normalized(item):
+                self.changes.append(Change(ChangeKind.CHANGED, f"{path}[{key}]", owner_id, None, old_items[key], item))
+
+
+def _contains_elements(value: Any) -> bool:
+    """Check if a value is a model element or a list with model elements."""
+    return is_element(value) or (isinstance(value, list) and any(is_element(item) for item in value))
+
+
+def diff(
+    old: Union[ParseResult, Any],
+    new: Union[ParseResult, Any],
+    ignore_di: bool = False,
+    ignore_documentation: bool = False,
+) -> list[Change]:
+    """
+    List the changes between two versions of a model.
+
+    The elements are compared by content hash first (see `pybpmn_parser.hashing.ModelHasher`), so identical
+    subtrees are skipped without being walked and the cost of a diff grows with the size of the changes. The
+    items of lists are matched by ID, so moving an element within a list is not a change, and the hashes ignore
+    the order of these items too, so a moved element never makes its ancestors look changed. Items without an ID
+    are matched, and hashed, by position among them. Whitespace changes in strings are not reported either.
+
+    Args:
+        old: The result of parsing the previous version, or its root model element.
+        new: The result of parsing the new version, or its root model element.
+        ignore_di: Leave out the diagram interchange elements.
+        ignore_documentation: Leave out the documentation elements.
+
+    Returns:
+        The changes, removals before additions within each list.
+    """
+    old_root = old.definition if isinstance(old, ParseResult) else old
+    new_root = new.definition if isinstance(new, ParseResult) else new
+    differ = _Differ(ModelHasher(ignore_di, ignore_documentation))
+    differ.element(old_root, new_root, "")
+    return differ.changes
@@ -1,12 +1,15 @@
 """A registry for mapping element names to dataclasses."""
 
-from dataclasses import dataclass, fields
+import importlib
+import pickle  # noqa: S403
+import threading
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field, fields
 from inspect import signature
-from typing import Any, Optional, Union, get_args, get_origin
+from typing import Any, Callable, Optional, Union, get_args, get_origin
 
 from typing_extensions import type_repr
 
-from pybpmn_parser.bpmn import get_loaded_namespace
 from pybpmn_parser.core import QName
 
 
@@ -52,25 +55,146 @@ class ElementDescriptor:
     properties: dict[QName, ElementProperty]
     """A mapping of BPMN attribute names to ElementProperty objects."""
 
+    key_cache: dict[tuple[str, int], Any] = field(default_factory=dict, repr=False, compare=False)
+    """How the factory resolves each `xmltodict` key, by key and namespace context ID."""
+
+    key_cache_version: int = field(default=-1, repr=False, compare=False)
+    """The registry version `key_cache` was filled with."""
+
 
 class ElementRegistry:
-    """A registry for BPMN elements."""
+    """
+    A registry for BPMN elements.
+
+    An element goes through three stages: *declared* by the import path of its class, *registered* as a class,
+    and *described* once its descriptor is built from the class's type hints. `by_qname` and `by_name` contain
+    the elements in every stage; looking one up imports its module and builds its descriptor as needed, so
+    importing the model costs nothing until an element is used.
+    """
 
     def __init__(self):
-        self.by_qname: dict[QName, Any] = {}
-        self.by_name: dict[str, Any] = {}
+        self._declared: dict[QName, tuple[str, str]] = {}
+        self._classes: dict[QName, Any] = {}
+        self._descriptors: dict[QName, ElementDescriptor] = {}
+        self._names: dict[str, QName] = {}
+        self._lock = threading.RLock()
+
+        self.by_qname: Mapping[QName, ElementDescriptor] = _Descriptors(self, None)
+        """The descriptors by qualified name, built on first access."""
+
+        self.by_name: Mapping[str, ElementDescriptor] = _Descriptors(self, self._names)
+        """The descriptors by local name, built on first access. The last element registered with a name wins."""
+
         self.registered_namespaces: set[str] = set()
+        self.version = 0
+        """Incremented whenever an element is registered, so cached lookups can be invalidated."""
 
-    def register(self, element: Any) -> None:
-        """Register an element in the registry."""
+    def declare(self, package: str, classes: Mapping[QName, str]) -> None:
+        """
+        Declare the elements of a package, which register themselves when their module is imported.
+
+        Args:
+            package: The name of the package the classes belong to.
+            classes: The import path of a class, e.g. `package.module.Class`, by qualified name. Other classes of
+                the package registered under the same name are ignored, as they would be replaced if the whole
+                package was imported.
+        """
+        with self._lock:
+            for q_name, import_path in classes.items():
+                if q_name in self._classes or q_name in self._descriptors:
+                    continue
+                self._declared[q_name] = (package, import_path)
+                self._names[q_name.local] = q_name
+                self.registered_namespaces.add(q_name.uri)
+            self.version += 1
+
+    def register(self, element: Any, properties: Optional[dict[QName, ElementProperty]] = None) -> None:
+        """
+        Register an element in the registry.
+
+        Args:
+            element: The element class.
+            properties: The properties of the class, as computed by `descriptor_from_class` earlier, e.g. in
+                another process. Computed from the class's type hints on first access if omitted.
+
+        Raises:
+            ValueError: If the class has no `Meta` class.
+        """
         if not hasattr(element, "Meta"):
             raise ValueError(f"Element {element} does not have a Meta class.")
-        q_name = QName(uri=element.Meta.namespace, local=element.Meta.name)
+        q_name = element_qname(element)
+
+        with self._lock:
+            if (declared := self._declared.get(q_name)) is not None:
+                package, import_path = declared
+                if element.__module__.startswith(f"{package}.") and import_path != _import_path(element):
+                    return
+                del self._declared[q_name]
+            if properties is None:
+                self._descriptors.pop(q_name, None)
+                self._classes[q_name] = element
+            else:
+                self._classes.pop(q_name, None)
+                self._descriptors[q_name] = ElementDescriptor(
+                    type=element, name=q_name.local, q_name=q_name, properties=properties
+                )
+            self._names[q_name.local] = q_name
+            self.registered_namespaces.add(q_name.uri)
+            self.version += 1
+
+    def _is_known(self, q_name: Optional[QName]) -> bool:
+        return q_name in self._descriptors or q_name in self._classes or q_name in self._declared
+
+    def _describe(self, q_name: Optional[QName]) -> Optional[ElementDescriptor]:
+        """Return the descriptor of an element, importing its module and building the descriptor if needed."""
+        descriptor = self._descriptors.get(q_name)
+        if descriptor is not None or not self._is_known(q_name):
+            return descriptor
+        with self._lock:
+            if (declared := self._declared.get(q_name)) is not None:
+                importlib.import_module(declared[1].rsplit(".", 1)[0])
+                if q_name in self._declared:
+                    raise ImportError(f"{declared[1]} is declared as {q_name} but was not registered.")
+            if (element := self._classes.get(q_name)) is not None:
+                self._descriptors[q_name] = descriptor_from_class(element)
+                del self._classes[q_name]
+            return self._descriptors.get(q_name)
+
+
+class _Descriptors(Mapping):
+    """A read-only view of the descriptors of a registry, building each one on first access."""
+
+    def __init__(self, element_registry: ElementRegistry, names: Optional[dict[str, QName]]):
+        self._registry = element_registry
+        self._names = names
+
+    def __getitem__(self, key: Any) -> ElementDescriptor:
+        q_name = key if self._names is None else self._names.get(key)
+        if (descriptor := self._registry._describe(q_name)) is None:
+            raise KeyError(key)
+        return descriptor
+
+    def __contains__(self, key: Any) -> bool:
+        return self._registry._is_known(key if self._names is None else self._names.get(key))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._names is not None:
+            return iter(list(self._names))
+        element_registry = self._registry
+        return iter(
+            list(
+                dict.fromkeys(
+                    [*element_registry._descriptors, *element_registry._classes, *element_registry._declared]
+                )
+            )
+        )
 
-        descriptor = descriptor_from_class(element)
-        self.by_qname[q_name] = descriptor
-        self.by_name[q_name.local] = descriptor
-        self.registered_namespaces.add(q_name.uri)
+    def __len__(self) -> int:
+        return len(self._names) if self._names is not None else sum(1 for _ in self)
+
+
+def _import_path(element: Any) -> str:
+    return f"{element.__module__}.{element.__qualname__}"
 
 
 def dataclass_fields(data_class: Any) -> dict[str, dict]:
@@ -82,6 +206,9 @@ def descriptor_from_class(element_class: Any) -> ElementDescriptor:
     """Create a descriptor from a BPMN element class."""
     from typing import get_type_hints
 
+    # Imported here: the element modules import this module to register themselves.
+    from pybpmn_parser.bpmn import get_loaded_namespace
+
     q_name = QName(uri=element_class.Meta.namespace, local=element_class.Meta.name)
     property_name_map = {}
     parent_locals = get_loaded_namespace()
@@ -149,40 +276,110 @@ def type_hint_to_property(name: str, type_hint: Any, field_metadata: dict[str, A
 registry = ElementRegistry()
 
 
-def register_element(element: Any) -> Any:
-    """Register an element in the global element registry."""
+def make_from_kwargs(element: Any) -> Callable[..., Any]:
+    """
+    Build the `from_kwargs` constructor of an element class.
 
-    def from_kwargs(cls: Any, **kwargs) -> Any:
-        """
-        Add extra kwargs to the dataclass when the element is created.
+    The constructor accepts keyword arguments that are not fields of the class, such as vendor attributes.
+    They are set on the instance and recorded in its `__extra_kwargs__` attribute.
 
-        Based on: https://blog.jcharistech.com/2024/02/11/pydantic-dataclasses-how-to-allow-extra-kwargs/
-        """
-        # fetch the constructor's signature
-        cls_fields = set(signature(cls).parameters)
-
-        # split the kwargs into native ones and new ones
-        native_args, new_args = {}, {}
-        for name, val in kwargs.items():
-            if name in cls_fields:
-                native_args[name] = val
-            else:
-                new_args[name] = val
+    The names of the constructor's parameters are computed once, here, instead of on every call, and once per
+    unregistered subclass that inherits the constructor. Instances
+    created without extra arguments are built with a single call to the class and get no `__extra_kwargs__`
+    attribute; readers use `getattr(instance, "__extra_kwargs__", {})`.
 
-        # use the native ones to create the class ...
-        ret = cls(**native_args)
-        extra_kwargs = {}
+    Based on: https://blog.jcharistech.com/2024/02/11/pydantic-dataclasses-how-to-allow-extra-kwargs/
+
+    Args:
+        element: The element class.
+
+    Returns:
+        A function to use as the `from_kwargs` classmethod of the class.
+    """
+    fields_by_class = {element: frozenset(signature(element).parameters)}
 
-        # ... and add the new ones by hand
-        for new_name, new_val in new_args.items():
+    def from_kwargs(cls: Any, **kwargs) -> Any:
+        """Create an instance, adding the keyword arguments that are not fields as extra attributes."""
+        if (element_fields := fields_by_class.get(cls)) is None:
+            # An unregistered subclass has its own fields.
+            element_fields = fields_by_class[cls] = frozenset(signature(cls).parameters)
+        if kwargs.keys() <= element_fields:
+            return cls(**kwargs)
+
+        native_args = {name: val for name, val in kwargs.items() if name in element_fields}
+        extra_kwargs = {name: val for name, val in kwargs.items() if name not in element_fields}
+        ret = cls(**native_args)
+        for new_name, new_val in extra_kwargs.items():
             setattr(ret, new_name, new_val)
-            extra_kwargs[new_name] = new_val
         ret.__extra_kwargs__ = extra_kwargs
-
         return ret
 
-    element.from_kwargs = classmethod(from_kwargs)
-    registry.register(element)
+    return from_kwargs
+
+
+def element_qname(element_class: Any) -> QName:
+    """Return the qualified name an element class is registered under."""
+    return QName(uri=element_class.Meta.namespace, local=element_class.Meta.name)
+
+
+def new_element(q_name: QName) -> Any:
+    """
+    Create an uninitialized instance of the class registered under a qualified name.
+
+    This is how pickled elements are recreated: classes generated from moddle extensions live in no importable
+    module, so they are found through the registry. When the name is unknown, the built-in elements and the
+    default plugins are loaded first, as a freshly started process has none of them.
+
+    Args:
+        q_name: The qualified name of the element.
+
+    Returns:
+        An instance whose attributes are not set yet.
+
+    Raises:
+        pickle.UnpicklingError: If no class is registered under the name, for example because the moddle
+            extension that defines it was not loaded.
+    """
+    if q_name not in registry.by_qname:
+        import pybpmn_parser.bpmn  # noqa: F401
+        from pybpmn_parser.plugins import load_default_plugins
+
+        load_default_plugins()
+    if (descriptor := registry.by_qname.get(q_name)) is None:
+        raise pickle.UnpicklingError(f"No element is registered for {q_name}. Load its moddle extension first.")
+    return object.__new__(descriptor.type)
+
+
+def reduce_element(element: Any) -> tuple:
+    """
+    Pickle an element by the qualified name of its class instead of the class's import path.
+
+    The instance is recreated by `new_element` before its state is restored, so shared and cyclic
+    references between elements are preserved.
+
+    Args:
+        element: The element to pickle.
+
+    Returns:
+        The `__reduce__` tuple of the element.
+    """
+    return new_element, (element_qname(type(element)),), element.__getstate__()
+
+
+def register_element(element: Any, properties: Optional[dict[QName, ElementProperty]] = None) -> Any:
+    """
+    Register an element in the global element registry, making it pickle by its qualified name.
+
+    Args:
+        element: The element class.
+        properties: The precomputed properties of the class. See `ElementRegistry.register`.
+
+    Returns:
+        The element class, so this can be used as a class decorator.
+    """
+    element.from_kwargs = classmethod(make_from_kwargs(element))
+    element.__reduce__ = reduce_element
+    registry.register(element, properties)
     return element
 
 
@@ -0,0 +1,272 @@
+"""Read-only, xmltodict-compatible views over an `lxml` element tree."""
+
+from __future__ import annotations
+
+from collections.abc import ItemsView, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import lxml.etree as ET  # noqa: N812
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+_KEYS: dict[tuple[str, Optional[str]], str] = {}
+"""Cache of `xmltodict` keys by element tag and prefix."""
+
+_NO_DECLARATIONS: dict[Optional[str], str] = {}
+"""Shared (never mutated) result for elements that declare no namespaces."""
+
+
+def _prefixed_name(clark_name: str, prefix: Optional[str]) -> str:
+    """Convert a `{uri}local` name into the name `xmltodict` reports: `prefix:local` or just `local`."""
+    if clark_name[0] != "{":
+        return clark_name
+    local = clark_name[clark_name.index("}") + 1 :]
+    return f"{prefix}:{local}" if prefix else local
+
+
+def _namespace(clark_name: str) -> Optional[str]:
+    """Return the namespace URI of a `{uri}local` name."""
+    return clark_name[1 : clark_name.index("}")] if clark_name[0] == "{" else None
+
+
+def _own_namespace_declarations(nsmap: dict, parent_nsmap: Optional[dict]) -> dict[Optional[str], str]:
+    """Return the namespace declarations made on an element itself, not inherited from its parent."""
+    if parent_nsmap is None:
+        return dict(nsmap)
+    if nsmap is parent_nsmap or nsmap == parent_nsmap:
+        return _NO_DECLARATIONS
+    return {prefix: uri for prefix, uri in nsmap.items() if parent_nsmap.get(prefix) != uri}
+
+
+def _attribute_prefixes(nsmap: dict) -> dict[str, str]:
+    """Map namespace URIs to the prefix used for attributes."""
+    prefixes = {XML_NAMESPACE: "xml"}
+    for prefix, uri in nsmap.items():
+        # Attributes can't use the default namespace, so a named prefix always wins.
+        if prefix is not None or uri not in prefixes:
+            prefixes[uri] = prefix
+    return prefixes
+
+
+def element_key(element: ET._Element) -> str:
+    """
+    Return the key `xmltodict` would use for the element.
+
+    Args:
+        element: The element to get the key for.
+
+    Returns:
+        The tag name with the prefix used in the source document, e.g. `bpmn:task`.
+    """
+    cache_key = (element.tag, element.prefix)
+    if cache_key not in _KEYS:
+        _KEYS[cache_key] = _prefixed_name(*cache_key)
+    return _KEYS[cache_key]
+
+
+def element_text(element: ET._Element) -> Optional[str]:
+    """
+    Return the character data directly inside the element, stripped like `xmltodict` does.
+
+    Args:
+        element: The element to get the text of.
+
+    Returns:
+        The stripped text, or None if there is no non-whitespace text.
+    """
+    if not len(element):
+        return (element.text or "").strip() or None
+    chunks = [element.text or ""]
+    chunks.extend(child.tail or "" for child in element)
+    return "".join(chunks).strip() or None
+
+
+def element_value(element: ET._Element, parent_nsmap: Optional[dict] = None, release: bool = False) -> Any:
+    """
+    Return the value `xmltodict` would produce for the element, as a lazy view where possible.
+
+    Elements without attributes and child elements collapse to their text (or None when empty),
+    exactly as `xmltodict` does. Everything else becomes an `ElementView`.
+
+    Args:
+        element: The element to get the value of.
+        parent_nsmap: The namespace map of the parent element, if already known.
+        release: Whether the returned view may clear its element once it is consumed.
+
+    Returns:
+        The text of the element, None, or an `ElementView`.
+    """
+    if parent_nsmap is None and (parent := element.getparent()) is not None:
+        parent_nsmap = parent.nsmap
+    nsmap = element.nsmap
+    declarations = _own_namespace_declarations(nsmap, parent_nsmap)
+    if not declarations and parent_nsmap is not None:
+        # Share the parent's map so sibling views don't each hold a copy.
+        nsmap = parent_nsmap
+    if declarations or element.attrib or _has_child_elements(element):
+        return ElementView(element, nsmap, declarations, release)
+    return element_text(element)
+
+
+def element_attributes(element: ET._Element, nsmap: dict, declarations: dict[Optional[str], str]) -> dict[str, Any]:
+    """
+    Return the namespace declarations and attributes of the element, keyed the way `xmltodict` does.
+
+    Args:
+        element: The element to get the attributes of.
+        nsmap: The namespace map in scope for the element.
+        declarations: The namespace declarations made on the element itself.
+
+    Returns:
+        A dictionary of `@xmlns`, `@xmlns:prefix` and `@name` keys, in document order.
+    """
+    items: dict[str, Any] = {}
+
+    for prefix, uri in declarations.items():
+        items[f"@xmlns:{prefix}" if prefix else "@xmlns"] = uri
+
+    prefixes = None
+    for name, value in element.items():
+        if name[0] == "{":
+            prefixes = prefixes or _attribute_prefixes(nsmap)
+            items[f"@{_prefixed_name(name, prefixes.get(_namespace(name)))}"] = value
+        else:
+            items[f"@{name}"] = value
+    return items
+
+
+def own_namespace_declarations(element: ET._Element) -> dict[Optional[str], str]:
+    """
+    Return the namespace declarations made on the element itself, not inherited from its parent.
+
+    Args:
+        element: The element to get the declarations of.
+
+    Returns:
+        A mapping of prefix (None for the default namespace) to namespace URI.
+    """
+    parent = element.getparent()
+    return _own_namespace_declarations(element.nsmap, None if parent is None else parent.nsmap)
+
+
+def _has_child_elements(element: ET._Element) -> bool:
+    """Check if the element has child elements, ignoring comments and processing instructions."""
+    return any(isinstance(child.tag, str) for child in element)
+
+
+class ElementView(Mapping):
+    """
+    A lazy mapping over an `lxml` element that mirrors the dictionary `xmltodict.parse` produces.
+
+    Attributes are prefixed with `@`, namespace declarations appear as `@xmlns` and `@xmlns:prefix`,
+    repeated child elements are grouped into lists, and character data is stored under `#text`.
+    Child values are views themselves, so nothing is copied until a caller asks for it.
+
+    The items are computed on demand and never cached: a view keeps no reference to its children,
+    so memory is only held for the elements currently being processed. When `release` is set,
+    consumers may call `release_element` once they are done with a view to free the subtree.
+    """
+
+    __slots__ = ("_declarations", "_nsmap", "element", "release")
+
+    def __init__(
+        self,
+        element: ET._Element,
+        nsmap: Optional[dict] = None,
+        declarations: Optional[dict[Optional[str], str]] = None,
+        release: bool = False,
+    ):
+        self.element = element
+        """The underlying `lxml` element."""
+
+        self.release = release
+        """Whether the underlying tree is owned by the consumer and may be cleared as it is consumed."""
+
+        self._nsmap = nsmap
+        self._declarations = declarations
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Compute the keys and values of this element.
+
+        Only this level is converted; child element values are still views.
+
+        Returns:
+            A dictionary with the same keys and values `xmltodict` would produce for the element.
+        """
+        element = self.element
+        nsmap = self._nsmap if self._nsmap is not None else element.nsmap
+        declarations = self._declarations
+        if declarations is None:
+            declarations = own_namespace_declarations(element)
+        items = element_attributes(element, nsmap, declarations)
+
+        for child in element:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+            key = _KEYS.get((tag, child.prefix)) or element_key(child)
+            value = element_value(child, nsmap, self.release)
+            if key not in items:
+                items[key] = value
+            elif isinstance(items[key], list):
+                items[key].append(value)
+            else:
+                items[key] = [items[key], value]
+
+        if text := element_text(element):
+            items["#text"] = text
+        return items
+
+    def release_element(self) -> None:
+        """Free the subtree of the underlying element if the view was created with `release`."""
+        if self.release:
+            self.element.clear()
+
+    def items(self) -> ItemsView[str, Any]:
+        """Return the items of the view, computing them once."""
+        return self.to_dict().items()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"ElementView({element_key(self.element)!r})"
+
+
+def root_view(root: ET._Element, release: bool = False) -> dict[str, Any]:
+    """
+    Return the top-level mapping `xmltodict.parse` would return for a document.
+
+    Args:
+        root: The root element of the document.
+        release: Whether the consumer owns the tree and may clear elements once they are consumed.
+
+    Returns:
+        A dictionary with a single key, the root element's name, mapped to its view.
+    """
+    return {element_key(root): ElementView(root, release=release)}
+
+
+def materialize(value: Any) -> Any:
+    """
+    Convert views (and lists of views) into plain dictionaries.
+
+    Args:
+        value: A value produced by an `ElementView`.
+
+    Returns:
+        The same value with every `ElementView` replaced by a `dict`.
+    """
+    if isinstance(value, ElementView):
+        return {key: materialize(val) for key, val in value.to_dict().items()}
+    if isinstance(value, list):
+        return [materialize(val) for val in value]
+    return value
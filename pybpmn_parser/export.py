@@ -0,0 +1,111 @@
+"""Export the elements of a model as flat JSON records, one per element, for search indexers and the like."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from pybpmn_parser.element_registry import element_qname
+from pybpmn_parser.hashing import is_element
+from pybpmn_parser.parse import ParseResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import TextIO
+
+RECORD_KEYS = ("id", "qname", "parent_id")
+"""The keys every record starts with, before the scalar properties of its element."""
+
+_JSON_SCALARS = (str, int, float, bool)
+
+
+def _scalar(value: Any, enum_as: str) -> Any:
+    """Return the JSON value of a scalar, or None if the value is not a scalar."""
+    if isinstance(value, Enum):
+        value = value.value if enum_as == "value" else value.name
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    return None
+
+
+class _RecordFields:
+    """The names of the fields of each element class, looked up once per class."""
+
+    def __init__(self) -> None:
+        self._names: dict[type, tuple[str, ...]] = {}
+
+    def __call__(self, element: Any) -> list[tuple[str, Any]]:
+        element_type = type(element)
+        if (names := self._names.get(element_type)) is None:
+            names = self._names[element_type] = tuple(field.name for field in fields(element_type))
+        items = [(name, getattr(element, name)) for name in names]
+        items.extend(getattr(element, "__extra_kwargs__", {}).items())
+        return items
+
+
+def element_records(model: Union[ParseResult, Any], enum_as: str = "value") -> Iterator[dict[str, Any]]:
+    """
+    Yield a flat record for every element of a model, each parent before its children.
+
+    A record has the ID of its element, its qualified name in Clark notation (`{uri}local`), the ID of the closest
+    element above it with one, and the properties of the element whose values are scalars or lists of scalars, by
+    name. Unset and empty properties are left out, and so are child elements, which get their own records.
+    The records are produced while the model is walked, so they can be consumed before the walk is over.
+
+    Args:
+        model: The result of parsing a document, or the root element of a model.
+        enum_as: How to represent Enum members: "value" (default) or "name".
+
+    Yields:
+        The records, as dicts that `json.dumps` serializes.
+    """
+    root = model.definition if isinstance(model, ParseResult) else model
+    properties = _RecordFields()
+    stack: list[tuple[Any, Optional[str]]] = [(root, None)]
+    while stack:
+        element, parent_id = stack.pop()
+        element_id = getattr(element, "id", None)
+        record: dict[str, Any] = {
+            "id": element_id,
+            "qname": str(element_qname(type(element))),
+            "parent_id": parent_id,
+        }
+        children: list[Any] = []
+        for name, value in properties(element):
+            if isinstance(value, list):
+                scalars = [scalar for item in value if (scalar := _scalar(item, enum_as)) is not None]
+                if scalars:
+                    record[name] = scalars
+                children.extend(item for item in value if is_element(item))
+            elif is_element(value):
+                children.append(value)
+            elif (scalar := _scalar(value, enum_as)) is not None and (scalar or not isinstance(scalar, str)):
+                record[name] = scalar
+        yield record
+        owner_id = element_id or parent_id
+        stack.extend((child, owner_id) for child in reversed(children))
+
+
+def write_jsonl(model: Union[ParseResult, Any], fp: TextIO, enum_as: str = "value") -> int:
+    """
+    Write the records of the elements of a model to a file as JSON Lines, one record per line.
+
+    See `element_records` for the records. Each line is written as soon as its element is reached, so the memory
+    used does not grow with the size of the model.
+
+    Args:
+        model: The result of parsing a document, or the root element of a model.
+        fp: The text file to write to.
+        enum_as: How to represent Enum members: "value" (default) or "name".
+
+    Returns:
+        The number of records written.
+    """
+    count = 0
+    for record in element_records(model, enum_as):
+        fp.write(json.dumps(record))
+        fp.write("\n")
+        count += 1
+    return count
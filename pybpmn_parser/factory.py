@@ -1,16 +1,22 @@
 """A factory to create BPMN elements from an XML dictionary."""
 
 import re
-from typing import Any, Callable, Optional
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
 from pydantic.alias_generators import to_snake
 
 from pybpmn_parser.bpmn.infrastructure.definitions import Definitions
 from pybpmn_parser.bpmn.types import NAMESPACES
-from pybpmn_parser.core import QName
-from pybpmn_parser.element_registry import ElementDescriptor, registry
+from pybpmn_parser.core import NamespaceContext, QName
+from pybpmn_parser.element_registry import ElementDescriptor, ElementProperty, registry
+from pybpmn_parser.element_view import ElementView, materialize, root_view
 from pybpmn_parser.parse import ParseContext, Reference
 
+if TYPE_CHECKING:
+    import lxml.etree as ET  # noqa: N812
+
 IGNORE_ATTRIBUTES = re.compile(r"@xmlns:.+")
 
 
@@ -22,6 +28,14 @@ SCALAR_CONVERTER: dict[str, Callable[[str], Any]] = {
 }
 
 
+@dataclass(frozen=True, slots=True)
+class PrebuiltElement:
+    """A child element whose model object was already built, for example by the streaming builder."""
+
+    element: Any
+    """The built model object."""
+
+
 def attr_is_ignored(attr_name: str) -> bool:
     """
     Check if an attribute is ignored.
@@ -72,122 +86,153 @@ def get_property_name(base_name: str, descriptor: ElementDescriptor, nsmap: dict
         return to_snake(attr_name.replace(":", "_"))
 
 
-def _handle_unknown_property(
-    key: str,
-    value: Any,
-    descriptor: ElementDescriptor,
-    parent_uri: str,
-    context: ParseContext,
-    ns_map: dict[str, str],
-) -> dict[str, Any]:
+class KeyKind(Enum):
+    """How the factory handles a key of an element dictionary."""
+
+    IGNORED = "ignored"
+    """A namespace declaration."""
+
+    SCALAR = "scalar"
+    """A known property with a scalar type, converted with `SCALAR_CONVERTER`."""
+
+    ATTRIBUTE = "attribute"
+    """A known property stored as is."""
+
+    CHILD = "child"
+    """A known property holding child elements."""
+
+    UNKNOWN = "unknown"
+    """A key that is not a property of the element, such as a vendor extension."""
+
+
+@dataclass(frozen=True, slots=True)
+class KeyResolution:
+    """The precomputed handling of one key of an element dictionary."""
+
+    kind: KeyKind
+    """How the value is handled."""
+
+    property_name: str = ""
+    """The name of the property the value is stored in."""
+
+    attr_name: Optional[QName] = None
+    """The qualified name of the key."""
+
+    converter: Optional[Callable[[str], Any]] = None
+    """The scalar converter for `SCALAR` keys."""
+
+    is_many: bool = False
+    """Whether the property holds a list."""
+
+    child_descriptor: Optional[ElementDescriptor] = None
+    """The descriptor used to build child elements, if any. Values without one are kept as is."""
+
+
+IGNORED_KEY = KeyResolution(KeyKind.IGNORED)
+
+
+def _resolve_key(key: str, descriptor: ElementDescriptor, ns_map: dict[str, str]) -> KeyResolution:
+    """Work out how a key of an element dictionary is handled."""
+    if attr_is_ignored(key):
+        return IGNORED_KEY
+
+    attr_name = get_attribute_name(key, descriptor, ns_map)
+    property_name = get_property_name(key, descriptor, ns_map)
+    prop_descriptor = descriptor.properties.get(attr_name)
+    if prop_descriptor is None:
+        return KeyResolution(
+            KeyKind.UNKNOWN, property_name, attr_name, child_descriptor=registry.by_qname.get(attr_name)
+        )
+    if prop_descriptor.type in SCALAR_CONVERTER:
+        converter = SCALAR_CONVERTER[prop_descriptor.type]
+        return KeyResolution(KeyKind.SCALAR, property_name, attr_name, converter, prop_descriptor.is_many)
+    if prop_descriptor.is_attr:
+        return KeyResolution(KeyKind.ATTRIBUTE, property_name, attr_name)
+    child_descriptor = registry.by_qname.get(get_child_qname(attr_name, descriptor, key, ns_map))
+    return KeyResolution(
+        KeyKind.CHILD, property_name, attr_name, is_many=prop_descriptor.is_many, child_descriptor=child_descriptor
+    )
+
+
+def resolve_key(key: str, descriptor: ElementDescriptor, ns_map: dict[str, str]) -> KeyResolution:
     """
-    Handles an unknown property found during element processing.
-
-    This function processes a given key and its corresponding value that do not match
-    directly to any recognized property descriptor. It attempts to resolve and map the key
-    to a known attribute name or property using the descriptor and namespace map. If the
-    attribute descriptor is identified, it creates new elements from the given value and
-    maps them properly. If no descriptor is identified, the key-value pair is added as is
-    to the provided item values.
-
-    Arguments:
-        key: The property key being evaluated.
-        value: The associated value with the property key, which can be a list or a raw value.
-        descriptor: Descriptor providing information about the current element's structure.
-        parent_uri: URI of the parent element in the hierarchy.
-        context: Context providing information about the current element's structure.
-        ns_map: Dictionary providing namespace mapping for resolution of keys.
+    Return how a key of an element dictionary is handled, computing it only once.
+
+    Resolutions are cached on the descriptor by key and namespace context, so after the first element of a kind
+    the cost of a key is a single dictionary lookup. The cache is dropped when the registry changes. Namespace
+    maps that are not a `NamespaceContext` are resolved without the cache.
+
+    Args:
+        key: The `xmltodict` key, e.g. `@id` or `bpmn:task`.
+        descriptor: The descriptor of the element the key belongs to.
+        ns_map: The namespace map in scope for the element.
 
     Returns:
-        A dictionary containing the updated property values.
-    """
-    property_name = get_property_name(key, descriptor, ns_map)
-    attr_name = get_attribute_name(key, descriptor, ns_map)
-    attr_descriptor = registry.by_qname.get(attr_name)
-    new_values: dict[str, Any] = {}
+        The resolution of the key.
 
-    if attr_descriptor:
-        if isinstance(value, list):
-            new_values[property_name] = [
-                create_element_from_dict(child_val, attr_descriptor, parent_uri, context, ns_map)
-                for child_val in value
-            ]
-        else:
-            new_values[property_name] = create_element_from_dict(value, attr_descriptor, parent_uri, context, ns_map)
-    else:
-        # Unknown to the registry as well: keep raw value
-        new_values[property_name] = value
+    Raises:
+        ValueError: If the key uses a prefix that is not defined in the namespace map.
+    """
+    if not isinstance(ns_map, NamespaceContext):
+        return _resolve_key(key, descriptor, ns_map)
 
-    return new_values
+    if descriptor.key_cache_version != registry.version:
+        descriptor.key_cache.clear()
+        descriptor.key_cache_version = registry.version
+    cache_key = (key, ns_map.context_id)
+    if (resolution := descriptor.key_cache.get(cache_key)) is None:
+        resolution = descriptor.key_cache[cache_key] = _resolve_key(key, descriptor, ns_map)
+    return resolution
 
 
-def _handle_known_property(
-    key: str,
+def convert_value(
+    resolution: KeyResolution,
     value: Any,
-    descriptor: ElementDescriptor,
     parent_uri: str,
     context: ParseContext,
     ns_map: dict[str, str],
-) -> dict[str, Any]:
+) -> Any:
     """
-    Handles known properties of an element descriptor and updates item values.
+    Convert the value of a key into the value of its property.
 
-    This function processes an XML element's key-value pair to map them to the
-    corresponding property of an element descriptor. It supports scalar
-    conversion, attributes without child elements, and child elements with
-    possible nested descriptors. The function updates the item's values based on
-    the processed property information.
+    Scalars are converted, attributes and values without a descriptor are kept as is, and child elements
+    are built with their descriptor.
 
     Args:
-        key: The key representing the XML element.
-        value: The value associated with the given XML element.
-        descriptor: The descriptor that defines the properties of the XML element.
-        parent_uri: A parent URI to resolve relative paths.
-        context: Context providing information about the current element's structure.
-        ns_map: A dictionary mapping namespace prefixes to their URIs.
-
-    Raises:
-        KeyError: If the property descriptor for the given key cannot be found.
+        resolution: The resolution of the key, from `resolve_key`.
+        value: The value of the key.
+        parent_uri: The URI of the parent BPMN element.
+        context: The parsing context for the element.
+        ns_map: The namespace map in scope for the element.
 
     Returns:
-        A dictionary containing the updated property values.
+        The value of the property.
     """
-    properties = descriptor.properties
-    property_name = get_property_name(key, descriptor, ns_map)
-    attr_name = get_attribute_name(key, descriptor, ns_map)
-    prop_descriptor = properties[attr_name]
-    new_values: dict[str, Any] = {}
-
-    # Scalar conversion
-    if prop_descriptor.type in SCALAR_CONVERTER:
-        if prop_descriptor.is_many:
+    kind = resolution.kind
+    if kind is KeyKind.SCALAR:
+        value = materialize(value)
+        if resolution.is_many:
             if not isinstance(value, list):
                 value = [value]
-            new_values[property_name] = [SCALAR_CONVERTER[prop_descriptor.type](v) for v in value]
-        else:
-            new_values[property_name] = SCALAR_CONVERTER[prop_descriptor.type](value)
-        return new_values
+            return [resolution.converter(v) for v in value]
+        return resolution.converter(value)
 
-    # Simple attribute (no child elements)
-    if prop_descriptor.is_attr:
-        new_values[property_name] = value
-        return new_values
-
-    # Child element(s)
-    child_qname = get_child_qname(attr_name, descriptor, key, ns_map)
-    child_descriptor = registry.by_qname.get(child_qname)
-    new_values[property_name] = get_child_value(
-        value,
-        child_descriptor,
-        prop_descriptor.is_many,
-        ns_map,
-        parent_uri,
-        context,
-    )
-    return new_values
+    if kind is KeyKind.CHILD:
+        return get_child_value(value, resolution.child_descriptor, resolution.is_many, ns_map, parent_uri, context)
+
+    if kind is KeyKind.UNKNOWN and (attr_descriptor := resolution.child_descriptor):
+        if isinstance(value, list):
+            return [
+                create_element_from_dict(child_val, attr_descriptor, parent_uri, context, ns_map)
+                for child_val in value
+            ]
+        return create_element_from_dict(value, attr_descriptor, parent_uri, context, ns_map)
+
+    # Attributes, and keys unknown to the registry as well: keep raw value
+    return materialize(value)
 
 
-def create_element_from_dict(  # noqa: C901
+def create_element_from_dict(
     element_dict: dict,
     descriptor: ElementDescriptor,
     parent_uri: str,
@@ -197,7 +242,7 @@ def create_element_from_dict(  # noqa: C901
     """Create a BPMN element from a dictionary representation.
 
     Args:
-        element_dict: A dictionary representing a BPMN element.
+        element_dict: A dictionary representing a BPMN element, or an `ElementView` of one.
         descriptor: A descriptor for the BPMN element.
         parent_uri: The URI of the parent BPMN element.
         context: The parsing context for the element.
@@ -209,6 +254,17 @@ def create_element_from_dict(  # noqa: C901
     if element_dict is None:
         return None
 
+    context.check_cancelled()
+    if isinstance(element_dict, PrebuiltElement):
+        return element_dict.element
+
+    view = None
+    if isinstance(element_dict, ElementView):
+        view = element_dict
+        if context.prebuilt and (element := context.prebuilt.get(view.element)) is not None:
+            return element
+        element_dict = view.to_dict()
+
     if isinstance(element_dict, str):
         element_dict = {"#text": element_dict}
 
@@ -218,28 +274,36 @@ def create_element_from_dict(  # noqa: C901
     ns_map = extract_nsmap_from_dict(element_dict, nsmap)
 
     item_values: dict[str, Any] = {}  # The values passed to the element constructor
-    properties = descriptor.properties
 
     for key, value in element_dict.items():
-        if attr_is_ignored(key):
+        resolution = resolve_key(key, descriptor, ns_map)
+        if resolution.kind is KeyKind.IGNORED:
             continue
+        item_values[resolution.property_name] = convert_value(resolution, value, parent_uri, context, ns_map)
+    element = descriptor.type.from_kwargs(**item_values)
+    add_references(element, descriptor.properties.values(), context)
+    context.add_element(element)
+    if view is not None:
+        view.release_element()
+    return element
 
-        attr_name = get_attribute_name(key, descriptor, ns_map)
-        if attr_name not in properties:
-            item_values |= _handle_unknown_property(key, value, descriptor, parent_uri, context, ns_map)
-            continue
 
-        item_values |= _handle_known_property(key, value, descriptor, parent_uri, context, ns_map)
-    element = descriptor.type.from_kwargs(**item_values)
-    for prop in properties.values():
+def add_references(element: Any, properties: Iterable[ElementProperty], context: ParseContext) -> None:
+    """
+    Add the references held by an element to the parsing context.
+
+    Args:
+        element: The built element.
+        properties: The properties of the element to look for references in.
+        context: The parsing context for the element.
+    """
+    for prop in properties:
         if prop.is_reference and (prop_value := getattr(element, prop.property_name)):
             if isinstance(prop_value, list):
                 for ref_id in prop_value:
                     context.add_reference(Reference(element.id, prop.property_name, ref_id))
             else:
                 context.add_reference(Reference(element.id, prop.property_name, prop_value))
-    context.add_element(element)
-    return element
 
 
 def get_child_value(
@@ -271,7 +335,7 @@ def get_child_value(
         based on the descriptor and the provided input.
     """
     if child_descriptor is None or value is None:
-        return value
+        return materialize(value)
     elif is_many or isinstance(value, list):
         if not isinstance(value, list):
             value = [value]
@@ -280,6 +344,23 @@ def get_child_value(
         return create_element_from_dict(value, child_descriptor, parent_uri, context, ns_map)
 
 
+def get_child_descriptor(key: str, descriptor: ElementDescriptor, ns_map: dict[str, str]) -> ElementDescriptor | None:
+    """
+    Return the descriptor used to build the child element stored under `key`.
+
+    Scalar and attribute properties, and elements unknown to the registry, are kept as raw values.
+
+    Args:
+        key: The `xmltodict` key of the child element, e.g. `bpmn:task`.
+        descriptor: The descriptor of the parent element.
+        ns_map: The namespace map in scope for the parent element.
+
+    Returns:
+        The descriptor of the child element, or None if the child is kept as a raw value.
+    """
+    return resolve_key(key, descriptor, ns_map).child_descriptor
+
+
 def get_child_qname(attr_name: QName, descriptor: ElementDescriptor, key: str, ns_map: dict[str, str]) -> QName | None:
     """
     Compute the qualified name (QName) for a child element based on the provided information.
@@ -300,17 +381,29 @@ def get_child_qname(attr_name: QName, descriptor: ElementDescriptor, key: str, n
     return descriptor.properties[attr_name].type_qname or QName.from_str(key, ns_map)
 
 
-def extract_nsmap_from_dict(element_dict: dict, nsmap: dict[str, str] | None) -> dict[str, str]:
-    """Extract a namespace map from an XML dictionary."""
-    xmlns_keys = [key for key in element_dict if key.startswith("@xmlns")]
-    ns_map = nsmap.copy() if nsmap else {}
-    for xmlns_key in xmlns_keys:
-        if ":" in xmlns_key:
-            prefix = xmlns_key.split(":")[1]
-            ns_map[prefix] = element_dict[xmlns_key]
+def extract_nsmap_from_dict(element_dict: dict, nsmap: dict[str, str] | None) -> NamespaceContext:
+    """
+    Extract the namespace context of an element from its XML dictionary.
+
+    The parent's context is returned as is when the element declares no new namespaces, so nothing is copied.
+
+    Args:
+        element_dict: The XML dictionary of the element.
+        nsmap: The namespace map in scope for the parent element.
+
+    Returns:
+        The namespace context in scope for the element.
+    """
+    declarations = {}
+    for key, value in element_dict.items():
+        if not key.startswith("@xmlns"):
+            continue
+        if ":" in key:
+            prefix = key.split(":")[1]
+            declarations[prefix] = value
         else:
-            ns_map["default"] = element_dict[xmlns_key]
-    return ns_map
+            declarations["default"] = value
+    return NamespaceContext.of(nsmap).with_declarations(declarations)
 
 
 def create_bpmn(
@@ -319,7 +412,7 @@ def create_bpmn(
     """
     Create a BPMN element from a root XML dictionary.
 
-    Pass the dict resulting from xmltodict.
+    Pass the dict resulting from xmltodict, or the mapping returned by `element_view.root_view`.
 
     Args:
         root_xml_dict: A root XML dictionary.
@@ -346,3 +439,28 @@ def create_bpmn(
     if len(output) > 1:
         raise ValueError("Expected exactly one BPMN definition, but found multiple.")
     return output[0]
+
+
+def create_bpmn_from_element(
+    root: "ET._Element",
+    context: ParseContext,
+    initial_nsmap: Optional[dict[str, str]] = None,
+    release_tree: bool = False,
+) -> Definitions:
+    """
+    Create a BPMN element from the root element of an already parsed `lxml` tree.
+
+    The tree is read in place through `ElementView`s, so the document is not re-tokenized
+    and no intermediate dictionary of the whole document is built.
+
+    Args:
+        root: The root element of the document, usually `bpmn:definitions`.
+        context: A ParseContext instance.
+        initial_nsmap: An optional namespace map for resolving prefixed element names.
+        release_tree: Clear each element once its model object is built. Only use this when the tree is
+            not needed afterward; it keeps peak memory close to the size of the model instead of model plus tree.
+
+    Returns:
+        The created BPMN element.
+    """
+    return create_bpmn(root_view(root, release=release_tree), context, initial_nsmap)
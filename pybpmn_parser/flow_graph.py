@@ -0,0 +1,208 @@
+"""The sequence flows of each process as a compact directed graph."""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Any, Optional
+
+from pybpmn_parser.bpmn.common.flow_node import FlowNode
+from pybpmn_parser.bpmn.common.sequence_flow import SequenceFlow
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+INDEX_TYPECODE = "l"
+"""The `array` type code of the CSR arrays: signed integers of the platform's C `long`."""
+
+
+class FlowGraph:
+    """
+    The flow nodes of a process and the sequence flows between them, in compressed sparse row (CSR) form.
+
+    Nodes are numbered densely in document order. The edges leaving node `i` are the positions
+    `out_offsets[i]` to `out_offsets[i + 1]` of `out_targets` (the target nodes) and `out_flows` (the sequence
+    flows); `in_offsets`, `in_sources` and `in_flows` hold the edges entering each node the same way. Every
+    adjacency query is therefore a slice, in time proportional to the degree of the node.
+
+    The nodes and flows of nested sub-processes belong to the graph of their process. The endpoints of a flow
+    that are not flow nodes of the process are added as nodes, so every edge has both ends. A flow without a
+    source or a target, such as one being edited or loaded from an incomplete dict, is not an edge; its ID is
+    listed in `incomplete_flow_ids` instead.
+    """
+
+    def __init__(
+        self,
+        process_id: Optional[str],
+        node_ids: list[str],
+        flows: list[tuple[str, Optional[str], Optional[str]]],
+    ) -> None:
+        """
+        Build a graph.
+
+        Args:
+            process_id: The ID of the process.
+            node_ids: The IDs of the flow nodes, in document order.
+            flows: The ID, source ID and target ID of each sequence flow, in document order.
+        """
+        self.process_id = process_id
+        """The ID of the process."""
+
+        self.incomplete_flow_ids: list[str] = [flow[0] for flow in flows if flow[1] is None or flow[2] is None]
+        """The IDs of the sequence flows left out of the graph because they lack a source or a target."""
+
+        if self.incomplete_flow_ids:
+            flows = [flow for flow in flows if flow[1] is not None and flow[2] is not None]
+
+        self.node_ids: list[str] = []
+        """The ID of each node, by node number."""
+
+        self.node_index: dict[str, int] = {}
+        """The number of each node, by ID."""
+
+        for node_id in node_ids:
+            self._add_node(node_id)
+        sources = array(INDEX_TYPECODE, [self._add_node(source) for _, source, _ in flows])
+        targets = array(INDEX_TYPECODE, [self._add_node(target) for _, _, target in flows])
+
+        self.flow_ids: list[str] = [flow_id for flow_id, _, _ in flows]
+        """The ID of each sequence flow, by flow number."""
+
+        self.out_offsets, self.out_flows = _csr(len(self.node_ids), sources)
+        self.out_targets = array(INDEX_TYPECODE, [targets[flow] for flow in self.out_flows])
+        self.in_offsets, self.in_flows = _csr(len(self.node_ids), targets)
+        self.in_sources = array(INDEX_TYPECODE, [sources[flow] for flow in self.in_flows])
+
+    def _add_node(self, node_id: str) -> int:
+        if (number := self.node_index.get(node_id)) is None:
+            number = self.node_index[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+        return number
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.node_index
+
+    def __repr__(self) -> str:
+        return f"FlowGraph({self.process_id!r}, nodes={len(self.node_ids)}, flows={len(self.flow_ids)})"
+
+    def successors(self, node_id: str) -> list[str]:
+        """Return the IDs of the targets of the sequence flows leaving a node, in document order."""
+        return [self.node_ids[target] for target in _row(self.out_offsets, self.out_targets, self.node_index[node_id])]
+
+    def predecessors(self, node_id: str) -> list[str]:
+        """Return the IDs of the sources of the sequence flows entering a node, in document order."""
+        return [self.node_ids[source] for source in _row(self.in_offsets, self.in_sources, self.node_index[node_id])]
+
+    def outgoing(self, node_id: str) -> list[str]:
+        """Return the IDs of the sequence flows leaving a node, in document order."""
+        return [self.flow_ids[flow] for flow in _row(self.out_offsets, self.out_flows, self.node_index[node_id])]
+
+    def incoming(self, node_id: str) -> list[str]:
+        """Return the IDs of the sequence flows entering a node, in document order."""
+        return [self.flow_ids[flow] for flow in _row(self.in_offsets, self.in_flows, self.node_index[node_id])]
+
+    def out_degree(self, node_id: str) -> int:
+        """Return the number of sequence flows leaving a node."""
+        number = self.node_index[node_id]
+        return self.out_offsets[number + 1] - self.out_offsets[number]
+
+    def in_degree(self, node_id: str) -> int:
+        """Return the number of sequence flows entering a node."""
+        number = self.node_index[node_id]
+        return self.in_offsets[number + 1] - self.in_offsets[number]
+
+    def edges(self) -> Iterator[tuple[int, int]]:
+        """Yield the source and target node numbers of each sequence flow, grouped by source."""
+        for source in range(len(self.node_ids)):
+            for position in range(self.out_offsets[source], self.out_offsets[source + 1]):
+                yield source, self.out_targets[position]
+
+    def adjacency(self) -> list[list[int]]:
+        """Return the target node numbers of each node, by node number."""
+        targets = self.out_targets.tolist()
+        offsets = self.out_offsets
+        return [targets[offsets[number] : offsets[number + 1]] for number in range(len(self.node_ids))]
+
+    def to_numpy(self) -> tuple[Any, Any]:
+        """
+        Return the outgoing edges as NumPy arrays, sharing memory with the graph.
+
+        The arrays are the row offsets and column indices of the adjacency matrix, as expected by e.g.
+        `scipy.sparse.csr_matrix((numpy.ones(len(indices)), indices, indptr))`.
+
+        Returns:
+            The `indptr` and `indices` arrays.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        import numpy
+
+        dtype = numpy.dtype(f"i{self.out_offsets.itemsize}")
+        return numpy.frombuffer(self.out_offsets, dtype=dtype), numpy.frombuffer(self.out_targets, dtype=dtype)
+
+
+def _row(offsets: array, values: array, number: int) -> array:
+    """Return the values of one row of a CSR array."""
+    return values[offsets[number] : offsets[number + 1]]
+
+
+def _csr(node_count: int, rows: array) -> tuple[array, array]:
+    """
+    Group edges by one of their ends with a counting sort, keeping document order within each group.
+
+    Args:
+        node_count: The number of nodes.
+        rows: The node number of each edge's end to group by, by edge number.
+
+    Returns:
+        The offsets of each node's edges, and the edge numbers grouped by node.
+    """
+    offsets = array(INDEX_TYPECODE, [0]) * (node_count + 1)
+    for row in rows:
+        offsets[row + 1] += 1
+    for number in range(node_count):
+        offsets[number + 1] += offsets[number]
+    positions = offsets[:-1]
+    edges = array(INDEX_TYPECODE, [0]) * len(rows)
+    for edge, row in enumerate(rows):
+        edges[positions[row]] = edge
+        positions[row] += 1
+    return offsets, edges
+
+
+def _collect(container: Any, node_ids: list[str], flows: list[tuple[str, Optional[str], Optional[str]]]) -> None:
+    """Add the flow nodes and sequence flows of a process or sub-process, and of its nested sub-processes."""
+    for value in vars(container).values():
+        if not isinstance(value, list):
+            continue
+        for item in value:
+            if isinstance(item, SequenceFlow):
+                flows.append((item.id, item.source_ref, item.target_ref))
+            elif isinstance(item, FlowNode):
+                node_ids.append(item.id)
+                if hasattr(item, "sequence_flows"):
+                    _collect(item, node_ids, flows)
+
+
+def process_graph(process: Any) -> FlowGraph:
+    """
+    Build the flow graph of a process.
+
+    Args:
+        process: The process.
+
+    Returns:
+        The graph of the process's flow nodes and sequence flows, including those of its sub-processes.
+    """
+    node_ids: list[str] = []
+    flows: list[tuple[str, Optional[str], Optional[str]]] = []
+    _collect(process, node_ids, flows)
+    return FlowGraph(process.id, node_ids, flows)
+
+
+def flow_graphs(processes: Iterable[Any]) -> dict[Optional[str], FlowGraph]:
+    """Build the flow graph of each process, by process ID."""
+    return {process.id: process_graph(process) for process in processes}
@@ -0,0 +1,202 @@
+"""Stable content hashes of model elements, computed bottom-up like a Merkle tree."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import fields
+from enum import Enum
+from typing import Any
+
+from pybpmn_parser.bpmn.foundation.documentation import Documentation
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.element_registry import element_qname
+
+HASH_PERSONALIZATION = b"pybpmn-hash-v2"
+"""The BLAKE2b personalization of the hashes, changed whenever their encoding changes."""
+
+DIGEST_SIZE = 16
+"""The size in bytes of a digest."""
+
+DI_NAMESPACES = frozenset({NAMESPACES["bpmndi"], NAMESPACES["dc"], NAMESPACES["di"]})
+"""The namespaces of the diagram interchange elements, left out with `ignore_di`."""
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip a string and collapse every run of whitespace inside it into a single space."""
+    return " ".join(text.split())
+
+
+def is_element(value: Any) -> bool:
+    """Check if a value is a model element rather than a plain value."""
+    return hasattr(type(value), "Meta")
+
+
+def item_keys(items: list[Any]) -> dict[str, Any]:
+    """
+    Key the items of a list by ID, or by position among the items without an ID.
+
+    An item whose ID was already seen is keyed by position too. Positions are decimal numbers, which valid IDs
+    never are, as XML IDs cannot start with a digit.
+    """
+    keyed: dict[str, Any] = {}
+    position = 0
+    for item in items:
+        item_id = getattr(item, "id", None) if is_element(item) else None
+        if item_id is None or item_id in keyed:
+            key = str(position)
+            position += 1
+        else:
+            key = item_id
+        keyed[key] = item
+    return keyed
+
+
+class ModelHasher:
+    """
+    Compute content hashes of model elements.
+
+    The hash of an element covers its type and the values of its fields in declaration order, followed by the
+    vendor attributes it was built with, by name. Child elements contribute their own hash, so the hash of an
+    element is computed from those of its children and two subtrees with the same hash are equal, up to the order
+    of the elements with an ID in lists: those are hashed by ID, see `item_keys`, so that moving an element within
+    its list changes no hash, just as `pybpmn_parser.diff.diff` matches them by ID and reports no move. Unset and
+    empty values are left out, and whitespace in strings is normalized, so reformatting a document does not
+    change its hashes. Hashes only depend on the content, not on the process or the Python version, so they can
+    be stored and compared across runs.
+
+    Each element is hashed once per hasher: the hashes are cached by object, so do not modify the elements of
+    a model while a hasher is in use.
+    """
+
+    def __init__(self, ignore_di: bool = False, ignore_documentation: bool = False) -> None:
+        """
+        Create a hasher.
+
+        Args:
+            ignore_di: Leave out the diagram interchange elements (`bpmndi`, `dc` and `di`), so that two models
+                that only differ in their layout have the same hash.
+            ignore_documentation: Leave out the `bpmn:documentation` elements.
+        """
+        self.ignore_di = ignore_di
+        """Whether the diagram interchange elements are left out."""
+
+        self.ignore_documentation = ignore_documentation
+        """Whether the documentation elements are left out."""
+
+        self._digests: dict[int, tuple[Any, bytes]] = {}
+        self._types: dict[type, tuple[str, tuple[str, ...]]] = {}
+        self._ignored_types: dict[type, bool] = {}
+
+    def digest(self, element: Any) -> bytes:
+        """
+        Return the hash of an element and everything below it.
+
+        Args:
+            element: A model element.
+
+        Returns:
+            The digest, `DIGEST_SIZE` bytes long.
+        """
+        if (cached := self._digests.get(id(element))) is not None:
+            return cached[1]
+        encode = self._encode
+        prefix = self._type_info(type(element))[0]
+        encoded = "".join([prefix, *(f"{name}={encode(value)};" for name, value in self.properties(element))])
+        result = hashlib.blake2b(encoded.encode(), digest_size=DIGEST_SIZE, person=HASH_PERSONALIZATION).digest()
+        # The element is kept alive with its digest so that its id() is not reused.
+        self._digests[id(element)] = (element, result)
+        return result
+
+    def hexdigest(self, element: Any) -> str:
+        """Return the hash of an element as a hexadecimal string."""
+        return self.digest(element).hex()
+
+    def is_ignored(self, value: Any) -> bool:
+        """Check if a value is an element left out by the options of the hasher."""
+        value_type = type(value)
+        if (ignored := self._ignored_types.get(value_type)) is None:
+            ignored = self._ignored_types[value_type] = is_element(value) and (
+                (self.ignore_documentation and issubclass(value_type, Documentation))
+                or (self.ignore_di and value_type.Meta.namespace in DI_NAMESPACES)
+            )
+        return ignored
+
+    def properties(self, element: Any) -> list[tuple[str, Any]]:
+        """
+        Return the properties of an element that its hash covers.
+
+        Args:
+            element: A model element.
+
+        Returns:
+            The names and values of the fields in declaration order, then of the vendor attributes by name.
+            Unset and empty values and the ignored elements are left out.
+        """
+        filtered = self.ignore_di or self.ignore_documentation
+        properties = []
+        for name in self._type_info(type(element))[1]:
+            value = getattr(element, name)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                if value.strip():
+                    properties.append((name, value))
+            elif isinstance(value, list):
+                kept = [item for item in value if not self.is_ignored(item)] if filtered else value
+                if kept:
+                    properties.append((name, kept))
+            elif not filtered or not self.is_ignored(value):
+                properties.append((name, value))
+        if extra := getattr(element, "__extra_kwargs__", None):
+            properties.extend((name, value) for name, value in sorted(extra.items()) if value is not None)
+        return properties
+
+    def _type_info(self, element_type: type) -> tuple[str, tuple[str, ...]]:
+        """Return the prefix of the encoding of a type's elements, and the names of its fields."""
+        if (info := self._types.get(element_type)) is None:
+            names = tuple(field.name for field in fields(element_type))
+            info = self._types[element_type] = (f"{element_qname(element_type)}:", names)
+        return info
+
+    def _encode(self, value: Any) -> str:
+        """Encode a value so that different values of any kinds have different encodings."""
+        value_type = type(value)
+        if value_type is str:
+            return repr(normalize_whitespace(value))
+        if value_type is list:
+            if any(map(is_element, value)):
+                items = sorted(item_keys(value).items())
+                return f"[{','.join(f'{key!r}:{self._encode(item)}' for key, item in items)}]"
+            return f"[{','.join(map(self._encode, value))}]"
+        if value_type in {bool, int, float}:
+            return repr(value)
+        if is_element(value):
+            return self.digest(value).hex()
+        if isinstance(value, Enum):
+            return f"<{self._encode(value.value)}>"
+        if isinstance(value, str):
+            return repr(normalize_whitespace(value))
+        if isinstance(value, dict):
+            items = sorted((str(key), item) for key, item in value.items())
+            return f"{{{','.join(f'{key!r}:{self._encode(item)}' for key, item in items)}}}"
+        if isinstance(value, tuple):
+            return f"({','.join(map(self._encode, value))})"
+        return repr(value)
+
+
+def content_hash(element: Any, ignore_di: bool = False, ignore_documentation: bool = False) -> str:
+    """
+    Return the content hash of a model element, such as the definitions of a document.
+
+    Documents with the same hash are equal up to whitespace, and up to the ignored parts, so the hash of the
+    definitions can be used to find duplicate documents in a large corpus.
+
+    Args:
+        element: A model element.
+        ignore_di: Leave out the diagram interchange elements.
+        ignore_documentation: Leave out the documentation elements.
+
+    Returns:
+        The hash, as a hexadecimal string.
+    """
+    return ModelHasher(ignore_di, ignore_documentation).hexdigest(element)
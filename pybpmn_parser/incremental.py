@@ -0,0 +1,292 @@
+"""Re-parse a new version of a document, rebuilding only the subtrees that changed since it was last parsed."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import lxml.etree as ET  # noqa: N812
+
+from pybpmn_parser.bpmn.common.sequence_flow import SequenceFlow
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.element_registry import element_qname, registry
+from pybpmn_parser.factory import add_references, create_bpmn_from_element
+from pybpmn_parser.flow_graph import process_graph
+from pybpmn_parser.parse import ParseContext, ParseResult, Reference
+from pybpmn_parser.validator import ValidationLevel, model_elements, validate_changes, validate_element
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from pybpmn_parser.parse import Parser
+
+CONTAINER_TAGS = frozenset(
+    [
+        *(
+            f"{{{NAMESPACES['bpmn']}}}{name}"
+            for name in ("definitions", "process", "subProcess", "transaction", "adHocSubProcess", "collaboration")
+        ),
+        f"{{{NAMESPACES['bpmndi']}}}BPMNPlane",
+    ]
+)
+"""The elements whose children with an ID are digested, and reused or rebuilt, one by one."""
+
+DIGEST_SIZE = 16
+"""The size in bytes of the digest of a subtree."""
+
+SPEC_NAMESPACE = "http://www.omg.org/spec/"
+"""The start of the namespaces of the elements defined by the BPMN specification."""
+
+_NO_CHILDREN: dict[str, SubtreeDigest] = {}
+"""Shared (never mutated) children of the subtrees without tracked elements."""
+
+
+@dataclass(frozen=True, slots=True)
+class SubtreeDigest:
+    """The digest of the serialized subtree of an element, and the digests of the tracked elements below it."""
+
+    digest: bytes
+    """The BLAKE2b digest of the subtree, serialized with the namespace declarations in scope."""
+
+    children: dict[str, SubtreeDigest]
+    """The digests of the tracked elements directly below the element, by ID."""
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentDigests:
+    """The subtree digests of a parsed document, compared with those of its next version by `Parser.reparse`."""
+
+    fingerprint: str
+    """The fingerprint of the parser that built the document, see `pybpmn_parser.parse.Parser.fingerprint`."""
+
+    root_elements: dict[str, SubtreeDigest]
+    """The digests of the root elements, by ID."""
+
+
+def _subtree_digest(element: ET._Element) -> bytes:
+    """Return the digest of an element's subtree."""
+    return hashlib.blake2b(ET.tostring(element, with_tail=False), digest_size=DIGEST_SIZE).digest()
+
+
+class _Plan:
+    """Which subtrees of a new document are reused from the model of the previous version, and which are rebuilt."""
+
+    def __init__(self, elements_by_id: Mapping[str, Any]) -> None:
+        self.elements_by_id = elements_by_id
+
+        self.reused: dict[ET._Element, Any] = {}
+        """The previous model object of every unchanged tracked element."""
+
+        self.replaced: list[Any] = []
+        """The previous model objects of the tracked elements that changed or were removed."""
+
+        self.descended: set[ET._Element] = set()
+        """The elements that are rebuilt around the tracked elements below them."""
+
+    def match(self, element: ET._Element, previous: Mapping[str, SubtreeDigest]) -> dict[str, SubtreeDigest]:
+        """
+        Digest the tracked elements below a rebuilt element and compare them with their previous versions.
+
+        Unchanged elements are reused, and the tracked elements below a changed one are matched in turn.
+
+        Args:
+            element: The rebuilt element.
+            previous: The digests of the tracked elements below the previous version of the element, by ID.
+
+        Returns:
+            The digests of the tracked elements below the element, by ID.
+        """
+        self.descended.add(element)
+        children: dict[str, SubtreeDigest] = {}
+        reused_ids: set[str] = set()
+        for child in self._tracked_children(element):
+            child_id = child.get("id")
+            digest = _subtree_digest(child)
+            old = previous.get(child_id)
+            if (
+                old is not None
+                and old.digest == digest
+                and child_id not in reused_ids
+                and (built := self.elements_by_id.get(child_id)) is not None
+            ):
+                self.reused[child] = built
+                reused_ids.add(child_id)
+                children[child_id] = old
+            else:
+                children[child_id] = SubtreeDigest(digest, self.match(child, old.children if old else _NO_CHILDREN))
+        self.replaced.extend(
+            self.elements_by_id[child_id]
+            for child_id in previous
+            if child_id not in reused_ids and child_id in self.elements_by_id
+        )
+        return children or _NO_CHILDREN
+
+    def _tracked_children(self, element: ET._Element) -> Iterator[ET._Element]:
+        """Yield the children with an ID of a container, looking through nested containers such as a plane."""
+        container = element.tag in CONTAINER_TAGS
+        for child in element.iterchildren(ET.Element):
+            if container and child.get("id") is not None:
+                yield child
+            elif child.tag in CONTAINER_TAGS:
+                self.descended.add(child)
+                yield from self._tracked_children(child)
+
+    def changed_parts(self, element: ET._Element) -> ET._Element:
+        """Copy a rebuilt element without the reused subtrees below it."""
+        part = ET.Element(element.tag, element.attrib, nsmap=element.nsmap)
+        part.text = element.text
+        for child in element:
+            if child in self.reused:
+                continue
+            part.append(self.changed_parts(child) if child in self.descended else copy.deepcopy(child))
+        return part
+
+
+@dataclass(frozen=True)
+class _KeptIds:
+    """The IDs of the BPMN elements of the previous model that are not replaced."""
+
+    elements_by_id: Mapping[str, Any]
+    removed_ids: set[str]
+
+    def __contains__(self, element_id: object) -> bool:
+        element = self.elements_by_id.get(element_id)
+        return element_id not in self.removed_ids and element is not None and _is_spec_element(element)
+
+
+def _is_spec_element(element: Any) -> bool:
+    """Check if a model element is defined by the BPMN specification rather than by an extension."""
+    return (element_qname(type(element)).uri or "").startswith(SPEC_NAMESPACE)
+
+
+def _registered_id(element: Any) -> Optional[str]:
+    """Return the ID an element is indexed by, see `pybpmn_parser.parse.ParseContext.add_element`."""
+    return getattr(element, "id", None) or getattr(element, "@id", None)
+
+
+def _references_of(elements: list[Any]) -> list[Reference]:
+    """Return the references the elements added to the parse context when they were built."""
+    context = ParseContext()
+    for element in elements:
+        if (descriptor := registry.by_qname.get(element_qname(type(element)))) is not None:
+            add_references(element, descriptor.properties.values(), context)
+    return context.references
+
+
+def _kept_flows(previous: ParseResult, removed_ids: set[str]) -> list[dict[str, Optional[str]]]:
+    """Return the attributes of the unchanged sequence flows that start or end at a removed element."""
+    flows: dict[str, dict[str, Optional[str]]] = {}
+    for removed_id in removed_ids:
+        for resolved in previous.reference_index.referrers(removed_id):
+            flow = resolved.source.get()
+            if resolved.source.id not in removed_ids and isinstance(flow, SequenceFlow):
+                flows[flow.id] = {"id": flow.id, "sourceRef": flow.source_ref, "targetRef": flow.target_ref}
+    return list(flows.values())
+
+
+def _parse_tracked(parser: Parser, root: ET._Element) -> ParseResult:
+    """Validate and build a whole document, recording the digests of its subtrees."""
+    validate_element(root, parser.validation, parser.schema_backend).raise_for_errors()
+    root_elements = _Plan({}).match(root, _NO_CHILDREN)
+    skipped = parser.element_filter.prune(root) if parser.element_filter is not None else []
+
+    context = ParseContext()
+    definitions = create_bpmn_from_element(root, context, parser.ns_map, release_tree=True)
+    result = ParseResult(definitions, context, skipped=skipped)
+    result.digests = DocumentDigests(parser.fingerprint, root_elements)
+    return result
+
+
+def reparse_tree(parser: Parser, previous: Optional[ParseResult], root: ET._Element) -> ParseResult:
+    """
+    Update the result of parsing a document to a new version of it, rebuilding only what changed.
+
+    See `pybpmn_parser.parse.Parser.reparse`.
+
+    Args:
+        parser: The parser, with the options `previous` was parsed with.
+        previous: The result to update, or None to parse the document and record its digests.
+        root: The root element of the new version. The tree is consumed.
+
+    Returns:
+        The updated result.
+
+    Raises:
+        ValidationError: If a changed part of the new version is invalid. `previous` is left unchanged.
+        ValueError: If the parser is lazy.
+    """
+    if parser.lazy:
+        raise ValueError("Incremental parsing builds the whole model; use a parser created with lazy=False.")
+    digests = previous.digests if previous is not None else None
+    if digests is None or digests.fingerprint != parser.fingerprint:
+        result = _parse_tracked(parser, root)
+        if previous is None:
+            return result
+        vars(previous).clear()
+        vars(previous).update(vars(result))
+        return previous
+
+    elements_by_id = previous.elements_by_id
+    plan = _Plan(elements_by_id)
+    root_elements = plan.match(root, digests.root_elements)
+    plan.replaced.append(previous.definition)
+    boundaries = {id(element) for element in (*plan.reused.values(), *plan.replaced)}
+    removed = [element for replaced in plan.replaced for element in model_elements(replaced, boundaries)]
+    removed_ids = {
+        element_id
+        for element in removed
+        if (element_id := _registered_id(element)) is not None and elements_by_id.get(element_id) is element
+    }
+
+    if parser.validation is not ValidationLevel.OFF:
+        validate_changes(
+            plan.changed_parts(root),
+            [process for process in root.iterchildren("{*}process") if process in plan.descended],
+            _KeptIds(elements_by_id, removed_ids),
+            _kept_flows(previous, removed_ids),
+            parser.validation,
+            parser.schema_backend,
+        ).raise_for_errors()
+    skipped = parser.element_filter.prune(root) if parser.element_filter is not None else []
+
+    context = ParseContext()
+    context.prebuilt = plan.reused
+    # Clearing elements while the reused ones still have proxies costs more than freeing the tree at once.
+    definitions = create_bpmn_from_element(root, context, parser.ns_map)
+
+    for element_id in removed_ids:
+        del elements_by_id[element_id]
+    elements_by_id.update(context.elements_by_id)
+    removed_references = _references_of(removed)
+    stale = Counter((ref.element_id, ref.property, ref.reference_id) for ref in removed_references)
+    kept_references = []
+    for reference in previous.references:
+        key = (reference.element_id, reference.property, reference.reference_id)
+        if stale.get(key):
+            stale[key] -= 1
+        else:
+            kept_references.append(reference)
+    previous.references[:] = [*kept_references, *context.references]
+
+    cached = vars(previous)
+    if (reference_index := cached.get("reference_index")) is not None:
+        reference_index.discard(removed_references)
+        reference_index.add(context.references)
+    if (graphs := cached.get("flow_graphs")) is not None:
+        reused = {id(element) for element in plan.reused.values()}
+        updated = {
+            process.id: graphs[process.id]
+            if id(process) in reused and process.id in graphs
+            else process_graph(process)
+            for process in definitions.processes
+        }
+        graphs.clear()
+        graphs.update(updated)
+
+    previous.definition = definitions
+    previous.skipped = skipped
+    previous.digests = DocumentDigests(digests.fingerprint, root_elements)
+    return previous
@@ -0,0 +1,207 @@
+"""Build the root elements of a BPMN document only when they are first accessed."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import lxml.etree as ET  # noqa: N812
+
+from pybpmn_parser.bpmn.infrastructure.definitions import Definitions
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.element_registry import make_from_kwargs, registry
+from pybpmn_parser.element_view import ElementView, root_view
+from pybpmn_parser.factory import KeyKind, add_references, convert_value, extract_nsmap_from_dict, resolve_key
+
+if TYPE_CHECKING:
+    from pybpmn_parser.parse import ParseContext
+
+
+@dataclass(frozen=True, slots=True)
+class SourceLocation:
+    """Where an element with an ID is found in the source document."""
+
+    line: Optional[int]
+    """The line of the element as reported by `lxml`, where its start tag ends, if known."""
+
+    root_property: str
+    """The property of the definitions that holds the root element containing the element, e.g. `processes`."""
+
+
+def _lazy_property(name: str) -> property:
+    """Create a property that builds the value of a definitions field on first access."""
+
+    def getter(self: LazyDefinitions) -> Any:
+        values = self.__dict__
+        pending = values.get("_pending")
+        if pending and name in pending:
+            values[name] = pending.pop(name)()
+        return values[name]
+
+    def setter(self: LazyDefinitions, value: Any) -> None:
+        values = self.__dict__
+        values[name] = value
+        if pending := values.get("_pending"):
+            pending.pop(name, None)
+
+    return property(getter, setter)
+
+
+class LazyDefinitions(Definitions):
+    """
+    `Definitions` whose root elements are built when they are first accessed.
+
+    Attributes such as `id` and `target_namespace` are available at once. Each property holding root elements,
+    such as `processes`, `collaborations` or `bpmndiagrams`, is built from the source tree the first time it is
+    read, and all its elements are added to the parse context. Assigning a property discards its pending value.
+
+    Comparing, copying or pickling the definitions builds everything first; a lazily parsed document compares
+    equal to the same document parsed eagerly.
+    """
+
+    @property
+    def pending_properties(self) -> list[str]:
+        """The names of the properties that are not built yet."""
+        return list(self.__dict__.get("_pending") or ())
+
+    def build_pending(self) -> None:
+        """Build every property that is not built yet, in document order."""
+        for name in self.pending_properties:
+            getattr(self, name)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Definitions):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(Definitions) if f.compare)
+
+    __hash__ = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        self.build_pending()
+        return {name: value for name, value in self.__dict__.items() if name != "_pending"}
+
+
+for _field in fields(Definitions):
+    setattr(LazyDefinitions, _field.name, _lazy_property(_field.name))
+LazyDefinitions.from_kwargs = classmethod(make_from_kwargs(LazyDefinitions))
+
+
+class LazyElementIndex(Mapping[str, Any]):
+    """
+    The elements of a lazily parsed document by ID.
+
+    Looking up an ID builds the root element containing it, found through the source location index built
+    at parse time. Iterating or taking the length builds the whole document.
+    """
+
+    def __init__(
+        self, definitions: LazyDefinitions, elements_by_id: dict[str, Any], locations: dict[str, SourceLocation]
+    ):
+        """
+        Create the index.
+
+        Args:
+            definitions: The lazily built definitions.
+            elements_by_id: The elements built so far, filled as root elements are built.
+            locations: The source location of every element with an ID.
+        """
+        self.definitions = definitions
+        """The lazily built definitions."""
+
+        self.locations = locations
+        """The source location of every element with an ID, known without building anything."""
+
+        self._elements_by_id = elements_by_id
+
+    def __getitem__(self, element_id: str) -> Any:
+        if element_id not in self._elements_by_id and (location := self.locations.get(element_id)):
+            getattr(self.definitions, location.root_property)
+        return self._elements_by_id[element_id]
+
+    def __contains__(self, element_id: object) -> bool:
+        try:
+            self[element_id]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self.definitions.build_pending()
+        return iter(self._elements_by_id)
+
+    def __len__(self) -> int:
+        self.definitions.build_pending()
+        return len(self._elements_by_id)
+
+
+def _index_locations(value: Any, root_property: str, locations: dict[str, SourceLocation]) -> None:
+    """Record the source location of every element with an ID below the views of a root property."""
+    for view in value if isinstance(value, list) else [value]:
+        if not isinstance(view, ElementView):
+            continue
+        for element in view.element.iter(ET.Element):
+            if (element_id := element.get("id")) is not None:
+                locations[element_id] = SourceLocation(element.sourceline, root_property)
+
+
+def create_lazy_bpmn(
+    root: ET._Element,
+    context: ParseContext,
+    initial_nsmap: Optional[dict[str, str]] = None,
+    release_tree: bool = False,
+) -> tuple[LazyDefinitions, LazyElementIndex]:
+    """
+    Create the definitions shell of an `lxml` tree, deferring its root elements until they are accessed.
+
+    The tree is kept alive until every root element is built. With `release_tree`, each root element is
+    cleared from the tree once it is built, and the tree is freed when the last one is.
+
+    Args:
+        root: The root element of the document, `bpmn:definitions`.
+        context: A ParseContext instance, filled as root elements are built.
+        initial_nsmap: An optional namespace map for resolving prefixed element names.
+        release_tree: Clear each element once its model object is built.
+
+    Returns:
+        The definitions and the index of their elements by ID.
+
+    Raises:
+        ValueError: If the root element is not a BPMN definitions element.
+    """
+    ((key, view),) = root_view(root, release=release_tree).items()
+    nsmap = NAMESPACES.copy()
+    nsmap.update(initial_nsmap or {})
+    element_dict = view.to_dict()
+    ns_map = extract_nsmap_from_dict(element_dict, nsmap)
+    qname = QName.from_str(key, ns_map, default_uri=ns_map.get("default", None))
+    descriptor = registry.by_qname.get(qname)
+    if descriptor is None or descriptor.type is not Definitions:
+        raise ValueError(f"Expected a BPMN definitions root element, but found {key}.")
+
+    item_values: dict[str, Any] = {}
+    pending: dict[str, Callable[[], Any]] = {}
+    locations: dict[str, SourceLocation] = {}
+    for child_key, value in element_dict.items():
+        resolution = resolve_key(child_key, descriptor, ns_map)
+        if resolution.kind is KeyKind.IGNORED:
+            continue
+        if resolution.kind is KeyKind.CHILD:
+            pending[resolution.property_name] = partial(convert_value, resolution, value, qname.uri, context, ns_map)
+            _index_locations(value, resolution.property_name, locations)
+        else:
+            item_values[resolution.property_name] = convert_value(resolution, value, qname.uri, context, ns_map)
+
+    definitions = LazyDefinitions.from_kwargs(**item_values)
+    definitions.__dict__["_pending"] = pending
+    add_references(
+        definitions,
+        [prop for prop in descriptor.properties.values() if prop.property_name not in pending],
+        context,
+    )
+    context.add_element(definitions)
+    if definitions.id is not None:
+        locations[definitions.id] = SourceLocation(root.sourceline, "")
+    return definitions, LazyElementIndex(definitions, context.elements_by_id, locations)
@@ -0,0 +1,225 @@
+"""Load a model back from the plain dicts of `dataclass_to_dict`, or their JSON, without parsing XML again."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from pydantic.alias_generators import to_snake
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.element_registry import ElementDescriptor, element_qname, registry
+from pybpmn_parser.factory import SCALAR_CONVERTER, add_references
+from pybpmn_parser.parse import ParseContext, ParseResult
+from pybpmn_parser.selection import SkippedElement
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+DEFINITIONS = QName(uri=NAMESPACES["bpmn"], local="definitions")
+"""The qualified name of the root element of a document."""
+
+
+@dataclass(frozen=True, slots=True)
+class _Slot:
+    """How the value of one key of an element dict is loaded."""
+
+    property_name: str
+    """The name of the property, or of the extra attribute, the value is stored in."""
+
+    child: Optional[ElementDescriptor]
+    """The descriptor used to build the dicts of the value into elements. Values without one are kept as is."""
+
+
+@dataclass(slots=True)
+class _Frame:
+    """An element dict whose keys are being loaded."""
+
+    descriptor: ElementDescriptor
+    slots: dict[str, _Slot]
+    items: Iterator[tuple[str, Any]]
+    kwargs: dict[str, Any]
+    target: Union[dict, list]
+    """The container the built element is stored in, under `key`."""
+    key: Union[str, int]
+
+
+_PROPERTY_SLOTS: dict[type, dict[str, _Slot]] = {}
+"""The slots of the properties of each element class, for registry version `_PROPERTY_SLOTS_VERSION`."""
+
+_PROPERTY_SLOTS_VERSION = -1
+
+
+def _property_slots(descriptor: ElementDescriptor) -> dict[str, _Slot]:
+    """Work out how each property of an element is loaded, as the factory does for the keys of `xmltodict`."""
+    global _PROPERTY_SLOTS_VERSION  # noqa: PLW0603
+    if registry.version != _PROPERTY_SLOTS_VERSION:
+        _PROPERTY_SLOTS.clear()
+        _PROPERTY_SLOTS_VERSION = registry.version
+    if (slots := _PROPERTY_SLOTS.get(descriptor.type)) is None:
+        slots = _PROPERTY_SLOTS[descriptor.type] = {}
+        for attr_name, prop in descriptor.properties.items():
+            child = None
+            if not prop.is_attr and prop.type not in SCALAR_CONVERTER:
+                child = registry.by_qname.get(prop.type_qname or attr_name)
+            slots[prop.property_name] = _Slot(prop.property_name, child)
+    return slots
+
+
+@lru_cache(maxsize=16)
+def _extension_names(version: int, ns_map: tuple[tuple[str, str], ...]) -> dict[str, ElementDescriptor]:
+    """
+    Map the names extension elements get as extra attributes to their descriptors, for a registry version.
+
+    The factory names extra attributes after the snake-cased `prefix:local` name of their element, or the local
+    name alone for elements in the namespace of their parent, which are mapped under the `("", uri)` prefix.
+    """
+    prefixes: dict[str, list[str]] = {}
+    for prefix, uri in ns_map:
+        prefixes.setdefault(uri, []).append(prefix)
+    return {
+        to_snake(f"{prefix}_{q_name.local}" if prefix else q_name.local): registry.by_qname[q_name]
+        for q_name in registry.by_qname
+        for prefix in prefixes.get(q_name.uri, ())
+    }
+
+
+class _Loader:
+    """Builds elements from their dicts, children first, and records them in a parsing context."""
+
+    def __init__(self, ns_map: Mapping[str, str]) -> None:
+        self.context = ParseContext()
+        self._ns_map = tuple(ns_map.items())
+        self._extras: dict[tuple[str, Optional[str]], _Slot] = {}
+
+    def load(self, data: Mapping[str, Any], descriptor: ElementDescriptor) -> Any:
+        root: list[Any] = [None]
+        stack = [self.frame(data, descriptor, root, 0)]
+        while stack:
+            frame = stack[-1]
+            for key, value in frame.items:
+                if children := self.add(frame, key, value):
+                    stack.extend(reversed(children))
+                    break
+            else:
+                stack.pop()
+                frame.target[frame.key] = self.build(frame)
+        return root[0]
+
+    @staticmethod
+    def frame(
+        data: Mapping[str, Any], descriptor: ElementDescriptor, target: Union[dict, list], key: Union[str, int]
+    ) -> _Frame:
+        return _Frame(descriptor, _property_slots(descriptor), iter(data.items()), {}, target, key)
+
+    def add(self, frame: _Frame, key: str, value: Any) -> list[_Frame]:
+        """Store a value in the keyword arguments of the frame's element, returning the frames of its children."""
+        if (slot := frame.slots.get(key)) is None:
+            slot = self.extra_slot(key, frame.descriptor.q_name.uri)
+        child = slot.child
+        if child is not None and isinstance(value, list):
+            items = frame.kwargs[slot.property_name] = list(value)
+            return [
+                self.frame(item, child, items, index) for index, item in enumerate(value) if isinstance(item, dict)
+            ]
+        frame.kwargs[slot.property_name] = value
+        if child is not None and isinstance(value, dict):
+            return [self.frame(value, child, frame.kwargs, slot.property_name)]
+        return []
+
+    def extra_slot(self, key: str, parent_uri: Optional[str]) -> _Slot:
+        """Return the slot of a key that is not a property, built into an extension element if it names one."""
+        if (slot := self._extras.get((key, parent_uri))) is None:
+            names = _extension_names(registry.version, (*self._ns_map, ("", parent_uri)))
+            slot = self._extras[key, parent_uri] = _Slot(key, names.get(key))
+        return slot
+
+    def build(self, frame: _Frame) -> Any:
+        descriptor = frame.descriptor
+        element = descriptor.type.from_kwargs(**frame.kwargs)
+        add_references(element, descriptor.properties.values(), self.context)
+        self.context.add_element(element)
+        return element
+
+
+def _default_ns_map() -> dict[str, str]:
+    """Load the built-in elements and the default plugins, and return the prefixes they are known by."""
+    import pybpmn_parser.bpmn  # noqa: F401
+    from pybpmn_parser.plugins import load_default_plugins
+    from pybpmn_parser.plugins.moddle import registry as moddle_registry
+
+    load_default_plugins()
+    return {**NAMESPACES, **moddle_registry.namespace_map}
+
+
+def _descriptor(element_type: Union[QName, str, type]) -> ElementDescriptor:
+    if isinstance(element_type, type):
+        element_type = element_qname(element_type)
+    elif isinstance(element_type, str):
+        element_type = QName.from_str(element_type)
+    if (descriptor := registry.by_qname.get(element_type)) is None:
+        raise ValueError(f"No element is registered for {element_type}.")
+    return descriptor
+
+
+def _skipped(data: Mapping[str, Any]) -> SkippedElement:
+    q_name = data["qname"]
+    q_name = QName(**q_name) if isinstance(q_name, dict) else QName.from_str(q_name)
+    return SkippedElement(q_name, data.get("element_id"), data.get("line"))
+
+
+def element_from_dict(
+    data: Mapping[str, Any], element_type: Union[QName, str, type], ns_map: Optional[Mapping[str, str]] = None
+) -> Any:
+    """
+    Build an element and its children from the dict `dataclass_to_dict` made of it.
+
+    See `from_dict`.
+
+    Args:
+        data: The dict of the element.
+        element_type: The class of the element, or its qualified name as a `QName` or in Clark notation.
+        ns_map: The prefixes of the namespaces of extension elements, see `from_dict`.
+
+    Returns:
+        The element.
+
+    Raises:
+        ValueError: If no element is registered for `element_type`.
+    """
+    ns_map = {**_default_ns_map(), **(ns_map or {})}
+    return _Loader(ns_map).load(data, _descriptor(element_type))
+
+
+def from_dict(data: Mapping[str, Any], ns_map: Optional[Mapping[str, str]] = None) -> ParseResult:
+    """
+    Rebuild the result of parsing a document from its dict form, such as the JSON of `write_json`.
+
+    `data` is either the dict `dataclass_to_dict` made of a `ParseResult`, or that of its definitions. Each
+    nested dict is built into the class the registry declares for its property, so the model has the same types
+    as a parsed one as long as no property holds a subclass of its declared type; the dict form does not record
+    the classes. Unknown keys become extra attributes, as in the parser, and the dicts of those named after a
+    registered extension element, such as `zeebe_task_definition`, are built into that element. Enum members must
+    have been converted with `enum_as="value"`, the default; they are loaded as strings, as the parser reads them.
+    Properties left out with `skip_empty` get their defaults, so empty strings come back as None.
+
+    `elements_by_id` and `references` are rebuilt while the model is built; those in `data`, if any, are ignored.
+
+    Args:
+        data: The dict of a `ParseResult`, or of the definitions of a document.
+        ns_map: The prefixes of the namespaces of extension elements, which name their extra attributes. Those of
+            the BPMN namespaces and of the loaded moddle extensions are known.
+
+    Returns:
+        The rebuilt result.
+    """
+    skipped = None
+    if "definition" in data:
+        skipped = [_skipped(item) for item in data.get("skipped") or ()]
+        data = data["definition"]
+    ns_map = {**_default_ns_map(), **(ns_map or {})}
+    loader = _Loader(ns_map)
+    definitions = loader.load(data, registry.by_qname[DEFINITIONS])
+    return ParseResult(definitions, loader.context, skipped=skipped)
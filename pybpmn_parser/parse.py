@@ -1,36 +1,96 @@
 """Parse a BPMN file."""
 
+import copy
+import mmap
+import os
+import threading
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, Optional, Union
 
-import xmltodict
+import lxml.etree as ET  # noqa: N812
 
 from pybpmn_parser.bpmn.infrastructure.definitions import Definitions
 from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.cache import ParseCache, fingerprint
+from pybpmn_parser.core import QName
 from pybpmn_parser.plugins import load_default_plugins
 from pybpmn_parser.plugins.moddle import convert_moddle_registry, load_moddle_file
-from pybpmn_parser.validator import validate
+from pybpmn_parser.plugins.moddle import registry as moddle_registry
+from pybpmn_parser.references import ReferenceIndex
+from pybpmn_parser.selection import DIAGRAM_QNAMES, ElementFilter, SkippedElement
+from pybpmn_parser.validator import (
+    SchemaBackend,
+    ValidationError,
+    ValidationLevel,
+    ValidationResult,
+    XMLBuffer,
+    parse_xml,
+    parse_xml_bytes,
+    parse_xml_file,
+    validate_element,
+)
 
 if TYPE_CHECKING:
     from pybpmn_parser.element_registry import ElementDescriptor
+    from pybpmn_parser.flow_graph import FlowGraph
+    from pybpmn_parser.incremental import DocumentDigests
+    from pybpmn_parser.pool import ParseOutcome
 
 
 class ParseResult:
     """Result for parsing a BPMN file."""
 
-    def __init__(self, definitions: Definitions, context: "ParseContext") -> None:
+    def __init__(
+        self,
+        definitions: Definitions,
+        context: "ParseContext",
+        elements_by_id: Optional[Mapping[str, Any]] = None,
+        skipped: Optional[list["SkippedElement"]] = None,
+    ) -> None:
         self.definition = definitions
-        self.elements_by_id: dict[str, ElementDescriptor] = context.elements_by_id
+        self.elements_by_id: Mapping[str, ElementDescriptor] = (
+            context.elements_by_id if elements_by_id is None else elements_by_id
+        )
         self.references: list[Reference] = context.references
+        self.skipped: list[SkippedElement] = skipped or []
+        """The subtrees dropped by the parser's element filter."""
+        self.digests: Optional[DocumentDigests] = None
+        """The digests of the document's subtrees, recorded by `Parser.reparse` to find what a new version changes."""
+
+    @cached_property
+    def reference_index(self) -> ReferenceIndex:
+        """
+        The references between the elements, resolved to handles and indexed in both directions.
+
+        The index is built on first access, in time linear in the number of references. A lazily parsed document
+        is built completely first, as the references of the pending elements are not known yet.
+        """
+        from pybpmn_parser.lazy import LazyDefinitions
+
+        if isinstance(self.definition, LazyDefinitions):
+            self.definition.build_pending()
+        return ReferenceIndex(self.references, self.elements_by_id)
+
+    @cached_property
+    def flow_graphs(self) -> dict[Optional[str], "FlowGraph"]:
+        """
+        The flow graph of each process, by process ID, built on first access.
+
+        See `pybpmn_parser.flow_graph.FlowGraph` for the adjacency queries and the CSR arrays.
+        """
+        from pybpmn_parser.flow_graph import flow_graphs
+
+        return flow_graphs(self.definition.processes)
 
 
 @dataclass
 class Reference:
     """A reference to an element that has not been fully processed yet."""
 
-    element_id: str
-    """The ID of the element that containing the reference."""
+    element_id: Optional[str]
+    """The ID of the element containing the reference. None for elements without an ID, such as labels."""
 
     property: str
     """The property on the element that contains the reference."""
@@ -39,16 +99,36 @@ class Reference:
     """The id of the reference."""
 
 
+class ParseCancelledError(Exception):
+    """Parsing was stopped because its cancel event was set."""
+
+
 class ParseContext:
     """Context for parsing BPMN elements from XML dictionaries."""
 
-    def __init__(self):
+    def __init__(self, cancel_event: Optional[threading.Event] = None):
         self.elements_by_id: dict[str, Any] = {}
         """A mapping from element ID to element instance."""
 
         self.references: list[Reference] = []
         """A list of unresolved references."""
 
+        self.cancel_event = cancel_event
+        """When set by another thread, building stops before the next element."""
+
+        self.prebuilt: dict[Any, Any] = {}
+        """Model objects to use instead of building the subtrees of these `lxml` elements, see `Parser.reparse`."""
+
+    def check_cancelled(self) -> None:
+        """
+        Stop parsing if the cancel event is set.
+
+        Raises:
+            ParseCancelledError: If the cancel event is set.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ParseCancelledError("Parsing was cancelled.")
+
     def add_reference(self, reference: Reference) -> None:
         """Add an unresolved reference."""
         self.references.append(reference)
@@ -62,7 +142,70 @@ class ParseContext:
 class Parser:
     """A parser for BPMN files."""
 
-    def __init__(self, moddle_extensions: Optional[list[Path]] = None, ns_map: Optional[dict[str, str]] = None):
+    def __init__(
+        self,
+        moddle_extensions: Optional[list[Path]] = None,
+        ns_map: Optional[dict[str, str]] = None,
+        lazy: bool = False,
+        include: Optional[Iterable[Union[QName, str]]] = None,
+        exclude: Optional[Iterable[Union[QName, str]]] = None,
+        skip_diagrams: bool = False,
+        validation: Union[ValidationLevel, str] = ValidationLevel.SCHEMA,
+        cache: Optional[ParseCache] = None,
+        schema_backend: Union[SchemaBackend, str] = SchemaBackend.XMLSCHEMA,
+    ):
+        """
+        Create a parser.
+
+        Args:
+            moddle_extensions: Moddle extension files to load.
+            ns_map: Additional namespace prefixes.
+            lazy: Build only the definitions and a source location index of the element IDs when parsing.
+                Each root element (process, collaboration, diagram, ...) is built when its property is first
+                read, and `ParseResult.elements_by_id` builds the root element holding an ID when it is looked up.
+                References are collected as root elements are built. `parse_stream` is never lazy.
+            include: The names of the elements to build, as `QName`s, `{uri}local` or `prefix:local` strings,
+                where `*` matches any local name or URI. Their subtrees and ancestors are built, and every other
+                subtree is dropped. Everything is built if omitted.
+            exclude: The names of the elements whose subtrees are dropped, e.g. `camunda:*` for a vendor's
+                extensions.
+            skip_diagrams: Drop the diagram interchange part of the documents (`bpmndi:BPMNDiagram`).
+            validation: The checks run before the model is built: `"schema"` for the BPMN 2.0 schema and the
+                structural checks, `"structural"` for the element IDs and sequence flow references only, or
+                `"off"` for documents that were validated before. Malformed XML is always rejected.
+            cache: A cache for the results of `parse_file`, `parse_fileobj`, `parse_bytes` and `parse_string`.
+                A hit skips all XML work. Results are keyed by the document and `fingerprint`, so a cache can be
+                shared by parsers with different options. Lazy results are fully built when they are stored.
+            schema_backend: The implementation of the schema check: `"xmlschema"`, in pure Python, or `"lxml"`,
+                which checks documents in C with `libxml2` and only uses `xmlschema` to describe the errors of
+                invalid documents.
+
+        Filtered subtrees are removed from the `lxml` tree after validation, before any model object is built,
+        and reported in `ParseResult.skipped`. `parse_stream` drops them while it reads the document.
+
+        Raises:
+            ValueError: If a filter name uses an unknown prefix, `validation` is not a validation level, or
+                `schema_backend` is not a schema backend.
+        """
+        include = None if include is None else tuple(include)
+        exclude = None if exclude is None else tuple(exclude)
+        self.options: dict[str, Any] = {
+            "moddle_extensions": moddle_extensions,
+            "ns_map": ns_map,
+            "lazy": lazy,
+            "include": include,
+            "exclude": exclude,
+            "skip_diagrams": skip_diagrams,
+            "validation": validation,
+            "cache": cache,
+            "schema_backend": schema_backend,
+        }
+        """The arguments the parser was created with, to create the same parser in another process."""
+        self.lazy = lazy
+        self.validation = ValidationLevel(validation)
+        """The checks run before the model is built."""
+        self.schema_backend = SchemaBackend(schema_backend)
+        """The implementation of the schema check."""
         load_default_plugins()
         self.ns_map = NAMESPACES.copy()
         if ns_map:
@@ -71,40 +214,269 @@ class Parser:
         for extension_path in self.moddle_extensions:
             load_moddle_file(extension_path)
         convert_moddle_registry()
+        if skip_diagrams:
+            exclude = [*(exclude or ()), *DIAGRAM_QNAMES]
+        self.element_filter: Optional[ElementFilter] = None
+        """The filter applied to documents before the model is built, if any."""
+        if include is not None or exclude:
+            # Filters may name vendor elements by the prefix of their moddle package.
+            self.element_filter = ElementFilter(include, exclude, {**moddle_registry.namespace_map, **self.ns_map})
 
-    def parse_file(self, xml_file: Path) -> ParseResult:
+        self.cache = cache
+        """The cache of parse results, if any."""
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """A digest of the loaded moddle packages and the parser options, part of every cache key."""
+        return fingerprint(
+            moddle_registry.packages,
+            [
+                sorted(self.ns_map.items()),
+                self.lazy,
+                self.validation,
+                self.schema_backend,
+                self.element_filter and (self.element_filter.include, self.element_filter.exclude),
+            ],
+        )
+
+    def parse_file(self, xml_file: Path, memory_map: bool = False) -> ParseResult:
         """
         Parse a BPMN XML file into internal representation.
 
+        The raw bytes are handed to `lxml`, so the encoding declared by the document is honored.
+
         Args:
             xml_file: The path to a BPMN XML file
+            memory_map: Map the file into memory and parse the mapping directly instead of reading
+                the file in chunks. This avoids any copy of the document on large files.
 
         Returns:
             Definitions object
         """
-        xml = xml_file.read_text(encoding="utf-8")
-        return self.parse_string(xml)
+        with open(xml_file, "rb") as f:
+            if not memory_map or not os.fstat(f.fileno()).st_size:
+                return self.parse_fileobj(f)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return self.parse_bytes(buffer)
+
+    def parse_fileobj(self, xml_file: IO[bytes], *, cancel_event: Optional[threading.Event] = None) -> ParseResult:
+        """
+        Parse a BPMN XML document from a binary file object into internal representation.
+
+        Args:
+            xml_file: A file object opened in binary mode
+            cancel_event: When set by another thread, building stops before the next element
+                with `ParseCancelledError`.
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        return self._parse_source(parse_xml_file, xml_file, cancel_event)
+
+    def parse_bytes(self, xml_bytes: XMLBuffer, *, cancel_event: Optional[threading.Event] = None) -> ParseResult:
+        """
+        Parse raw BPMN XML data into internal representation.
 
-    def parse_string(self, xml_str: str) -> ParseResult:
+        The data is not decoded first, so the encoding declared by the document is honored.
+
+        Args:
+            xml_bytes: The BPMN XML document as `bytes` or any object supporting the buffer protocol, such as `mmap`
+            cancel_event: When set by another thread, building stops before the next element
+                with `ParseCancelledError`.
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        return self._parse_source(parse_xml_bytes, xml_bytes, cancel_event)
+
+    def parse_string(self, xml_str: str, *, cancel_event: Optional[threading.Event] = None) -> ParseResult:
         """
         Parse a BPMN XML string into internal representation.
 
+        The string is tokenized once; the resulting `lxml` tree is shared by validation and model building.
+        Prefer `parse_bytes` or `parse_file` when the document is not already a string.
+
         Args:
             xml_str: A BPMN XML string
+            cancel_event: When set by another thread, building stops before the next element
+                with `ParseCancelledError`.
 
         Returns:
             Dictionary containing parsed nodes and flows
         """
-        from pybpmn_parser.factory import create_bpmn
+        return self._parse_source(parse_xml, xml_str, cancel_event)
+
+    def validate(
+        self, xml: Union[str, XMLBuffer], *, cancel_event: Optional[threading.Event] = None
+    ) -> ValidationResult:
+        """
+        Validate a BPMN XML document with the parser's validation level and schema backend, without building it.
+
+        Args:
+            xml: The BPMN XML document, as a string or raw data
+            cancel_event: When set by another thread, the document is not validated once it is read.
+
+        Returns:
+            ValidationResult containing validation status and any errors
+
+        Raises:
+            ParseCancelledError: If the cancel event is set.
+        """
+        try:
+            root = parse_xml(xml) if isinstance(xml, str) else parse_xml_bytes(xml)
+        except ValidationError as error:
+            return ValidationResult([error])
+        ParseContext(cancel_event).check_cancelled()
+        return validate_element(root, self.validation, self.schema_backend)
+
+    def reparse(self, previous: Optional[ParseResult], xml: Union[str, XMLBuffer]) -> ParseResult:
+        """
+        Parse a new version of a document, rebuilding only the parts that changed since `previous` was parsed.
+
+        The subtrees of the root elements, of the flow elements and of the diagram elements are digested and
+        compared with those of the previous version. Unchanged subtrees keep their model objects; only the changed
+        ones are validated and built, so the cost of a small edit hardly depends on the size of the document.
+
+        `previous` is updated in place: its definitions, `elements_by_id`, `references`, `skipped` and the indexes
+        already built from them (`reference_index`, `flow_graphs`) describe the new version afterward. The model
+        objects of the previous version are not modified, so its definitions stay valid for as long as they are
+        referenced elsewhere.
+
+        Only results of `reparse` carry the digests to compare with. Pass None, or a result from another method,
+        to build the whole document and record them; so does a result from a parser with other options.
+
+        Reused subtrees are whole model objects, so a lazy parser cannot reparse: create it with `lazy=False`.
+
+        Args:
+            previous: The result of parsing the previous version with `reparse`, or None.
+            xml: The new version, as a string or raw XML data.
+
+        Returns:
+            The result of the new version: `previous` itself, updated, unless it was None.
+
+        Raises:
+            ValidationError: If the new version is not well-formed or a changed part is invalid. `previous` is
+                left unchanged then.
+            ValueError: If the parser is lazy.
+        """
+        from pybpmn_parser.incremental import reparse_tree
+
+        try:
+            root = parse_xml(xml) if isinstance(xml, str) else parse_xml_bytes(xml)
+        except ValidationError as error:
+            ValidationResult([error]).raise_for_errors()
+        return reparse_tree(self, previous, root)
+
+    def parse_many(
+        self, paths: Iterable[Union[str, Path]], workers: Optional[int] = None, ordered: bool = True
+    ) -> Iterator["ParseOutcome"]:
+        """
+        Parse many BPMN files in parallel worker processes.
+
+        Each worker creates a parser with the same options as this one, see `options`.
+        Use `ParserPool` directly to reuse the workers across batches.
+
+        Args:
+            paths: The files to parse
+            workers: The number of worker processes. Defaults to the number of CPUs.
+            ordered: Yield the outcomes in the order of `paths` instead of as soon as they are available
+
+        Yields:
+            One `ParseOutcome` per path, holding either the parse result or the error
+        """
+        from pybpmn_parser.pool import ParserPool
+
+        with ParserPool(workers, **self.options) as pool:
+            yield from pool.imap(paths) if ordered else pool.imap_unordered(paths)
+
+    def parse_stream(self, source: Union[Path, IO[bytes]]) -> ParseResult:
+        """
+        Parse a BPMN document incrementally, building the model while the document is read.
+
+        Finished elements are discarded as soon as their model object exists, so peak memory grows with the
+        nesting depth of the document instead of its size. Schema validation needs the whole document,
+        so the document is only checked for well-formedness.
+
+        Subtrees dropped by the filters are cleared as they are read and never built. An element outside `include`
+        is held until its end, to find out whether it contains an included element.
+
+        Args:
+            source: The path to a BPMN XML file, or a binary file object
 
-        # Validate XML first
-        validation_result = validate(xml_str)
-        for error in validation_result.errors:
-            print(error)
-        validation_result.raise_for_errors()
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        from pybpmn_parser.streaming import iterparse_bpmn
 
-        # Parse root element
-        root = xmltodict.parse(xml_str)
         context = ParseContext()
-        definition_element = create_bpmn(root, context, self.ns_map)
-        return ParseResult(definition_element, context)
+        skipped: list[SkippedElement] = []
+        try:
+            definition_element = iterparse_bpmn(source, context, self.ns_map, self.element_filter, skipped)
+        except ET.XMLSyntaxError as e:
+            ValidationResult([ValidationError("XML_PARSE_ERROR", str(e))]).raise_for_errors()
+        return ParseResult(definition_element, context, skipped=skipped)
+
+    def parse_element(self, root: "ET._Element") -> ParseResult:
+        """
+        Parse an already parsed BPMN document into internal representation.
+
+        Use this when you already hold an `lxml` tree, for example after running your own XSLT or XPath over it.
+
+        Args:
+            root: The root element (`bpmn:definitions`) of an `lxml` tree
+
+        Returns:
+            The parsed BPMN definitions and the elements indexed by ID
+        """
+        return self._parse_tree(root, release_tree=False)
+
+    def _parse_source(
+        self,
+        parse_func: Callable[[Any], "ET._Element"],
+        source: Any,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> ParseResult:
+        """Parse a source into a tree the parser owns, then build the model from it, going through the cache."""
+        cache_key = None
+        if self.cache is not None:
+            if parse_func is parse_xml_file:
+                parse_func, source = parse_xml_bytes, source.read()
+            data = source.encode("utf-8") if isinstance(source, str) else source
+            cache_key = self.cache.key(data, self.fingerprint)
+            if (result := self.cache.get(cache_key)) is not None:
+                return result
+
+        try:
+            root = parse_func(source)
+        except ValidationError as error:
+            ValidationResult([error]).raise_for_errors()
+        result = self._parse_tree(root, release_tree=True, cancel_event=cancel_event)
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        return result
+
+    def _parse_tree(
+        self, root: "ET._Element", release_tree: bool, cancel_event: Optional[threading.Event] = None
+    ) -> ParseResult:
+        """Validate a tree and build the model from it, optionally clearing the tree as it goes."""
+        validate_element(root, self.validation, self.schema_backend).raise_for_errors()
+
+        skipped = []
+        if self.element_filter is not None:
+            if not release_tree:
+                # Never modify a tree the caller owns.
+                root = copy.deepcopy(root)
+            skipped = self.element_filter.prune(root)
+
+        context = ParseContext(cancel_event)
+        context.check_cancelled()
+        if self.lazy:
+            from pybpmn_parser.lazy import create_lazy_bpmn
+
+            definitions, elements_by_id = create_lazy_bpmn(root, context, self.ns_map, release_tree=release_tree)
+            return ParseResult(definitions, context, elements_by_id, skipped)
+
+        from pybpmn_parser.factory import create_bpmn_from_element
+
+        definition_element = create_bpmn_from_element(root, context, self.ns_map, release_tree=release_tree)
+        return ParseResult(definition_element, context, skipped=skipped)
@@ -8,22 +8,36 @@ def load_default_plugins() -> None:
     Loads and registers the default plugins used by the application.
 
     Note:
-        For best results, the `pybpmn_parser.bpmn.load_classes` function should be called before this.
+        The `pybpmn_parser.bpmn` package must be imported before this. The element classes the plugins extend
+        are imported as they are needed.
 
     This function reads the default plugin definitions from resources, parses
     them into Moddle package configurations, and registers these packages in
     the global registry. After registering the plugins, the Moddle registry is
     converted to its final usable state.
+
+    Calling it again does nothing. The first call in a process restores the registries from a snapshot written
+    by an earlier process, if the plugin files and the library version are unchanged; see
+    `pybpmn_parser.plugins.snapshot`.
     """
-    import json
     from importlib.resources import files
 
-    from .moddle import ModdlePackage, convert_moddle_registry, registry
+    from .moddle import convert_moddle_registry, load_moddle_source, registry
+    from .snapshot import RegistrySnapshot, load_snapshot, save_snapshot, snapshot_key
 
-    plugin_files = files("pybpmn_parser.plugins.moddle_models")
-    for plugin in DEFAULT_PLUGINS:
-        extension_contents = json.loads(plugin_files.joinpath(plugin).read_text(encoding="utf-8"))
-        pkg = ModdlePackage(**extension_contents)
-        registry.register_package(pkg)
+    sources = [f"{__name__}.moddle_models/{plugin}" for plugin in DEFAULT_PLUGINS]
+    if all(source in registry.sources for source in sources):
+        return
 
-    convert_moddle_registry()
+    plugin_files = files("pybpmn_parser.plugins.moddle_models")
+    contents = [plugin_files.joinpath(plugin).read_bytes() for plugin in DEFAULT_PLUGINS]
+    # Only a registry without any package can be restored.
+    key = None if registry.packages else snapshot_key(zip(sources, contents, strict=True))
+    if key is not None and (snapshot := load_snapshot(key)) is not None and snapshot.restore():
+        return
+
+    for source, extension_contents in zip(sources, contents, strict=True):
+        load_moddle_source(source, extension_contents)
+    specs = convert_moddle_registry()
+    if key is not None:
+        save_snapshot(key, RegistrySnapshot.capture(specs))
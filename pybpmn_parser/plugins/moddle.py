@@ -7,7 +7,7 @@ from enum import EnumType, StrEnum
 from graphlib import TopologicalSorter
 from itertools import chain
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 from pydantic.alias_generators import to_snake
 
@@ -71,6 +71,12 @@ class ModdleRegistry:
         self.type_map: dict[QName, ModdleType | EnumType] = {}
         """Mapping of type names to their extension parser class."""
 
+        self.sources: dict[str, ModdlePackage] = {}
+        """The packages loaded from files, by source name, so loading a file again is free."""
+
+        self.converted_packages = 0
+        """The number of `packages` whose types were converted into element classes."""
+
     def _type_is_registered(self, type_q_name: QName) -> bool:
         """Check if a type is registered."""
         if type_q_name in self.type_map:
@@ -160,13 +166,24 @@ def filter_package_types(package: ModdlePackage) -> list[ModdleType]:
     return valid_types
 
 
-def convert_moddle_registry() -> None:
-    """Register all Moddle extension types."""
+def convert_moddle_registry() -> list["ElementSpec"]:
+    """
+    Register the element classes of the Moddle packages registered since the last call.
+
+    Types converted by an earlier call are skipped, so calling this again is cheap.
+
+    Returns:
+        The specifications of the registered classes, in registration order.
+    """
+    pending_packages = registry.packages[registry.converted_packages :]
+    if not pending_packages:
+        return []
     type_order = registry.dependency_tree()
     filtered_types = {
-        typ_.normalized_name for typ_ in chain.from_iterable([filter_package_types(pkg) for pkg in registry.packages])
+        typ_.normalized_name for typ_ in chain.from_iterable([filter_package_types(pkg) for pkg in pending_packages])
     }
 
+    specs = []
     for moddle_type_name in type_order:
         if moddle_type_name not in filtered_types:
             continue
@@ -176,8 +193,11 @@ def convert_moddle_registry() -> None:
 
         moddle_type = registry.get_type(moddle_type_name)
         if isinstance(moddle_type, ModdleType):
-            parser = convert_moddle_to_element(moddle_type)
-            register_element(parser)
+            spec = element_spec(moddle_type)
+            register_element(element_from_spec(spec))
+            specs.append(spec)
+    registry.converted_packages = len(registry.packages)
+    return specs
 
 
 @dataclass
@@ -189,50 +209,156 @@ class DataclassField:
     field: Field
 
 
-def convert_moddle_to_element(definition: ModdleType) -> type:
+@dataclass(frozen=True)
+class FieldSpec:
+    """A field of a generated element class, described without references to classes."""
+
+    name: str
+    """The attribute name."""
+
+    type_ref: Union[str, QName]
+    """The name of a type in `BUILTIN_TYPES`, or the qualified name of a registered element."""
+
+    is_many: bool
+    """Whether the field holds a list."""
+
+    default: Any
+    """The default value."""
+
+    metadata: dict[str, str]
+    """The dataclass field metadata: the XML name and whether it is an attribute or an element."""
+
+    def type_hint(self) -> Any:
+        """Resolve the type of the field against the element registry."""
+        if isinstance(self.type_ref, str):
+            type_hint = BUILTIN_TYPES[self.type_ref]
+        else:
+            type_hint = element_registry.by_qname[self.type_ref].type
+        if self.is_many:
+            type_hint = List[type_hint]  # type: ignore[valid-type]
+        return Optional[type_hint]
+
+    def to_dataclass_field(self) -> DataclassField:
+        """Create the dataclass field."""
+        return DataclassField(
+            name=self.name, type=self.type_hint(), field=field(default=self.default, metadata=self.metadata)
+        )
+
+
+@dataclass(frozen=True)
+class ElementSpec:
     """
-    Create an Element dataclass model for a Moddle extension type.
+    Everything needed to generate the element class of a Moddle type.
+
+    Unlike the class, a specification can be pickled: the base classes and field types are referenced by qualified
+    name and resolved against the element registry when the class is created.
+    """
+
+    name: str
+    """The class name."""
+
+    q_name: QName
+    """The qualified name the class is registered under."""
+
+    bases: tuple[QName, ...]
+    """The qualified names of the base classes."""
+
+    fields: tuple[FieldSpec, ...]
+    """The fields declared by the class."""
+
+    def references(self) -> set[QName]:
+        """The qualified names of the registered elements this specification needs."""
+        return set(self.bases) | {fld.type_ref for fld in self.fields if isinstance(fld.type_ref, QName)}
+
+
+def element_spec(definition: ModdleType) -> ElementSpec:
+    """
+    Describe the element class of a Moddle extension type.
 
     Args:
         definition: ModdlePlugin definition
 
     Returns:
-        A dynamically created dataclass model
+        The specification of the class
     """
     cls_tag = lower_first_char(definition.tag) if definition.package.use_lowercase else definition.tag
-    ns_uri = definition.normalized_name.uri
-    cls_name = definition.name
-    base_classes = get_parser_base_classes(definition) or ()
-    meta_class = type("Meta", (), {"namespace": ns_uri, "name": cls_tag})
+    return ElementSpec(
+        name=definition.name,
+        q_name=QName(local=cls_tag, uri=definition.normalized_name.uri),
+        bases=tuple(get_parser_base_qnames(definition)),
+        fields=tuple(moddle_field_specs(definition)),
+    )
+
 
-    dataclass_fields = convert_moddle_properties(definition)
-    dc_fields_as_tuple = [(dc.name, dc.type, dc.field) for dc in dataclass_fields]
+def element_from_spec(spec: ElementSpec) -> type:
+    """
+    Create the element dataclass described by a specification.
+
+    Args:
+        spec: The specification, from `element_spec`.
+
+    Returns:
+        A dynamically created dataclass model
+    """
+    base_classes = tuple(element_registry.by_qname[base].type for base in spec.bases)
+    meta_class = type("Meta", (), {"namespace": spec.q_name.uri, "name": spec.q_name.local})
+    # A docstring spares `dataclass` from computing one with `inspect.signature`.
+    doc = f"The `{spec.q_name}` element, generated from its Moddle type."
+    dc_fields_as_tuple = [(dc.name, dc.type, dc.field) for dc in map(FieldSpec.to_dataclass_field, spec.fields)]
     return make_dataclass(
-        cls_name, dc_fields_as_tuple, bases=base_classes, namespace={"Meta": meta_class}, kw_only=True
+        spec.name, dc_fields_as_tuple, bases=base_classes, namespace={"Meta": meta_class, "__doc__": doc}, kw_only=True
     )
 
 
+def convert_moddle_to_element(definition: ModdleType) -> type:
+    """
+    Create an Element dataclass model for a Moddle extension type.
+
+    Args:
+        definition: ModdlePlugin definition
+
+    Returns:
+        A dynamically created dataclass model
+    """
+    return element_from_spec(element_spec(definition))
+
+
 def convert_moddle_properties(definition: ModdleType) -> list[DataclassField]:
     """
     Converts a Moddle definition's properties into corresponding dataclass fields.
 
+    Args:
+        definition: The Moddle definition containing properties to be processed.
+
+    Returns:
+        A list of dataclass field representations corresponding to the Moddle definition's properties.
+
+    Raises:
+        ValueError: If a field has an unknown or unresolved type or any unsupported format.
+    """
+    return [spec.to_dataclass_field() for spec in moddle_field_specs(definition)]
+
+
+def moddle_field_specs(definition: ModdleType) -> list[FieldSpec]:
+    """
+    Describe the dataclass fields of a Moddle definition's properties.
+
     This function processes the properties of a given ModdleType definition. It validates
     type information, detects circular references, and resolves field types based on the
     provided element registry. Depending on the property type (attributes, elements, or
-    text body), it constructs the appropriate dataclass field representation. If an
+    text body), it constructs the appropriate field specification. If an
     unknown field type or mismatched references are encountered, an error is raised.
-    The resulting fields are useful for creating dataclass representations from Moddle definitions.
 
     Args:
         definition: The Moddle definition containing properties to be processed.
 
     Returns:
-        A list of dataclass field representations corresponding to the Moddle definition's properties.
+        A list of field specifications corresponding to the Moddle definition's properties.
 
     Raises:
         ValueError: If a field has an unknown or unresolved type or any unsupported format.
     """
-    dataclass_fields: list[DataclassField] = []
+    field_specs: list[FieldSpec] = []
 
     for fld in definition.properties:
         is_builtin = fld.normalized_type.local in BUILTIN_TYPES
@@ -249,61 +375,61 @@ def convert_moddle_properties(definition: ModdleType) -> list[DataclassField]:
         if not is_builtin and missing_type and not fld.is_reference:
             raise ValueError(f"Unknown field type: {fld.normalized_type}")
 
-        type_hint = get_property_type_hint(fld)
+        type_ref = get_property_type_ref(fld)
         fld_name = get_valid_name(fld.name)
+        is_many = fld.is_many and not fld.is_attr and not fld.is_reference
 
         if fld.is_attr:
-            field_def = DataclassField(
-                name=fld_name,
-                type=Optional[type_hint],
-                field=field(default=fld.default, metadata={"name": fld.name, "type": "Attribute"}),
-            )
+            metadata = {"name": fld.name, "type": "Attribute"}
         elif not fld.is_body and not fld.is_virtual:
             metadata_name = fld.normalized_type.local if fld.name != fld.normalized_type.local else fld.name
             metadata_name = lower_first_char(metadata_name) if definition.package.use_lowercase else metadata_name
-            field_def = DataclassField(
-                name=fld_name,
-                type=Optional[type_hint],
-                field=field(default=fld.default, metadata={"name": metadata_name, "type": "Element"}),
-            )
+            metadata = {"name": metadata_name, "type": "Element"}
         elif fld.is_body:
-            field_def = DataclassField(
-                name=fld_name,
-                type=Optional[type_hint],
-                field=field(default=fld.default, metadata={"name": "#text", "type": "Element"}),
-            )
+            metadata = {"name": "#text", "type": "Element"}
         else:
-            raise ValueError(f"Unknown field type: {fld.type} ({type_hint}) for {fld.name}")
+            raise ValueError(f"Unknown field type: {fld.type} ({type_ref}) for {fld.name}")
 
-        dataclass_fields.append(field_def)
-    return dataclass_fields
+        field_specs.append(
+            FieldSpec(name=fld_name, type_ref=type_ref, is_many=is_many, default=fld.default, metadata=metadata)
+        )
+    return field_specs
 
 
-def get_property_type_hint(fld: TypeProperty) -> type:
+def get_property_type_ref(fld: TypeProperty) -> Union[str, QName]:
     """
-    Returns the appropriate type for a field based on its properties and the available types.
+    Returns the base type of a field: the name of a built-in type or the qualified name of a registered element.
 
     Args:
         fld: PluginProperty object representing the field.
 
     Returns:
-        The appropriate type hint for the field
+        A key of `BUILTIN_TYPES` or a key of the element registry
     """
     if fld.is_reference:
-        return str
+        return "String"
 
     if fld.normalized_type.local in BUILTIN_TYPES:
-        type_hint = BUILTIN_TYPES[fld.normalized_type.local]
-    elif fld.normalized_type in element_registry.by_qname:
-        type_hint = element_registry.by_qname[fld.normalized_type].type
-    else:
-        true_type = QName(local=lower_first_char(fld.normalized_type.local), uri=fld.normalized_type.uri)
-        type_hint = element_registry.by_qname[true_type].type
+        return fld.normalized_type.local
+    if fld.normalized_type in element_registry.by_qname:
+        return fld.normalized_type
+    return QName(local=lower_first_char(fld.normalized_type.local), uri=fld.normalized_type.uri)
+
+
+def get_property_type_hint(fld: TypeProperty) -> type:
+    """
+    Returns the appropriate type for a field based on its properties and the available types.
 
-    if fld.is_attr:
-        return type_hint
+    Args:
+        fld: PluginProperty object representing the field.
+
+    Returns:
+        The appropriate type hint for the field
+    """
+    type_ref = get_property_type_ref(fld)
+    type_hint = BUILTIN_TYPES[type_ref] if isinstance(type_ref, str) else element_registry.by_qname[type_ref].type
 
-    if fld.is_many:
+    if fld.is_many and not fld.is_attr and not fld.is_reference:
         type_hint = List[type_hint]  # type: ignore[valid-type]
 
     return type_hint
@@ -313,6 +439,13 @@ def get_parser_base_classes(moddle_type: ModdleType) -> tuple[type, ...] | None:
     """Figure out the base classes for a Moddle extension type."""
     if not moddle_type.superClass:
         return None
+    return tuple(element_registry.by_qname[super_class].type for super_class in get_parser_base_qnames(moddle_type))
+
+
+def get_parser_base_qnames(moddle_type: ModdleType) -> list[QName]:
+    """Figure out the qualified names of the registered base classes for a Moddle extension type."""
+    if not moddle_type.superClass:
+        return []
 
     super_classes = filter_ignorable_superclasses(moddle_type.normalized_superclass)
     missing_classes = {class_name for class_name in super_classes if class_name not in element_registry.by_qname}
@@ -329,7 +462,7 @@ def get_parser_base_classes(moddle_type: ModdleType) -> tuple[type, ...] | None:
     if final_missing_classes:
         raise ValueError(f"Unknown super class(es): {','.join(map(str, missing_classes))}")
 
-    return tuple(element_registry.by_qname[super_class].type for super_class in super_classes)
+    return super_classes
 
 
 def filter_ignorable_superclasses(super_classes: list[QName]) -> list[QName]:
@@ -346,8 +479,25 @@ def get_valid_name(name: str) -> str:
 
 
 def load_moddle_file(file_path: Path) -> ModdlePackage:
-    """Read a Moddle extension JSON file."""
-    extension_contents = json.loads(file_path.read_text(encoding="utf-8"))
-    pkg = ModdlePackage(**extension_contents)
+    """Read a Moddle extension JSON file. A file that was loaded before is not read again."""
+    source = str(file_path.resolve())
+    if source not in registry.sources:
+        load_moddle_source(source, file_path.read_bytes())
+    return registry.sources[source]
+
+
+def load_moddle_source(source: str, contents: bytes | str) -> ModdlePackage:
+    """
+    Register the Moddle package of a JSON document.
+
+    Args:
+        source: The name the package is recorded under in `registry.sources`.
+        contents: The JSON document.
+
+    Returns:
+        The package.
+    """
+    pkg = ModdlePackage(**json.loads(contents))
     registry.register_package(pkg)
+    registry.sources[source] = pkg
     return pkg
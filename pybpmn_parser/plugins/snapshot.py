@@ -0,0 +1,149 @@
+"""A snapshot of the registries after the default plugins are loaded, to skip that work in later processes."""
+
+from __future__ import annotations
+
+import hashlib
+import pickle  # noqa: S403
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import pydantic
+
+import pybpmn_parser
+from pybpmn_parser.cache import read_verified, user_cache_directory, write_verified
+from pybpmn_parser.element_registry import register_element
+from pybpmn_parser.element_registry import registry as element_registry
+from pybpmn_parser.plugins.moddle import ElementSpec, element_from_spec
+from pybpmn_parser.plugins.moddle import registry as moddle_registry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from pybpmn_parser.core import QName
+    from pybpmn_parser.element_registry import ElementProperty
+
+SNAPSHOT_FORMAT = 3
+"""The version of the snapshot layout, part of every key."""
+
+MAX_SNAPSHOTS = 8
+"""The number of snapshot files kept, for different library versions or plugin files."""
+
+
+def snapshot_directory() -> Optional[Path]:
+    """Return the directory of the snapshot files, see `pybpmn_parser.cache.user_cache_directory`."""
+    return user_cache_directory()
+
+
+def snapshot_key(sources: Iterable[tuple[str, bytes]]) -> str:
+    """
+    Return the key of the snapshot taken after loading some plugin files.
+
+    Args:
+        sources: The name and contents of each plugin file, in loading order.
+
+    Returns:
+        A hexadecimal digest of the files, the library version and the versions the pickled objects depend on.
+    """
+    digest = hashlib.sha256(
+        f"{SNAPSHOT_FORMAT}:{pybpmn_parser.__version__}:{pydantic.VERSION}:{sys.version_info[:2]}".encode()
+    )
+    for name, contents in sources:
+        digest.update(name.encode())
+        digest.update(hashlib.sha256(contents).digest())
+    return digest.hexdigest()
+
+
+@dataclass
+class RegistrySnapshot:
+    """The state the plugins added to the Moddle registry, and how to recreate the element classes they generated."""
+
+    moddle_state: dict[str, Any]
+    """The attributes of the Moddle registry: the packages and their normalized types."""
+
+    elements: list[tuple[ElementSpec, dict[QName, ElementProperty]]]
+    """The specification and registry properties of each generated class, in registration order."""
+
+    @classmethod
+    def capture(cls, specs: Iterable[ElementSpec]) -> RegistrySnapshot:
+        """
+        Take a snapshot of the registries.
+
+        Args:
+            specs: The specifications of the generated classes, from `convert_moddle_registry`.
+
+        Returns:
+            The snapshot.
+        """
+        return cls(
+            moddle_state=dict(vars(moddle_registry)),
+            elements=[(spec, element_registry.by_qname[spec.q_name].properties) for spec in specs],
+        )
+
+    def restore(self) -> bool:
+        """
+        Recreate the registries' state, generating the classes without introspecting their type hints.
+
+        Returns:
+            False, leaving the registries untouched, if a class refers to an element that is not registered.
+        """
+        known = set(element_registry.by_qname)
+        for spec, _ in self.elements:
+            if not spec.references() <= known:
+                return False
+            known.add(spec.q_name)
+
+        vars(moddle_registry).update(self.moddle_state)
+        for spec, properties in self.elements:
+            register_element(element_from_spec(spec), properties)
+        return True
+
+
+def load_snapshot(key: str) -> Optional[RegistrySnapshot]:
+    """
+    Read a snapshot.
+
+    The file is only unpickled once `pybpmn_parser.cache.read_verified` has checked that the current user wrote it
+    for this key.
+
+    Args:
+        key: The snapshot key, from `snapshot_key`.
+
+    Returns:
+        The snapshot, or None if there is none or it cannot be read.
+    """
+    if (directory := snapshot_directory()) is None:
+        return None
+    if (payload := read_verified(_path(directory, key), key)) is None:
+        return None
+    try:
+        snapshot = pickle.loads(payload)  # noqa: S301
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+    return snapshot if isinstance(snapshot, RegistrySnapshot) else None
+
+
+def save_snapshot(key: str, snapshot: RegistrySnapshot) -> None:
+    """
+    Write a snapshot atomically, deleting the least recently written ones beyond `MAX_SNAPSHOTS`.
+
+    A directory that cannot be written is ignored: the snapshot only saves time.
+
+    Args:
+        key: The snapshot key, from `snapshot_key`.
+        snapshot: The snapshot.
+    """
+    if (directory := snapshot_directory()) is None:
+        return
+    try:
+        write_verified(_path(directory, key), pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL), key)
+        snapshots = sorted(directory.glob("registry-*.pickle"), key=lambda path: path.stat().st_mtime_ns)
+        for path in snapshots[:-MAX_SNAPSHOTS]:
+            path.unlink(missing_ok=True)
+    except OSError:
+        return
+
+
+def _path(directory: Path, key: str) -> Path:
+    return directory / f"registry-{key}.pickle"
@@ -0,0 +1,255 @@
+"""Parse many BPMN files in parallel with a pool of warm worker processes."""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+from pybpmn_parser.parse import Parser, ParseResult
+from pybpmn_parser.validator import SchemaBackend, ValidationLevel, bpmn_schema, lxml_schema
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from pybpmn_parser.cache import ParseCache
+    from pybpmn_parser.core import QName
+
+_WORKER_PARSER: Optional[Parser] = None
+"""The parser of the current worker process, created once by `_init_worker`."""
+
+
+_FREEZING_POOLS = 0
+"""The number of open pools that called `gc.freeze()`. The last one to close calls `gc.unfreeze()`."""
+
+_FREEZE_LOCK = threading.Lock()
+
+
+def _freeze() -> None:
+    """Move every tracked object into the permanent generation, and count the pool that asked for it."""
+    global _FREEZING_POOLS  # noqa: PLW0603
+    with _FREEZE_LOCK:
+        gc.freeze()
+        _FREEZING_POOLS += 1
+
+
+def _unfreeze() -> None:
+    """Let the collector see the frozen objects again once no open pool needs them frozen."""
+    global _FREEZING_POOLS  # noqa: PLW0603
+    with _FREEZE_LOCK:
+        _FREEZING_POOLS -= 1
+        if not _FREEZING_POOLS:
+            gc.unfreeze()
+
+
+def _warm_parser(parser_options: dict[str, Any]) -> Parser:
+    """Create a parser and compile the schemas its validation level and schema backend use."""
+    parser = Parser(**parser_options)
+    if parser.validation is ValidationLevel.SCHEMA:
+        bpmn_schema()
+        if parser.schema_backend is SchemaBackend.LXML:
+            lxml_schema()
+    return parser
+
+
+def _init_worker(parser_options: dict[str, Any]) -> None:
+    """Load the plugins, the moddle registry and the schema once per worker process."""
+    global _WORKER_PARSER  # noqa: PLW0603
+    _WORKER_PARSER = _warm_parser(parser_options)
+
+
+def _parse_path(path: Path) -> ParseResult:
+    """Parse one file in a worker process."""
+    if _WORKER_PARSER is None:
+        raise RuntimeError("The worker process was not initialized.")
+    return _WORKER_PARSER.parse_file(path)
+
+
+@dataclass
+class ParseOutcome:
+    """The outcome of parsing one file of a batch."""
+
+    path: Path
+    """The path of the parsed file."""
+
+    result: Optional[ParseResult] = None
+    """The parse result, if the file was parsed successfully."""
+
+    error: Optional[BaseException] = None
+    """The exception raised while parsing the file, if any."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was parsed successfully."""
+        return self.error is None
+
+
+class ParserPool:
+    """
+    A pool of worker processes, each holding a fully initialized `Parser`.
+
+    Every worker loads the plugins, converts the moddle registry and compiles the schema its validation needs once,
+    in its initializer, and then parses any number of files. With the `fork` start method the parent process is
+    warmed up first and `gc.freeze()` is called, so the registry and the compiled schema are shared copy-on-write
+    instead of being rebuilt in every worker.
+    `gc.unfreeze()` is called when the last open pool that froze the heap is closed.
+
+    Results stream back as files finish. At most `max_in_flight` files are submitted at a time, so memory stays
+    bounded no matter how many paths are given. A file that fails to parse produces a `ParseOutcome` with its
+    `error` set; it does not abort the batch.
+
+    Example:
+        ```python
+        with ParserPool(workers=8) as pool:
+            for outcome in pool.imap_unordered(paths):
+                ...
+        ```
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        moddle_extensions: Optional[list[Path]] = None,
+        ns_map: Optional[dict[str, str]] = None,
+        max_in_flight: Optional[int] = None,
+        start_method: Optional[str] = None,
+        *,
+        lazy: bool = False,
+        include: Optional[Iterable[Union[QName, str]]] = None,
+        exclude: Optional[Iterable[Union[QName, str]]] = None,
+        skip_diagrams: bool = False,
+        validation: Union[ValidationLevel, str] = ValidationLevel.SCHEMA,
+        cache: Optional[ParseCache] = None,
+        schema_backend: Union[SchemaBackend, str] = SchemaBackend.XMLSCHEMA,
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            workers: The number of worker processes. Defaults to the number of CPUs.
+            moddle_extensions: Moddle extension files each worker loads, as for `Parser`.
+            ns_map: Additional namespace prefixes, as for `Parser`.
+            max_in_flight: The maximum number of files submitted and not yet consumed. Defaults to twice
+                the number of workers.
+            start_method: The `multiprocessing` start method. Defaults to the platform default.
+            lazy: Build lazily, as for `Parser`. Results are fully built when they are sent back.
+            include: The elements to build, as for `Parser`.
+            exclude: The elements to drop, as for `Parser`.
+            skip_diagrams: Drop the diagram interchange part of the documents, as for `Parser`.
+            validation: The checks run before the model is built, as for `Parser`.
+            cache: A cache of parse results, as for `Parser`. Each worker gets its own in-memory tier and shares
+                the on-disk tier, if any.
+            schema_backend: The implementation of the schema check, as for `Parser`.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        """The number of worker processes."""
+
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        """The maximum number of files submitted and not yet consumed."""
+
+        self.parser_options: dict[str, Any] = {
+            "moddle_extensions": moddle_extensions or [],
+            "ns_map": ns_map,
+            "lazy": lazy,
+            "include": None if include is None else tuple(include),
+            "exclude": None if exclude is None else tuple(exclude),
+            "skip_diagrams": skip_diagrams,
+            "validation": validation,
+            "cache": cache,
+            "schema_backend": schema_backend,
+        }
+        """The arguments of the parser of each worker."""
+
+        context = multiprocessing.get_context(start_method)
+        self._frozen = context.get_start_method() == "fork"
+        if self._frozen:
+            # Build everything the workers need before forking and keep it out of the collector's reach,
+            # so the pages holding the registry and the schema are never written to and stay shared.
+            _warm_parser(self.parser_options)
+            _freeze()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.parser_options,),
+        )
+
+    def imap(self, paths: Iterable[Union[str, Path]]) -> Iterator[ParseOutcome]:
+        """
+        Parse files in parallel, yielding the outcomes in the order of `paths`.
+
+        Args:
+            paths: The files to parse.
+
+        Yields:
+            One `ParseOutcome` per path.
+        """
+        pending: deque[tuple[Path, Future]] = deque()
+        for path in map(Path, paths):
+            pending.append((path, self._executor.submit(_parse_path, path)))
+            if len(pending) >= self.max_in_flight:
+                yield _outcome(*pending.popleft())
+        while pending:
+            yield _outcome(*pending.popleft())
+
+    def imap_unordered(self, paths: Iterable[Union[str, Path]]) -> Iterator[ParseOutcome]:
+        """
+        Parse files in parallel, yielding the outcomes as soon as they are available.
+
+        Args:
+            paths: The files to parse.
+
+        Yields:
+            One `ParseOutcome` per path, in completion order.
+        """
+        in_flight: dict[Future, Path] = {}
+        for path in map(Path, paths):
+            in_flight[self._executor.submit(_parse_path, path)] = path
+            if len(in_flight) >= self.max_in_flight:
+                yield from self._drain(in_flight)
+        while in_flight:
+            yield from self._drain(in_flight)
+
+    @staticmethod
+    def _drain(in_flight: dict[Future, Path]) -> Iterator[ParseOutcome]:
+        """Wait until at least one submitted file is done and yield the outcomes of the finished ones."""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield _outcome(in_flight.pop(future), future)
+
+    def close(self, cancel_pending: bool = False) -> None:
+        """
+        Stop the worker processes.
+
+        Args:
+            cancel_pending: Cancel the files that have not started parsing instead of waiting for them.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        if self._frozen:
+            _unfreeze()
+            self._frozen = False
+
+    def __enter__(self) -> ParserPool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close(cancel_pending=exc_type is not None)
+
+
+def _outcome(path: Path, future: Future) -> ParseOutcome:
+    """Wait for a submitted file and convert its result or exception into an outcome."""
+    try:
+        return ParseOutcome(path, result=future.result())
+    except Exception as e:  # noqa: BLE001
+        return ParseOutcome(path, error=e)
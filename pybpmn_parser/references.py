@@ -0,0 +1,234 @@
+"""Resolve the references between the elements of a parsed document, and index them in both directions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar, Union
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from pybpmn_parser.parse import Reference
+
+T = TypeVar("T")
+
+
+class DanglingReferenceError(KeyError):
+    """A reference points to an ID that no element of the document has."""
+
+
+@dataclass(frozen=True, slots=True)
+class ElementRef(Generic[T]):
+    """A handle to an element, dereferenced through the document's ID index."""
+
+    id: Optional[str]
+    """The ID of the element."""
+
+    elements_by_id: Mapping[str, Any] = field(repr=False, compare=False)
+    """The index the element is looked up in."""
+
+    @property
+    def exists(self) -> bool:
+        """Whether the document has an element with this ID."""
+        return self.id is not None and self.id in self.elements_by_id
+
+    def get(self, default: Optional[T] = None) -> Optional[T]:
+        """Return the element, or the default if the document has no element with this ID."""
+        return default if self.id is None else self.elements_by_id.get(self.id, default)
+
+    def resolve(self) -> T:
+        """
+        Return the element.
+
+        Raises:
+            DanglingReferenceError: If the document has no element with this ID.
+        """
+        try:
+            return self.elements_by_id[self.id]
+        except KeyError:
+            raise DanglingReferenceError(self.id) from None
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedReference:
+    """A reference from a property of one element to another element."""
+
+    source: ElementRef
+    """The element holding the reference."""
+
+    property: str
+    """The property of the source element holding the reference."""
+
+    target: ElementRef
+    """The referenced element."""
+
+
+def target_id(reference_id: str, elements_by_id: Mapping[str, Any]) -> str:
+    """
+    Return the ID a reference points to.
+
+    References are XML qualified names, so they may carry a namespace prefix, e.g. `tns:Message_1`.
+    The prefix is dropped when only the local part is the ID of an element.
+
+    Args:
+        reference_id: The value of the reference, as found in the document.
+        elements_by_id: The elements of the document, indexed by ID.
+
+    Returns:
+        The ID of the referenced element, or the reference unchanged if no element matches it.
+    """
+    if reference_id in elements_by_id:
+        return reference_id
+    _, colon, local = reference_id.partition(":")
+    if colon and local in elements_by_id:
+        return local
+    return reference_id
+
+
+class ReferenceIndex:
+    """
+    The references of a parsed document, resolved in one pass over them.
+
+    Every lookup is a dictionary access: the references an element holds, the elements referring to an
+    element, and the handles of a property. References to IDs that no element has are kept in `dangling`.
+    Handles are created when they are asked for, so indexing costs one entry per reference in each direction.
+
+    The index is kept up to date with `add` and `discard` when elements are added to or removed from the document,
+    as `pybpmn_parser.parse.Parser.reparse` does.
+
+    References held by elements without an ID, such as the `label_style` of a `BPMNLabel`, have no source to look
+    up, so they are left out of both directions; only those that dangle are reported, in `dangling`.
+    """
+
+    def __init__(self, references: Iterable[Reference], elements_by_id: Mapping[str, Any]) -> None:
+        """
+        Resolve references.
+
+        Args:
+            references: The references recorded while parsing, see `pybpmn_parser.parse.ParseContext.references`.
+            elements_by_id: The elements of the document, indexed by ID.
+        """
+        self.elements_by_id = elements_by_id
+        """The elements of the document, indexed by ID."""
+
+        self._outgoing: dict[str, list[tuple[str, str]]] = {}
+        self._incoming: dict[str, list[tuple[str, str]]] = {}
+        self._anonymous: list[tuple[str, str]] = []
+        self.add(references)
+
+    @property
+    def dangling(self) -> list[Reference]:
+        """The references to IDs that no element of the document has, grouped by the element holding them."""
+        from pybpmn_parser.parse import Reference
+
+        return [
+            Reference(element_id, property_name, resolved_id)
+            for element_id, targets in (*self._outgoing.items(), (None, self._anonymous))
+            for property_name, resolved_id in targets
+            if resolved_id not in self.elements_by_id
+        ]
+
+    def add(self, references: Iterable[Reference]) -> None:
+        """
+        Resolve and index more references.
+
+        Args:
+            references: The references, resolved against the elements indexed by ID at the time of the call.
+        """
+        elements_by_id = self.elements_by_id
+        for reference in references:
+            resolved_id = reference.reference_id
+            if resolved_id not in elements_by_id:
+                resolved_id = target_id(resolved_id, elements_by_id)
+            if reference.element_id is None:
+                self._anonymous.append((reference.property, resolved_id))
+                continue
+            self._outgoing.setdefault(reference.element_id, []).append((reference.property, resolved_id))
+            self._incoming.setdefault(resolved_id, []).append((reference.element_id, reference.property))
+
+    def discard(self, references: Iterable[Reference]) -> None:
+        """
+        Remove references from the index, for example those of elements removed from the document.
+
+        Args:
+            references: The references, as recorded while parsing. References that are not indexed are ignored.
+        """
+        for reference in references:
+            element_id = reference.element_id
+            targets = self._anonymous if element_id is None else self._outgoing.get(element_id, [])
+            position = _position(targets, reference)
+            if position is None:
+                continue
+            property_name, resolved_id = targets.pop(position)
+            if element_id is None:
+                continue
+            if not targets:
+                del self._outgoing[element_id]
+            referrers = self._incoming[resolved_id]
+            referrers.remove((element_id, property_name))
+            if not referrers:
+                del self._incoming[resolved_id]
+
+    def __len__(self) -> int:
+        return sum(len(targets) for targets in self._outgoing.values())
+
+    def __iter__(self) -> Iterator[ResolvedReference]:
+        for element_id, targets in self._outgoing.items():
+            source = self.ref(element_id)
+            for property_name, resolved_id in targets:
+                yield ResolvedReference(source, property_name, self.ref(resolved_id))
+
+    def ref(self, element: Union[str, Any, None]) -> ElementRef:
+        """Return the handle of an element or an ID."""
+        return ElementRef(_element_id(element), self.elements_by_id)
+
+    def references_from(self, element: Union[str, Any]) -> list[ResolvedReference]:
+        """Return the references an element or the element with an ID holds, in document order."""
+        source = self.ref(element)
+        return [
+            ResolvedReference(source, property_name, self.ref(resolved_id))
+            for property_name, resolved_id in self._outgoing.get(source.id, ())
+        ]
+
+    def referrers(self, element: Union[str, Any]) -> list[ResolvedReference]:
+        """Return the references to an element or the element with an ID, in document order."""
+        target = self.ref(element)
+        return [
+            ResolvedReference(self.ref(element_id), property_name, target)
+            for element_id, property_name in self._incoming.get(target.id, ())
+        ]
+
+    def targets(self, element: Union[str, Any], property_name: str) -> list[ElementRef]:
+        """
+        Return the handles of the elements referenced by a property of an element.
+
+        Args:
+            element: The element holding the references, or its ID.
+            property_name: The name of the property, e.g. `source_ref` or `flow_node_refs`.
+
+        Returns:
+            One handle for a single reference, one per value for a list of references, none if the property is unset.
+        """
+        return [
+            self.ref(resolved_id)
+            for name, resolved_id in self._outgoing.get(_element_id(element), ())
+            if name == property_name
+        ]
+
+
+def _position(targets: list[tuple[str, str]], reference: Reference) -> Optional[int]:
+    """Return the position of the indexed target of a reference, matching its ID with or without its prefix."""
+    _, colon, local = reference.reference_id.partition(":")
+    return next(
+        (
+            position
+            for position, (property_name, resolved_id) in enumerate(targets)
+            if property_name == reference.property
+            and (resolved_id == reference.reference_id or (colon and resolved_id == local))
+        ),
+        None,
+    )
+
+
+def _element_id(element: Union[str, Any, None]) -> Optional[str]:
+    return element if element is None or isinstance(element, str) else getattr(element, "id", None)
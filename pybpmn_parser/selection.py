@@ -0,0 +1,159 @@
+"""Select the elements of a BPMN document that are built, by qualified name."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+import lxml.etree as ET  # noqa: N812
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+DIAGRAM_QNAMES = (QName("BPMNDiagram", NAMESPACES["bpmndi"]),)
+"""The elements dropped by `skip_diagrams`: the diagram interchange part of a document."""
+
+
+@dataclass(frozen=True, slots=True)
+class SkippedElement:
+    """A subtree that was dropped before the model was built."""
+
+    qname: QName
+    """The qualified name of the subtree's root element."""
+
+    element_id: Optional[str]
+    """The ID of the subtree's root element, if it has one."""
+
+    line: Optional[int]
+    """The line of the subtree's root element as reported by `lxml`, if known."""
+
+    @classmethod
+    def of(cls, element: ET._Element) -> SkippedElement:
+        """Describe the subtree of an `lxml` element."""
+        return cls(QName.from_str(element.tag), element.get("id"), element.sourceline)
+
+
+def _tag(name: Union[QName, str], ns_map: Mapping[str, str]) -> str:
+    """
+    Convert a qualified name into the tag `lxml` matches.
+
+    Strings are either `{uri}local` or `prefix:local`. `*` is a wildcard for the local name or the URI,
+    e.g. `bpmndi:*` or `{*}extensionElements`.
+    """
+    if isinstance(name, str):
+        name = QName.from_str(name, dict(ns_map))
+    return str(name)
+
+
+def _remove(element: ET._Element) -> None:
+    """Remove an element from its parent, keeping the text that follows it."""
+    parent = element.getparent()
+    if element.tail:
+        if (previous := element.getprevious()) is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+
+class ElementFilter:
+    """
+    Drop subtrees of a parsed document before any model object is built.
+
+    With `include`, only the elements matching one of the names are kept, along with their whole subtree and
+    their ancestors; every other subtree is dropped. Then every subtree matching `exclude` is dropped, also
+    inside included ones. The root element is always kept.
+
+    Example:
+        ```python
+        # Only the processes, without any Camunda extensions
+        ElementFilter(include=["bpmn:process"], exclude=["camunda:*"], ns_map=NAMESPACES)
+        ```
+    """
+
+    def __init__(
+        self,
+        include: Optional[Iterable[Union[QName, str]]] = None,
+        exclude: Optional[Iterable[Union[QName, str]]] = None,
+        ns_map: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        Create a filter.
+
+        Args:
+            include: The names of the elements to keep. Everything is kept if omitted.
+            exclude: The names of the elements to drop.
+            ns_map: The prefixes used by names given as `prefix:local` strings.
+
+        Raises:
+            ValueError: If a name uses a prefix that is not in `ns_map`.
+        """
+        ns_map = ns_map or NAMESPACES
+        self.include = None if include is None else tuple(_tag(name, ns_map) for name in include)
+        """The `lxml` tags of the elements to keep, or None to keep everything."""
+
+        self.exclude = tuple(_tag(name, ns_map) for name in exclude or ())
+        """The `lxml` tags of the elements to drop."""
+
+    def prune(self, root: ET._Element) -> list[SkippedElement]:
+        """
+        Remove the filtered subtrees from a tree, in place.
+
+        Args:
+            root: The root element of the document.
+
+        Returns:
+            The dropped subtrees, in document order for each filter.
+        """
+        skipped: list[SkippedElement] = []
+        if self.include is not None:
+            self._prune_not_included(root, skipped)
+        skipped.extend(self.prune_excluded(root))
+        return skipped
+
+    def prune_excluded(self, root: ET._Element) -> list[SkippedElement]:
+        """
+        Remove the subtrees matching `exclude` from a tree, in place, ignoring `include`.
+
+        Args:
+            root: The root element of the tree, which is always kept.
+
+        Returns:
+            The dropped subtrees, in document order.
+        """
+        skipped: list[SkippedElement] = []
+        if self.exclude:
+            removed: set[ET._Element] = set()
+            for element in list(root.iter(*self.exclude)):
+                # Matches are in document order, so an enclosing match has been removed already.
+                if element is root or not removed.isdisjoint(element.iterancestors()):
+                    continue
+                skipped.append(SkippedElement.of(element))
+                _remove(element)
+                removed.add(element)
+        return skipped
+
+    def includes(self, element: ET._Element) -> bool:
+        """Whether an element matches `include` itself, or every element does as there is no `include`."""
+        return self.include is None or next(element.iter(*self.include), None) is element
+
+    def excludes(self, element: ET._Element) -> bool:
+        """Whether an element matches `exclude` itself."""
+        return bool(self.exclude) and next(element.iter(*self.exclude), None) is element
+
+    def contains_included(self, element: ET._Element) -> bool:
+        """Whether an element or one of its descendants matches `include`."""
+        return self.include is None or next(element.iter(*self.include), None) is not None
+
+    def _prune_not_included(self, parent: ET._Element, skipped: list[SkippedElement]) -> None:
+        """Drop the children that neither match `include` nor contain a match."""
+        for child in list(parent.iterchildren(ET.Element)):
+            match = next(child.iter(*self.include), None)
+            if match is None:
+                skipped.append(SkippedElement.of(child))
+                _remove(child)
+            elif match is not child:
+                self._prune_not_included(child, skipped)
@@ -0,0 +1,264 @@
+"""Build BPMN elements directly from `lxml.etree.iterparse` events."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Optional, Union
+
+import lxml.etree as ET  # noqa: N812
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.element_registry import ElementDescriptor, registry
+from pybpmn_parser.element_view import (
+    element_attributes,
+    element_key,
+    element_value,
+    materialize,
+    own_namespace_declarations,
+)
+from pybpmn_parser.factory import (
+    PrebuiltElement,
+    create_element_from_dict,
+    extract_nsmap_from_dict,
+    get_child_descriptor,
+)
+from pybpmn_parser.selection import SkippedElement
+
+if TYPE_CHECKING:
+    from pybpmn_parser.bpmn.infrastructure.definitions import Definitions
+    from pybpmn_parser.parse import ParseContext
+    from pybpmn_parser.selection import ElementFilter
+
+
+@dataclass
+class _Frame:
+    """The state of an element whose end tag has not been seen yet."""
+
+    element: ET._Element
+    """The element being parsed."""
+
+    descriptor: ElementDescriptor
+    """The descriptor used to build the element."""
+
+    ns_map: dict[str, str]
+    """The namespace map in scope for the element, including its own declarations."""
+
+    parent_ns_map: dict[str, str]
+    """The namespace map in scope for the parent element."""
+
+    items: dict[str, Any]
+    """The `xmltodict`-style items of the element. Built children are stored as `PrebuiltElement`s."""
+
+    text_chunks: list[str] = field(default_factory=list)
+    """The character data of the element collected from siblings that were already removed."""
+
+    text_started: bool = False
+    """Whether the text before the first child was collected."""
+
+    has_children: bool = False
+    """Whether the element has child elements."""
+
+    kept: bool = True
+    """Whether the element or one of its ancestors matches the `include` filter, so its whole subtree is kept."""
+
+
+@dataclass
+class _Subtree:
+    """An element whose subtree is read whole before it is handled."""
+
+    element: ET._Element
+    """The root of the subtree."""
+
+    descriptor: Optional[ElementDescriptor]
+    """The descriptor used to build the element, or None to keep it as a raw value."""
+
+    excluded: bool = False
+    """Whether the element matches the `exclude` filter, so the subtree is dropped without being built."""
+
+    kept: bool = True
+    """Whether the element or one of its ancestors matches the `include` filter."""
+
+    depth: int = 1
+    """The depth inside the subtree of the current event."""
+
+
+def _collect_text(frame: _Frame, stop: Optional[ET._Element] = None) -> None:
+    """Collect the text of the frame's element up to `stop`, then remove the children before it."""
+    parent = frame.element
+    if not frame.text_started:
+        frame.text_chunks.append(parent.text or "")
+        frame.text_started = True
+    count = 0
+    for child in parent:
+        if child is stop:
+            break
+        frame.text_chunks.append(child.tail or "")
+        count += 1
+    if count:
+        del parent[:count]
+
+
+def _add_item(items: dict[str, Any], key: str, value: Any) -> None:
+    """Add a child value, grouping repeated keys into a list like `xmltodict` does."""
+    if key not in items:
+        items[key] = value
+    elif isinstance(items[key], list):
+        items[key].append(value)
+    else:
+        items[key] = [items[key], value]
+
+
+def _build(frame: _Frame, parent_uri: str, context: ParseContext) -> Any:
+    """Build the model object for a frame whose end tag was reached."""
+    _collect_text(frame)
+    if text := "".join(frame.text_chunks).strip():
+        frame.items["#text"] = text
+    if not frame.items and not frame.has_children:
+        # An empty element: `xmltodict` reports None, and the factory builds nothing from it.
+        return None
+    return create_element_from_dict(frame.items, frame.descriptor, parent_uri, context, frame.parent_ns_map)
+
+
+class _StreamBuilder:
+    """Builds the model from `iterparse` events, holding only the elements whose end tag was not seen yet."""
+
+    def __init__(self, context: ParseContext, base_nsmap: dict[str, str], element_filter: Optional[ElementFilter]):
+        self.context = context
+        self.base_nsmap = base_nsmap
+        self.element_filter = element_filter
+        self.stack: list[_Frame] = []
+        self.subtree: Optional[_Subtree] = None
+        self.parent_uri = ""
+        self.skipped: list[SkippedElement] = []
+        self.definitions: Optional[Definitions] = None
+
+    def feed(self, event: str, element: ET._Element) -> bool:
+        """Handle an event, returning whether the root element ended."""
+        if self.subtree is not None:
+            self.subtree_event(event, element)
+            return False
+        if event == "start":
+            self.start(element)
+            return False
+        return self.end(element)
+
+    def start(self, element: ET._Element) -> None:
+        key = element_key(element)
+        declarations = own_namespace_declarations(element)
+        items = element_attributes(element, element.nsmap, declarations)
+        if not self.stack:
+            ns_map = extract_nsmap_from_dict(items, self.base_nsmap)
+            qname = QName.from_str(key, ns_map, default_uri=ns_map.get("default", None))
+            self.parent_uri = qname.uri
+            kept = self.element_filter is None or self.element_filter.include is None
+            self.stack.append(_Frame(element, registry.by_qname[qname], ns_map, ns_map, items, kept=kept))
+            return
+
+        parent = self.stack[-1]
+        parent.has_children = True
+        _collect_text(parent, stop=element)
+        descriptor = get_child_descriptor(key, parent.descriptor, parent.ns_map)
+        # Without a filter, or without `include`, every frame is kept.
+        kept = parent.kept or self.element_filter.includes(element)
+        if self.element_filter is not None and self.element_filter.excludes(element):
+            self.subtree = _Subtree(element, descriptor, excluded=True)
+        elif descriptor is None or not kept:
+            # Whether an element outside `include` holds an included one is only known at its end.
+            self.subtree = _Subtree(element, descriptor, kept=kept)
+        else:
+            ns_map = extract_nsmap_from_dict(items, parent.ns_map)
+            self.stack.append(_Frame(element, descriptor, ns_map, parent.ns_map, items))
+
+    def end(self, element: ET._Element) -> bool:
+        frame = self.stack.pop()
+        value = _build(frame, self.parent_uri, self.context)
+        element.clear(keep_tail=True)
+        if not self.stack:
+            self.definitions = value
+            return True
+        _add_item(self.stack[-1].items, element_key(element), None if value is None else PrebuiltElement(value))
+        return False
+
+    def subtree_event(self, event: str, element: ET._Element) -> None:
+        subtree = self.subtree
+        subtree.depth += 1 if event == "start" else -1
+        if subtree.depth:
+            if subtree.excluded and event == "end":
+                element.clear()
+            return
+        self.subtree = None
+        if subtree.excluded or not (subtree.kept or self.element_filter.contains_included(element)):
+            self.skipped.append(SkippedElement.of(element))
+        else:
+            if self.element_filter is not None:
+                prune = self.element_filter.prune_excluded if subtree.kept else self.element_filter.prune
+                self.skipped.extend(prune(element))
+            self.add_subtree(element, subtree.descriptor)
+        element.clear(keep_tail=True)
+
+    def add_subtree(self, element: ET._Element, descriptor: Optional[ElementDescriptor]) -> None:
+        """Add a subtree read whole to the items of its parent, built, or as a raw value without a descriptor."""
+        parent = self.stack[-1]
+        value = element_value(element, parent.element.nsmap, release=True)
+        if descriptor is None:
+            value = materialize(value)
+        elif (
+            built := create_element_from_dict(value, descriptor, self.parent_uri, self.context, parent.ns_map)
+        ) is None:
+            value = None
+        else:
+            value = PrebuiltElement(built)
+        _add_item(parent.items, element_key(element), value)
+
+
+def iterparse_bpmn(
+    source: Union[str, Path, IO[bytes]],
+    context: ParseContext,
+    initial_nsmap: Optional[dict[str, str]] = None,
+    element_filter: Optional[ElementFilter] = None,
+    skipped: Optional[list[SkippedElement]] = None,
+) -> Definitions:
+    """
+    Create a BPMN element by streaming a document with `lxml.etree.iterparse`.
+
+    Descriptors are looked up by QName when an element starts and the model object is built when it ends.
+    Finished elements are removed from the tree, so only the current path from the root is held in memory,
+    along with the objects built so far.
+
+    The result is equal to the one `create_bpmn` builds from the same document. Elements are added to
+    `context` in document order.
+
+    With a filter, subtrees matching `exclude` are cleared as they are read and never built. An element outside
+    `include` is read whole, as whether it holds an included element is only known at its end, then dropped or
+    pruned like `ElementFilter.prune` does and built.
+
+    Args:
+        source: A file name or a binary file object.
+        context: A ParseContext instance.
+        initial_nsmap: An optional namespace map for resolving prefixed element names.
+        element_filter: The subtrees to drop, if any.
+        skipped: A list the dropped subtrees are appended to.
+
+    Returns:
+        The created BPMN element.
+
+    Raises:
+        ValueError: If the document has no root element.
+    """
+    base_nsmap = NAMESPACES.copy()
+    base_nsmap.update(initial_nsmap or {})
+    if isinstance(source, Path):
+        source = str(source)
+
+    builder = _StreamBuilder(context, base_nsmap, element_filter)
+    for event, element in ET.iterparse(source, events=("start", "end"), remove_blank_text=True):
+        if builder.feed(event, element):
+            break
+
+    if builder.definitions is None:
+        raise ValueError("No BPMN definitions found.")
+    if skipped is not None:
+        skipped.extend(builder.skipped)
+    return builder.definitions
@@ -1,24 +1,143 @@
 """Validator for BPMN 2.0 XML documents."""
 
+import hashlib
+import importlib
 import logging
+import mmap
+import pickle  # noqa: S403
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cache
 from pathlib import Path
-from typing import List, Optional
+from typing import IO, TYPE_CHECKING, Any, Callable, Container, Iterable, Iterator, List, Mapping, Optional, Union
 
 import lxml.etree as ET
-import xmlschema
 from returns.pipeline import flow
 from returns.pointfree import bind
 from returns.result import Failure, Result, Success, safe
 
+import pybpmn_parser
+from pybpmn_parser.cache import read_verified, user_cache_directory, write_verified
+
+if TYPE_CHECKING:
+    import xmlschema
+
+    from pybpmn_parser.core import QName
+
 logger = logging.getLogger(__name__)
 
 SCHEMA_DIR = Path(__file__).parent / "schemas"
 
-BPMN_SCHEMA = xmlschema.XMLSchema(
-    SCHEMA_DIR / "BPMN20.xsd",
-    validation="lax",  # Use lax validation to handle missing imports
-    base_url=str(SCHEMA_DIR.absolute()),  # Set base URL for imports
-)
+_PARSERS = threading.local()
+_SCHEMAS = threading.local()
+_SCHEMA_LOCK = threading.Lock()
+
+
+class SchemaBackend(str, Enum):
+    """The implementation that checks documents against the BPMN 2.0 schema."""
+
+    XMLSCHEMA = "xmlschema"
+    """The pure-Python `xmlschema` package, which describes every error."""
+
+    LXML = "lxml"
+    """`libxml2` through `lxml`, in C. The errors of an invalid document are described by `xmlschema`."""
+
+
+def bpmn_schema() -> "xmlschema.XMLSchema":
+    """
+    Return the BPMN 2.0 schema compiled by `xmlschema`.
+
+    The schema is compiled on the first call, or loaded from the copy pickled in the user's cache directory
+    (see `pybpmn_parser.cache.user_cache_directory`) by an earlier process. That copy is replaced when the
+    schema files or the versions of the library, `xmlschema` or Python change, and only unpickled once
+    `pybpmn_parser.cache.read_verified` has checked that the current user wrote it for these versions.
+
+    Returns:
+        The compiled schema, shared by all threads.
+    """
+    with _SCHEMA_LOCK:
+        return _load_bpmn_schema()
+
+
+@cache
+def _load_bpmn_schema() -> "xmlschema.XMLSchema":
+    """Unpickle the cached schema, or compile it and cache it."""
+    import xmlschema
+
+    directory = user_cache_directory()
+    digest = hashlib.sha256(f"{pybpmn_parser.__version__}:{xmlschema.__version__}:{sys.version_info[:2]}".encode())
+    for path in sorted(SCHEMA_DIR.glob("*.xsd")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    key = digest.hexdigest()
+    cache_file = None if directory is None else directory / f"xmlschema-{key}.pickle"
+
+    if cache_file is not None and (payload := read_verified(cache_file, key)) is not None:
+        try:
+            schema = pickle.loads(payload)  # noqa: S301
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            schema = None
+        if isinstance(schema, xmlschema.XMLSchemaBase):
+            return schema
+
+    schema = xmlschema.XMLSchema(
+        SCHEMA_DIR / "BPMN20.xsd",
+        validation="lax",  # Use lax validation to handle missing imports
+        base_url=str(SCHEMA_DIR.absolute()),  # Set base URL for imports
+    )
+    if cache_file is not None:
+        try:
+            write_verified(cache_file, pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL), key)
+        except OSError:
+            logger.debug("Cannot cache the compiled schema in %s", cache_file.parent)
+    return schema
+
+
+def lxml_schema() -> ET.XMLSchema:
+    """
+    Return the BPMN 2.0 schema compiled by `libxml2` for the current thread.
+
+    Compiling takes a few milliseconds, so each thread compiles its own instead of sharing one.
+
+    Returns:
+        An `lxml` schema owned by the current thread.
+    """
+    if (schema := getattr(_SCHEMAS, "schema", None)) is None:
+        schema = _SCHEMAS.schema = ET.XMLSchema(ET.parse(str(SCHEMA_DIR / "BPMN20.xsd")))
+    return schema
+
+
+def __getattr__(name: str) -> Any:
+    # `BPMN_SCHEMA` used to be compiled on import.
+    if name == "BPMN_SCHEMA":
+        return bpmn_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def xml_parser() -> ET.XMLParser:
+    """
+    Return the parser for BPMN documents for the current thread.
+
+    Whitespace-only text nodes carry no BPMN content, so they are dropped. `lxml` serializes the parses
+    of a shared parser instance, so every thread gets its own.
+
+    Returns:
+        An `lxml` parser owned by the current thread.
+    """
+    if (parser := getattr(_PARSERS, "parser", None)) is None:
+        parser = _PARSERS.parser = ET.XMLParser(remove_blank_text=True)
+    return parser
+
+
+XMLBuffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+"""Raw XML data that `lxml` can read without a copy."""
+
+BLANK_XML = re.compile(rb"\s*\Z")
 
 # Define known validation issues to skip
 KNOWN_VALIDATION_PATTERNS = [
@@ -33,13 +152,37 @@ NAMESPACES = {
 }
 
 
+class ValidationLevel(str, Enum):
+    """How thoroughly a document is checked before the model is built."""
+
+    OFF = "off"
+    """No checks beyond well-formedness, for documents that were validated before."""
+
+    STRUCTURAL = "structural"
+    """Element IDs and sequence flow references only."""
+
+    SCHEMA = "schema"
+    """The BPMN 2.0 schema, then the structural checks."""
+
+
 class ValidationError(Exception):
     """An error encountered during validation."""
 
-    def __init__(self, code: str, message: str, element_id: Optional[str] = None):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        element_id: Optional[str] = None,
+        errors: Optional[list["ValidationError"]] = None,
+    ):
         self.code = code
         self.message = message
         self.element_id = element_id
+        self.errors = errors or []
+        """The individual errors, when this error reports a failed validation."""
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.code, self.message, self.element_id, self.errors)
 
     def __str__(self) -> str:
         if self.element_id:
@@ -65,10 +208,10 @@ class ValidationResult:
         self.is_valid = len(self.errors) == 0
 
     def raise_for_errors(self) -> None:
-        """Raises a ValidationError if there are any errors."""
+        """Raises a ValidationError holding the errors in its `errors` attribute, if there are any."""
         if self.errors:
             errors = "\n".join(str(error) for error in self.errors)
-            raise ValidationError("VALIDATION_ERROR", f"Validation failed\n{errors}")
+            raise ValidationError("VALIDATION_ERROR", f"Validation failed\n{errors}", errors=list(self.errors))
 
 
 @safe
@@ -80,16 +223,28 @@ def _strip_extra_whitespace(value: str) -> str:
     return return_value
 
 
-@safe
-def _parse_xml(xml: str) -> ET.Element:
-    """Parses an XML string into an ElementTree Element."""
+def _fromstring(xml: XMLBuffer) -> ET.Element:
+    """Parses raw XML data into an ElementTree Element, using the encoding the document declares."""
     try:
-        xml_bytes = xml.encode("utf-8")
-        return ET.fromstring(xml_bytes)
+        return ET.fromstring(xml, xml_parser())
     except ET.ParseError as e:
         raise ValidationError("XML_PARSE_ERROR", str(e)) from e
 
 
+@safe
+def _parse_xml(xml: str) -> ET.Element:
+    """Parses an XML string into an ElementTree Element."""
+    return _fromstring(xml.encode("utf-8"))
+
+
+@safe
+def _parse_xml_bytes(xml: XMLBuffer) -> ET.Element:
+    """Parses raw XML data into an ElementTree Element."""
+    if BLANK_XML.match(xml):
+        raise ValidationError("EMPTY_XML", "Value cannot be empty")
+    return _fromstring(xml)
+
+
 def _parse_xml_with_strip(xml: str) -> Result[ET.Element, ValidationError]:
     """Parses an XML string into an ElementTree Element and strips extra whitespace."""
     return flow(xml, _strip_extra_whitespace, bind(_parse_xml))
@@ -107,24 +262,22 @@ def _is_skippable_error(error: str) -> bool:
     return False
 
 
-def _validate_bpmn_schema(doc: ET.Element) -> List[ValidationError]:
+def _validate_bpmn_schema(doc: ET.Element, backend: SchemaBackend = SchemaBackend.XMLSCHEMA) -> List[ValidationError]:
     """Validates an ElementTree Element against the BPMN 2.0 schema."""
+    if backend is SchemaBackend.LXML and lxml_schema().validate(doc):
+        return []
     return [
         ValidationError("SCHEMA_ERROR", f"{error.reason} ({error.elem.tag.split('}')[-1]})")
-        for error in BPMN_SCHEMA.iter_errors(doc, namespaces=NAMESPACES)
+        for error in bpmn_schema().iter_errors(doc, namespaces=NAMESPACES)
         if not _is_skippable_error(str(error))
     ]
 
 
-def _get_unique_ids(doc: ET.Element) -> List[str]:
-    """Validates that all IDs are unique within the document."""
-    ids = set()
+SPEC_NAMESPACE_PREFIX = "{http://www.omg.org/spec/"
+"""The start of the tags of the elements defined by the BPMN specification, whose IDs must be unique."""
 
-    for elem in doc.findall(".//*[@id]"):
-        elem_id = elem.get("id")
-        ids.add(elem_id)
-
-    return list(ids)
+_NODE_NAMES = frozenset({"startEvent", "activities", "endEvent"})
+"""The local names of the elements that make a process without sequence flows invalid."""
 
 
 def _validate_process_id(process: ET.Element) -> List[ValidationError]:
@@ -134,8 +287,10 @@ def _validate_process_id(process: ET.Element) -> List[ValidationError]:
     return []
 
 
-def _validate_flows(flows: List[ET.Element], ids: List[str]) -> List[ValidationError]:
-    """Validates that all flows have a source and target reference."""
+def _validate_flows(
+    flows: Iterable[Union[ET.Element, Mapping[str, Any]]], ids: Container[str]
+) -> List[ValidationError]:
+    """Validates that all flows have a source and target reference, given as elements or mappings of attributes."""
     errors = []
     for flo in flows:
         flow_id = flo.get("id")
@@ -164,36 +319,174 @@ def _validate_flows(flows: List[ET.Element], ids: List[str]) -> List[ValidationE
     return errors
 
 
-def _validate_sequence_flows(doc: ET.Element, ids: List[str]) -> List[ValidationError]:
-    """Validates that all sequence flows reference existing nodes."""
-    errors = []
+@dataclass
+class _IdScan:
+    """The IDs of a document, collected while walking the tree."""
 
-    for process in doc.findall(".//{*}process"):
-        errors.extend(_validate_process_id(process))
+    ids: set[str] = field(default_factory=set)
+    spec_ids: set[str] = field(default_factory=set)
+    duplicates: dict[str, None] = field(default_factory=dict)
 
-        # Get all flow nodes and sequence flows
-        nodes = (
-            process.findall(".//{*}startEvent")
-            + process.findall(".//{*}activities")
-            + process.findall(".//{*}endEvent")
-        )
-        flows = process.findall(".//{*}sequenceFlow")
+    def visit(self, element: ET.Element) -> None:
+        if (element_id := element.get("id")) is None:
+            return
+        self.ids.add(element_id)
+        if element.tag.startswith(SPEC_NAMESPACE_PREFIX):
+            if element_id in self.spec_ids:
+                self.duplicates[element_id] = None
+            else:
+                self.spec_ids.add(element_id)
 
-        # Check if nodes are connected
-        if nodes and not flows:
-            errors.append(ValidationError("INVALID_STRUCTURE", "Process contains nodes but no sequence flows"))
 
-        errors.extend(_validate_flows(flows, ids))
+@dataclass
+class _ProcessScan:
+    """What the structural checks need from a process, collected while walking the tree."""
+
+    process: ET.Element
+    has_nodes: bool = False
+    flows: list[ET.Element] = field(default_factory=list)
+
+    def visit(self, element: ET.Element) -> None:
+        name = _local_name(element.tag)
+        if name == "sequenceFlow":
+            self.flows.append(element)
+        elif name in _NODE_NAMES:
+            self.has_nodes = True
+
+
+def _validate_structure(doc: ET.Element) -> List[ValidationError]:
+    """
+    Validates the element IDs and the sequence flows of each process, visiting every element once.
+
+    The IDs are collected into sets, so an ID used twice is found as it is seen and each flow reference
+    is checked in constant time. The flows of nested sub-processes are checked with their process.
+    Only the IDs of BPMN elements must be unique: extension elements may use the attribute for other purposes.
+    """
+    id_scan = _IdScan()
+    id_scan.visit(doc)
+    scans: list[_ProcessScan] = []
+    for root_element in doc.iterchildren(ET.Element):
+        if _local_name(root_element.tag) != "process":
+            for element in root_element.iter(ET.Element):
+                id_scan.visit(element)
+            continue
+        scan = _ProcessScan(root_element)
+        scans.append(scan)
+        for element in root_element.iter(ET.Element):
+            id_scan.visit(element)
+            scan.visit(element)
+
+    errors = [
+        ValidationError("DUPLICATE_ID", f"ID '{element_id}' is used by more than one element", element_id)
+        for element_id in id_scan.duplicates
+    ]
+    for scan in scans:
+        errors.extend(_validate_process_id(scan.process))
+        if scan.has_nodes and not scan.flows:
+            errors.append(ValidationError("INVALID_STRUCTURE", "Process contains nodes but no sequence flows"))
+        errors.extend(_validate_flows(scan.flows, id_scan.ids))
 
     return errors
 
 
-def validate(xml: str) -> ValidationResult:
+def _has_nodes_without_flows(process: ET.Element) -> bool:
+    """Check if a process contains nodes but no sequence flows, searching its elements in C."""
+    nodes = process.iter(*(f"{{*}}{name}" for name in _NODE_NAMES))
+    return next(nodes, None) is not None and next(process.iter("{*}sequenceFlow"), None) is None
+
+
+@dataclass(frozen=True)
+class _KnownIds:
+    """The IDs of the changed parts of a document, and of its unchanged parts."""
+
+    changed: set[str]
+    kept: Container[str]
+
+    def __contains__(self, element_id: object) -> bool:
+        return element_id in self.changed or element_id in self.kept
+
+
+def _local_name(tag: str) -> str:
+    """Return the local part of a `{uri}local` tag."""
+    return tag[tag.rfind("}") + 1 :]
+
+
+def parse_xml(xml: str) -> ET._Element:
+    """
+    Parse a BPMN XML string into an `lxml` tree suitable for `validate_element`.
+
+    Args:
+        xml: The BPMN XML string to parse
+
+    Returns:
+        The root element of the parsed document
+
+    Raises:
+        ValidationError: If the string is empty or is not well-formed XML
+    """
+    match _parse_xml_with_strip(xml):
+        case Success(value):
+            return value
+        case Failure(error):
+            raise error
+
+
+def parse_xml_bytes(xml: XMLBuffer) -> ET._Element:
+    """
+    Parse raw BPMN XML data into an `lxml` tree suitable for `validate_element`.
+
+    The data is handed to `lxml` as is, so the encoding declared by the document is honored
+    and no decoded copy is made. Any object supporting the buffer protocol works, including `mmap.mmap`.
+
+    Args:
+        xml: The BPMN XML document
+
+    Returns:
+        The root element of the parsed document
+
+    Raises:
+        ValidationError: If the data is empty or is not well-formed XML
+    """
+    match _parse_xml_bytes(xml):
+        case Success(value):
+            return value
+        case Failure(error):
+            raise error
+
+
+def parse_xml_file(xml_file: IO[bytes]) -> ET._Element:
+    """
+    Parse a BPMN XML document from a binary file object into an `lxml` tree suitable for `validate_element`.
+
+    The file is read in chunks, so the whole document is never held in memory as a `bytes` object.
+
+    Args:
+        xml_file: A file object opened in binary mode
+
+    Returns:
+        The root element of the parsed document
+
+    Raises:
+        ValidationError: If the file is not well-formed XML
+    """
+    try:
+        return ET.parse(xml_file, xml_parser()).getroot()
+    except ET.ParseError as e:
+        raise ValidationError("XML_PARSE_ERROR", str(e)) from e
+
+
+def validate(
+    xml: str,
+    level: Union[ValidationLevel, str] = ValidationLevel.SCHEMA,
+    backend: Union[SchemaBackend, str] = SchemaBackend.XMLSCHEMA,
+) -> ValidationResult:
     """
     Validates a BPMN XML string against the BPMN 2.0 schema and additional rules.
 
     Args:
         xml: The BPMN XML string to validate
+        level: The checks to run. Well-formedness is always checked.
+        backend: The implementation of the schema check
 
     Returns:
         ValidationResult containing validation status and any errors
@@ -208,11 +501,353 @@ def validate(xml: str) -> ValidationResult:
             result.add_errors([error])
             return result
 
-    result.add_errors(_validate_bpmn_schema(doc))
-    if not result.is_valid:
+    return validate_element(doc, level, backend)
+
+
+def validate_element(
+    doc: ET._Element,
+    level: Union[ValidationLevel, str] = ValidationLevel.SCHEMA,
+    backend: Union[SchemaBackend, str] = SchemaBackend.XMLSCHEMA,
+) -> ValidationResult:
+    """
+    Validates an already parsed BPMN document against the BPMN 2.0 schema and additional rules.
+
+    Args:
+        doc: The root element of the parsed BPMN document
+        level: The checks to run
+        backend: The implementation of the schema check. With `"lxml"`, valid documents are checked in C only.
+
+    Returns:
+        ValidationResult containing validation status and any errors
+
+    Raises:
+        ValueError: If `level` is not a validation level, or `backend` is not a schema backend
+    """
+    level = ValidationLevel(level)
+    backend = SchemaBackend(backend)
+    result = ValidationResult()
+    if level is ValidationLevel.OFF:
+        return result
+
+    if level is ValidationLevel.SCHEMA:
+        result.add_errors(_validate_bpmn_schema(doc, backend))
+        if not result.is_valid:
+            return result
+
+    result.add_errors(_validate_structure(doc))
+
+    return result
+
+
+_IDREF_NOT_FOUND = re.compile(r"IDREF '([^']*)' not found")
+"""The schema error of a reference to an ID that the validated document does not have."""
+
+
+def validate_changes(
+    changed: ET._Element,
+    processes: Iterable[ET._Element],
+    kept_ids: Container[str],
+    kept_flows: Iterable[Mapping[str, Optional[str]]] = (),
+    level: Union[ValidationLevel, str] = ValidationLevel.SCHEMA,
+    backend: Union[SchemaBackend, str] = SchemaBackend.XMLSCHEMA,
+) -> ValidationResult:
+    """
+    Validates the changed parts of a document whose other parts passed `validate_element` before.
+
+    The schema and the element checks only visit `changed`, so the cost depends on the size of the change.
+    References from the changed parts into the unchanged ones are resolved with `kept_ids`, and an ID of the
+    changed parts that is also in `kept_ids` is a duplicate.
+
+    Args:
+        changed: A copy of the root element of the document holding only the changed subtrees.
+        processes: The changed processes, as found in the document with all their elements, for the checks
+            that look at a whole process.
+        kept_ids: The IDs of the BPMN elements of the unchanged parts.
+        kept_flows: The `id`, `sourceRef` and `targetRef` attributes of the unchanged sequence flows whose
+            source or target was changed or removed.
+        level: The checks to run
+        backend: The implementation of the schema check
+
+    Returns:
+        ValidationResult containing validation status and any errors
+
+    Raises:
+        ValueError: If `level` is not a validation level, or `backend` is not a schema backend
+    """
+    level = ValidationLevel(level)
+    backend = SchemaBackend(backend)
+    result = ValidationResult()
+    if level is ValidationLevel.OFF:
         return result
 
-    ids = _get_unique_ids(doc)
-    result.add_errors(_validate_sequence_flows(doc, ids))
+    if level is ValidationLevel.SCHEMA:
+        result.add_errors(
+            [
+                error
+                for error in _validate_bpmn_schema(changed, backend)
+                if not ((match := _IDREF_NOT_FOUND.search(error.message)) and match.group(1) in kept_ids)
+            ]
+        )
+        if not result.is_valid:
+            return result
+
+    id_scan = _IdScan()
+    flows: list[Union[ET.Element, Mapping[str, Any]]] = []
+    for element in changed.iter(ET.Element):
+        id_scan.visit(element)
+    for process in changed.iterchildren("{*}process"):
+        flows.extend(process.iter("{*}sequenceFlow"))
+    flows.extend(kept_flows)
+
+    duplicates = dict.fromkeys([*id_scan.duplicates, *(id_ for id_ in id_scan.spec_ids if id_ in kept_ids)])
+    errors = [
+        ValidationError("DUPLICATE_ID", f"ID '{element_id}' is used by more than one element", element_id)
+        for element_id in duplicates
+    ]
+    for process in processes:
+        errors.extend(_validate_process_id(process))
+        if _has_nodes_without_flows(process):
+            errors.append(ValidationError("INVALID_STRUCTURE", "Process contains nodes but no sequence flows"))
+    errors.extend(_validate_flows(flows, _KnownIds(id_scan.ids, kept_ids)))
+    result.add_errors(errors)
 
     return result
+
+
+RuleCheck = Callable[[Any, "RuleContext"], Iterable[Union[str, ValidationError]]]
+"""A rule's check: it receives an element and yields a message, or a `ValidationError`, for each problem."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A semantic check of the parsed model, run on every element of the types it applies to."""
+
+    name: str
+    """The name of the rule, used as the code of the errors it reports from messages."""
+
+    applies_to: tuple[Union["QName", str], ...]
+    """
+    The qualified names of the element types checked, as `QName`s, `{uri}local` or `prefix:local` strings.
+
+    Elements of subtypes are checked too: a rule on `bpmn:flowNode` runs on every task, event and gateway.
+    """
+
+    check: RuleCheck
+    """The check. It must be defined at module level to run in a process pool."""
+
+    def __reduce__(self) -> tuple:
+        # The decorator replaces the check function in its module, so a decorated rule is pickled by name.
+        module, name = self.check.__module__, self.check.__qualname__
+        if _import_rule(module, name) is self:
+            return _import_rule, (module, name)
+        return Rule, (self.name, self.applies_to, self.check)
+
+
+def _import_rule(module: str, name: str) -> Any:
+    """Return the object a module holds under a possibly dotted name, or None if there is none."""
+    value: Any = sys.modules.get(module) or importlib.import_module(module)
+    for attribute in name.split("."):
+        value = getattr(value, attribute, None)
+    return value
+
+
+def rule(*applies_to: Union["QName", str], name: Optional[str] = None) -> Callable[[RuleCheck], Rule]:
+    """
+    Make a rule from a check function.
+
+    Example:
+        ```python
+        @rule("bpmn:exclusiveGateway")
+        def gateway_fan_out(gateway, context):
+            if len(gateway.outgoing) > 5:
+                yield f"Gateway has {len(gateway.outgoing)} outgoing flows"
+        ```
+
+    Args:
+        *applies_to: The qualified names of the element types the rule checks.
+        name: The name of the rule. Defaults to the name of the function.
+
+    Returns:
+        A decorator that turns the function into a `Rule`.
+    """
+
+    def decorator(check: RuleCheck) -> Rule:
+        return Rule(name or check.__name__, applies_to, check)
+
+    return decorator
+
+
+@dataclass(frozen=True)
+class RuleContext:
+    """Where a rule is run."""
+
+    root: Any
+    """The root element being checked: a `Process`, or the definitions for everything outside the processes."""
+
+    elements_by_id: dict[str, Any]
+    """The elements below the root that have an ID, e.g. to find the activity a boundary event is attached to."""
+
+
+@dataclass
+class RuleTiming:
+    """The time spent in one rule."""
+
+    calls: int = 0
+    """The number of elements checked."""
+
+    seconds: float = 0.0
+    """The total time spent checking them, summed over all workers."""
+
+
+@dataclass
+class RuleReport:
+    """The outcome of running rules over a document."""
+
+    errors: list[ValidationError] = field(default_factory=list)
+    """The problems found: those outside the processes first, then those of each process in turn."""
+
+    timings: dict[str, RuleTiming] = field(default_factory=dict)
+    """The time spent in each rule, by rule name."""
+
+    def merge(self, other: "RuleReport") -> None:
+        """Add the errors and timings of another report."""
+        self.errors.extend(other.errors)
+        for name, timing in other.timings.items():
+            total = self.timings.setdefault(name, RuleTiming())
+            total.calls += timing.calls
+            total.seconds += timing.seconds
+
+    def raise_for_errors(self) -> None:
+        """Raises a ValidationError holding the errors in its `errors` attribute, if there are any."""
+        ValidationResult(list(self.errors)).raise_for_errors()
+
+
+class RuleEngine:
+    """
+    Run semantic rules over parsed documents in one traversal of the model.
+
+    Each element is dispatched only to the rules for its type, through an index built once per element class
+    from the qualified names of the class and its bases. Processes are independent, so they can be checked
+    in parallel by an executor.
+    """
+
+    def __init__(self, rules: Iterable[Rule], ns_map: Optional[dict[str, str]] = None):
+        """
+        Create an engine.
+
+        Args:
+            rules: The rules to run.
+            ns_map: Namespace prefixes for the rules' qualified names, besides the BPMN ones and those of the
+                loaded moddle extensions, e.g. `zeebe`.
+        """
+        from pybpmn_parser.bpmn.types import NAMESPACES as BPMN_NAMESPACES
+        from pybpmn_parser.core import QName
+        from pybpmn_parser.plugins.moddle import registry as moddle_registry
+
+        self.rules = list(rules)
+        """The rules, in the order they run on each element."""
+
+        prefixes = {**moddle_registry.namespace_map, **BPMN_NAMESPACES, **(ns_map or {})}
+        self._by_qname: dict["QName", list[Rule]] = {}
+        for checked in self.rules:
+            for name in checked.applies_to:
+                q_name = name if isinstance(name, QName) else QName.from_str(name, prefixes)
+                self._by_qname.setdefault(q_name, []).append(checked)
+        self._dispatch: dict[type, tuple[Rule, ...]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The index holds classes generated from moddle extensions, which cannot be pickled.
+        return {**self.__dict__, "_dispatch": {}}
+
+    def rules_for(self, element_class: type) -> tuple[Rule, ...]:
+        """Return the rules that check the elements of a class, in engine order."""
+        if (rules := self._dispatch.get(element_class)) is None:
+            from pybpmn_parser.element_registry import element_qname
+
+            matching = {
+                id(checked)
+                for base in element_class.__mro__
+                if "Meta" in vars(base)
+                for checked in self._by_qname.get(element_qname(base), ())
+            }
+            rules = self._dispatch[element_class] = tuple(checked for checked in self.rules if id(checked) in matching)
+        return rules
+
+    def check(self, definitions: Any, executor: Optional[Executor] = None) -> RuleReport:
+        """
+        Run the rules over a document.
+
+        Args:
+            definitions: The parsed definitions, e.g. `ParseResult.definition`.
+            executor: Checks the processes in parallel, one task per process. A `ProcessPoolExecutor` needs
+                rules defined at module level. Without one, everything is checked in the calling thread.
+
+        Returns:
+            The problems found and the time spent in each rule.
+        """
+        if (build_pending := getattr(definitions, "build_pending", None)) is not None:
+            # A lazily parsed document keeps the root elements it has not built outside its attributes.
+            build_pending()
+        processes = list(definitions.processes)
+        report = self.check_root(definitions, skip=processes)
+        if executor is None:
+            reports = map(self.check_root, processes)
+        else:
+            reports = (future.result() for future in [executor.submit(self.check_root, root) for root in processes])
+        for process_report in reports:
+            report.merge(process_report)
+        return report
+
+    def check_root(self, root: Any, skip: Iterable[Any] = ()) -> RuleReport:
+        """
+        Run the rules over a root element and everything below it.
+
+        Args:
+            root: The element to start from.
+            skip: Elements below the root that are left out, with everything below them.
+
+        Returns:
+            The problems found and the time spent in each rule.
+        """
+        report = RuleReport()
+        timings = report.timings
+        elements = list(model_elements(root, {id(element) for element in skip}))
+        context = RuleContext(root, {element.id: element for element in elements if getattr(element, "id", None)})
+        for element in elements:
+            for checked in self.rules_for(type(element)):
+                start = time.perf_counter()
+                problems = list(checked.check(element, context))
+                timing = timings.setdefault(checked.name, RuleTiming())
+                timing.calls += 1
+                timing.seconds += time.perf_counter() - start
+                report.errors.extend(
+                    problem
+                    if isinstance(problem, ValidationError)
+                    else ValidationError(checked.name, problem, getattr(element, "id", None))
+                    for problem in problems
+                )
+        return report
+
+
+def model_elements(root: Any, skipped: Container[int] = ()) -> Iterator[Any]:
+    """
+    Yield a model element and every model element below it, depth first in field order.
+
+    Args:
+        root: The element to start from. It is always yielded.
+        skipped: The `id()` of the elements to leave out, with everything below them.
+
+    Yields:
+        The elements.
+    """
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        yield element
+        children = [
+            item
+            for value in vars(element).values()
+            for item in (value if isinstance(value, list) else (value,))
+            if hasattr(type(item), "Meta") and id(item) not in skipped
+        ]
+        stack.extend(reversed(children))
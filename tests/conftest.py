@@ -1,11 +1,22 @@
 """Base class for engine tests."""
 
+import os
 from pathlib import Path
 
 import pytest
 
+from pybpmn_parser.cache import CACHE_DIR_ENV
+
 
 @pytest.fixture(scope="session")
 def fixture_dir() -> Path:
     """Return the path to the fixture directory."""
     return Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Keep the files cached by the tests, such as registry snapshots, out of the user's cache directory."""
+    directory = tmp_path_factory.mktemp("cache")
+    os.environ[CACHE_DIR_ENV] = str(directory)
+    return directory
@@ -0,0 +1,163 @@
+"""Tests for the aio module."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.aio import AsyncParser, aparse_bytes, aparse_file, avalidate
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.parse import ParseCancelledError, Parser
+from pybpmn_parser.validator import SchemaBackend, ValidationError, ValidationLevel
+
+
+@pytest.fixture(scope="module")
+def parser() -> Parser:
+    """A parser shared by the tests of this module."""
+    return Parser()
+
+
+class TestAsyncParser:
+    """Unit tests for the AsyncParser class."""
+
+    @pytest.mark.asyncio
+    async def test_parse_file_matches_sync_parse(self, parser: Parser, fixture_dir: Path):
+        """Parsing a file asynchronously gives the same model as parsing it synchronously."""
+        path = fixture_dir / "kitchen-sink.bpmn"
+        async with AsyncParser(parser) as async_parser:
+            result = await async_parser.parse_file(path)
+
+        expected = parser.parse_file(path)
+        assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected.definition)
+
+    @pytest.mark.asyncio
+    async def test_parse_bytes_and_string(self, parser: Parser, fixture_dir: Path):
+        """Raw data and strings are parsed."""
+        xml_bytes = (fixture_dir / "kitchen-sink.bpmn").read_bytes()
+        async with AsyncParser(parser) as async_parser:
+            from_bytes = await async_parser.parse_bytes(xml_bytes)
+            from_string = await async_parser.parse_string(xml_bytes.decode("utf-8"))
+
+        assert dataclass_to_dict(from_bytes.definition) == dataclass_to_dict(from_string.definition)
+
+    @pytest.mark.asyncio
+    async def test_invalid_document_raises_validation_error(self, parser: Parser):
+        """Errors raised by the parser are raised by the coroutine."""
+        async with AsyncParser(parser) as async_parser:
+            with pytest.raises(ValidationError, match="XML_PARSE_ERROR"):
+                await async_parser.parse_bytes(b"<bpmn:definitions")
+
+    @pytest.mark.asyncio
+    async def test_validate(self, parser: Parser, fixture_dir: Path):
+        """Strings and raw data are validated."""
+        xml_bytes = (fixture_dir / "kitchen-sink.bpmn").read_bytes()
+        async with AsyncParser(parser) as async_parser:
+            assert (await async_parser.validate(xml_bytes)).is_valid
+            assert (await async_parser.validate(xml_bytes.decode("utf-8"))).is_valid
+            result = await async_parser.validate(b"")
+
+        assert result.errors[0].code == "EMPTY_XML"
+
+    @pytest.mark.asyncio
+    async def test_validate_uses_the_parser_settings(self):
+        """Documents are validated at the parser's validation level."""
+        xml = b"""<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+            targetNamespace="http://example.org/bpmn"><bpmn:unknownTag/></bpmn:definitions>"""
+        async with AsyncParser(Parser(validation=ValidationLevel.OFF)) as async_parser:
+            assert (await async_parser.validate(xml)).is_valid
+        async with AsyncParser(Parser(schema_backend=SchemaBackend.LXML)) as async_parser:
+            assert (await async_parser.validate(xml)).errors[0].code == "SCHEMA_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, parser: Parser, mocker):
+        """No more than `max_concurrency` documents are processed at the same time."""
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def slow_parse(xml_bytes, cancel_event=None):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        mocker.patch.object(parser, "parse_bytes", slow_parse)
+        async with AsyncParser(parser, max_concurrency=2) as async_parser:
+            await asyncio.gather(*(async_parser.parse_bytes(b"<x/>") for _ in range(6)))
+
+        assert max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_the_work(self, parser: Parser, mocker):
+        """Cancelling the task sets the cancel event, and the task waits for the work to stop."""
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def endless_parse(xml_bytes, cancel_event=None):
+            started.set()
+            while not cancel_event.wait(0.01):
+                pass
+            stopped.set()
+            raise ParseCancelledError("Parsing was cancelled.")
+
+        mocker.patch.object(parser, "parse_bytes", endless_parse)
+        async with AsyncParser(parser) as async_parser:
+            task = asyncio.create_task(async_parser.parse_bytes(b"<x/>"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert stopped.is_set()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_is_not_blocked(self, parser: Parser, fixture_dir: Path):
+        """Other tasks keep running while a document is parsed."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async with AsyncParser(parser) as async_parser:
+            ticker_task = asyncio.create_task(ticker())
+            await async_parser.parse_file(fixture_dir / "kitchen-sink.bpmn")
+            ticker_task.cancel()
+
+        assert ticks > 1
+
+
+class TestModuleFunctions:
+    """Unit tests for the module-level coroutines."""
+
+    @pytest.mark.asyncio
+    async def test_aparse_file(self, parser: Parser, fixture_dir: Path):
+        """A file is parsed with the given parser."""
+        result = await aparse_file(fixture_dir / "kitchen-sink.bpmn", parser)
+        assert result.definition.id
+
+    @pytest.mark.asyncio
+    async def test_aparse_bytes_uses_a_default_parser(self, fixture_dir: Path):
+        """A default parser is used when none is given."""
+        result = await aparse_bytes((fixture_dir / "kitchen-sink.bpmn").read_bytes())
+        assert result.definition.id
+
+    @pytest.mark.asyncio
+    async def test_avalidate(self):
+        """Invalid documents produce a failed ValidationResult."""
+        result = await avalidate("<root>")
+        assert not result.is_valid
+        assert result.errors[0].code == "XML_PARSE_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_avalidate_with_a_parser(self):
+        """The given parser's validation level is used."""
+        result = await avalidate(b"<root/>", Parser(validation=ValidationLevel.OFF))
+        assert result.is_valid
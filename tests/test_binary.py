@@ -0,0 +1,197 @@
+"""Tests for the binary module."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.binary import BinaryElementView, BinaryModel, write_binary
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.parse import Parser
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = sorted(FIXTURE_DIR.glob("**/*.bpmn"))
+
+DOCUMENT_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  xmlns:zeebe="http://camunda.org/schema/zeebe/1.0"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1" isExecutable="true">
+    <bpmn:serviceTask id="Task_1" name="Ship">
+      <bpmn:documentation>Ships the order</bpmn:documentation>
+      <bpmn:extensionElements>
+        <zeebe:taskDefinition type="ship" retries="3" />
+      </bpmn:extensionElements>
+      <bpmn:outgoing>Flow_1</bpmn:outgoing>
+    </bpmn:serviceTask>
+    <bpmn:endEvent id="End_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Task_1" targetRef="End_1" />
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Task_1_di" bpmnElement="Task_1">
+        <dc:Bounds x="160" y="80" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+def reference_keys(references) -> list[tuple]:
+    """Return references in a stable order."""
+    return sorted((ref.element_id or "", ref.property, ref.reference_id) for ref in references)
+
+
+@pytest.fixture
+def result():
+    """The parsed test document."""
+    return Parser().parse_bytes(DOCUMENT_XML)
+
+
+@pytest.fixture
+def model(result):
+    """The test document in the binary format."""
+    buffer = io.BytesIO()
+    write_binary(result, buffer)
+    return BinaryModel(buffer.getvalue())
+
+
+class TestBinaryModel:
+    """Unit tests for the BinaryModel class."""
+
+    @pytest.mark.parametrize("bpmn_file", FIXTURES, ids=lambda path: path.stem)
+    def test_round_trip(self, bpmn_file: Path):
+        """Building a written model gives back an equal model, with its IDs and references."""
+        parsed = Parser().parse_file(bpmn_file)
+        buffer = io.BytesIO()
+
+        count = write_binary(parsed, buffer)
+        model = BinaryModel(buffer.getvalue())
+        loaded = model.to_result()
+
+        assert len(model) == count
+        assert loaded.definition == parsed.definition
+        assert loaded.elements_by_id.keys() == parsed.elements_by_id.keys()
+        assert reference_keys(loaded.references) == reference_keys(parsed.references)
+        assert reference_keys(model.references) == reference_keys(parsed.references)
+
+    def test_elements_by_id(self, model, result):
+        """Every ID is found by binary search, and unknown IDs are missing."""
+        assert set(model.elements_by_id) == set(result.elements_by_id)
+        assert len(model.elements_by_id) == len(result.elements_by_id)
+        for element_id in result.elements_by_id:
+            assert model.elements_by_id[element_id].id == element_id
+        assert "Task_2" not in model.elements_by_id
+
+    def test_open_maps_the_file(self, result, tmp_path: Path):
+        """A model opened from a file can be read until it is closed."""
+        path = tmp_path / "model.bin"
+        with path.open("wb") as fp:
+            write_binary(result, fp)
+
+        with BinaryModel.open(path) as model:
+            assert model.elements_by_id["Task_1"].name == "Ship"
+            assert model.root.processes[0].id == "Process_1"
+
+        assert model._mmap is None
+        assert model.closed
+
+    def test_close_with_string_bytes_held(self, result, tmp_path: Path):
+        """The bytes of a string outlive the model, so holding them doesn't stop it from closing."""
+        path = tmp_path / "model.bin"
+        with path.open("wb") as fp:
+            write_binary(result, fp)
+        model = BinaryModel.open(path)
+        element_id = model.string_bytes(model._ids[0])
+
+        model.close()
+
+        assert isinstance(element_id, bytes)
+        assert element_id.decode() in result.elements_by_id
+        assert model._mmap is None
+
+    def test_close_twice(self, model):
+        """Closing a closed model does nothing."""
+        model.close()
+        model.close()
+
+        assert model.closed
+
+    def test_closed_model(self, model):
+        """Reading a closed model, or a view of it, is a clear error."""
+        task = model.elements_by_id["Task_1"]
+        assert task.name == "Ship"
+
+        model.close()
+
+        with pytest.raises(ValueError, match="model is closed"):
+            _ = task.name
+        with pytest.raises(ValueError, match="model is closed"):
+            _ = model.root.id
+        with pytest.raises(ValueError, match="model is closed"):
+            _ = model.elements_by_id["Task_1"]
+        with pytest.raises(ValueError, match="model is closed"):
+            len(model)
+        with pytest.raises(ValueError, match="model is closed"):
+            model.string(0)
+
+    def test_not_a_model(self):
+        """Buffers that don't hold a model are rejected."""
+        with pytest.raises(ValueError, match="Not a binary model"):
+            BinaryModel(b"<?xml version='1.0'?><definitions/>")
+
+
+class TestBinaryElementView:
+    """Unit tests for the BinaryElementView class."""
+
+    def test_properties(self, model):
+        """Properties read like those of the element; lists are tuples and children are views."""
+        task = model.elements_by_id["Task_1"]
+
+        assert (task.name, task.outgoing, task.start_quantity, task.is_for_compensation) == (
+            "Ship",
+            ("Flow_1",),
+            1,
+            False,
+        )
+        assert task.qname == QName(uri=NAMESPACES["bpmn"], local="serviceTask")
+        assert task.element_type.__name__ == "ServiceTask"
+        assert task.documentation[0].content == "Ships the order"
+        bounds = model.elements_by_id["Task_1_di"].bounds
+        assert (bounds.x, bounds.width) == (160.0, 100.0)
+
+    def test_extension_elements(self, model):
+        """Extra attributes are read like properties, including extension elements."""
+        definition = model.elements_by_id["Task_1"].extension_elements.zeebe_task_definition
+
+        assert isinstance(definition, BinaryElementView)
+        assert (definition.type, definition.retries) == ("ship", "3")
+
+    def test_tree(self, model):
+        """Views know their parent and their children."""
+        task = model.elements_by_id["Task_1"]
+
+        assert task.parent == model.elements_by_id["Process_1"]
+        assert task in task.parent.children
+        assert model.root.parent is None
+        assert model.root == model.element(0)
+
+    def test_read_only(self, model):
+        """Views can't be changed, and unknown attributes are missing."""
+        task = model.elements_by_id["Task_1"]
+
+        with pytest.raises(AttributeError, match="read-only"):
+            task.name = "Send"
+        with pytest.raises(AttributeError, match="no attribute"):
+            _ = task.no_such_property
+
+    def test_to_element(self, model, result):
+        """A view builds the element it shows, with the elements below it."""
+        task = model.elements_by_id["Task_1"].to_element()
+
+        assert task == result.elements_by_id["Task_1"]
+        assert type(task.extension_elements.zeebe_task_definition).__name__ == "TaskDefinition"
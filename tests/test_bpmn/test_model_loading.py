@@ -0,0 +1,100 @@
+"""Tests for loading the element model on demand."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pybpmn_parser.bpmn
+from pybpmn_parser.bpmn import ELEMENT_CLASSES, import_class, load_classes
+from pybpmn_parser.element_registry import element_qname, registry
+
+REPO_DIR = Path(__file__).parent.parent.parent
+
+# Reports what importing a module costs: the model modules it loads and the descriptors it builds.
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+from pybpmn_parser.element_registry import registry
+print(json.dumps({
+    "modules": sorted(name for name in sys.modules if name.startswith("pybpmn_parser.bpmn.")),
+    "descriptors": len(registry._descriptors),
+    "seconds": elapsed,
+}))
+"""
+
+PACKAGE_IMPORT_BUDGET = 0.1
+"""Seconds `pybpmn_parser.bpmn` may take to import by itself. Loading every class took about 0.5."""
+
+
+def import_cost(module: str) -> dict:
+    """Import a module in a fresh interpreter and report what it loaded."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_SCRIPT, module], capture_output=True, text=True, check=True, cwd=REPO_DIR
+    )
+    return json.loads(output.stdout)
+
+
+def package_self_import_time() -> float:
+    """Return the seconds spent in the body of `pybpmn_parser/bpmn/__init__.py`, dependencies excluded."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pybpmn_parser.bpmn"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_DIR,
+    )
+    for line in output.stderr.splitlines():
+        _, self_us, _, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == "pybpmn_parser.bpmn":
+            return int(self_us) / 1_000_000
+    raise AssertionError("pybpmn_parser.bpmn was not imported")
+
+
+class TestImportBudget:
+    """Importing the library does not load the element model."""
+
+    def test_validator_loads_no_model(self):
+        """The validator works without the model."""
+        assert import_cost("pybpmn_parser.validator")["modules"] == []
+
+    def test_parser_loads_almost_no_model(self):
+        """Importing the parser loads a handful of model modules and builds no descriptor."""
+        cost = import_cost("pybpmn_parser.parse")
+
+        assert len(cost["modules"]) <= 5, cost["modules"]
+        assert cost["descriptors"] == 0
+
+    def test_package_import_time(self):
+        """Importing the model package stays cheap."""
+        assert package_self_import_time() < PACKAGE_IMPORT_BUDGET
+
+
+class TestElementClasses:
+    """Unit tests for the index of the element classes."""
+
+    def test_index_covers_every_registered_class(self):
+        """Every class of the model registers under a name of the index, which points to its final class."""
+        load_classes()
+        for module_name, module in list(sys.modules.items()):
+            if not module_name.startswith("pybpmn_parser.bpmn."):
+                continue
+            for element in vars(module).values():
+                if isinstance(element, type) and element.__module__ == module_name and "__reduce__" in vars(element):
+                    assert element_qname(element) in ELEMENT_CLASSES, element
+
+    def test_index_points_to_classes_with_that_name(self):
+        """Each indexed class is registered under its qualified name."""
+        for q_name, import_path in ELEMENT_CLASSES.items():
+            element = import_class(import_path)
+
+            assert element_qname(element) == q_name
+            assert registry.by_qname[q_name].type is element
+
+    def test_classes_are_package_attributes(self):
+        """The classes are imported when read from the package."""
+        from pybpmn_parser.bpmn.process.process import Process
+
+        assert pybpmn_parser.bpmn.Process is Process
@@ -0,0 +1,274 @@
+"""Tests for the cache module."""
+
+import io
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.cache import MAC_SIZE, ParseCache, read_verified, write_verified
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.parse import Parser
+
+CACHE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:startEvent id="Start_1" />
+    <bpmn:task id="Task_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Task_1" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+def document(number: int) -> bytes:
+    """Return a distinct document."""
+    return CACHE_XML.replace(b"Process_1", f"Process_{number}".encode())
+
+
+def fail_parsing(*args, **kwargs):
+    """Stand in for the XML parser when a test expects no XML work."""
+    raise AssertionError("The document was parsed")
+
+
+class StaleEntry:
+    """Pickles to an object that fails to load with a `ValueError`, like an entry of an older version."""
+
+    def __reduce__(self):
+        return int, ("not a number",)
+
+
+class TestParseCache:
+    """Unit tests for the ParseCache class."""
+
+    def test_memory_hit_skips_parsing(self, mocker):
+        """A second parse of the same document is answered from memory, as an independent copy."""
+        cache = ParseCache()
+        parser = Parser(cache=cache)
+        first = parser.parse_bytes(CACHE_XML)
+        mocker.patch("pybpmn_parser.parse.Parser._parse_tree", fail_parsing)
+
+        second = parser.parse_bytes(CACHE_XML)
+
+        assert dataclass_to_dict(second.definition) == dataclass_to_dict(first.definition)
+        assert second.definition is not first.definition
+        assert second.elements_by_id["Task_1"] is second.definition.processes[0].tasks[0]
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_all_sources_share_entries(self, tmp_path: Path):
+        """Files, file objects, bytes and strings of the same document have the same key."""
+        path = tmp_path / "doc.bpmn"
+        path.write_bytes(CACHE_XML)
+        cache = ParseCache()
+        parser = Parser(cache=cache)
+
+        parser.parse_file(path)
+        parser.parse_file(path, memory_map=True)
+        parser.parse_fileobj(io.BytesIO(CACHE_XML))
+        parser.parse_string(CACHE_XML.decode())
+
+        assert (cache.stats.hits, cache.stats.misses, len(cache)) == (3, 1, 1)
+
+    def test_disk_tier_survives_the_process(self, tmp_path: Path):
+        """A new cache over the same directory finds the entries written earlier."""
+        Parser(cache=ParseCache(directory=tmp_path)).parse_bytes(CACHE_XML)
+        cache = ParseCache(directory=tmp_path)
+
+        result = Parser(cache=cache).parse_bytes(CACHE_XML)
+
+        assert result.definition.processes[0].id == "Process_1"
+        assert (cache.stats.disk_hits, cache.stats.misses) == (1, 0)
+
+    def test_parser_options_change_the_key(self):
+        """Parsers with different options don't share entries."""
+        cache = ParseCache()
+
+        Parser(cache=cache).parse_bytes(CACHE_XML)
+        Parser(cache=cache, skip_diagrams=True).parse_bytes(CACHE_XML)
+
+        assert Parser().fingerprint != Parser(validation="off").fingerprint
+        assert cache.stats.misses == 2
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        """Entries beyond the memory budget are evicted, oldest first."""
+        parser = Parser()
+        sizes = []
+        for number in range(3):
+            probe = ParseCache()
+            Parser(cache=probe).parse_bytes(document(number))
+            sizes.append(probe._memory_bytes)
+        cache = ParseCache(max_memory_bytes=sizes[0] + sizes[1] + 10)
+        parser.cache = cache
+
+        for number in (0, 1, 0, 2):
+            parser.parse_bytes(document(number))
+
+        assert cache.stats.memory_evictions == 1
+        parser.parse_bytes(document(0))
+        assert cache.stats.memory_hits == 2
+
+    def test_disk_budget_evicts_least_recently_used(self, tmp_path: Path):
+        """Files beyond the disk budget are deleted, oldest first."""
+        probe = ParseCache(directory=tmp_path / "probe")
+        Parser(cache=probe).parse_bytes(document(0))
+        size = probe._disk_bytes
+        cache = ParseCache(max_memory_bytes=0, directory=tmp_path / "cache", max_disk_bytes=2 * size + 10)
+        parser = Parser(cache=cache)
+
+        for number in range(3):
+            parser.parse_bytes(document(number))
+
+        assert cache.stats.disk_evictions == 1
+        assert len(list((tmp_path / "cache").glob("*.pickle"))) == 2
+
+    def test_disk_budget_covers_other_processes(self, tmp_path: Path):
+        """Once over budget, a cache also evicts the files other caches over its directory wrote."""
+        probe = ParseCache(directory=tmp_path / "probe")
+        Parser(cache=probe).parse_bytes(document(0))
+        size = probe._disk_bytes
+        directory = tmp_path / "cache"
+        first, second = (
+            ParseCache(max_memory_bytes=0, directory=directory, max_disk_bytes=2 * size + 10) for _ in range(2)
+        )
+
+        for number in range(2):
+            Parser(cache=first).parse_bytes(document(number))
+        for number in range(2, 5):
+            Parser(cache=second).parse_bytes(document(number))
+
+        assert second.stats.disk_evictions == 3
+        assert len(list(directory.glob("*.pickle"))) == 2
+        assert second._disk_bytes <= second.max_disk_bytes
+
+    def test_damaged_file_is_a_miss(self, tmp_path: Path):
+        """A file that cannot be unpickled is deleted and the document is parsed again."""
+        cache = ParseCache(max_memory_bytes=0, directory=tmp_path)
+        parser = Parser(cache=cache)
+        parser.parse_bytes(CACHE_XML)
+        (path,) = tmp_path.glob("*.pickle")
+        path.write_bytes(b"damaged")
+
+        result = parser.parse_bytes(CACHE_XML)
+
+        assert result.definition.id == "Definitions_1"
+        assert cache.stats.misses == 2
+
+    def test_unverified_file_is_not_unpickled(self, tmp_path: Path, mocker):
+        """A file replaced by a pickle without the right MAC is deleted without being unpickled."""
+        cache = ParseCache(max_memory_bytes=0, directory=tmp_path)
+        parser = Parser(cache=cache)
+        parser.parse_bytes(CACHE_XML)
+        (path,) = tmp_path.glob("*.pickle")
+        path.write_bytes(bytes(MAC_SIZE) + pickle.dumps(parser.parse_bytes(CACHE_XML)))
+        loads = mocker.spy(pickle, "loads")
+
+        result = parser.parse_bytes(CACHE_XML)
+
+        assert result.definition.id == "Definitions_1"
+        loads.assert_not_called()
+        assert cache.stats.disk_hits == 1
+        assert cache.stats.misses == 2
+        assert cache.get(cache.key(CACHE_XML, parser.fingerprint)) is not None
+
+    def test_stale_file_is_a_miss(self, tmp_path: Path):
+        """A verified file whose objects fail to load, e.g. after a class changed, is deleted and reparsed."""
+        cache = ParseCache(max_memory_bytes=0, directory=tmp_path)
+        parser = Parser(cache=cache)
+        parser.parse_bytes(CACHE_XML)
+        (path,) = tmp_path.glob("*.pickle")
+        write_verified(path, pickle.dumps(StaleEntry()), path.stem)
+        assert read_verified(path, path.stem) is not None
+
+        result = parser.parse_bytes(CACHE_XML)
+
+        assert result.definition.id == "Definitions_1"
+        assert cache.stats.misses == 2
+
+    def test_unpicklable_results_are_rejected(self):
+        """A result that cannot be pickled is returned but not stored."""
+        cache = ParseCache()
+        result = Parser().parse_bytes(CACHE_XML)
+        result.definition.processes[0].callback = lambda: None
+
+        cache.put("key", result)
+
+        assert cache.stats.rejected == 1
+        assert cache.get("key") is None
+
+    def test_clear(self, tmp_path: Path):
+        """Clearing drops every entry from both tiers."""
+        cache = ParseCache(directory=tmp_path)
+        Parser(cache=cache).parse_bytes(CACHE_XML)
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert not list(tmp_path.glob("*.pickle"))
+
+    def test_validation_errors_are_not_cached(self):
+        """Invalid documents raise every time."""
+        from pybpmn_parser.validator import ValidationError
+
+        cache = ParseCache()
+        parser = Parser(cache=cache)
+
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                parser.parse_bytes(b"<bpmn:definitions")
+
+        assert len(cache) == 0
+
+    def test_pickles_its_settings(self, tmp_path: Path):
+        """A pickled cache, as sent to a worker process, shares the on-disk tier but not the memory tier."""
+        cache = ParseCache(max_memory_bytes=1024, directory=tmp_path)
+        Parser(cache=cache).parse_bytes(CACHE_XML)
+
+        copy = pickle.loads(pickle.dumps(cache))
+
+        assert (copy.max_memory_bytes, copy.directory) == (1024, tmp_path)
+        assert Parser(cache=copy).parse_bytes(CACHE_XML).definition.id == "Definitions_1"
+        assert (copy.stats.memory_hits, copy.stats.disk_hits) == (0, 1)
+
+
+class TestVerifiedFiles:
+    """Unit tests for the write_verified and read_verified functions."""
+
+    def test_round_trip(self, tmp_path: Path):
+        """A file is read back with the key it was written with, and the directory is created private."""
+        path = tmp_path / "cache" / "file.pickle"
+
+        write_verified(path, b"payload", "key")
+
+        assert read_verified(path, "key") == b"payload"
+        if os.name == "posix":
+            assert path.parent.stat().st_mode & 0o777 == 0o700
+
+    @pytest.mark.parametrize(
+        "damage", [lambda data: data[:-1] + b"!", lambda data: data[MAC_SIZE:]], ids=["payload", "mac"]
+    )
+    def test_damaged_files_are_rejected(self, tmp_path: Path, damage):
+        """A file whose payload doesn't match its HMAC is rejected."""
+        path = tmp_path / "file.pickle"
+        write_verified(path, b"payload", "key")
+        path.write_bytes(damage(path.read_bytes()))
+
+        assert read_verified(path, "key") is None
+
+    def test_other_keys_are_rejected(self, tmp_path: Path):
+        """A file written for another key, e.g. by another version of the library, is rejected."""
+        path = tmp_path / "file.pickle"
+        write_verified(path, b"payload", "key")
+
+        assert read_verified(path, "other key") is None
+        assert read_verified(tmp_path / "missing.pickle", "key") is None
+
+    @pytest.mark.skipif(os.name != "posix", reason="needs POSIX permissions")
+    def test_files_others_can_write_are_rejected(self, tmp_path: Path):
+        """A file that other users can write may have been replaced, so it is rejected."""
+        path = tmp_path / "file.pickle"
+        write_verified(path, b"payload", "key")
+        path.chmod(0o666)
+
+        assert read_verified(path, "key") is None
@@ -1,12 +1,18 @@
 """Tests for the core module."""
 
+import io
+import json
+import pickle
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
 import pytest
 
 from pybpmn_parser.core import (
+    NamespaceContext,
     QName,
     _convert,
     _enum_to_primitive,
@@ -16,6 +22,7 @@ from pybpmn_parser.core import (
     default_empty_predicate,
     get_fields_by_metadata,
     index_ids,
+    write_json,
 )
 
 
@@ -124,6 +131,45 @@ class TestQName:
         assert qname == expected
 
 
+class TestNamespaceContext:
+    """Tests for the NamespaceContext class."""
+
+    def test_equal_maps_are_interned(self):
+        """Equal namespace maps give the same context."""
+        first = NamespaceContext.of({"a": "urn:a", "b": "urn:b"})
+        second = NamespaceContext.of({"b": "urn:b", "a": "urn:a"})
+        assert first is second
+        assert NamespaceContext.of(first) is first
+
+    def test_different_maps_have_different_ids(self):
+        """Different namespace maps give contexts with different IDs."""
+        assert NamespaceContext.of({"a": "urn:a"}).context_id != NamespaceContext.of({"a": "urn:other"}).context_id
+
+    def test_with_declarations_copies_on_write(self):
+        """New declarations give another context and never change the original one."""
+        parent = NamespaceContext.of({"a": "urn:a"})
+
+        child = parent.with_declarations({"b": "urn:b"})
+
+        assert child == {"a": "urn:a", "b": "urn:b"}
+        assert parent == {"a": "urn:a"}
+        assert parent.with_declarations({}) is parent
+        assert parent.with_declarations({"a": "urn:a"}) is parent
+
+    def test_is_immutable(self):
+        """A context can't be modified in place."""
+        context = NamespaceContext.of({"a": "urn:a"})
+        with pytest.raises(TypeError):
+            context["b"] = "urn:b"
+        with pytest.raises(TypeError):
+            context.update({"b": "urn:b"})
+
+    def test_pickles_to_the_interned_context(self):
+        """A pickled context is restored as the interned one."""
+        context = NamespaceContext.of({"a": "urn:a"})
+        assert pickle.loads(pickle.dumps(context)) is context
+
+
 class TestDefaultEmptyPredicate:
     """Unit tests for the default_empty_predicate function."""
 
@@ -308,6 +354,48 @@ class TestConvert:
         expected: dict[str, Any] = {}
         assert _convert(data, skip_empty=True, empty_predicate=custom_predicate) == expected
 
+    def test_convert_deeply_nested(self):
+        """Test that the depth of a value is not limited by the recursion limit."""
+        data: list[Any] = []
+        innermost = data
+        for _ in range(sys.getrecursionlimit() * 2):
+            innermost.append([])
+            innermost = innermost[0]
+        innermost.append("leaf")
+
+        result = _convert(data)
+        for _ in range(sys.getrecursionlimit() * 2):
+            result = result[0]
+        assert result == ["leaf"]
+
+    def test_convert_cycle_emits_the_id(self):
+        """Test that an object containing itself is replaced with its ID inside itself."""
+        element = ExampleElement(id="Task_1", value=None)
+        element.value = [element]
+
+        assert _convert(element) == {"id": "Task_1", "value": ["Task_1"]}
+
+    def test_convert_shared_objects_are_not_cycles(self):
+        """Test that an object referenced twice, but not from itself, is converted both times."""
+        shared = ExampleElement(id="shared", value="A")
+
+        assert _convert([shared, shared]) == [{"id": "shared", "value": "A"}] * 2
+
+    def test_convert_json_compatible(self):
+        """Test that the JSON-compatible mode only produces types JSON libraries serialize natively."""
+
+        class Color(Enum):
+            RED = 1
+
+        data = {Color.RED: b"red", 2: {"qname": QName("task", "urn:x")}, "set": {1}, "object": object()}
+        result = _convert(data, enum_as="name", json_compatible=True)
+
+        assert result["RED"] == "red"
+        assert result["2"] == {"qname": {"local": "task", "uri": "urn:x"}}
+        assert result["set"] == [1]
+        assert result["object"].startswith("<object object")
+        assert json.loads(json.dumps(result)) == result
+
 
 class TestConvertDict:
     """Unit tests for the convert_dict function."""
@@ -345,6 +433,12 @@ class TestConvertDict:
         result = convert_dict(data, empty_predicate=None, enum_as="value", skip_empty=False)
         assert result == expected
 
+    def test_convert_dict_nested_skip_empty(self):
+        """Test that empty values are skipped in nested dictionaries and lists as well."""
+        data = {"key1": {"nested_key": None, "kept": 1}, "key2": {"nested_key": ""}, "key3": [None, {"a": ""}]}
+        result = convert_dict(data, empty_predicate=None, enum_as="value", skip_empty=True)
+        assert result == {"key1": {"kept": 1}}
+
     def test_convert_dict_with_custom_empty_predicate(self):
         """Test converting a dictionary with a custom empty predicate."""
         data = {"key1": 0, "key2": "value2"}
@@ -489,6 +583,20 @@ class TestDataclassToDict:
         assert mock_convert.call_args[1]["skip_empty"] is True
         assert mock_convert.call_args[1]["empty_predicate"] == custom_predicate
 
+    def test_orjson_serializes_json_compatible_output(self):
+        """Test that orjson serializes the JSON-compatible output without a default hook."""
+        orjson = pytest.importorskip("orjson")
+
+        @dataclass
+        class DataclassWithExtra:
+            __extra_kwargs__ = {"{urn:vendor}key": b"value"}
+            field_one: Enum
+
+        instance = DataclassWithExtra(field_one=self.ExampleEnum.FIRST)
+        result = dataclass_to_dict(instance, json_compatible=True)
+
+        assert orjson.loads(orjson.dumps(result)) == {"field_one": "first", "{urn:vendor}key": "value"}
+
 
 @dataclass
 class ExampleElement:
@@ -570,3 +678,69 @@ class TestIndexIds:
         container = ExampleContainer(elements=[nested_1, nested_2])
         result = index_ids(container)
         assert result == {"nested1": nested_1, "nested2": nested_2}
+
+
+class TestWriteJson:
+    """Unit tests for the write_json function."""
+
+    @staticmethod
+    def written(value: Any, **options: Any) -> str:
+        """Return what write_json writes for a value."""
+        buffer = io.StringIO()
+        write_json(value, buffer, **options)
+        return buffer.getvalue()
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            ExampleContainer([ExampleElement("1", ExampleEnum.VALUE_ONE), ExampleElement("2", [None, "", 1.5])]),
+            {"a": {}, "b": [], "c": [[], {"d": None}], "e": 0, "f": False},
+            [],
+            "text",
+            None,
+        ],
+    )
+    @pytest.mark.parametrize("indent", [None, 2])
+    @pytest.mark.parametrize("skip_empty", [False, True])
+    def test_same_as_dumping_the_converted_value(self, value: Any, indent: Any, skip_empty: bool):
+        """Test that the output is that of json.dumps on the JSON-compatible conversion."""
+        expected = json.dumps(
+            dataclass_to_dict(value, skip_empty=skip_empty, json_compatible=True), indent=indent, sort_keys=True
+        )
+        assert self.written(value, skip_empty=skip_empty, indent=indent, sort_keys=True) == expected
+
+    def test_empty_containers_are_skipped(self):
+        """Test that with skip_empty, containers without non-empty items are left out, but not the root."""
+        assert self.written({"a": {"b": [None, {"c": ""}]}, "d": 1}, skip_empty=True) == '{"d": 1}'
+        assert self.written({"a": {"b": None}}, skip_empty=True) == "{}"
+
+    def test_cycles_are_written_as_ids(self):
+        """Test that an object containing itself is written as its ID inside itself."""
+        element = ExampleElement(id="Task_1", value=None)
+        element.value = [element]
+
+        assert self.written(element) == '{"id": "Task_1", "value": ["Task_1"]}'
+
+    def test_writes_fixture_files(self, fixture_dir: Path):
+        """Test that the expected fixture files are written as they are stored."""
+        from pybpmn_parser.parse import Parser
+
+        result = Parser().parse_file(fixture_dir / "kitchen-sink.bpmn")
+        expected = (fixture_dir / "kitchen-sink.json").read_text(encoding="utf-8")
+
+        assert self.written(result, skip_empty=True, indent=2, sort_keys=True) == expected
+
+    def test_writes_incrementally(self, fixture_dir: Path):
+        """Test that a large value is written in several pieces rather than at once."""
+        from pybpmn_parser.parse import Parser
+
+        result = Parser().parse_file(fixture_dir / "kitchen-sink.bpmn")
+        pieces: list[str] = []
+
+        class Recorder:
+            write = pieces.append
+
+        write_json(result, Recorder())
+
+        assert len(pieces) > 1
+        assert json.loads("".join(pieces)) == dataclass_to_dict(result, json_compatible=True)
@@ -0,0 +1,92 @@
+"""Tests for the diff module."""
+
+from pybpmn_parser.diff import ChangeKind, diff
+from pybpmn_parser.parse import Parser
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:task id="Task_1" name="{task_name}" />
+    <bpmn:task id="Task_2" name="Pack" />{extra_elements}
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Task_1_di" bpmnElement="Task_1">
+        <dc:Bounds x="{task_x}" y="80" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+def parse(task_name: str = "Ship", task_x: int = 160, extra_elements: str = ""):
+    """Parse the test document."""
+    return Parser().parse_string(
+        DOCUMENT_XML.format(task_name=task_name, task_x=task_x, extra_elements=extra_elements)
+    )
+
+
+class TestDiff:
+    """Unit tests for the diff function."""
+
+    def test_equal_models_have_no_changes(self):
+        """Two parses of the same document, or of a reformatted one, do not differ."""
+        assert diff(parse(), parse()) == []
+        assert diff(parse(), parse(task_name=" Ship\n")) == []
+
+    def test_changed_property(self):
+        """A changed attribute is reported with its path, its element and both values."""
+        (change,) = diff(parse(), parse(task_name="Send"))
+
+        assert change.kind is ChangeKind.CHANGED
+        assert change.path == "processes[Process_1].tasks[Task_1].name"
+        assert (change.element_id, change.property, change.old, change.new) == ("Task_1", "name", "Ship", "Send")
+
+    def test_added_and_removed_elements(self):
+        """Elements are matched by ID, so adding one is reported once, and removing it as well."""
+        extended = parse(extra_elements='\n    <bpmn:userTask id="Task_3" name="Check" />')
+
+        (added,) = diff(parse(), extended)
+        (removed,) = diff(extended, parse())
+
+        assert (added.kind, added.path, added.element_id) == (
+            ChangeKind.ADDED,
+            "processes[Process_1].user_tasks[Task_3]",
+            "Task_3",
+        )
+        assert added.new.name == "Check"
+        assert (removed.kind, removed.element_id, removed.old.name) == (ChangeKind.REMOVED, "Task_3", "Check")
+
+    def test_moved_elements_are_not_changes(self):
+        """Reordering elements with an ID is neither reported nor hashed as a change of their parent."""
+        old = parse(extra_elements='\n    <bpmn:task id="Task_3" name="Check" />')
+        new = Parser().parse_string(
+            DOCUMENT_XML.format(task_name="Ship", task_x=160, extra_elements="").replace(
+                '<bpmn:task id="Task_1"', '<bpmn:task id="Task_3" name="Check" />\n    <bpmn:task id="Task_1"'
+            )
+        )
+
+        assert [task.id for task in new.definition.processes[0].tasks] == ["Task_3", "Task_1", "Task_2"]
+        assert diff(old, new) == []
+
+    def test_changes_below_elements_without_an_id(self):
+        """A change in an element without an ID names the closest element above it with one."""
+        (change,) = diff(parse(), parse(task_x=200))
+
+        assert change.path == "bpmndiagrams[Diagram_1].plane.bpmn_shapes[Task_1_di].bounds.x"
+        assert (change.element_id, change.property, change.old, change.new) == ("Task_1_di", "x", 160.0, 200.0)
+
+    def test_di_can_be_ignored(self):
+        """With `ignore_di`, layout changes are not reported."""
+        assert diff(parse(), parse(task_x=200), ignore_di=True) == []
+        assert len(diff(parse(), parse(task_name="Send", task_x=200), ignore_di=True)) == 1
+
+    def test_accepts_model_elements(self):
+        """The roots of two models can be compared directly."""
+        (change,) = diff(parse().definition, parse(task_name="Send").definition)
+
+        assert change.new == "Send"
@@ -1,6 +1,7 @@
 """Tests for the element_registry module."""
 
 from dataclasses import dataclass, field
+from inspect import signature
 from types import NoneType
 from typing import Dict, List, Optional, Union
 
@@ -11,9 +12,11 @@ from pybpmn_parser.core import QName
 from pybpmn_parser.element_registry import (
     ElementDescriptor,
     ElementProperty,
+    ElementRegistry,
     dataclass_fields,
     descriptor_from_class,
     get_base_type,
+    make_from_kwargs,
     type_hint_to_property,
 )
 
@@ -253,3 +256,173 @@ class TestDescriptorFromClass:
         descriptor = descriptor_from_class(NoMetadataElement)
         assert len(descriptor.properties) == 1
         assert QName(uri="http://example.org", local="field_one") in descriptor.properties
+
+
+class TestMakeFromKwargs:
+    """Unit tests for the make_from_kwargs function."""
+
+    @dataclass
+    class ExampleElement:
+        """Example element class to test make_from_kwargs."""
+
+        class Meta:
+            name = "ExampleElement"
+            namespace = "http://example.com"
+
+        id: str
+        names: list[str] = field(default_factory=list)
+
+    def test_native_arguments_only(self):
+        """Instances without extra arguments get no `__extra_kwargs__` attribute."""
+        from_kwargs = make_from_kwargs(self.ExampleElement)
+
+        instance = from_kwargs(self.ExampleElement, id="E1", names=["a"])
+
+        assert instance == self.ExampleElement(id="E1", names=["a"])
+        assert "__extra_kwargs__" not in vars(instance)
+
+    def test_extra_arguments_are_set_and_recorded(self):
+        """Arguments that are not fields are set on the instance and recorded in `__extra_kwargs__`."""
+        from_kwargs = make_from_kwargs(self.ExampleElement)
+
+        instance = from_kwargs(self.ExampleElement, id="E1", vendor_attr="x")
+
+        assert instance.id == "E1"
+        assert instance.vendor_attr == "x"
+        assert instance.__extra_kwargs__ == {"vendor_attr": "x"}
+
+    def test_signature_is_computed_once(self, mocker):
+        """The constructor's parameters are computed when the builder is made, not on every call."""
+        spy = mocker.patch("pybpmn_parser.element_registry.signature", wraps=signature)
+        from_kwargs = make_from_kwargs(self.ExampleElement)
+
+        for index in range(3):
+            from_kwargs(self.ExampleElement, id=f"E{index}")
+
+        assert spy.call_count == 1
+
+    def test_unregistered_subclass_uses_its_own_fields(self):
+        """A subclass that inherits the classmethod still accepts its own fields."""
+
+        @dataclass
+        class SubElement(self.ExampleElement):
+            extra_field: int = 0
+
+        SubElement.from_kwargs = classmethod(make_from_kwargs(self.ExampleElement))
+
+        instance = SubElement.from_kwargs(id="E1", extra_field=3)
+
+        assert instance.extra_field == 3
+        assert "__extra_kwargs__" not in vars(instance)
+
+    def test_subclass_signature_is_computed_once(self, mocker):
+        """The parameters of an unregistered subclass are computed on its first call only."""
+
+        @dataclass
+        class SubElement(self.ExampleElement):
+            extra_field: int = 0
+
+        SubElement.from_kwargs = classmethod(make_from_kwargs(self.ExampleElement))
+        spy = mocker.patch("pybpmn_parser.element_registry.signature", wraps=signature)
+
+        for index in range(3):
+            SubElement.from_kwargs(id=f"E{index}", vendor_attr="x")
+
+        assert spy.call_count == 1
+        assert SubElement.from_kwargs(id="E1", vendor_attr="x").__extra_kwargs__ == {"vendor_attr": "x"}
+
+
+@dataclass
+class FirstElement:
+    """An element class for the registry tests."""
+
+    class Meta:
+        name = "first"
+        namespace = "urn:test"
+
+    value: Optional[int] = None
+
+
+@dataclass
+class SecondElement:
+    """Another element class with the same qualified name."""
+
+    class Meta:
+        name = "first"
+        namespace = "urn:test"
+
+
+class TestElementRegistry:
+    """Unit tests for the ElementRegistry class."""
+
+    def test_descriptor_is_built_on_first_access(self, mocker):
+        """Registering a class does not introspect it; the first lookup does, once."""
+        spy = mocker.patch("pybpmn_parser.element_registry.descriptor_from_class", wraps=descriptor_from_class)
+        element_registry = ElementRegistry()
+
+        element_registry.register(FirstElement)
+
+        assert QName("first", "urn:test") in element_registry.by_qname
+        assert spy.call_count == 0
+        descriptor = element_registry.by_qname[QName("first", "urn:test")]
+        assert element_registry.by_name["first"] is descriptor
+        assert descriptor.type is FirstElement
+        assert spy.call_count == 1
+
+    def test_precomputed_properties_are_used(self, mocker):
+        """Properties passed when registering are used as they are."""
+        spy = mocker.patch("pybpmn_parser.element_registry.descriptor_from_class")
+        element_registry = ElementRegistry()
+        properties = {QName("value", "urn:test"): ElementProperty(property_name="value", type="int")}
+
+        element_registry.register(FirstElement, properties)
+
+        assert element_registry.by_qname[QName("first", "urn:test")].properties is properties
+        assert spy.call_count == 0
+
+    def test_declared_elements_are_listed(self):
+        """Declared elements are listed by both mappings without importing anything."""
+        element_registry = ElementRegistry()
+
+        element_registry.declare("tests", {QName("first", "urn:test"): f"{__name__}.FirstElement"})
+
+        assert list(element_registry.by_qname) == [QName("first", "urn:test")]
+        assert list(element_registry.by_name) == ["first"]
+        assert "urn:test" in element_registry.registered_namespaces
+        assert "missing" not in element_registry.by_name
+
+    def test_other_classes_of_the_declaring_package_are_ignored(self):
+        """Only the declared class of a package is registered under its name."""
+        element_registry = ElementRegistry()
+        element_registry.declare("tests", {QName("first", "urn:test"): f"{__name__}.SecondElement"})
+
+        element_registry.register(FirstElement)
+        element_registry.register(SecondElement)
+
+        assert element_registry.by_qname[QName("first", "urn:test")].type is SecondElement
+
+    def test_classes_of_other_packages_replace_declarations(self):
+        """A class from outside the declaring package replaces the declared one."""
+        element_registry = ElementRegistry()
+        element_registry.declare("other_package", {QName("first", "urn:test"): "other_package.module.Element"})
+
+        element_registry.register(FirstElement)
+
+        assert element_registry.by_qname[QName("first", "urn:test")].type is FirstElement
+
+    def test_declared_module_must_register_the_class(self):
+        """Importing a declared module that does not register the class is an error."""
+        element_registry = ElementRegistry()
+        element_registry.declare("tests", {QName("first", "urn:test"): f"{__name__}.FirstElement"})
+
+        with pytest.raises(ImportError, match="was not registered"):
+            element_registry.by_qname[QName("first", "urn:test")]
+
+    def test_unknown_names(self):
+        """Unknown names are missing from both mappings."""
+        element_registry = ElementRegistry()
+
+        assert element_registry.by_qname.get(QName("first", "urn:test")) is None
+        with pytest.raises(KeyError):
+            element_registry.by_name["first"]
+        assert len(element_registry.by_qname) == 0
@@ -0,0 +1,85 @@
+"""Tests for the element_view module."""
+
+from pathlib import Path
+
+import lxml.etree as ET  # noqa: N812
+import pytest
+import xmltodict
+
+from pybpmn_parser.element_view import ElementView, element_key, element_value, materialize, root_view
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+def as_xmltodict(xml: str) -> dict:
+    """Return the materialized view of a document."""
+    root = ET.fromstring(xml)
+    return {key: materialize(value) for key, value in root_view(root).items()}
+
+
+class TestElementView:
+    """Unit tests for the ElementView class."""
+
+    def test_attributes_are_prefixed(self):
+        """Attributes are reported with an `@` prefix."""
+        view = ElementView(ET.fromstring('<root id="r1" name="Root"/>'))
+        assert dict(view.items()) == {"@id": "r1", "@name": "Root"}
+
+    def test_namespace_declarations_are_attributes(self):
+        """Namespace declarations on the element appear as `@xmlns` attributes."""
+        xml = '<a:root xmlns:a="urn:a" xmlns="urn:default"><a:child x="1"/></a:root>'
+        assert as_xmltodict(xml) == {"a:root": {"@xmlns:a": "urn:a", "@xmlns": "urn:default", "a:child": {"@x": "1"}}}
+
+    def test_inherited_namespaces_are_not_repeated(self):
+        """Child elements don't report namespace declarations they inherit."""
+        xml = '<a:root xmlns:a="urn:a"><a:child id="c"/></a:root>'
+        assert as_xmltodict(xml)["a:root"]["a:child"] == {"@id": "c"}
+
+    def test_namespaced_attributes_use_document_prefix(self):
+        """Namespaced attributes keep the prefix used in the document."""
+        xml = '<root xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><c xsi:type="tFoo"/></root>'
+        assert as_xmltodict(xml)["root"]["c"] == {"@xsi:type": "tFoo"}
+
+    def test_repeated_children_are_grouped(self):
+        """Repeated children become a list, even when they are not adjacent."""
+        xml = "<root><a>1</a><b>2</b><a>3</a></root>"
+        assert as_xmltodict(xml) == {"root": {"a": ["1", "3"], "b": "2"}}
+
+    def test_text_only_and_empty_children_collapse(self):
+        """Children without attributes or children become their text, or None when empty."""
+        xml = "<root><a>text</a><b/><c>   </c></root>"
+        assert as_xmltodict(xml) == {"root": {"a": "text", "b": None, "c": None}}
+
+    def test_mixed_content_is_stored_under_text_key(self):
+        """Character data next to attributes or children is stored under `#text`."""
+        xml = '<root id="1"> before <!-- comment --> <child/> after </root>'
+        assert as_xmltodict(xml) == {"root": {"@id": "1", "child": None, "#text": "before   after"}}
+
+    def test_children_are_lazy_views(self):
+        """Child elements with content are returned as views, not dictionaries."""
+        view = ElementView(ET.fromstring('<root><child id="c"/></root>'))
+        assert isinstance(view["child"], ElementView)
+        assert element_key(view["child"].element) == "child"
+
+    def test_release_element_clears_owned_trees(self):
+        """Views created with `release` clear their element once released."""
+        root = ET.fromstring('<root><child id="c"><grandchild/></child></root>')
+        view = element_value(root[0], release=True)
+        view.release_element()
+        assert len(root[0]) == 0
+        assert root[0].get("id") is None
+
+    def test_release_element_keeps_borrowed_trees(self):
+        """Views created without `release` never modify the tree."""
+        root = ET.fromstring('<root><child id="c"><grandchild/></child></root>')
+        element_value(root[0]).release_element()
+        assert len(root[0]) == 1
+
+
+@pytest.mark.parametrize("bpmn_file", sorted(FIXTURE_DIR.glob("**/*.bpmn")), ids=lambda path: path.stem)
+def test_matches_xmltodict_for_fixtures(bpmn_file: Path):
+    """The materialized view of every fixture is identical to the output of `xmltodict.parse`."""
+    xml_bytes = bpmn_file.read_bytes()
+    root = ET.fromstring(xml_bytes, ET.XMLParser(remove_blank_text=True))
+    actual = {key: materialize(value) for key, value in root_view(root).items()}
+    assert actual == xmltodict.parse(xml_bytes)
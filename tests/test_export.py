@@ -0,0 +1,87 @@
+"""Tests for the export module."""
+
+import io
+import json
+from pathlib import Path
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.export import RECORD_KEYS, element_records, write_jsonl
+from pybpmn_parser.parse import Parser
+
+DOCUMENT_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1" isExecutable="true">
+    <bpmn:task id="Task_1" name="Ship">
+      <bpmn:documentation>Ships the order</bpmn:documentation>
+      <bpmn:outgoing>Flow_1</bpmn:outgoing>
+    </bpmn:task>
+    <bpmn:endEvent id="End_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Task_1" targetRef="End_1" />
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Task_1_di" bpmnElement="Task_1">
+        <dc:Bounds x="160" y="80" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+BPMN = NAMESPACES["bpmn"]
+
+
+class TestElementRecords:
+    """Unit tests for the element_records function."""
+
+    def test_one_flat_record_per_element(self):
+        """Every element gets a record with its ID, qualified name, parent ID and scalar properties."""
+        records = {record["id"]: record for record in element_records(Parser().parse_bytes(DOCUMENT_XML))}
+
+        assert records["Task_1"] == {
+            "id": "Task_1",
+            "qname": f"{{{BPMN}}}task",
+            "parent_id": "Process_1",
+            "name": "Ship",
+            "outgoing": ["Flow_1"],
+            "start_quantity": 1,
+            "completion_quantity": 1,
+            "is_for_compensation": False,
+        }
+        assert records["Process_1"]["is_executable"] is True
+        assert list(records["Flow_1"])[: len(RECORD_KEYS)] == list(RECORD_KEYS)
+        assert records["Definitions_1"]["parent_id"] is None
+
+    def test_elements_without_an_id(self):
+        """Elements without an ID name the closest element above them with one as their parent."""
+        records = list(element_records(Parser().parse_bytes(DOCUMENT_XML)))
+
+        documentation = next(record for record in records if record["qname"] == f"{{{BPMN}}}documentation")
+        bounds = next(record for record in records if record["qname"].endswith("}Bounds"))
+
+        assert (documentation["id"], documentation["parent_id"]) == (None, "Task_1")
+        assert documentation["content"] == "Ships the order"
+        assert (bounds["parent_id"], bounds["x"]) == ("Task_1_di", 160.0)
+
+    def test_parents_come_first(self):
+        """Each record comes after the record of its parent."""
+        seen: set[str] = set()
+        for record in element_records(Parser().parse_bytes(DOCUMENT_XML)):
+            assert record["parent_id"] is None or record["parent_id"] in seen
+            if record["id"]:
+                seen.add(record["id"])
+
+    def test_write_jsonl(self, fixture_dir: Path):
+        """The JSON Lines file has one record per line."""
+        result = Parser().parse_file(fixture_dir / "kitchen-sink.bpmn")
+        buffer = io.StringIO()
+
+        count = write_jsonl(result, buffer)
+
+        lines = buffer.getvalue().splitlines()
+        assert count == len(lines)
+        assert [json.loads(line) for line in lines] == list(element_records(result))
+        assert {json.loads(line)["id"] for line in lines} >= set(result.elements_by_id)
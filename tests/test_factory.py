@@ -0,0 +1,94 @@
+"""Tests for the factory module."""
+
+import pytest
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import NamespaceContext, QName
+from pybpmn_parser.element_registry import registry
+from pybpmn_parser.factory import KeyKind, extract_nsmap_from_dict, resolve_key
+from pybpmn_parser.parse import Parser
+
+BPMN_URI = "http://www.omg.org/spec/BPMN/20100524/MODEL"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def loaded_registry():
+    """Make sure the default plugins are registered."""
+    Parser()
+
+
+@pytest.fixture
+def ns_map() -> NamespaceContext:
+    """The default namespace context."""
+    return NamespaceContext.of(NAMESPACES)
+
+
+class TestResolveKey:
+    """Tests for the resolve_key function."""
+
+    def test_resolves_each_kind(self, ns_map: NamespaceContext):
+        """Keys resolve to the way their values are handled."""
+        task = registry.by_qname[QName("task", BPMN_URI)]
+
+        assert resolve_key("@xmlns:bpmn", task, ns_map).kind is KeyKind.IGNORED
+        assert resolve_key("@id", task, ns_map).kind is KeyKind.SCALAR
+        assert resolve_key("@id", task, ns_map).property_name == "id"
+        incoming = resolve_key("bpmn:incoming", task, ns_map)
+        assert (incoming.kind, incoming.is_many) == (KeyKind.SCALAR, True)
+        extension_elements = resolve_key("bpmn:extensionElements", task, ns_map)
+        assert extension_elements.kind is KeyKind.CHILD
+        assert extension_elements.child_descriptor.q_name == QName("extensionElements", BPMN_URI)
+        vendor = resolve_key("@vendorAttribute", task, ns_map)
+        assert (vendor.kind, vendor.property_name, vendor.child_descriptor) == (
+            KeyKind.UNKNOWN,
+            "vendor_attribute",
+            None,
+        )
+
+    def test_resolutions_are_cached_per_namespace_context(self, ns_map: NamespaceContext):
+        """The second lookup of a key in the same context returns the cached resolution."""
+        task = registry.by_qname[QName("task", BPMN_URI)]
+        first = resolve_key("@name", task, ns_map)
+
+        assert resolve_key("@name", task, ns_map) is first
+        assert ("@name", ns_map.context_id) in task.key_cache
+
+    def test_plain_dicts_are_not_cached(self):
+        """Namespace maps that are not contexts have no stable identity, so nothing is cached."""
+        task = registry.by_qname[QName("task", BPMN_URI)]
+        task.key_cache.clear()
+
+        resolution = resolve_key("@name", task, dict(NAMESPACES))
+
+        assert resolution.property_name == "name"
+        assert not task.key_cache
+
+    def test_registering_an_element_invalidates_the_cache(self, ns_map: NamespaceContext, mocker):
+        """Cached resolutions are dropped when the registry changes, since child descriptors may have changed."""
+        task = registry.by_qname[QName("task", BPMN_URI)]
+        first = resolve_key("@name", task, ns_map)
+        mocker.patch.object(registry, "version", registry.version + 1)
+
+        assert resolve_key("@name", task, ns_map) is not first
+        assert task.key_cache_version == registry.version
+
+
+class TestExtractNsmapFromDict:
+    """Tests for the extract_nsmap_from_dict function."""
+
+    def test_returns_parent_context_without_declarations(self, ns_map: NamespaceContext):
+        """Elements that declare nothing share their parent's context."""
+        assert extract_nsmap_from_dict({"@id": "Task_1"}, ns_map) is ns_map
+
+    def test_adds_declarations(self, ns_map: NamespaceContext):
+        """Prefixed and default namespace declarations are added to the context."""
+        result = extract_nsmap_from_dict({"@xmlns:v": "urn:v", "@xmlns": "urn:default"}, ns_map)
+
+        assert result["v"] == "urn:v"
+        assert result["default"] == "urn:default"
+        assert "v" not in ns_map
+
+    def test_accepts_plain_dicts(self):
+        """A plain parent map, or none at all, is accepted."""
+        assert extract_nsmap_from_dict({"@xmlns:v": "urn:v"}, None) == {"v": "urn:v"}
+        assert extract_nsmap_from_dict({}, {"a": "urn:a"}) == {"a": "urn:a"}
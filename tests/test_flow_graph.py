@@ -0,0 +1,138 @@
+"""Tests for the flow_graph module."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.flow_graph import FlowGraph, process_graph
+from pybpmn_parser.parse import Parser
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MIWG_FIXTURES = sorted((FIXTURE_DIR / "miwg-test-suite-2025").glob("*.bpmn"))
+
+GRAPH_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:startEvent id="Start_1" />
+    <bpmn:parallelGateway id="Split_1" />
+    <bpmn:task id="Task_1" />
+    <bpmn:subProcess id="Sub_1">
+      <bpmn:startEvent id="SubStart_1" />
+      <bpmn:endEvent id="SubEnd_1" />
+      <bpmn:sequenceFlow id="SubFlow_1" sourceRef="SubStart_1" targetRef="SubEnd_1" />
+    </bpmn:subProcess>
+    <bpmn:parallelGateway id="Join_1" />
+    <bpmn:endEvent id="End_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Split_1" />
+    <bpmn:sequenceFlow id="Flow_2" sourceRef="Split_1" targetRef="Task_1" />
+    <bpmn:sequenceFlow id="Flow_3" sourceRef="Split_1" targetRef="Sub_1" />
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Task_1" targetRef="Join_1" />
+    <bpmn:sequenceFlow id="Flow_5" sourceRef="Sub_1" targetRef="Join_1" />
+    <bpmn:sequenceFlow id="Flow_6" sourceRef="Join_1" targetRef="End_1" />
+  </bpmn:process>
+  <bpmn:process id="Process_2">
+    <bpmn:task id="Task_2" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+@pytest.fixture
+def graph() -> FlowGraph:
+    """The flow graph of a process with a split, a join and a sub-process."""
+    return Parser().parse_bytes(GRAPH_XML).flow_graphs["Process_1"]
+
+
+class TestFlowGraph:
+    """Unit tests for the FlowGraph class."""
+
+    def test_one_graph_per_process(self):
+        """Every process gets a graph, even without sequence flows."""
+        graphs = Parser().parse_bytes(GRAPH_XML).flow_graphs
+
+        assert list(graphs) == ["Process_1", "Process_2"]
+        assert graphs["Process_2"].node_ids == ["Task_2"]
+        assert graphs["Process_2"].outgoing("Task_2") == []
+
+    def test_adjacency_queries(self, graph: FlowGraph):
+        """Successors, predecessors and the flows between them are listed in document order."""
+        assert graph.successors("Split_1") == ["Task_1", "Sub_1"]
+        assert graph.outgoing("Split_1") == ["Flow_2", "Flow_3"]
+        assert graph.predecessors("Join_1") == ["Task_1", "Sub_1"]
+        assert graph.incoming("Join_1") == ["Flow_4", "Flow_5"]
+        assert (graph.out_degree("Split_1"), graph.in_degree("Split_1")) == (2, 1)
+        assert graph.predecessors("Start_1") == []
+
+    def test_sub_processes_belong_to_their_process(self, graph: FlowGraph):
+        """The nodes and flows of a sub-process are part of the graph of its process."""
+        assert graph.successors("SubStart_1") == ["SubEnd_1"]
+        assert "SubEnd_1" in graph
+        assert len(graph) == 8
+
+    def test_csr_arrays(self, graph: FlowGraph):
+        """The offsets delimit each node's edges in the target and flow arrays."""
+        number = graph.node_index["Split_1"]
+        start, end = graph.out_offsets[number], graph.out_offsets[number + 1]
+
+        assert [graph.node_ids[target] for target in graph.out_targets[start:end]] == ["Task_1", "Sub_1"]
+        assert [graph.flow_ids[flow] for flow in graph.out_flows[start:end]] == ["Flow_2", "Flow_3"]
+        assert len(graph.out_offsets) == len(graph) + 1
+        assert graph.out_offsets[-1] == graph.in_offsets[-1] == len(graph.flow_ids)
+
+    def test_edges_and_adjacency(self, graph: FlowGraph):
+        """The edge list and the adjacency lists describe the same graph."""
+        adjacency = graph.adjacency()
+
+        assert sorted(graph.edges()) == sorted(
+            (source, target) for source, targets in enumerate(adjacency) for target in targets
+        )
+        assert len(list(graph.edges())) == 7
+
+    def test_unknown_endpoints_become_nodes(self):
+        """A flow to an ID that is not a flow node of the process still has both ends."""
+        graph = FlowGraph("Process_1", ["Task_1"], [("Flow_1", "Task_1", "Elsewhere_1")])
+
+        assert graph.successors("Task_1") == ["Elsewhere_1"]
+        assert graph.node_ids == ["Task_1", "Elsewhere_1"]
+
+    def test_flows_without_an_end_are_reported(self):
+        """A flow missing its source or target is listed instead of adding a None node."""
+        result = Parser().parse_bytes(GRAPH_XML)
+        result.elements_by_id["Flow_4"].target_ref = None
+
+        graph = process_graph(result.definition.processes[0])
+
+        assert graph.incomplete_flow_ids == ["Flow_4"]
+        assert None not in graph
+        assert graph.outgoing("Task_1") == []
+        assert len(graph.flow_ids) == 6
+
+    def test_survives_pickling(self, graph: FlowGraph):
+        """A pickled graph answers the same queries."""
+        restored = pickle.loads(pickle.dumps(graph))
+
+        assert restored.successors("Split_1") == ["Task_1", "Sub_1"]
+        assert restored.out_targets == graph.out_targets
+
+    def test_numpy_arrays_share_memory(self, graph: FlowGraph):
+        """The NumPy arrays are views of the CSR arrays."""
+        numpy = pytest.importorskip("numpy")
+
+        indptr, indices = graph.to_numpy()
+
+        assert indptr.tolist() == graph.out_offsets.tolist()
+        assert indices.tolist() == graph.out_targets.tolist()
+        assert numpy.shares_memory(indices, numpy.frombuffer(graph.out_targets, dtype=indices.dtype))
+
+    @pytest.mark.parametrize("bpmn_file", MIWG_FIXTURES, ids=lambda path: path.stem)
+    def test_matches_a_scan_of_the_flows(self, bpmn_file: Path):
+        """The graph of every MIWG fixture agrees with matching the sequence flows' references."""
+        result = Parser().parse_file(bpmn_file)
+
+        for graph in result.flow_graphs.values():
+            flows = [result.elements_by_id[flow_id] for flow_id in graph.flow_ids]
+            for node_id in graph.node_ids:
+                assert graph.outgoing(node_id) == [flow.id for flow in flows if flow.source_ref == node_id]
+                assert graph.incoming(node_id) == [flow.id for flow in flows if flow.target_ref == node_id]
@@ -0,0 +1,110 @@
+"""Tests for the hashing module."""
+
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.hashing import DIGEST_SIZE, ModelHasher, content_hash
+from pybpmn_parser.parse import Parser
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MIWG_FIXTURES = sorted((FIXTURE_DIR / "miwg-test-suite-2025").glob("*.bpmn"))
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:task id="Task_1" name="{task_name}">{documentation}</bpmn:task>
+    <bpmn:task id="Task_2" name="Pack" />
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Task_1_di" bpmnElement="Task_1">
+        <dc:Bounds x="{task_x}" y="80" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+def parse(task_name: str = "Ship", task_x: int = 160, documentation: str = ""):
+    """Parse the test document and return its definitions."""
+    xml = DOCUMENT_XML.format(task_name=task_name, task_x=task_x, documentation=documentation)
+    return Parser().parse_string(xml).definition
+
+
+class TestModelHasher:
+    """Unit tests for the ModelHasher class."""
+
+    def test_equal_documents_have_equal_hashes(self):
+        """Two parses of the same document have the same hash."""
+        digest = ModelHasher().digest(parse())
+
+        assert digest == ModelHasher().digest(parse())
+        assert len(digest) == DIGEST_SIZE
+
+    def test_changes_change_the_hash(self):
+        """Changing a name or a position changes the hash of the document."""
+        hashes = {content_hash(parse()), content_hash(parse(task_name="Send")), content_hash(parse(task_x=200))}
+
+        assert len(hashes) == 3
+
+    def test_whitespace_is_ignored(self):
+        """Reformatting the strings of a document does not change its hash."""
+        assert content_hash(parse(task_name="  Ship ")) == content_hash(parse())
+        assert content_hash(parse(task_name="Ship   it")) == content_hash(parse(task_name="Ship it"))
+
+    def test_di_can_be_ignored(self):
+        """With `ignore_di`, moving a shape does not change the hash."""
+        assert content_hash(parse(task_x=200), ignore_di=True) == content_hash(parse(), ignore_di=True)
+        assert content_hash(parse(task_name="Send"), ignore_di=True) != content_hash(parse(), ignore_di=True)
+
+    def test_documentation_can_be_ignored(self):
+        """With `ignore_documentation`, documenting a task does not change the hash."""
+        documented = parse(documentation="<bpmn:documentation>Ships the order</bpmn:documentation>")
+
+        assert content_hash(documented) != content_hash(parse())
+        assert content_hash(documented, ignore_documentation=True) == content_hash(parse(), ignore_documentation=True)
+
+    def test_subtree_hashes(self):
+        """Unchanged subtrees keep their hash when a sibling changes."""
+        old = parse()
+        new = parse(task_name="Send")
+        old_tasks = old.processes[0].tasks
+        new_tasks = new.processes[0].tasks
+
+        assert ModelHasher().digest(old_tasks[1]) == ModelHasher().digest(new_tasks[1])
+        assert ModelHasher().digest(old_tasks[0]) != ModelHasher().digest(new_tasks[0])
+
+    def test_order_of_elements_with_an_id_is_ignored(self):
+        """Moving an element with an ID within its list changes no hash, as `diff` matches it by ID."""
+        xml = DOCUMENT_XML.format(task_name="Ship", task_x=160, documentation="")
+        task_2 = '\n    <bpmn:task id="Task_2" name="Pack" />'
+        moved = Parser().parse_string(
+            xml.replace(task_2, "").replace('<bpmn:process id="Process_1">', f'<bpmn:process id="Process_1">{task_2}')
+        )
+
+        assert [task.id for task in moved.definition.processes[0].tasks] == ["Task_2", "Task_1"]
+        assert content_hash(moved.definition) == content_hash(parse())
+
+    def test_the_type_is_hashed(self):
+        """Turning a task into a user task with the same attributes changes the hash."""
+        hasher = ModelHasher()
+        result = Parser().parse_string(
+            DOCUMENT_XML.format(task_name="Ship", task_x=160, documentation="").replace(
+                '<bpmn:task id="Task_2" name="Pack" />', '<bpmn:userTask id="Task_2" name="Pack" />'
+            )
+        )
+
+        assert hasher.digest(result.definition) != hasher.digest(parse())
+
+    @pytest.mark.parametrize("bpmn_file", MIWG_FIXTURES, ids=lambda path: path.stem)
+    def test_hashes_are_stable(self, bpmn_file: Path):
+        """Every MIWG fixture gets the same hash from two separate parses."""
+        first = Parser().parse_file(bpmn_file).definition
+        second = Parser().parse_file(bpmn_file).definition
+
+        assert content_hash(first) == content_hash(second)
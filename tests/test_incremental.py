@@ -0,0 +1,284 @@
+"""Tests for the incremental module."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+import pybpmn_parser.incremental
+from pybpmn_parser.incremental import DocumentDigests
+from pybpmn_parser.parse import Parser
+from pybpmn_parser.validator import ValidationError
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MIWG_FIXTURES = sorted((FIXTURE_DIR / "miwg-test-suite-2025").glob("*.bpmn"))
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:message id="Message_1" name="Order" />
+  <bpmn:process id="Process_1" isExecutable="true">
+    <bpmn:startEvent id="Start_1" />
+    <bpmn:task id="Task_1" name="{task_name}" />
+    <bpmn:subProcess id="Sub_1">
+      <bpmn:startEvent id="SubStart_1" />
+      <bpmn:endEvent id="SubEnd_1" />
+      <bpmn:sequenceFlow id="SubFlow_1" sourceRef="SubStart_1" targetRef="SubEnd_1" />
+    </bpmn:subProcess>
+    <bpmn:endEvent id="End_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Task_1" />
+    <bpmn:sequenceFlow id="Flow_2" sourceRef="Task_1" targetRef="Sub_1" />
+    <bpmn:sequenceFlow id="Flow_3" sourceRef="Sub_1" targetRef="End_1" />{extra_elements}
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Shape_Start_1" bpmnElement="Start_1">
+        <dc:Bounds x="100" y="100" width="36" height="36" />
+      </bpmndi:BPMNShape>
+      <bpmndi:BPMNShape id="Shape_Task_1" bpmnElement="Task_1">
+        <dc:Bounds x="{task_x}" y="100" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+def document(task_name: str = "Check order", task_x: int = 200, extra_elements: str = "") -> str:
+    """Return a version of the test document."""
+    return DOCUMENT_XML.format(task_name=task_name, task_x=task_x, extra_elements=extra_elements)
+
+
+@pytest.fixture
+def parser() -> Parser:
+    """A parser with the default options."""
+    return Parser()
+
+
+def assert_matches_a_full_parse(parser: Parser, result, xml: str) -> None:
+    """Check that a re-parsed result describes the document exactly like parsing it from scratch."""
+    fresh = parser.parse_string(xml)
+
+    assert result.definition == fresh.definition
+    assert dict(result.elements_by_id) == dict(fresh.elements_by_id)
+    assert sorted(map(repr, result.references)) == sorted(map(repr, fresh.references))
+
+
+class TestReparse:
+    """Unit tests for Parser.reparse."""
+
+    def test_lazy_parsers_are_rejected(self):
+        """A lazy parser cannot reuse model objects, so it refuses to reparse instead of building eagerly."""
+        with pytest.raises(ValueError, match="lazy=False"):
+            Parser(lazy=True).reparse(None, document())
+
+    def test_first_parse_records_digests(self, parser: Parser):
+        """Re-parsing without a previous result builds the whole document and records the digests."""
+        result = parser.reparse(None, document())
+
+        assert isinstance(result.digests, DocumentDigests)
+        assert list(result.digests.root_elements) == ["Message_1", "Process_1", "Diagram_1"]
+        assert list(result.digests.root_elements["Process_1"].children["Sub_1"].children) == [
+            "SubStart_1",
+            "SubEnd_1",
+            "SubFlow_1",
+        ]
+        assert_matches_a_full_parse(parser, result, document())
+
+    def test_unchanged_document_reuses_every_root_element(self, parser: Parser):
+        """Nothing below the definitions is rebuilt when the document did not change."""
+        previous = parser.reparse(None, document())
+        processes, diagrams = previous.definition.processes, previous.definition.bpmndiagrams
+
+        result = parser.reparse(previous, document().encode())
+
+        assert result is previous
+        assert result.definition.processes[0] is processes[0]
+        assert result.definition.bpmndiagrams[0] is diagrams[0]
+
+    def test_only_changed_subtrees_are_rebuilt(self, parser: Parser):
+        """Changing one task rebuilds the task and its process, and reuses its siblings and the other roots."""
+        previous = parser.reparse(None, document())
+        old = dict(previous.elements_by_id)
+        old_definitions = previous.definition
+
+        result = parser.reparse(previous, document(task_name="Check the order"))
+
+        assert result.elements_by_id["Task_1"] is not old["Task_1"]
+        assert result.elements_by_id["Process_1"] is not old["Process_1"]
+        for element_id in ("Start_1", "Sub_1", "SubStart_1", "Flow_1", "Message_1", "Diagram_1", "Shape_Task_1"):
+            assert result.elements_by_id[element_id] is old[element_id]
+        assert old_definitions.processes[0].tasks[0].name == "Check order"
+        assert_matches_a_full_parse(parser, result, document(task_name="Check the order"))
+
+    def test_diagram_elements_are_reused_one_by_one(self, parser: Parser):
+        """Moving a shape rebuilds the shape and its diagram, and reuses the other shapes and the processes."""
+        previous = parser.reparse(None, document())
+        old = dict(previous.elements_by_id)
+
+        result = parser.reparse(previous, document(task_x=400))
+
+        assert result.elements_by_id["Shape_Task_1"] is not old["Shape_Task_1"]
+        assert result.elements_by_id["Shape_Start_1"] is old["Shape_Start_1"]
+        assert result.elements_by_id["Process_1"] is old["Process_1"]
+        assert_matches_a_full_parse(parser, result, document(task_x=400))
+
+    def test_added_and_removed_elements(self, parser: Parser):
+        """The ID index and the references follow elements that are added, then removed again."""
+        extra = """
+    <bpmn:task id="Task_2" />
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Task_1" targetRef="Task_2" />"""
+        result = parser.reparse(None, document())
+
+        parser.reparse(result, document(extra_elements=extra))
+
+        assert "Task_2" in result.elements_by_id
+        assert_matches_a_full_parse(parser, result, document(extra_elements=extra))
+
+        parser.reparse(result, document())
+
+        assert "Task_2" not in result.elements_by_id
+        assert "Flow_4" not in result.elements_by_id
+        assert_matches_a_full_parse(parser, result, document())
+
+    def test_indexes_are_updated_in_place(self, parser: Parser):
+        """The reference index and the flow graphs already built are updated, not dropped."""
+        extra = """
+    <bpmn:task id="Task_2" />
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Task_1" targetRef="Task_2" />"""
+        result = parser.reparse(None, document())
+        elements_by_id, references, index = result.elements_by_id, result.references, result.reference_index
+        graphs = result.flow_graphs
+
+        parser.reparse(result, document(extra_elements=extra))
+
+        assert result.elements_by_id is elements_by_id
+        assert result.references is references
+        assert result.reference_index is index
+        assert result.flow_graphs is graphs
+        assert [resolved.source.id for resolved in index.referrers("Task_2")] == ["Flow_4"]
+        assert graphs["Process_1"].successors("Task_1") == ["Sub_1", "Task_2"]
+
+        parser.reparse(result, document())
+
+        assert index.referrers("Task_2") == []
+        assert [resolved.source.id for resolved in index.referrers("Task_1")] == ["Flow_1", "Flow_2", "Shape_Task_1"]
+        assert graphs["Process_1"].successors("Task_1") == ["Sub_1"]
+        assert not index.dangling
+
+    def test_only_changed_subtrees_are_validated(self, parser: Parser, monkeypatch):
+        """The validator sees the changed task and the elements around it, not the unchanged subtrees."""
+        checked = []
+        validate_changes = pybpmn_parser.incremental.validate_changes
+
+        def spy(changed, *args):
+            checked.extend(element.get("id") for element in changed.iter() if element.get("id"))
+            return validate_changes(changed, *args)
+
+        previous = parser.reparse(None, document())
+        monkeypatch.setattr(pybpmn_parser.incremental, "validate_changes", spy)
+
+        parser.reparse(previous, document(task_name="Check the order"))
+
+        assert checked == ["Definitions_1", "Process_1", "Task_1"]
+
+    def test_invalid_change_leaves_the_result_unchanged(self, parser: Parser):
+        """A change that fails validation raises, and the previous result still describes the old version."""
+        broken = """
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Task_1" targetRef="Missing_1" />"""
+        result = parser.reparse(None, document())
+        definitions = result.definition
+
+        with pytest.raises(ValidationError, match="Missing_1"):
+            parser.reparse(result, document(extra_elements=broken))
+
+        assert result.definition is definitions
+        assert "Flow_4" not in result.elements_by_id
+
+    def test_references_into_unchanged_parts_are_valid(self, parser: Parser):
+        """A changed element may reference the elements of the unchanged subtrees."""
+        extra = """
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Sub_1" targetRef="Start_1" />"""
+        result = parser.reparse(None, document())
+
+        parser.reparse(result, document(extra_elements=extra))
+
+        assert result.elements_by_id["Flow_4"].target_ref == "Start_1"
+
+    def test_removing_a_referenced_element_is_invalid(self, parser: Parser):
+        """Removing an element that an unchanged sequence flow still references is reported."""
+        result = parser.reparse(None, document())
+        xml = document().replace('<bpmn:endEvent id="End_1" />', "")
+
+        with pytest.raises(ValidationError) as error:
+            parser.reparse(result, xml)
+
+        assert [e.code for e in error.value.errors] == ["INVALID_REFERENCE"]
+        assert "Flow_3" in error.value.errors[0].message
+
+    def test_duplicate_of_an_unchanged_id_is_invalid(self, parser: Parser):
+        """A new element with the ID of an unchanged element is reported."""
+        result = parser.reparse(None, document())
+
+        with pytest.raises(ValidationError) as error:
+            parser.reparse(result, document(extra_elements='\n    <bpmn:task id="Start_1" />'))
+
+        assert [(e.code, e.element_id) for e in error.value.errors] == [("DUPLICATE_ID", "Start_1")]
+
+    def test_schema_errors_in_changed_parts(self, parser: Parser):
+        """The changed parts are checked against the schema."""
+        result = parser.reparse(None, document())
+
+        with pytest.raises(ValidationError) as error:
+            parser.reparse(result, document(extra_elements='\n    <bpmn:task id="Task_2" unknown="1" />'))
+
+        assert [e.code for e in error.value.errors] == ["SCHEMA_ERROR"]
+
+    def test_result_without_digests_is_rebuilt(self, parser: Parser):
+        """A result from another method is replaced by a full parse of the new version."""
+        previous = parser.parse_string(document())
+        old_process = previous.definition.processes[0]
+
+        result = parser.reparse(previous, document())
+
+        assert result is previous
+        assert result.digests is not None
+        assert result.definition.processes[0] is not old_process
+
+    def test_other_parser_options_rebuild(self, parser: Parser):
+        """Digests recorded by a parser with other options are not trusted."""
+        previous = Parser(validation="off").reparse(None, document())
+        old_process = previous.definition.processes[0]
+
+        result = parser.reparse(previous, document())
+
+        assert result.definition.processes[0] is not old_process
+        assert result.digests.fingerprint == parser.fingerprint
+
+    def test_survives_pickling(self, parser: Parser):
+        """A pickled result can be re-parsed incrementally."""
+        previous = pickle.loads(pickle.dumps(parser.reparse(None, document())))
+        message = previous.elements_by_id["Message_1"]
+
+        result = parser.reparse(previous, document(task_name="Check the order"))
+
+        assert result.elements_by_id["Message_1"] is message
+        assert_matches_a_full_parse(parser, result, document(task_name="Check the order"))
+
+    @pytest.mark.parametrize("bpmn_file", MIWG_FIXTURES, ids=lambda path: path.stem)
+    def test_fixtures(self, parser: Parser, bpmn_file: Path):
+        """Every MIWG fixture is re-parsed into the same model, reusing every root element."""
+        xml = bpmn_file.read_bytes()
+        previous = parser.reparse(None, xml)
+        roots = [*previous.definition.processes, *previous.definition.bpmndiagrams]
+
+        result = parser.reparse(previous, xml)
+
+        assert [*result.definition.processes, *result.definition.bpmndiagrams] == roots
+        assert all(
+            new is old
+            for new, old in zip([*result.definition.processes, *result.definition.bpmndiagrams], roots, strict=True)
+        )
+        assert_matches_a_full_parse(parser, result, xml.decode("utf-8"))
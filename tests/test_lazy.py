@@ -0,0 +1,151 @@
+"""Tests for the lazy module."""
+
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.lazy import LazyDefinitions, SourceLocation
+from pybpmn_parser.parse import Parser
+from pybpmn_parser.validator import parse_xml_bytes
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+LAZY_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:message id="Message_1" name="Order" />
+  <bpmn:process id="Process_1">
+    <bpmn:startEvent id="Start_1" />
+    <bpmn:task id="Task_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Task_1" />
+  </bpmn:process>
+  <bpmn:process id="Process_2">
+    <bpmn:task id="Task_2" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+def context_ids(result) -> set:
+    """Return the IDs of the elements built so far, without building anything."""
+    return set(result.elements_by_id._elements_by_id)
+
+
+class TestLazyParser:
+    """Unit tests for parsing with Parser(lazy=True)."""
+
+    def test_only_the_definitions_are_built_at_parse_time(self):
+        """Root elements wait until they are accessed."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        assert isinstance(result.definition, LazyDefinitions)
+        assert result.definition.id == "Definitions_1"
+        assert result.definition.pending_properties == ["messages", "processes"]
+        assert context_ids(result) == {"Definitions_1"}
+
+    def test_property_access_builds_one_root_property(self):
+        """Reading a property builds its root elements and indexes them."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        processes = result.definition.processes
+
+        assert [process.id for process in processes] == ["Process_1", "Process_2"]
+        assert result.definition.pending_properties == ["messages"]
+        assert {"Process_1", "Start_1", "Task_1", "Flow_1", "Process_2", "Task_2"} <= context_ids(result)
+        assert "Message_1" not in context_ids(result)
+        assert result.definition.processes is processes
+
+    def test_lookup_by_id_builds_the_containing_root_element(self):
+        """Looking up a nested ID builds the root property it belongs to, and nothing else."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        task = result.elements_by_id["Task_2"]
+
+        assert task.id == "Task_2"
+        assert result.definition.pending_properties == ["messages"]
+        assert "Missing" not in result.elements_by_id
+        with pytest.raises(KeyError):
+            result.elements_by_id["Missing"]
+
+    def test_iteration_builds_everything(self):
+        """Iterating the index builds every root element."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        assert len(result.elements_by_id) == 8
+        assert result.definition.pending_properties == []
+
+    def test_source_locations(self):
+        """Every ID is located without building anything."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        locations = result.elements_by_id.locations
+
+        assert locations["Message_1"] == SourceLocation(4, "messages")
+        assert locations["Task_2"] == SourceLocation(11, "processes")
+        assert locations["Definitions_1"].line == 3
+        assert context_ids(result) == {"Definitions_1"}
+
+    def test_assignment_discards_the_pending_value(self):
+        """A property that is assigned before being read is never built."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+
+        result.definition.processes = []
+
+        assert result.definition.processes == []
+        assert "Process_1" not in context_ids(result)
+
+    def test_references_are_collected_when_built(self):
+        """References of a root element are added once it is built."""
+        result = Parser(lazy=True).parse_bytes(LAZY_XML)
+        assert result.references == []
+
+        result.definition.build_pending()
+
+        assert {(ref.element_id, ref.reference_id) for ref in result.references} == {
+            ("Flow_1", "Start_1"),
+            ("Flow_1", "Task_1"),
+        }
+
+    def test_equals_the_eager_definitions(self):
+        """A lazily parsed document compares equal to the same document parsed eagerly, both ways."""
+        lazy = Parser(lazy=True).parse_bytes(LAZY_XML).definition
+        eager = Parser().parse_bytes(LAZY_XML).definition
+
+        assert lazy == eager
+        assert eager == lazy
+
+    def test_copy_and_pickle_build_everything(self):
+        """Copies and pickles hold the whole model, not the pending builders."""
+        definitions = Parser(lazy=True).parse_bytes(LAZY_XML).definition
+
+        copied = copy.deepcopy(definitions)
+        restored = pickle.loads(pickle.dumps(definitions))
+
+        assert definitions.pending_properties == []
+        assert [process.id for process in copied.processes] == ["Process_1", "Process_2"]
+        assert restored == definitions
+
+    def test_parse_element_keeps_the_tree(self):
+        """A tree owned by the caller is left intact once everything is built."""
+        root = parse_xml_bytes(LAZY_XML)
+
+        Parser(lazy=True).parse_element(root).definition.build_pending()
+
+        assert len(root.findall(".//{*}task")) == 2
+
+
+@pytest.mark.parametrize("bpmn_file", sorted(FIXTURE_DIR.glob("**/*.bpmn")), ids=lambda path: path.stem)
+def test_matches_eager_parse_for_fixtures(bpmn_file: Path):
+    """Parsing every fixture lazily builds the same model as parsing it eagerly."""
+    expected = Parser().parse_file(bpmn_file)
+
+    result = Parser(lazy=True).parse_file(bpmn_file)
+
+    assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected.definition)
+    assert {key: dataclass_to_dict(value) for key, value in result.elements_by_id.items()} == {
+        key: dataclass_to_dict(value) for key, value in expected.elements_by_id.items()
+    }
+    assert sorted(result.references, key=repr) == sorted(expected.references, key=repr)
@@ -0,0 +1,128 @@
+"""Tests for the loader module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName, dataclass_to_dict
+from pybpmn_parser.loader import element_from_dict, from_dict
+from pybpmn_parser.parse import Parser
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = sorted(FIXTURE_DIR.glob("**/*.bpmn"))
+
+ZEEBE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:zeebe="http://camunda.org/schema/zeebe/1.0"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1" isExecutable="true">
+    <bpmn:serviceTask id="Task_1" name="Ship">
+      <bpmn:extensionElements>
+        <zeebe:taskDefinition type="ship" retries="3" />
+      </bpmn:extensionElements>
+    </bpmn:serviceTask>
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+def reference_keys(result) -> list[tuple]:
+    """Return the references of a result in a stable order."""
+    return sorted((ref.element_id or "", ref.property, ref.reference_id) for ref in result.references)
+
+
+class TestFromDict:
+    """Unit tests for the from_dict function."""
+
+    @pytest.mark.parametrize("bpmn_file", FIXTURES, ids=lambda path: path.stem)
+    def test_round_trip(self, bpmn_file: Path):
+        """Loading the dict of a parsed document gives back an equal model, with its IDs and references."""
+        parsed = Parser().parse_file(bpmn_file)
+
+        loaded = from_dict(dataclass_to_dict(parsed))
+
+        assert loaded.definition == parsed.definition
+        assert loaded.elements_by_id.keys() == parsed.elements_by_id.keys()
+        assert reference_keys(loaded) == reference_keys(parsed)
+
+    @pytest.mark.parametrize("bpmn_file", FIXTURES, ids=lambda path: path.stem)
+    def test_fixture_json(self, bpmn_file: Path):
+        """The expected JSON of a fixture loads into a model with the same dict form as the parsed one."""
+        parsed = Parser().parse_file(bpmn_file)
+
+        loaded = from_dict(json.loads(bpmn_file.with_suffix(".json").read_text(encoding="utf-8")))
+
+        assert dataclass_to_dict(loaded.definition, skip_empty=True) == dataclass_to_dict(
+            parsed.definition, skip_empty=True
+        )
+        assert reference_keys(loaded) == reference_keys(parsed)
+        assert loaded.elements_by_id.keys() == parsed.elements_by_id.keys()
+
+    def test_elements_by_id_are_the_loaded_elements(self):
+        """`elements_by_id` holds the elements of the loaded tree, with their classes."""
+        result = from_dict(dataclass_to_dict(Parser().parse_bytes(ZEEBE_XML)))
+
+        task = result.definition.processes[0].service_tasks[0]
+        assert result.elements_by_id["Task_1"] is task
+        assert type(task).__name__ == "ServiceTask"
+
+    def test_extension_elements(self):
+        """Extra attributes named after a registered extension element are loaded as that element."""
+        parsed = Parser().parse_bytes(ZEEBE_XML)
+
+        loaded = from_dict(dataclass_to_dict(parsed))
+
+        extension = loaded.elements_by_id["Task_1"].extension_elements.zeebe_task_definition
+        assert type(extension).__name__ == "TaskDefinition"
+        assert (extension.type, extension.retries) == ("ship", "3")
+
+    def test_unknown_keys_are_extras(self):
+        """Keys that are neither properties nor extension elements are kept as extra attributes."""
+        result = from_dict(
+            {
+                "id": "Definitions_1",
+                "target_namespace": "urn:test",
+                "vendor_tag": {"@value": "x"},
+                "processes": [{"id": "P"}],
+            }
+        )
+
+        assert result.definition.vendor_tag == {"@value": "x"}
+        assert result.definition.__extra_kwargs__ == {"vendor_tag": {"@value": "x"}}
+        assert set(result.elements_by_id) == {"Definitions_1", "P"}
+
+    def test_deep_nesting(self):
+        """Deeply nested sub-processes load without recursion."""
+        data = {"id": "Sub_0"}
+        for depth in range(1, 3000):
+            data = {"id": f"Sub_{depth}", "sub_processes": [data]}
+
+        result = from_dict(
+            {
+                "id": "Definitions_1",
+                "target_namespace": "urn:test",
+                "processes": [{"id": "P", "sub_processes": [data]}],
+            }
+        )
+
+        assert len(result.elements_by_id) == 3002
+
+
+class TestElementFromDict:
+    """Unit tests for the element_from_dict function."""
+
+    def test_by_qname(self):
+        """An element is built from its dict and the qualified name of its class."""
+        task = element_from_dict(
+            {"id": "Task_1", "name": "Ship", "documentation": [{"content": "Ships the order"}]},
+            QName(uri=NAMESPACES["bpmn"], local="task"),
+        )
+
+        assert (task.id, task.name, task.documentation[0].content) == ("Task_1", "Ship", "Ships the order")
+
+    def test_unknown_type(self):
+        """A name without a registered element is an error."""
+        with pytest.raises(ValueError, match="No element is registered"):
+            element_from_dict({}, "{urn:unknown}thing")
@@ -1,11 +1,24 @@
 """Unit tests for the parse function in the parse module."""
 
+import io
+import threading
 from pathlib import Path
 
+import lxml.etree as ET  # noqa: N812
 import pytest
+import xmltodict
 
-from pybpmn_parser.parse import Parser
-from pybpmn_parser.validator import ValidationError
+import pybpmn_parser.parse
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.factory import create_bpmn
+from pybpmn_parser.parse import ParseCancelledError, ParseContext, Parser
+from pybpmn_parser.validator import SchemaBackend, ValidationError, ValidationLevel
+
+LATIN1_XML = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" targetNamespace="http://bpmn.io/schema/bpmn">
+    <bpmn:process id="Process_1" name="Caf\u00e9" />
+</bpmn:definitions>
+""".encode("iso-8859-1")
 
 
 class TestParser:
@@ -77,6 +90,155 @@ class TestParser:
             parser.parse_string(xml_str)
 
 
+class TestValidationOption:
+    """Unit tests for the validation option of Parser."""
+
+    def test_validation_off_builds_schema_invalid_documents(self):
+        """With validation off, the model is built from any well-formed document."""
+        xml_str = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" id="Definitions_1"
+            targetNamespace="http://example.org/bpmn">
+            <bpmn:process id="Process_1">
+                <bpmn:unknownTag/>
+                <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Missing_1"/>
+            </bpmn:process>
+        </bpmn:definitions>"""
+
+        result = Parser(validation="off").parse_string(xml_str)
+
+        assert result.definition.processes[0].id == "Process_1"
+
+    def test_validation_off_still_rejects_malformed_xml(self):
+        """Malformed XML is rejected at every level."""
+        with pytest.raises(ValidationError, match="XML_PARSE_ERROR"):
+            Parser(validation=ValidationLevel.OFF).parse_string("<bpmn:definitions")
+
+    def test_structural_validation_reports_errors(self, capsys):
+        """Structural errors are raised as structured errors and nothing is printed."""
+        xml_str = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" id="Definitions_1">
+            <bpmn:process id="Process_1">
+                <bpmn:startEvent id="Start_1"/>
+                <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Missing_1"/>
+            </bpmn:process>
+        </bpmn:definitions>"""
+
+        with pytest.raises(ValidationError) as excinfo:
+            Parser(validation="structural").parse_string(xml_str)
+
+        assert [error.code for error in excinfo.value.errors] == ["INVALID_REFERENCE"]
+        assert not capsys.readouterr().out
+
+    def test_unknown_level_raises(self):
+        """An unknown validation level is rejected when the parser is created."""
+        with pytest.raises(ValueError):
+            Parser(validation="strict")
+
+    def test_lxml_schema_backend(self, fixture_dir: Path):
+        """The lxml backend builds the same model and rejects the same documents."""
+        parser = Parser(schema_backend="lxml")
+
+        result = parser.parse_file(fixture_dir / "kitchen-sink.bpmn")
+
+        expected = Parser().parse_file(fixture_dir / "kitchen-sink.bpmn")
+        assert result.elements_by_id.keys() == expected.elements_by_id.keys()
+        assert parser.fingerprint != Parser().fingerprint
+        with pytest.raises(ValidationError, match="SCHEMA_ERROR"):
+            parser.parse_string(
+                """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                targetNamespace="http://example.org/bpmn"><bpmn:unknownTag/></bpmn:definitions>"""
+            )
+
+
+class TestValidate:
+    """Unit tests for the validate method of Parser."""
+
+    INVALID_XML = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+        targetNamespace="http://example.org/bpmn"><bpmn:unknownTag/></bpmn:definitions>"""
+
+    def test_uses_the_validation_level(self):
+        """The parser's validation level decides which checks run."""
+        assert not Parser().validate(self.INVALID_XML).is_valid
+        assert Parser(validation=ValidationLevel.OFF).validate(self.INVALID_XML).is_valid
+
+    def test_uses_the_schema_backend(self, mocker):
+        """The parser's schema backend checks the document."""
+        validate_element = mocker.spy(pybpmn_parser.parse, "validate_element")
+
+        result = Parser(schema_backend="lxml").validate(self.INVALID_XML.encode())
+
+        assert result.errors[0].code == "SCHEMA_ERROR"
+        assert validate_element.call_args.args[1:] == (ValidationLevel.SCHEMA, SchemaBackend.LXML)
+
+    def test_malformed_xml_is_an_error(self):
+        """Malformed documents give a failed result instead of raising."""
+        assert Parser().validate(b"<bpmn:definitions").errors[0].code == "XML_PARSE_ERROR"
+
+    def test_set_cancel_event_stops_validation(self):
+        """The document is not validated once the cancel event is set."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(ParseCancelledError):
+            Parser().validate(self.INVALID_XML, cancel_event=cancel_event)
+
+
+class TestParseElement:
+    """Unit tests for the Parser.parse_element method."""
+
+    def test_parses_an_existing_tree(self, fixture_dir: Path):
+        """An `lxml` tree held by the caller is parsed without re-reading the XML."""
+        root = ET.parse(fixture_dir / "kitchen-sink.bpmn").getroot()
+        parser = Parser()
+
+        result = parser.parse_element(root)
+
+        assert result.definition.id == root.get("id")
+        assert result.elements_by_id
+
+    def test_does_not_modify_the_callers_tree(self, fixture_dir: Path):
+        """The caller's tree is left intact after parsing."""
+        root = ET.parse(fixture_dir / "kitchen-sink.bpmn").getroot()
+        expected = ET.tostring(root)
+
+        Parser().parse_element(root)
+
+        assert ET.tostring(root) == expected
+
+    def test_invalid_tree_raises_validation_error(self):
+        """A tree that does not conform to the BPMN schema raises a ValidationError."""
+        root = ET.fromstring("<root><child>Some content</child></root>")
+
+        with pytest.raises(ValidationError, match="SCHEMA_ERROR: 'root' is not an element of the schema"):
+            Parser().parse_element(root)
+
+    def test_matches_the_xmltodict_pipeline(self, fixture_dir: Path):
+        """Building from the shared tree gives the same model as building from an `xmltodict` dictionary."""
+        xml_str = (fixture_dir / "kitchen-sink.bpmn").read_text(encoding="utf-8")
+        parser = Parser()
+        context = ParseContext()
+        expected = create_bpmn(xmltodict.parse(xml_str), context, parser.ns_map)
+
+        result = parser.parse_string(xml_str)
+
+        assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected)
+        assert result.elements_by_id.keys() == context.elements_by_id.keys()
+
+
+class TestParseContext:
+    """Unit tests for the ParseContext class."""
+
+    def test_set_cancel_event_stops_building(self, fixture_dir: Path):
+        """Building stops with a ParseCancelledError once the cancel event is set."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(ParseCancelledError):
+            Parser().parse_bytes((fixture_dir / "kitchen-sink.bpmn").read_bytes(), cancel_event=cancel_event)
+
+    def test_check_cancelled_without_event(self):
+        """A context without a cancel event never stops."""
+        ParseContext().check_cancelled()
+
+
 class TestParseFile:
     """Unit tests for the parse_file function in the parse module."""
 
@@ -92,3 +254,69 @@ class TestParseFile:
         non_existent_file = fixture_dir / "non_existent.bpmn"
         with pytest.raises(FileNotFoundError):
             parser.parse_file(non_existent_file)
+
+    def test_memory_mapped_file_matches_regular_read(self, fixture_dir: Path):
+        """Parsing a memory-mapped file gives the same model as reading it."""
+        parser = Parser()
+        expected = parser.parse_file(fixture_dir / "kitchen-sink.bpmn")
+
+        result = parser.parse_file(fixture_dir / "kitchen-sink.bpmn", memory_map=True)
+
+        assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected.definition)
+
+    def test_honors_declared_encoding(self, tmp_path: Path):
+        """A file in a non-UTF-8 encoding is decoded using its XML declaration."""
+        xml_file = tmp_path / "latin1.bpmn"
+        xml_file.write_bytes(LATIN1_XML)
+
+        for memory_map in (False, True):
+            result = Parser().parse_file(xml_file, memory_map=memory_map)
+            assert result.definition.processes[0].name == "Caf\u00e9"
+
+    def test_empty_memory_mapped_file_raises_validation_error(self, tmp_path: Path):
+        """An empty file can't be mapped, and raises a ValidationError like any other empty document."""
+        xml_file = tmp_path / "empty.bpmn"
+        xml_file.touch()
+
+        with pytest.raises(ValidationError):
+            Parser().parse_file(xml_file, memory_map=True)
+
+
+class TestParseBytes:
+    """Unit tests for the Parser.parse_bytes method."""
+
+    def test_parses_bytes(self, fixture_dir: Path):
+        """Raw bytes are parsed like the decoded string."""
+        xml_bytes = (fixture_dir / "kitchen-sink.bpmn").read_bytes()
+        parser = Parser()
+
+        result = parser.parse_bytes(xml_bytes)
+
+        expected = parser.parse_string(xml_bytes.decode("utf-8"))
+        assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected.definition)
+
+    def test_honors_declared_encoding(self):
+        """The encoding declared by the document is used to decode it."""
+        result = Parser().parse_bytes(LATIN1_XML)
+        assert result.definition.processes[0].name == "Caf\u00e9"
+
+    def test_empty_bytes_raises_validation_error(self):
+        """Empty data raises a ValidationError."""
+        with pytest.raises(ValidationError, match="EMPTY_XML"):
+            Parser().parse_bytes(b"")
+
+
+class TestParseFileobj:
+    """Unit tests for the Parser.parse_fileobj method."""
+
+    def test_parses_a_binary_file_object(self, fixture_dir: Path):
+        """An open binary file is parsed into a ParseResult."""
+        with open(fixture_dir / "kitchen-sink.bpmn", "rb") as xml_file:
+            result = Parser().parse_fileobj(xml_file)
+        assert result.definition.id
+        assert result.elements_by_id
+
+    def test_malformed_xml_raises_validation_error(self):
+        """Malformed XML raises a ValidationError."""
+        with pytest.raises(ValidationError, match="XML_PARSE_ERROR"):
+            Parser().parse_fileobj(io.BytesIO(b"<bpmn:definitions"))
@@ -0,0 +1,106 @@
+"""Tests for pickling parse results, including elements of runtime-generated extension classes."""
+
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.core import QName, dataclass_to_dict
+from pybpmn_parser.element_registry import element_qname, new_element, registry
+from pybpmn_parser.parse import Parser
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MIWG_FIXTURES = sorted((FIXTURE_DIR / "miwg-test-suite-2025").glob("*.bpmn"))
+EXTENSION_FIXTURE = FIXTURE_DIR / "miwg-test-suite-2025" / "C.1.0.bpmn"
+
+
+@pytest.mark.parametrize("bpmn_file", MIWG_FIXTURES, ids=lambda path: path.stem)
+def test_round_trip(bpmn_file: Path):
+    """Every MIWG fixture survives a pickle round trip."""
+    result = Parser().parse_file(bpmn_file)
+
+    restored = pickle.loads(pickle.dumps(result))
+
+    assert dataclass_to_dict(restored.definition) == dataclass_to_dict(result.definition)
+    assert restored.elements_by_id.keys() == result.elements_by_id.keys()
+    assert restored.references == result.references
+    for element_id, element in restored.elements_by_id.items():
+        assert type(element) is registry.by_qname[element_qname(type(result.elements_by_id[element_id]))].type
+
+
+class TestPickling:
+    """Unit tests for pickling elements by qualified name."""
+
+    def test_generated_classes_are_restored(self):
+        """Elements of classes generated from moddle extensions are restored with the registered class."""
+        result = Parser().parse_file(EXTENSION_FIXTURE)
+        originals = [
+            element
+            for element in _walk(result.definition)
+            if not type(element).__module__.startswith("pybpmn_parser.bpmn")
+        ]
+        assert originals
+
+        restored = pickle.loads(pickle.dumps(originals))
+
+        assert [type(element) for element in restored] == [type(element) for element in originals]
+        assert [dataclass_to_dict(element) for element in restored] == [
+            dataclass_to_dict(element) for element in originals
+        ]
+
+    def test_shared_elements_stay_shared(self):
+        """An element reachable from the model and the ID index is restored once."""
+        result = Parser().parse_file(EXTENSION_FIXTURE)
+
+        restored = pickle.loads(pickle.dumps(result))
+
+        process = restored.definition.processes[0]
+        assert restored.elements_by_id[process.id] is process
+
+    def test_extra_attributes_are_kept(self):
+        """Attributes set besides the dataclass fields survive the round trip."""
+        result = Parser().parse_file(FIXTURE_DIR / "kitchen-sink.bpmn")
+        process = result.definition.processes[0]
+        process.custom = {"a": 1}
+
+        restored = pickle.loads(pickle.dumps(process))
+
+        assert restored.custom == {"a": 1}
+
+    def test_unknown_qname_raises(self):
+        """An element whose class is not registered cannot be restored."""
+        with pytest.raises(pickle.UnpicklingError, match="urn:unknown"):
+            new_element(QName("thing", "urn:unknown"))
+
+    def test_restores_in_a_fresh_process(self, tmp_path: Path):
+        """A fresh interpreter restores extension elements without creating a parser first."""
+        pickle_file = tmp_path / "result.pickle"
+        pickle_file.write_bytes(pickle.dumps(Parser().parse_file(EXTENSION_FIXTURE)))
+        script = (
+            "import pickle, sys\n"
+            "result = pickle.loads(open(sys.argv[1], 'rb').read())\n"
+            "print(len(result.elements_by_id))\n"
+        )
+
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script, str(pickle_file)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+        )
+
+        assert int(output.stdout) == len(Parser().parse_file(EXTENSION_FIXTURE).elements_by_id)
+
+
+def _walk(value):
+    """Yield every element below a value, depth first."""
+    if isinstance(value, list):
+        for item in value:
+            yield from _walk(item)
+    elif hasattr(type(value), "Meta"):
+        yield value
+        for item in vars(value).values():
+            yield from _walk(item)
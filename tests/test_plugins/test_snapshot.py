@@ -0,0 +1,135 @@
+"""Tests for the registry snapshot and repeated plugin loading."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.cache import CACHE_DIR_ENV
+from pybpmn_parser.element_registry import registry as element_registry
+from pybpmn_parser.parse import Parser
+from pybpmn_parser.plugins import load_default_plugins
+from pybpmn_parser.plugins.moddle import element_from_spec, element_spec
+from pybpmn_parser.plugins.moddle import registry as moddle_registry
+from pybpmn_parser.plugins.snapshot import snapshot_directory
+
+REPO_DIR = Path(__file__).parent.parent.parent
+
+# Prints a summary of the registries, after forbidding the conversion of moddle types when asked to.
+REGISTRY_SCRIPT = """
+import sys
+import pybpmn_parser
+import pybpmn_parser.plugins.moddle as moddle
+if "--restore-only" in sys.argv:
+    moddle.element_spec = None
+if "--other-version" in sys.argv:
+    pybpmn_parser.__version__ = "0.0.0-other"
+from pybpmn_parser.element_registry import registry
+from pybpmn_parser.parse import Parser
+Parser()
+for q_name, descriptor in sorted(registry.by_qname.items(), key=lambda item: str(item[0])):
+    bases = [base.__name__ for base in descriptor.type.__bases__]
+    print(q_name, descriptor.type.__name__, bases, descriptor.properties)
+print(len(moddle.registry.packages), len(moddle.registry.type_map), moddle.registry.namespace_map)
+"""
+
+
+def registry_summary(cache_dir: Path, *args: str) -> str:
+    """Load the default plugins in a fresh interpreter and summarize the registries."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", REGISTRY_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_DIR,
+        env={**os.environ, CACHE_DIR_ENV: str(cache_dir)},
+    )
+    return output.stdout
+
+
+class TestRepeatedLoading:
+    """Unit tests for loading the plugins more than once in a process."""
+
+    def test_second_parser_registers_nothing(self):
+        """Creating another parser leaves both registries untouched."""
+        Parser()
+        descriptors = dict(element_registry.by_qname)
+        version = element_registry.version
+        packages = list(moddle_registry.packages)
+
+        Parser()
+        load_default_plugins()
+
+        assert element_registry.version == version
+        assert all(element_registry.by_qname[q_name] is descriptor for q_name, descriptor in descriptors.items())
+        assert moddle_registry.packages == packages
+        assert moddle_registry.converted_packages == len(packages)
+
+    def test_spec_recreates_an_equivalent_class(self):
+        """A class generated from a specification has the same fields and bases as the registered one."""
+        Parser()
+        q_name = next(
+            q_name for q_name in element_registry.by_qname if q_name.uri == "http://camunda.org/schema/1.0/bpmn"
+        )
+        registered = element_registry.by_qname[q_name].type
+        moddle_type = next(
+            moddle_type
+            for moddle_type in moddle_registry.type_map.values()
+            if element_spec(moddle_type).q_name == q_name
+        )
+
+        recreated = element_from_spec(element_spec(moddle_type))
+
+        assert recreated.__bases__ == registered.__bases__
+        assert recreated.__dataclass_fields__.keys() == registered.__dataclass_fields__.keys()
+        assert (recreated.Meta.namespace, recreated.Meta.name) == (q_name.uri, q_name.local)
+
+
+class TestRegistrySnapshot:
+    """Unit tests for warm-starting the registries from a snapshot."""
+
+    def test_restored_registries_match_a_cold_start(self, tmp_path: Path):
+        """A second process restores the same registries without converting any moddle type."""
+        cold = registry_summary(tmp_path)
+        assert len(list(tmp_path.glob("registry-*.pickle"))) == 1
+
+        warm = registry_summary(tmp_path, "--restore-only")
+
+        assert warm == cold
+
+    def test_new_version_rebuilds_the_snapshot(self, tmp_path: Path):
+        """A snapshot written by another version of the library is not used."""
+        registry_summary(tmp_path)
+
+        registry_summary(tmp_path, "--other-version")
+
+        assert len(list(tmp_path.glob("registry-*.pickle"))) == 2
+
+    def test_damaged_snapshot_is_rebuilt(self, tmp_path: Path):
+        """A snapshot that cannot be read is replaced."""
+        registry_summary(tmp_path)
+        (path,) = tmp_path.glob("registry-*.pickle")
+        path.write_bytes(b"damaged")
+
+        registry_summary(tmp_path)
+
+        assert path.stat().st_size > len(b"damaged")
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("", None), ("/some/dir", Path("/some/dir"))],
+    )
+    def test_snapshot_directory(self, monkeypatch, value: str, expected):
+        """The environment variable sets the directory, or disables snapshots when empty."""
+        monkeypatch.setenv(CACHE_DIR_ENV, value)
+
+        assert snapshot_directory() == expected
+
+    def test_default_directory(self, monkeypatch, tmp_path: Path):
+        """Snapshots go to the user's cache directory by default."""
+        monkeypatch.delenv(CACHE_DIR_ENV)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert snapshot_directory() == tmp_path / "pybpmn_parser"
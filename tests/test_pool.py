@@ -0,0 +1,196 @@
+"""Tests for the pool module."""
+
+import multiprocessing
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser import pool, validator
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.parse import Parser
+from pybpmn_parser.pool import ParseOutcome, ParserPool
+from pybpmn_parser.validator import ValidationError, ValidationLevel
+
+SCHEMA_INVALID_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:task id="Task_1" unknownAttribute="1" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+FIXTURE_NAMES = ["kitchen-sink.bpmn", "miwg-test-suite-2025/A.1.0.bpmn", "miwg-test-suite-2025/B.1.0.bpmn"]
+
+
+@pytest.fixture(scope="module")
+def parser_pool():
+    """A pool with two workers, shared by the tests of this module."""
+    with ParserPool(workers=2, max_in_flight=2) as parser_pool:
+        yield parser_pool
+
+
+@pytest.fixture
+def paths(fixture_dir: Path, tmp_path: Path) -> list[Path]:
+    """Valid fixtures with an invalid file in the middle."""
+    bad_file = tmp_path / "bad.bpmn"
+    bad_file.write_text("<bpmn:definitions", encoding="utf-8")
+    valid = [fixture_dir / name for name in FIXTURE_NAMES]
+    return [valid[0], bad_file, *valid[1:]]
+
+
+class TestParserPool:
+    """Unit tests for the ParserPool class."""
+
+    def test_imap_keeps_order_and_collects_errors(self, parser_pool: ParserPool, paths: list[Path]):
+        """Outcomes follow the order of the paths, and a bad file does not abort the batch."""
+        outcomes = list(parser_pool.imap(paths))
+
+        assert [outcome.path for outcome in outcomes] == paths
+        assert [outcome.ok for outcome in outcomes] == [True, False, True, True]
+        assert isinstance(outcomes[1].error, ValidationError)
+        assert "XML_PARSE_ERROR" in str(outcomes[1].error)
+
+    def test_results_match_a_local_parse(self, parser_pool: ParserPool, fixture_dir: Path):
+        """A file parsed by a worker gives the same model as parsing it in this process."""
+        path = fixture_dir / "kitchen-sink.bpmn"
+
+        (outcome,) = parser_pool.imap([path])
+
+        expected = Parser().parse_file(path)
+        assert dataclass_to_dict(outcome.result.definition) == dataclass_to_dict(expected.definition)
+        assert outcome.result.elements_by_id.keys() == expected.elements_by_id.keys()
+
+    def test_imap_unordered_yields_every_path(self, parser_pool: ParserPool, paths: list[Path]):
+        """Every path produces exactly one outcome, in any order."""
+        outcomes = list(parser_pool.imap_unordered(paths))
+
+        assert sorted(outcome.path for outcome in outcomes) == sorted(paths)
+        assert sum(not outcome.ok for outcome in outcomes) == 1
+
+    def test_in_flight_work_is_bounded(self, parser_pool: ParserPool, paths: list[Path]):
+        """Paths are consumed lazily, so no more than `max_in_flight` files are submitted ahead of the consumer."""
+        consumed = []
+
+        def tracked_paths():
+            for path in paths:
+                consumed.append(path)
+                yield path
+
+        outcomes = parser_pool.imap(tracked_paths())
+        next(outcomes)
+
+        assert len(consumed) == parser_pool.max_in_flight
+        outcomes.close()
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method")
+    def test_heap_is_unfrozen_by_the_last_pool(self, mocker):
+        """Closing a pool leaves the heap frozen while another pool that froze it is open."""
+        unfreeze = mocker.patch("gc.unfreeze")
+        already_frozen = pool._FREEZING_POOLS
+
+        first = ParserPool(workers=1, start_method="fork")
+        second = ParserPool(workers=1, start_method="fork")
+        first.close()
+
+        assert pool._FREEZING_POOLS == already_frozen + 1
+        unfreeze.assert_not_called()
+
+        second.close()
+        second.close()
+
+        assert pool._FREEZING_POOLS == already_frozen
+        assert unfreeze.call_count == (already_frozen == 0)
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method")
+    def test_schema_is_compiled_before_forking(self, mocker):
+        """With the fork start method, the parent compiles the schemas the workers validate with before forking."""
+        validator._load_bpmn_schema.cache_clear()
+        mocker.patch.object(validator, "_SCHEMAS", threading.local())
+        compiled = []
+        mocker.patch.object(
+            pool,
+            "_freeze",
+            side_effect=lambda: compiled.append(
+                (validator._load_bpmn_schema.cache_info().currsize, hasattr(validator._SCHEMAS, "schema"))
+            ),
+        )
+        mocker.patch.object(pool, "_unfreeze")
+
+        with ParserPool(workers=1, start_method="fork", schema_backend="lxml"):
+            pass
+
+        assert compiled == [(1, True)]
+
+
+class TestParseMany:
+    """Unit tests for the Parser.parse_many method."""
+
+    def test_parses_every_path(self, paths: list[Path]):
+        """Each path yields an outcome holding its result or its error."""
+        outcomes = list(Parser().parse_many(paths, workers=2))
+
+        assert [outcome.path for outcome in outcomes] == paths
+        assert [outcome.result is not None for outcome in outcomes] == [True, False, True, True]
+
+    def test_workers_apply_the_filters(self, fixture_dir: Path):
+        """The workers drop the subtrees the parser's filters exclude."""
+        path = fixture_dir / "kitchen-sink.bpmn"
+
+        (outcome,) = Parser(skip_diagrams=True).parse_many([path], workers=1)
+
+        assert outcome.result.definition.bpmndiagrams == []
+        assert outcome.result.skipped
+        assert Parser().parse_file(path).definition.bpmndiagrams
+
+    def test_workers_use_the_validation_level(self, tmp_path: Path):
+        """The workers validate documents at the parser's level."""
+        path = tmp_path / "invalid.bpmn"
+        path.write_text(SCHEMA_INVALID_XML, encoding="utf-8")
+
+        (strict,) = Parser().parse_many([path], workers=1)
+        (lenient,) = Parser(validation=ValidationLevel.OFF).parse_many([path], workers=1)
+
+        assert isinstance(strict.error, ValidationError)
+        assert lenient.ok
+        assert lenient.result.elements_by_id["Task_1"]
+
+
+class TestWorker:
+    """Unit tests for the worker functions."""
+
+    def test_parse_path_requires_initialization(self, mocker):
+        """A worker that was not initialized refuses to parse."""
+        mocker.patch.object(pool, "_WORKER_PARSER", None)
+        with pytest.raises(RuntimeError):
+            pool._parse_path(Path("any.bpmn"))
+
+    def test_initialized_worker_parses_files(self, mocker, fixture_dir: Path):
+        """The initializer creates the parser used for every file."""
+        mocker.patch.object(pool, "_WORKER_PARSER", None)
+        pool._init_worker({})
+
+        result = pool._parse_path(fixture_dir / "kitchen-sink.bpmn")
+
+        assert result.definition.id
+
+    def test_initializer_compiles_the_schema(self, mocker):
+        """The initializer compiles the schema only when the worker validates against it."""
+        mocker.patch.object(pool, "_WORKER_PARSER", None)
+        bpmn_schema = mocker.patch.object(pool, "bpmn_schema")
+
+        pool._init_worker({"validation": ValidationLevel.OFF})
+        bpmn_schema.assert_not_called()
+
+        pool._init_worker({})
+        bpmn_schema.assert_called_once()
+
+    def test_errors_survive_the_process_boundary(self):
+        """Parse errors can be sent back from a worker process."""
+        error = pickle.loads(pickle.dumps(ValidationError("XML_PARSE_ERROR", "bad")))
+        outcome = ParseOutcome(Path("bad.bpmn"), error=error)
+
+        assert not outcome.ok
+        assert str(outcome.error) == "XML_PARSE_ERROR: bad"
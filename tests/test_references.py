@@ -0,0 +1,179 @@
+"""Tests for the references module."""
+
+import pickle
+import time
+from pathlib import Path
+
+import pytest
+
+from pybpmn_parser.parse import Parser, Reference
+from pybpmn_parser.references import DanglingReferenceError, ElementRef, ReferenceIndex, target_id
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+REFERENCES_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  xmlns:tns="http://bpmn.io/schema/bpmn"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:message id="Message_1" name="Order" />
+  <bpmn:process id="Process_1">
+    <bpmn:startEvent id="Start_1">
+      <bpmn:outgoing>Flow_1</bpmn:outgoing>
+    </bpmn:startEvent>
+    <bpmn:receiveTask id="Task_1" messageRef="tns:Message_1">
+      <bpmn:incoming>Flow_1</bpmn:incoming>
+    </bpmn:receiveTask>
+    <bpmn:boundaryEvent id="Boundary_1" attachedToRef="Task_1" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Task_1" />
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1">
+      <bpmndi:BPMNShape id="Shape_Task_1" bpmnElement="Task_1">
+        <dc:Bounds x="100" y="100" width="100" height="80" />
+      </bpmndi:BPMNShape>
+      <bpmndi:BPMNShape id="Shape_Missing" bpmnElement="Missing_1">
+        <dc:Bounds x="300" y="100" width="100" height="80" />
+      </bpmndi:BPMNShape>
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+@pytest.fixture
+def result():
+    """A parsed document with references of every kind."""
+    return Parser(validation="off").parse_bytes(REFERENCES_XML)
+
+
+class TestReferenceIndex:
+    """Unit tests for the ReferenceIndex class."""
+
+    def test_targets_dereference_to_elements(self, result):
+        """The handles of a property resolve to the referenced elements."""
+        index = result.reference_index
+
+        (source,) = index.targets("Flow_1", "source_ref")
+        (target,) = index.targets(result.elements_by_id["Flow_1"], "target_ref")
+
+        assert source.resolve() is result.elements_by_id["Start_1"]
+        assert target.resolve() is result.elements_by_id["Task_1"]
+        assert index.targets("Flow_1", "name") == []
+
+    def test_referrers(self, result):
+        """The backlink index answers which elements reference an element."""
+        referrers = result.reference_index.referrers("Task_1")
+
+        assert sorted((resolved.source.id, resolved.property) for resolved in referrers) == [
+            ("Boundary_1", "attached_to_ref"),
+            ("Flow_1", "target_ref"),
+            ("Shape_Task_1", "bpmn_element"),
+        ]
+        assert all(resolved.target.resolve() is result.elements_by_id["Task_1"] for resolved in referrers)
+
+    def test_references_from(self, result):
+        """The references an element holds are listed with their properties."""
+        references = result.reference_index.references_from("Task_1")
+
+        assert [(resolved.property, resolved.target.id) for resolved in references] == [
+            ("incoming", "Flow_1"),
+            ("message_ref", "Message_1"),
+        ]
+
+    def test_prefixed_references_resolve(self, result):
+        """A reference with a namespace prefix resolves to the element with its local part as ID."""
+        (message,) = result.reference_index.targets("Task_1", "message_ref")
+
+        assert message.resolve() is result.elements_by_id["Message_1"]
+
+    def test_dangling_references_are_reported(self, result):
+        """References to unknown IDs are listed, and their handles cannot be resolved."""
+        index = result.reference_index
+
+        assert index.dangling == [Reference("Shape_Missing", "bpmn_element", "Missing_1")]
+        (missing,) = index.targets("Shape_Missing", "bpmn_element")
+        assert not missing.exists
+        assert missing.get() is None
+        with pytest.raises(DanglingReferenceError, match="Missing_1"):
+            missing.resolve()
+
+    def test_references_of_elements_without_an_id(self):
+        """References held by elements without an ID are left out of the index, but reported when they dangle."""
+        references = [
+            Reference(None, "label_style", "Style_1"),
+            Reference(None, "label_style", "Missing_1"),
+            Reference("Shape_1", "bpmn_element", "Style_1"),
+        ]
+        index = ReferenceIndex(references, {"Style_1": object(), "Shape_1": object()})
+
+        assert [resolved.source.id for resolved in index.referrers("Style_1")] == ["Shape_1"]
+        assert index.references_from(None) == []
+        assert len(index) == 1
+        assert index.dangling == [Reference(None, "label_style", "Missing_1")]
+
+        index.discard(references[1:2])
+
+        assert index.dangling == []
+
+    def test_iteration(self, result):
+        """Iterating the index yields every reference once, grouped by the element holding it."""
+        index = result.reference_index
+
+        assert len(index) == len(result.references) == len(list(index))
+        assert {resolved.target for resolved in index.referrers("Task_1")} == {index.ref("Task_1")}
+
+    def test_lazy_documents_are_built_first(self):
+        """The index of a lazily parsed document includes the references of the pending elements."""
+        result = Parser(lazy=True, validation="off").parse_bytes(REFERENCES_XML)
+
+        referrers = result.reference_index.referrers("Task_1")
+
+        assert len(referrers) == 3
+        assert not result.definition.pending_properties
+
+    def test_survives_pickling(self, result):
+        """A pickled index dereferences into the restored document."""
+        result.reference_index  # noqa: B018
+
+        restored = pickle.loads(pickle.dumps(result))
+
+        (target,) = restored.reference_index.targets("Flow_1", "target_ref")
+        assert target.resolve() is restored.elements_by_id["Task_1"]
+
+    def test_every_fixture_resolves(self):
+        """The references of the kitchen sink fixture all resolve."""
+        result = Parser().parse_file(FIXTURE_DIR / "kitchen-sink.bpmn")
+
+        assert not result.reference_index.dangling
+        assert all(resolved.target.exists for resolved in result.reference_index)
+
+    def test_linear_time(self):
+        """Indexing a hundred thousand references takes a fraction of the time a quadratic pass would."""
+        count = 100_000
+        elements_by_id = {f"Task_{number}": object() for number in range(count)}
+        references = [Reference(f"Flow_{number}", "target_ref", f"Task_{number}") for number in range(count)]
+
+        start = time.perf_counter()
+        index = ReferenceIndex(references, elements_by_id)
+        elapsed = time.perf_counter() - start
+
+        assert len(index.referrers("Task_500")) == 1
+        assert elapsed < 2.0
+
+
+class TestElementRef:
+    """Unit tests for the ElementRef class."""
+
+    def test_equality_ignores_the_index(self):
+        """Handles to the same ID are equal, whatever index they use."""
+        assert ElementRef("Task_1", {}) == ElementRef("Task_1", {"Task_1": object()})
+
+    @pytest.mark.parametrize(
+        ("reference_id", "expected"),
+        [("Task_1", "Task_1"), ("tns:Task_1", "Task_1"), ("tns:Other", "tns:Other"), ("a:b", "a:b")],
+    )
+    def test_target_id(self, reference_id: str, expected: str):
+        """The namespace prefix is dropped only when the local part is a known ID."""
+        assert target_id(reference_id, {"Task_1": object(), "a:b": object()}) == expected
@@ -0,0 +1,162 @@
+"""Tests for the selection module."""
+
+import lxml.etree as ET  # noqa: N812
+import pytest
+
+from pybpmn_parser.bpmn.types import NAMESPACES
+from pybpmn_parser.core import QName
+from pybpmn_parser.parse import Parser
+from pybpmn_parser.selection import ElementFilter, SkippedElement
+from pybpmn_parser.validator import parse_xml_bytes
+
+BPMN = NAMESPACES["bpmn"]
+
+SELECTION_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:vendor="urn:vendor"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:message id="Message_1" name="Order" />
+  <bpmn:process id="Process_1">
+    <bpmn:task id="Task_1">
+      <bpmn:extensionElements>
+        <vendor:settings level="3" />
+      </bpmn:extensionElements>
+    </bpmn:task>
+    <bpmn:subProcess id="Sub_1">
+      <bpmn:task id="Task_2" />
+    </bpmn:subProcess>
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="Diagram_1">
+    <bpmndi:BPMNPlane id="Plane_1" bpmnElement="Process_1" />
+  </bpmndi:BPMNDiagram>
+</bpmn:definitions>
+"""
+
+
+def tags(root: ET._Element) -> list[str]:
+    """Return the local names of the elements of a tree, in document order."""
+    return [ET.QName(element).localname for element in root.iter(ET.Element)]
+
+
+class TestElementFilter:
+    """Unit tests for the ElementFilter class."""
+
+    def test_exclude_drops_matching_subtrees(self):
+        """Excluded elements are removed with their subtree and reported."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        skipped = ElementFilter(exclude=["bpmn:subProcess", "bpmndi:BPMNDiagram"]).prune(root)
+
+        assert "Task_2" not in {element.get("id") for element in root.iter()}
+        assert "BPMNPlane" not in tags(root)
+        assert skipped == [
+            SkippedElement(QName("subProcess", BPMN), "Sub_1", 13),
+            SkippedElement(QName("BPMNDiagram", NAMESPACES["bpmndi"]), "Diagram_1", 17),
+        ]
+
+    def test_nested_matches_are_reported_once(self):
+        """A match inside an excluded subtree is not reported on its own."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        skipped = ElementFilter(exclude=["bpmn:process", "bpmn:task"]).prune(root)
+
+        assert [element.element_id for element in skipped] == ["Process_1"]
+
+    def test_namespace_wildcard(self):
+        """A `prefix:*` name drops every element of a namespace."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        ElementFilter(exclude=["{urn:vendor}*"]).prune(root)
+
+        assert "settings" not in tags(root)
+        assert "extensionElements" in tags(root)
+
+    def test_include_keeps_matches_and_their_ancestors(self):
+        """Included elements keep their subtree and ancestors; everything else is dropped."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        skipped = ElementFilter(include=[QName("subProcess", BPMN)]).prune(root)
+
+        assert tags(root) == ["definitions", "process", "subProcess", "task"]
+        assert [element.element_id for element in skipped] == ["Message_1", "Task_1", "Diagram_1"]
+
+    def test_exclude_applies_inside_included_subtrees(self):
+        """Excluded elements are dropped from included subtrees too."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        ElementFilter(include=["bpmn:process"], exclude=["bpmn:extensionElements"]).prune(root)
+
+        assert tags(root) == ["definitions", "process", "task", "subProcess", "task"]
+
+    def test_root_is_always_kept(self):
+        """The root element is never dropped."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        assert ElementFilter(exclude=["bpmn:definitions"]).prune(root) == []
+        assert ET.QName(root).localname == "definitions"
+
+    def test_text_after_a_removed_element_is_kept(self):
+        """Mixed content keeps the text that followed a dropped element."""
+        root = ET.fromstring("<doc><a>one<b/>two<c/>three</a></doc>")
+
+        ElementFilter(exclude=["b", "c"]).prune(root)
+
+        assert ET.tostring(root) == b"<doc><a>onetwothree</a></doc>"
+
+    def test_unknown_prefix_raises(self):
+        """Names with an unknown prefix are rejected."""
+        with pytest.raises(ValueError, match="unknown"):
+            ElementFilter(exclude=["unknown:task"])
+
+
+class TestParserFilters:
+    """Unit tests for the Parser filter options."""
+
+    def test_skip_diagrams(self):
+        """The diagram interchange part is not built and is reported."""
+        result = Parser(skip_diagrams=True).parse_bytes(SELECTION_XML)
+
+        assert result.definition.bpmndiagrams == []
+        assert "Plane_1" not in result.elements_by_id
+        assert [element.element_id for element in result.skipped] == ["Diagram_1"]
+
+    def test_include_and_exclude(self):
+        """Only the included subtrees, without the excluded ones, are built."""
+        result = Parser(include=["bpmn:process"], exclude=["vendor:*"], ns_map={"vendor": "urn:vendor"}).parse_bytes(
+            SELECTION_XML
+        )
+
+        assert result.definition.messages == []
+        assert result.elements_by_id.keys() == {"Definitions_1", "Process_1", "Task_1", "Sub_1", "Task_2"}
+        assert not hasattr(result.elements_by_id["Task_1"].extension_elements, "vendor_settings")
+
+    def test_parse_element_does_not_modify_the_tree(self):
+        """A tree owned by the caller is pruned on a copy."""
+        root = parse_xml_bytes(SELECTION_XML)
+
+        result = Parser(skip_diagrams=True).parse_element(root)
+
+        assert result.skipped
+        assert "BPMNDiagram" in tags(root)
+
+    def test_lazy_parse_skips_diagrams(self):
+        """Filters apply before the lazy index is built."""
+        result = Parser(lazy=True, skip_diagrams=True).parse_bytes(SELECTION_XML)
+
+        assert "Diagram_1" not in result.elements_by_id.locations
+        assert result.definition.bpmndiagrams == []
+
+    def test_no_filter_by_default(self):
+        """A parser without filters keeps everything."""
+        result = Parser().parse_bytes(SELECTION_XML)
+
+        assert Parser().element_filter is None
+        assert result.skipped == []
+        assert "Plane_1" in result.elements_by_id
+
+    def test_moddle_prefixes_are_known(self):
+        """Vendor elements can be named by the prefix of their moddle package."""
+        parser = Parser(exclude=["camunda:*"])
+
+        assert parser.element_filter.exclude == ("{http://camunda.org/schema/1.0/bpmn}*",)
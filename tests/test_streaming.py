@@ -0,0 +1,174 @@
+"""Tests for the streaming module."""
+
+import io
+from pathlib import Path
+
+import lxml.etree as ET  # noqa: N812
+import pytest
+import xmltodict
+
+import pybpmn_parser.streaming
+from pybpmn_parser.core import dataclass_to_dict
+from pybpmn_parser.factory import create_bpmn
+from pybpmn_parser.parse import ParseContext, Parser
+from pybpmn_parser.streaming import iterparse_bpmn
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+EXTENSIONS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:camunda="http://camunda.org/schema/1.0/bpmn"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:process id="Process_1">
+    <bpmn:documentation>Before <!-- a comment --> after</bpmn:documentation>
+    <bpmn:startEvent id="Start_1">
+      <bpmn:outgoing>Flow_1</bpmn:outgoing>
+    </bpmn:startEvent>
+    <bpmn:task id="Task_1">
+      <bpmn:extensionElements>
+        <camunda:properties>
+          <camunda:property name="a" value="1" />
+          <camunda:property name="b" value="2" />
+        </camunda:properties>
+        <vendor:settings xmlns:vendor="urn:vendor" level="3"><vendor:item>x</vendor:item></vendor:settings>
+      </bpmn:extensionElements>
+      <bpmn:incoming>Flow_1</bpmn:incoming>
+    </bpmn:task>
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Task_1" />
+    <bpmn:task id="Task_2" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+def reference_result(xml: bytes) -> tuple:
+    """Build the model with the dictionary-based factory."""
+    context = ParseContext()
+    definitions = create_bpmn(xmltodict.parse(xml), context, Parser().ns_map)
+    return definitions, context
+
+
+def as_dicts(context: ParseContext) -> dict:
+    """Return the parsed elements as dictionaries, as runtime-generated extension classes compare by identity."""
+    return {element_id: dataclass_to_dict(element) for element_id, element in context.elements_by_id.items()}
+
+
+def sort_references(context: ParseContext) -> list:
+    """Return the references in a stable order."""
+    return sorted(context.references, key=repr)
+
+
+class TestIterparseBpmn:
+    """Unit tests for the iterparse_bpmn function."""
+
+    def test_matches_create_bpmn(self):
+        """Registered, raw and mixed-content elements are built exactly like `create_bpmn` builds them."""
+        expected, expected_context = reference_result(EXTENSIONS_XML)
+        context = ParseContext()
+
+        definitions = iterparse_bpmn(io.BytesIO(EXTENSIONS_XML), context, Parser().ns_map)
+
+        assert definitions == expected
+        assert dataclass_to_dict(definitions) == dataclass_to_dict(expected)
+        assert as_dicts(context) == as_dicts(expected_context)
+        assert sort_references(context) == sort_references(expected_context)
+
+    def test_unknown_extensions_are_kept_as_dictionaries(self):
+        """Elements unknown to the registry are stored as `xmltodict`-style dictionaries."""
+        definitions = iterparse_bpmn(io.BytesIO(EXTENSIONS_XML), ParseContext(), Parser().ns_map)
+
+        task = definitions.processes[0].tasks[0]
+        assert task.extension_elements.vendor_settings == {
+            "@xmlns:vendor": "urn:vendor",
+            "@level": "3",
+            "vendor:item": "x",
+        }
+
+    def test_finished_elements_are_cleared(self, mocker):
+        """Every element is emptied once it is built, so the tree doesn't grow with the document."""
+        ended = []
+        original_iterparse = ET.iterparse
+
+        def recording_iterparse(*args, **kwargs):
+            for event, element in original_iterparse(*args, **kwargs):
+                if event == "end":
+                    ended.append(element)
+                yield event, element
+
+        mocker.patch("pybpmn_parser.streaming.ET.iterparse", recording_iterparse)
+
+        iterparse_bpmn(io.BytesIO(EXTENSIONS_XML), ParseContext(), Parser().ns_map)
+
+        assert all(len(element) == 0 for element in ended)
+        assert ended[-1].attrib == {}
+
+    def test_accepts_a_path(self, fixture_dir: Path):
+        """A file path can be streamed directly."""
+        definitions = iterparse_bpmn(fixture_dir / "kitchen-sink.bpmn", ParseContext())
+        assert definitions.id
+
+    def test_empty_document_raises_syntax_error(self):
+        """A document without a root element is not well-formed."""
+        with pytest.raises(ET.XMLSyntaxError):
+            iterparse_bpmn(io.BytesIO(b""), ParseContext())
+
+
+class TestParseStream:
+    """Unit tests for the Parser.parse_stream method."""
+
+    def test_parses_a_file_object(self):
+        """A binary file object is parsed into a ParseResult."""
+        result = Parser().parse_stream(io.BytesIO(EXTENSIONS_XML))
+        assert result.definition.processes[0].id == "Process_1"
+        assert {"Process_1", "Start_1", "Task_1", "Flow_1", "Task_2"} <= result.elements_by_id.keys()
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"skip_diagrams": True},
+            {"include": ["bpmn:task"]},
+            {"include": ["bpmn:process"], "exclude": ["bpmn:extensionElements"]},
+            {"exclude": ["camunda:*", "bpmn:sequenceFlow"]},
+        ],
+        ids=["skip_diagrams", "nested_include", "include_and_exclude", "exclude"],
+    )
+    @pytest.mark.parametrize("xml", [EXTENSIONS_XML, (FIXTURE_DIR / "kitchen-sink.bpmn").read_bytes()])
+    def test_filters_match_parse_bytes(self, options: dict, xml: bytes):
+        """The filters drop the same subtrees as when the whole document is parsed first."""
+        parser = Parser(validation="off", **options)
+
+        result = parser.parse_stream(io.BytesIO(xml))
+
+        expected = parser.parse_bytes(xml)
+        assert dataclass_to_dict(result.definition) == dataclass_to_dict(expected.definition)
+        assert result.elements_by_id.keys() == expected.elements_by_id.keys()
+        assert sorted(result.skipped, key=repr) == sorted(expected.skipped, key=repr)
+
+    def test_excluded_subtrees_are_not_built(self, mocker):
+        """Nothing is built from an excluded subtree."""
+        build = mocker.spy(pybpmn_parser.streaming, "create_element_from_dict")
+
+        result = Parser(skip_diagrams=True).parse_stream(FIXTURE_DIR / "kitchen-sink.bpmn")
+
+        assert result.skipped
+        assert not any(call.args[1].q_name.local.startswith("BPMN") for call in build.call_args_list)
+
+    def test_malformed_xml_raises_validation_error(self):
+        """Malformed XML raises a ValidationError, like `parse_string` does."""
+        from pybpmn_parser.validator import ValidationError
+
+        with pytest.raises(ValidationError, match="XML_PARSE_ERROR"):
+            Parser().parse_stream(io.BytesIO(b"<bpmn:definitions"))
+
+
+@pytest.mark.parametrize("bpmn_file", sorted(FIXTURE_DIR.glob("**/*.bpmn")), ids=lambda path: path.stem)
+def test_matches_create_bpmn_for_fixtures(bpmn_file: Path):
+    """Streaming every fixture builds the same model as `create_bpmn`."""
+    expected, expected_context = reference_result(bpmn_file.read_bytes())
+    context = ParseContext()
+
+    definitions = iterparse_bpmn(bpmn_file, context, Parser().ns_map)
+
+    assert definitions == expected
+    assert as_dicts(context) == as_dicts(expected_context)
+    assert sort_references(context) == sort_references(expected_context)
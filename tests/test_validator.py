@@ -1,15 +1,38 @@
 """Unit tests for the validator module."""
 
+import io
+import pickle
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
 import lxml.etree as ET  # noqa: N812
+import pytest
 
+from pybpmn_parser.cache import CACHE_DIR_ENV, MAC_SIZE
+from pybpmn_parser.parse import Parser
 from pybpmn_parser.validator import (
+    Rule,
+    RuleEngine,
+    SchemaBackend,
     ValidationError,
-    _get_unique_ids,
+    ValidationLevel,
+    ValidationResult,
     _is_skippable_error,
+    _load_bpmn_schema,
     _parse_xml,
     _strip_extra_whitespace,
     _validate_flows,
+    _validate_structure,
+    bpmn_schema,
+    parse_xml,
+    parse_xml_bytes,
+    parse_xml_file,
+    rule,
     validate,
+    validate_element,
 )
 
 
@@ -77,38 +100,173 @@ class TestParseXML:
         assert result[0].text == "Content"
 
 
-class TestValidateUniqueIds:
-    """Unit tests for _validate_unique_ids function."""
-
-    def test_unique_ids_passes(self):
-        """Test that a document with unique IDs passes the validation."""
-        xml = """<root>
-                    <element id="id1"/>
-                    <element id="id2"/>
-                </root>"""
-        doc = ET.fromstring(xml)
-        result = _get_unique_ids(doc)
-        assert set(result) == {"id1", "id2"}
-
-    def test_duplicate_ids_are_deduplicated(self):
-        """Test that a document with duplicate IDs returns only one ID per element."""
-        xml = """<root>
-                    <element id="id1"/>
-                    <element id="id1"/>
-                </root>"""
-        doc = ET.fromstring(xml)
-        result = _get_unique_ids(doc)
-        assert result == ["id1"]
-
-    def test_no_ids_passes_with_empty_list(self):
-        """Test that a document with no IDs passes the validation."""
-        xml = """<root>
-                    <element/>
-                    <element/>
-                </root>"""
-        doc = ET.fromstring(xml)
-        result = _get_unique_ids(doc)
-        assert result == []
+class TestParseXMLPublic:
+    """Unit tests for the parse_xml function."""
+
+    def test_returns_root_element(self):
+        """A well-formed document returns its root element."""
+        result = parse_xml("  <root><child>Content</child></root>  ")
+        assert result.tag == "root"
+        assert result[0].text == "Content"
+
+    def test_drops_blank_text(self):
+        """Whitespace between elements is not kept in the tree."""
+        result = parse_xml("<root>\n  <child/>\n</root>")
+        assert result.text is None
+        assert result[0].tail is None
+
+    def test_empty_string_raises_validation_error(self):
+        """An empty string raises an EMPTY_XML ValidationError."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_xml("   ")
+        assert exc_info.value.code == "EMPTY_XML"
+
+    def test_malformed_xml_raises_validation_error(self):
+        """Malformed XML raises an XML_PARSE_ERROR ValidationError."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_xml("<root>")
+        assert exc_info.value.code == "XML_PARSE_ERROR"
+
+
+class TestParseXMLBytes:
+    """Unit tests for the parse_xml_bytes function."""
+
+    def test_honors_declared_encoding(self):
+        """The encoding declared by the document is used to decode it."""
+        xml = '<?xml version="1.0" encoding="ISO-8859-1"?><root>caf\u00e9</root>'.encode("iso-8859-1")
+        assert parse_xml_bytes(xml).text == "caf\u00e9"
+
+    def test_accepts_buffers(self):
+        """Any object supporting the buffer protocol can be parsed."""
+        assert parse_xml_bytes(memoryview(b"<root><child/></root>"))[0].tag == "child"
+
+    def test_blank_data_raises_validation_error(self):
+        """Whitespace-only data raises an EMPTY_XML ValidationError."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_xml_bytes(b" \n ")
+        assert exc_info.value.code == "EMPTY_XML"
+
+    def test_malformed_xml_raises_validation_error(self):
+        """Malformed XML raises an XML_PARSE_ERROR ValidationError."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_xml_bytes(b"<root>")
+        assert exc_info.value.code == "XML_PARSE_ERROR"
+
+
+class TestParseXMLFile:
+    """Unit tests for the parse_xml_file function."""
+
+    def test_returns_root_element(self):
+        """A binary file object is parsed without blank text."""
+        result = parse_xml_file(io.BytesIO(b"<root>\n  <child/>\n</root>"))
+        assert result.tag == "root"
+        assert result[0].tail is None
+
+    def test_malformed_xml_raises_validation_error(self):
+        """Malformed XML raises an XML_PARSE_ERROR ValidationError."""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_xml_file(io.BytesIO(b"<root>"))
+        assert exc_info.value.code == "XML_PARSE_ERROR"
+
+
+STRUCTURE_XML = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" id="Definitions_1">
+    <bpmn:process id="Process_1">
+        <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Sub_1"/>
+        <bpmn:startEvent id="Start_1"/>
+        <bpmn:subProcess id="Sub_1">
+            <bpmn:startEvent id="SubStart_1"/>
+            <bpmn:task id="SubTask_1"/>
+            <bpmn:sequenceFlow id="SubFlow_1" sourceRef="SubStart_1" targetRef="{target}"/>
+        </bpmn:subProcess>
+    </bpmn:process>
+    <bpmn:message id="{message_id}"/>
+</bpmn:definitions>"""
+
+
+def linear_process(tasks: int) -> ET._Element:
+    """Return a document with a process of tasks connected in a line."""
+    definitions = ET.Element("{http://www.omg.org/spec/BPMN/20100524/MODEL}definitions", id="Definitions_1")
+    process = ET.SubElement(definitions, "{http://www.omg.org/spec/BPMN/20100524/MODEL}process", id="Process_1")
+    for number in range(tasks):
+        ET.SubElement(process, "{http://www.omg.org/spec/BPMN/20100524/MODEL}task", id=f"Task_{number}")
+    for number in range(1, tasks):
+        ET.SubElement(
+            process,
+            "{http://www.omg.org/spec/BPMN/20100524/MODEL}sequenceFlow",
+            id=f"Flow_{number}",
+            sourceRef=f"Task_{number - 1}",
+            targetRef=f"Task_{number}",
+        )
+    return definitions
+
+
+class TestValidateStructure:
+    """Unit tests for _validate_structure function."""
+
+    def test_valid_structure_passes(self):
+        """Flows may reference nodes that come after them, including in sub-processes."""
+        doc = ET.fromstring(STRUCTURE_XML.format(target="SubTask_1", message_id="Message_1"))
+
+        assert _validate_structure(doc) == []
+
+    def test_duplicate_ids_are_reported(self):
+        """Each ID used by more than one element is reported once, with the ID."""
+        doc = ET.fromstring(STRUCTURE_XML.format(target="SubTask_1", message_id="Start_1"))
+
+        errors = _validate_structure(doc)
+
+        assert [(error.code, error.element_id) for error in errors] == [("DUPLICATE_ID", "Start_1")]
+        assert errors[0].message == "ID 'Start_1' is used by more than one element"
+
+    def test_extension_elements_may_reuse_ids(self):
+        """The ID attribute of an extension element is not a BPMN ID."""
+        xml = STRUCTURE_XML.format(target="SubTask_1", message_id="Message_1").replace(
+            '<bpmn:startEvent id="Start_1"/>',
+            '<bpmn:startEvent id="Start_1"><bpmn:extensionElements><x:target xmlns:x="urn:x" id="Start_1"/>'
+            "</bpmn:extensionElements></bpmn:startEvent>",
+        )
+
+        assert _validate_structure(ET.fromstring(xml)) == []
+
+    def test_sub_process_flows_are_checked(self):
+        """A flow of a nested sub-process that references an unknown node is reported."""
+        doc = ET.fromstring(STRUCTURE_XML.format(target="Missing_1", message_id="Message_1"))
+
+        errors = _validate_structure(doc)
+
+        assert [error.code for error in errors] == ["INVALID_REFERENCE"]
+        assert "'SubFlow_1' target ref 'Missing_1'" in errors[0].message
+
+    def test_missing_process_id(self):
+        """A process without an ID is reported."""
+        doc = ET.fromstring(
+            STRUCTURE_XML.format(target="SubTask_1", message_id="Message_1").replace(' id="Process_1"', "")
+        )
+
+        assert [error.code for error in _validate_structure(doc)] == ["MISSING_ATTRIBUTE"]
+
+    def test_duplicates_fail_the_structural_level(self):
+        """Duplicate IDs make a document invalid without the schema check."""
+        xml = STRUCTURE_XML.format(target="SubTask_1", message_id="Process_1")
+
+        result = validate(xml, level="structural")
+
+        assert not result.is_valid
+        assert result.errors[0].code == "DUPLICATE_ID"
+
+    def test_linear_scaling(self):
+        """Ten times more flow nodes take about ten times longer, not a hundred."""
+
+        def best_time(tasks: int) -> float:
+            doc = linear_process(tasks)
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                assert _validate_structure(doc) == []
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        assert best_time(20_000) / best_time(2_000) < 30
 
 
 class TestIsSkippableError:
@@ -405,3 +563,324 @@ class TestValidate:
         assert len(result.errors) == 1
         assert result.errors[0].code == "XML_PARSE_ERROR"
         assert "Premature end of data in tag definitions" in result.errors[0].message
+
+
+class TestValidateElement:
+    """Unit tests for validate_element function."""
+
+    def test_validates_a_parsed_tree(self):
+        """An already parsed tree is validated without re-parsing."""
+        xml = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+            targetNamespace="http://example.org/bpmn">
+            <bpmn:process id="Process_1">
+                <bpmn:startEvent id="Start_1"/>
+                <bpmn:endEvent id="End_1"/>
+                <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="End_1"/>
+            </bpmn:process>
+        </bpmn:definitions>"""
+
+        result = validate_element(parse_xml(xml))
+
+        assert result.is_valid
+
+    def test_reports_the_same_errors_as_validate(self):
+        """Validating a tree reports the same errors as validating the string."""
+        xml = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+            targetNamespace="http://example.org/bpmn">
+            <bpmn:process id="Process_1">
+                <bpmn:startEvent id="Start_1"/>
+                <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Missing_1"/>
+            </bpmn:process>
+        </bpmn:definitions>"""
+
+        result = validate_element(parse_xml(xml))
+
+        assert not result.is_valid
+        assert [str(error) for error in result.errors] == [str(error) for error in validate(xml).errors]
+
+
+LEVELS_XML = """<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+    targetNamespace="http://example.org/bpmn">
+    <bpmn:process id="Process_1">
+        <bpmn:startEvent id="Start_1"/>
+        <bpmn:unknownTag/>
+        <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Missing_1"/>
+    </bpmn:process>
+</bpmn:definitions>"""
+
+
+class TestValidationLevel:
+    """Unit tests for the validation levels of validate_element and validate."""
+
+    def test_schema_level_stops_at_schema_errors(self):
+        """The schema level reports schema errors before the structural checks."""
+        result = validate_element(parse_xml(LEVELS_XML), ValidationLevel.SCHEMA)
+
+        assert result.errors
+        assert {error.code for error in result.errors} == {"SCHEMA_ERROR"}
+
+    def test_structural_level_skips_the_schema(self):
+        """The structural level only checks IDs and flow references."""
+        result = validate_element(parse_xml(LEVELS_XML), "structural")
+
+        assert [error.code for error in result.errors] == ["INVALID_REFERENCE"]
+
+    def test_off_level_runs_no_checks(self, mocker):
+        """Nothing is checked when validation is off."""
+        schema_check = mocker.patch("pybpmn_parser.validator._validate_bpmn_schema")
+
+        result = validate(LEVELS_XML, ValidationLevel.OFF)
+
+        assert result.is_valid
+        schema_check.assert_not_called()
+
+    def test_unknown_level_raises(self):
+        """An unknown level is rejected."""
+        with pytest.raises(ValueError, match="'strict' is not a valid ValidationLevel"):
+            validate_element(parse_xml(LEVELS_XML), "strict")
+
+
+class TestRaiseForErrors:
+    """Unit tests for ValidationResult.raise_for_errors."""
+
+    def test_raised_error_holds_the_errors(self):
+        """The raised error carries the individual errors, not only their text."""
+        errors = [ValidationError("INVALID_FLOW", "Flow Flow_1 missing source reference", "Flow_1")]
+
+        with pytest.raises(ValidationError) as excinfo:
+            ValidationResult(errors).raise_for_errors()
+
+        assert excinfo.value.code == "VALIDATION_ERROR"
+        assert excinfo.value.errors == errors
+
+    def test_errors_survive_pickling(self):
+        """The individual errors are kept when the error crosses a process boundary."""
+        error = ValidationError("VALIDATION_ERROR", "failed", errors=[ValidationError("SCHEMA_ERROR", "bad")])
+
+        restored = pickle.loads(pickle.dumps(error))
+
+        assert str(restored) == "VALIDATION_ERROR: failed"
+        assert [str(child) for child in restored.errors] == ["SCHEMA_ERROR: bad"]
+
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+class TestSchemaBackend:
+    """Unit tests for the schema backends."""
+
+    @pytest.mark.parametrize("bpmn_file", sorted(FIXTURE_DIR.rglob("*.bpmn")), ids=lambda path: path.stem)
+    def test_backends_agree(self, bpmn_file: Path):
+        """Both backends give the same result for every fixture."""
+        doc = parse_xml_bytes(bpmn_file.read_bytes())
+
+        lxml_result = validate_element(doc, backend="lxml")
+
+        assert lxml_result.errors == validate_element(doc, backend=SchemaBackend.XMLSCHEMA).errors
+
+    def test_valid_documents_skip_xmlschema(self, mocker):
+        """The lxml backend accepts a valid document without the pure-Python schema."""
+        mocker.patch("pybpmn_parser.validator.bpmn_schema", side_effect=AssertionError("xmlschema was used"))
+
+        assert validate_element(parse_xml_bytes((FIXTURE_DIR / "kitchen-sink.bpmn").read_bytes()), backend="lxml")
+
+    def test_invalid_documents_are_described_by_xmlschema(self):
+        """The lxml backend reports the same errors as the xmlschema backend."""
+        lxml_errors = validate(LEVELS_XML, backend="lxml").errors
+
+        assert [str(error) for error in lxml_errors] == [str(error) for error in validate(LEVELS_XML).errors]
+        assert lxml_errors
+
+    def test_unknown_backend_raises(self):
+        """An unknown backend is rejected."""
+        with pytest.raises(ValueError, match="'xerces' is not a valid SchemaBackend"):
+            validate(LEVELS_XML, backend="xerces")
+
+
+class TestSchemaCompilation:
+    """Unit tests for compiling the xmlschema schema on demand."""
+
+    def test_import_does_not_compile(self):
+        """Importing the validator neither compiles the schema nor imports xmlschema."""
+        script = "import sys, pybpmn_parser.validator; print('xmlschema' in sys.modules)"
+
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)  # noqa: S603
+
+        assert output.stdout.strip() == "False"
+
+    def test_compiled_schema_is_cached_on_disk(self, monkeypatch, mocker, tmp_path: Path):
+        """A compiled schema is pickled once and loaded by later processes."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        _load_bpmn_schema.__wrapped__()
+        (cache_file,) = tmp_path.glob("xmlschema-*.pickle")
+        compile_schema = mocker.patch("xmlschema.XMLSchema")
+
+        schema = _load_bpmn_schema.__wrapped__()
+
+        compile_schema.assert_not_called()
+        assert schema.is_valid(parse_xml_bytes((FIXTURE_DIR / "kitchen-sink.bpmn").read_bytes()))
+        assert cache_file.exists()
+
+    def test_damaged_cache_is_replaced(self, monkeypatch, tmp_path: Path):
+        """A cached schema that cannot be unpickled is compiled again."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        _load_bpmn_schema.__wrapped__()
+        (cache_file,) = tmp_path.glob("xmlschema-*.pickle")
+        cache_file.write_bytes(b"damaged")
+
+        _load_bpmn_schema.__wrapped__()
+
+        assert cache_file.stat().st_size > len(b"damaged")
+
+    def test_unverified_cache_is_not_unpickled(self, monkeypatch, mocker, tmp_path: Path):
+        """A cached schema without the HMAC of `write_verified`, such as a planted pickle, is never unpickled."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        _load_bpmn_schema.__wrapped__()
+        (cache_file,) = tmp_path.glob("xmlschema-*.pickle")
+        cache_file.write_bytes(cache_file.read_bytes()[MAC_SIZE:])
+        loads = mocker.patch("pybpmn_parser.validator.pickle.loads")
+
+        _load_bpmn_schema.__wrapped__()
+
+        loads.assert_not_called()
+
+    def test_schema_is_shared(self):
+        """The schema is compiled once per process, and still available as `BPMN_SCHEMA`."""
+        import pybpmn_parser.validator
+
+        assert bpmn_schema() is bpmn_schema() is pybpmn_parser.validator.BPMN_SCHEMA
+
+
+RULES_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:zeebe="http://camunda.org/schema/zeebe/1.0"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+  <bpmn:message id="Message_1" />
+  <bpmn:process id="Process_1">
+    <bpmn:startEvent id="Start_1" />
+    <bpmn:exclusiveGateway id="Gateway_1" />
+    <bpmn:serviceTask id="Task_1">
+      <bpmn:extensionElements>
+        <zeebe:taskDefinition type="" />
+      </bpmn:extensionElements>
+    </bpmn:serviceTask>
+    <bpmn:scriptTask id="Task_2" />
+    <bpmn:boundaryEvent id="Boundary_1" attachedToRef="Task_2" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="Start_1" targetRef="Gateway_1" />
+    <bpmn:sequenceFlow id="Flow_2" sourceRef="Gateway_1" targetRef="Task_1" />
+    <bpmn:sequenceFlow id="Flow_3" sourceRef="Gateway_1" targetRef="Task_2" />
+  </bpmn:process>
+  <bpmn:process id="Process_2">
+    <bpmn:exclusiveGateway id="Gateway_2" default="Flow_5" />
+    <bpmn:task id="Task_3" />
+    <bpmn:task id="Task_4" />
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Gateway_2" targetRef="Task_3" />
+    <bpmn:sequenceFlow id="Flow_5" sourceRef="Gateway_2" targetRef="Task_4" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+@rule("bpmn:exclusiveGateway", "bpmn:inclusiveGateway")
+def missing_default_flow(gateway, context):
+    """A gateway that splits must have a default flow."""
+    flows = [flow for flow in context.root.sequence_flows if flow.source_ref == gateway.id]
+    if len(flows) > 1 and not gateway.default:
+        yield f"Gateway splits into {len(flows)} flows without a default"
+
+
+@rule("bpmn:boundaryEvent")
+def boundary_on_script_task(event, context):
+    """Boundary events are not supported on script tasks."""
+    if type(context.elements_by_id.get(event.attached_to_ref)).__name__ == "ScriptTask":
+        yield f"Boundary event attached to script task '{event.attached_to_ref}'"
+
+
+@rule("zeebe:taskDefinition", name="zeebe_task_type")
+def zeebe_task_type(task_definition, context):
+    """A zeebe task definition needs a job type."""
+    if not task_definition.type:
+        yield ValidationError("ZEEBE_TASK_TYPE", "Task definition without a job type")
+
+
+@rule("bpmn:flowNode")
+def every_flow_node(node, context):
+    """Report nothing, to count the flow nodes."""
+    return ()
+
+
+class TestRuleEngine:
+    """Unit tests for the RuleEngine class."""
+
+    @pytest.fixture
+    def definitions(self):
+        """A document that breaks each rule once."""
+        return Parser(validation="off").parse_bytes(RULES_XML).definition
+
+    def test_rules_report_problems(self, definitions):
+        """Messages are reported with the rule name and the element ID, errors as they are."""
+        engine = RuleEngine([missing_default_flow, boundary_on_script_task, zeebe_task_type])
+
+        report = engine.check(definitions)
+
+        assert [(error.code, error.element_id) for error in report.errors] == [
+            ("ZEEBE_TASK_TYPE", None),
+            ("missing_default_flow", "Gateway_1"),
+            ("boundary_on_script_task", "Boundary_1"),
+        ]
+        assert report.errors[1].message == "Gateway splits into 2 flows without a default"
+
+    def test_rules_apply_to_subtypes(self, definitions):
+        """A rule on an abstract type runs once on every element of its subtypes."""
+        report = RuleEngine([every_flow_node]).check(definitions)
+
+        assert report.timings["every_flow_node"].calls == 8
+        assert report.timings["every_flow_node"].seconds >= 0
+
+    def test_elements_are_dispatched_by_type(self):
+        """Each class is matched to the rules for it once, through its qualified names."""
+        Parser()
+        engine = RuleEngine([missing_default_flow, every_flow_node, zeebe_task_type])
+        from pybpmn_parser.bpmn import ExclusiveGateway, Message, Task
+
+        assert engine.rules_for(ExclusiveGateway) == (missing_default_flow, every_flow_node)
+        assert engine.rules_for(Task) == (every_flow_node,)
+        assert engine.rules_for(Message) == ()
+        assert engine.rules_for(Task) is engine.rules_for(Task)
+
+    @pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_processes_run_in_an_executor(self, definitions, executor_class):
+        """An executor gives the same report as checking in the calling thread."""
+        engine = RuleEngine([missing_default_flow, boundary_on_script_task, zeebe_task_type, every_flow_node])
+        expected = engine.check(definitions)
+
+        with executor_class(max_workers=2) as executor:
+            report = engine.check(definitions, executor)
+
+        assert [str(error) for error in report.errors] == [str(error) for error in expected.errors]
+        assert {name: timing.calls for name, timing in report.timings.items()} == {
+            name: timing.calls for name, timing in expected.timings.items()
+        }
+
+    def test_lazy_documents_are_checked_completely(self):
+        """The root elements of a lazily parsed document are built before checking."""
+        definitions = Parser(lazy=True, validation="off").parse_bytes(RULES_XML).definition
+
+        report = RuleEngine([every_flow_node]).check(definitions)
+
+        assert report.timings["every_flow_node"].calls == 8
+
+    def test_raise_for_errors(self, definitions):
+        """The report raises a ValidationError holding the errors."""
+        report = RuleEngine([missing_default_flow]).check(definitions)
+
+        with pytest.raises(ValidationError) as exc_info:
+            report.raise_for_errors()
+
+        assert exc_info.value.errors == report.errors
+
+    def test_rule_names_default_to_the_function(self):
+        """The decorator makes a rule named after the function."""
+        assert isinstance(missing_default_flow, Rule)
+        assert missing_default_flow.name == "missing_default_flow"
+        assert zeebe_task_type.applies_to == ("zeebe:taskDefinition",)
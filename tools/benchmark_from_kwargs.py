@@ -0,0 +1,85 @@
+"""
+Compare the generated `from_kwargs` constructors with the previous implementation.
+
+The previous implementation computed `inspect.signature(cls)` on every call and always allocated
+`__extra_kwargs__`. Usage:
+
+    python tools/benchmark_from_kwargs.py [--tasks N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from inspect import signature
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def legacy_from_kwargs(cls: Any, **kwargs) -> Any:
+    """The `from_kwargs` implementation before constructors were generated."""
+    cls_fields = set(signature(cls).parameters)
+    native_args, new_args = {}, {}
+    for name, val in kwargs.items():
+        if name in cls_fields:
+            native_args[name] = val
+        else:
+            new_args[name] = val
+    ret = cls(**native_args)
+    extra_kwargs = {}
+    for new_name, new_val in new_args.items():
+        setattr(ret, new_name, new_val)
+        extra_kwargs[new_name] = new_val
+    ret.__extra_kwargs__ = extra_kwargs
+    return ret
+
+
+def time_build(xml_bytes: bytes, repeat: int) -> float:
+    """Return the best time to build the model from an already parsed tree."""
+    from pybpmn_parser.factory import create_bpmn_from_element
+    from pybpmn_parser.parse import ParseContext, Parser
+    from pybpmn_parser.validator import parse_xml_bytes
+
+    parser = Parser()
+    timings = []
+    for _ in range(repeat):
+        root = parse_xml_bytes(xml_bytes)
+        start = time.perf_counter()
+        create_bpmn_from_element(root, ParseContext(), parser.ns_map)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    from bpmn_generator import generate
+
+    from pybpmn_parser.element_registry import registry
+    from pybpmn_parser.parse import Parser
+
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--tasks", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    Parser()
+    xml_bytes = generate(args.tasks).encode("utf-8")
+    generated = time_build(xml_bytes, args.repeat)
+
+    classes = {descriptor.type: descriptor.type.__dict__["from_kwargs"] for descriptor in registry.by_qname.values()}
+    try:
+        for cls in classes:
+            cls.from_kwargs = classmethod(legacy_from_kwargs)
+        legacy = time_build(xml_bytes, args.repeat)
+    finally:
+        for cls, from_kwargs in classes.items():
+            cls.from_kwargs = from_kwargs
+
+    print(f"Model build for {args.tasks} tasks")
+    print(f"  legacy     {legacy * 1000:10.1f} ms")
+    print(f"  generated  {generated * 1000:10.1f} ms  ({legacy / generated:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the wall time and peak memory of the parse pipelines.
+
+Each measurement runs in a fresh interpreter so the peak resident set size of one pipeline
+does not hide the other. Usage:
+
+    python tools/benchmark_parse.py [FILE ...] [--tasks N] [--repeat N]
+
+Without files, a synthetic document with `--tasks` service tasks is generated.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+if TYPE_CHECKING:
+    from pybpmn_parser.parse import Parser
+
+
+def _legacy(parser: "Parser", xml_str: str) -> object:
+    """Validate with one tokenizer pass, then build the model from a second `xmltodict` pass."""
+    import xmltodict
+
+    from pybpmn_parser.factory import create_bpmn
+    from pybpmn_parser.parse import ParseContext, ParseResult
+    from pybpmn_parser.validator import validate
+
+    validate(xml_str).raise_for_errors()
+    context = ParseContext()
+    return ParseResult(create_bpmn(xmltodict.parse(xml_str), context, parser.ns_map), context)
+
+
+def _single(parser: "Parser", xml_str: str) -> object:
+    """The current `Parser.parse_string` pipeline."""
+    return parser.parse_string(xml_str)
+
+
+def _stream(parser: "Parser", xml_str: str) -> object:
+    """The `Parser.parse_stream` pipeline, reading from a file object."""
+    import io
+
+    return parser.parse_stream(io.BytesIO(xml_str.encode("utf-8")))
+
+
+PIPELINES: dict[str, Callable[["Parser", str], object]] = {"legacy": _legacy, "single": _single, "stream": _stream}
+
+
+def run_one(pipeline: str, path: Path, repeat: int) -> dict:
+    """Measure one pipeline in the current process."""
+    from pybpmn_parser.parse import Parser
+
+    parser = Parser()  # Load the registry and plugins outside the measurement.
+    xml_str = path.read_text(encoding="utf-8")
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        PIPELINES[pipeline](parser, xml_str)
+        timings.append(time.perf_counter() - start)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"best_seconds": min(timings), "peak_rss_delta_kib": after - before}
+
+
+def measure(pipeline: str, path: Path, repeat: int) -> dict:
+    """Measure one pipeline in a subprocess."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--child", pipeline, "--repeat", str(repeat), str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("files", nargs="*", type=Path)
+    arg_parser.add_argument("--tasks", type=int, default=5000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--child", choices=sorted(PIPELINES), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child, args.files[0], args.repeat)))
+        return
+
+    files = args.files
+    if not files:
+        from bpmn_generator import generate
+
+        synthetic = Path(tempfile.mkdtemp()) / f"synthetic-{args.tasks}.bpmn"
+        synthetic.write_text(generate(args.tasks), encoding="utf-8")
+        files = [synthetic]
+
+    for path in files:
+        print(f"{path.name} ({path.stat().st_size / 1024 / 1024:.1f} MiB)")
+        for pipeline in PIPELINES:
+            result = measure(pipeline, path, args.repeat)
+            print(
+                f"  {pipeline:<8} {result['best_seconds'] * 1000:10.1f} ms"
+                f"  peak RSS +{result['peak_rss_delta_kib'] / 1024:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
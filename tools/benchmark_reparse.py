@@ -0,0 +1,55 @@
+"""
+Compare re-parsing a document after a one-task edit with parsing it from scratch.
+
+The documents have `--processes` linear processes with a complete diagram; the edit renames one task of the
+first process, so one process and its task are rebuilt. Usage:
+
+    python tools/benchmark_reparse.py [--sizes N ...] [--processes N] [--validation LEVEL] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    from bpmn_generator import generate
+
+    from pybpmn_parser.parse import Parser
+
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--processes", type=int, default=10)
+    arg_parser.add_argument("--validation", default="structural")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    parser = Parser(validation=args.validation)
+    print(f"{'tasks':>8} {'full parse':>12} {'reparse':>12} {'speedup':>8}")
+    for size in args.sizes:
+        xml = generate(size // args.processes, args.processes, with_extensions=False).encode("utf-8")
+        edited = xml.replace(b'name="Node 1"', b'name="Node one"', 1)
+        result = parser.reparse(None, xml)
+
+        full = []
+        incremental = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            parser.parse_bytes(edited)
+            full.append(time.perf_counter() - start)
+            for version in (edited, xml):
+                start = time.perf_counter()
+                parser.reparse(result, version)
+                incremental.append(time.perf_counter() - start)
+        print(
+            f"{size:>8} {min(full) * 1000:9.1f} ms {min(incremental) * 1000:9.1f} ms "
+            f"{min(full) / min(incremental):7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Show how the structural validation scales with the number of flow nodes, against the previous implementation.
+
+The previous implementation looked up each sequence flow's references in a list of every ID, so its time grows
+with the square of the document size; it is only run up to `--legacy-max` tasks. Usage:
+
+    python tools/benchmark_validator.py [--sizes N ...] [--legacy-max N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+if TYPE_CHECKING:
+    import lxml.etree as ET  # noqa: N812
+
+
+def legacy_validate_structure(doc: "ET._Element") -> list:
+    """The structural validation before it was done in one walk over the tree."""
+    from pybpmn_parser.validator import _validate_flows, _validate_process_id  # noqa: PLC2701
+
+    ids = list({elem.get("id") for elem in doc.findall(".//*[@id]")})
+    errors = []
+    for process in doc.findall(".//{*}process"):
+        errors.extend(_validate_process_id(process))
+        flows = process.findall(".//{*}sequenceFlow")
+        errors.extend(_validate_flows(flows, ids))
+    return errors
+
+
+def best_time(validate: Callable, doc: "ET._Element", repeat: int) -> float:
+    """Return the best time to validate a parsed document."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validate(doc)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    from bpmn_generator import generate
+
+    from pybpmn_parser.validator import _validate_structure, parse_xml_bytes  # noqa: PLC2701
+
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--legacy-max", type=int, default=10_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(f"{'tasks':>8} {'single walk':>14} {'per node':>10} {'legacy':>12}")
+    for size in args.sizes:
+        doc = parse_xml_bytes(generate(size, with_extensions=False).encode("utf-8"))
+        walk = best_time(_validate_structure, doc, args.repeat)
+        legacy = "" if size > args.legacy_max else f"{best_time(legacy_validate_structure, doc, 1) * 1000:9.1f} ms"
+        print(f"{size:>8} {walk * 1000:11.1f} ms {walk / size * 1e6:7.2f} us {legacy:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Generate synthetic BPMN documents of arbitrary size for benchmarking."""
+
+import argparse
+from pathlib import Path
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+                  xmlns:dc="http://www.omg.org/spec/DD/20100524/DC"
+                  xmlns:di="http://www.omg.org/spec/DD/20100524/DI"
+                  xmlns:camunda="http://camunda.org/schema/1.0/bpmn"
+                  id="Definitions_1" targetNamespace="http://bpmn.io/schema/bpmn">
+"""
+
+
+def _process(process_id: str, num_tasks: int, with_extensions: bool) -> tuple[list[str], list[str]]:
+    """Return the semantic and diagram lines for one linear process."""
+    node_ids = [f"{process_id}_Start"] + [f"{process_id}_Task_{i}" for i in range(num_tasks)] + [f"{process_id}_End"]
+    flow_ids = [f"{process_id}_Flow_{i}" for i in range(len(node_ids) - 1)]
+    lines = [f'  <bpmn:process id="{process_id}" isExecutable="true">']
+    shapes = []
+
+    for index, node_id in enumerate(node_ids):
+        incoming = f"      <bpmn:incoming>{flow_ids[index - 1]}</bpmn:incoming>\n" if index > 0 else ""
+        outgoing = f"      <bpmn:outgoing>{flow_ids[index]}</bpmn:outgoing>\n" if index < len(flow_ids) else ""
+        if index == 0:
+            tag = "startEvent"
+        elif index == len(node_ids) - 1:
+            tag = "endEvent"
+        else:
+            tag = "serviceTask"
+        extensions = ""
+        if with_extensions and tag == "serviceTask":
+            extensions = (
+                "      <bpmn:extensionElements>\n"
+                "        <camunda:properties>\n"
+                f'          <camunda:property name="index" value="{index}" />\n'
+                "        </camunda:properties>\n"
+                "      </bpmn:extensionElements>\n"
+            )
+        lines.append(
+            f'    <bpmn:{tag} id="{node_id}" name="Node {index}">\n{extensions}{incoming}{outgoing}    </bpmn:{tag}>'
+        )
+        shapes.append(
+            f'      <bpmndi:BPMNShape id="{node_id}_di" bpmnElement="{node_id}">\n'
+            f'        <dc:Bounds x="{index * 150}" y="100" width="100" height="80" />\n'
+            "      </bpmndi:BPMNShape>"
+        )
+
+    for index, flow_id in enumerate(flow_ids):
+        lines.append(
+            f'    <bpmn:sequenceFlow id="{flow_id}" sourceRef="{node_ids[index]}" targetRef="{node_ids[index + 1]}" />'
+        )
+        shapes.append(
+            f'      <bpmndi:BPMNEdge id="{flow_id}_di" bpmnElement="{flow_id}">\n'
+            f'        <di:waypoint x="{index * 150 + 100}" y="140" />\n'
+            f'        <di:waypoint x="{index * 150 + 150}" y="140" />\n'
+            "      </bpmndi:BPMNEdge>"
+        )
+
+    lines.append("  </bpmn:process>")
+    return lines, shapes
+
+
+def generate(num_tasks: int, num_processes: int = 1, with_extensions: bool = True) -> str:
+    """
+    Generate a BPMN document with linear processes and a complete diagram.
+
+    Args:
+        num_tasks: The number of service tasks in each process.
+        num_processes: The number of processes in the document.
+        with_extensions: Add a `camunda:properties` extension element to every task.
+
+    Returns:
+        The BPMN XML document.
+    """
+    semantic = []
+    diagrams = []
+    for process_index in range(num_processes):
+        process_id = f"Process_{process_index}"
+        lines, shapes = _process(process_id, num_tasks, with_extensions)
+        semantic.extend(lines)
+        diagrams.append(f'  <bpmndi:BPMNDiagram id="Diagram_{process_index}">')
+        diagrams.append(f'    <bpmndi:BPMNPlane id="Plane_{process_index}" bpmnElement="{process_id}">')
+        diagrams.extend(shapes)
+        diagrams.append("    </bpmndi:BPMNPlane>")
+        diagrams.append("  </bpmndi:BPMNDiagram>")
+    return HEADER + "\n".join(semantic + diagrams) + "\n</bpmn:definitions>\n"
+
+
+def main() -> None:
+    """Write a synthetic BPMN document to a file."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("output", type=Path, help="The file to write.")
+    arg_parser.add_argument("--tasks", type=int, default=1000, help="Service tasks per process.")
+    arg_parser.add_argument("--processes", type=int, default=1, help="Number of processes.")
+    arg_parser.add_argument("--no-extensions", action="store_true", help="Omit the camunda extension elements.")
+    args = arg_parser.parse_args()
+    args.output.write_text(generate(args.tasks, args.processes, not args.no_extensions), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
-"""Used to regenerate the expected output for testing the bpmn parser."""
+"""
+Used to regenerate the expected output for testing the bpmn parser.
 
+With `--benchmark`, time converting the MIWG suite to plain structures and to JSON, and loading it back
+instead. Usage:
+
+    python tools/rebuild_expected_fixtures.py [--benchmark] [--repeat N]
+"""
+
+import argparse
+import io
 import json
+import sys
+import time
 from pathlib import Path
 
-from pybpmn_parser.core import dataclass_to_dict
-
 repo_path = Path(__file__).parent.parent
 fixtures_path = repo_path / "tests/fixtures"
 
+sys.path.insert(0, str(repo_path))
+
+from pybpmn_parser.core import dataclass_to_dict, write_json  # noqa: E402
+from pybpmn_parser.loader import from_dict  # noqa: E402
+
 
 def generate_expected_output() -> None:
     """Convert bpmn output to JSON."""
@@ -16,11 +30,57 @@ def generate_expected_output() -> None:
     parser = Parser()
     for filename in fixtures_path.glob("**/*.bpmn"):
         o = parser.parse_file(filename)
-        output_file = filename.with_suffix(".json")
-        data = dataclass_to_dict(o, skip_empty=True)
-        output_file.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        with filename.with_suffix(".json").open("w", encoding="utf-8") as output_file:
+            write_json(o, output_file, skip_empty=True, indent=2, sort_keys=True)
     print("Finished generating expected output for all fixtures.")
 
 
+def benchmark(repeat: int) -> None:
+    """Time converting the parsed MIWG suite, serializing it with json and, if installed, orjson, and loading it."""
+    from pybpmn_parser.parse import Parser
+
+    parser = Parser()
+    filenames = sorted(fixtures_path.glob("miwg-test-suite-2025/*.bpmn"))
+    results = [parser.parse_file(filename) for filename in filenames]
+
+    serializers = {"json": json.dumps}
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        serializers["orjson"] = orjson.dumps
+
+    def best_of(function: object) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    print(f"{len(results)} MIWG files, best of {repeat}")
+    to_dict = best_of(lambda: [dataclass_to_dict(result, skip_empty=True) for result in results])
+    print(f"  dataclass_to_dict:                       {to_dict:9.1f} ms")
+    converted = [dataclass_to_dict(result, skip_empty=True, json_compatible=True) for result in results]
+    for name, dumps in serializers.items():
+        elapsed = best_of(lambda dumps=dumps: [dumps(data) for data in converted])
+        print(f"  {name + '.dumps':<40} {elapsed:9.1f} ms")
+    streamed = best_of(lambda: [write_json(result, io.StringIO(), skip_empty=True) for result in results])
+    print(f"  write_json:                              {streamed:9.1f} ms")
+    texts = [json.dumps(data) for data in converted]
+    loaded = best_of(lambda: [from_dict(json.loads(text)) for text in texts])
+    print(f"  from_dict(json.loads):                   {loaded:9.1f} ms")
+    parsed = best_of(lambda: [parser.parse_file(filename) for filename in filenames])
+    print(f"  Parser.parse_file:                       {parsed:9.1f} ms")
+
+
 if __name__ == "__main__":
-    generate_expected_output()
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--benchmark", action="store_true")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    if args.benchmark:
+        benchmark(args.repeat)
+    else:
+        generate_expected_output()